@@ -31,6 +31,7 @@ def build_app(
     plot_alternatives: str,
     extras: str,
     auth: bool,
+    explanations_cohort: int = 0,
 ) -> Path:
     def split_and_clean(raw: str) -> list:
         lst = raw.split(",")
@@ -85,6 +86,7 @@ def build_app(
                     ],
                     "extras_cbk": extras_cbk,
                     "auth": auth,
+                    "explanations_cohort": explanations_cohort,
                 }
             ),
         )
@@ -100,6 +102,7 @@ def build_app(
                     "explainers": split_and_clean(explainers),
                     "imputers": split_and_clean(imputers),
                     "plot_alternatives": [],
+                    "explanations_cohort": explanations_cohort,
                 }
             )
         )
@@ -188,7 +191,7 @@ def pack(
     "--explainers",
     type=str,
     default="kernel_shap",
-    help="Which explainers to include. There can be multiple explainer names, separated by a comma. Available explainers: kernel_shap,invase,shap_permutation_sampler,lime.",
+    help="Which explainers to include. There can be multiple explainer names, separated by a comma. Available explainers: kernel_shap,tree_shap,invase,shap_permutation_sampler,lime.",
 )
 @click.option(
     "--imputers",
@@ -220,6 +223,12 @@ def pack(
     default=False,
     help="Optional. If provided, the dashboard will be protected by a password.",
 )
+@click.option(
+    "--explanations_cohort",
+    type=int,
+    default=0,
+    help="Optional. Number of training rows whose explanations are precomputed at build time. The dashboard answers the requests close to them without running the explainers. 0 explains each request live.",
+)
 def build(
     name: str,
     task_type: str,
@@ -234,6 +243,7 @@ def build(
     extras: str,
     output: Path,
     auth: bool,
+    explanations_cohort: int,
 ) -> None:
     output = Path(output)
     try:
@@ -255,6 +265,7 @@ def build(
         plot_alternatives,
         extras,
         auth=auth,
+        explanations_cohort=explanations_cohort,
     )
 
     image_bin = Path(output) / "image_bin"
@@ -1,10 +1,11 @@
 # stdlib
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 # third party
 import pandas as pd
 
 # autoprognosis absolute
+from autoprognosis.deploy.explanations import explain
 import autoprognosis.logger as log
 from autoprognosis.plugins.explainers import Explainers
 from autoprognosis.studies._preprocessing import EncodersCallbacks
@@ -30,6 +31,7 @@ def classification_dashboard(
     encoders_ctx: EncodersCallbacks,
     menu_components: List,
     plot_alternatives: Dict,
+    explanations: Optional[Dict] = None,
 ) -> Any:
     """
     Streamlit helper for rendering the dashboard, using serialized models and menu components.
@@ -49,7 +51,11 @@ def classification_dashboard(
             Type of menu item for each feature: checkbox, dropdown etc.
         plot_alternatives: list
             List of features where to plot alternative values. Example: if treatment == 0, it will plot alternative treatment == 1 as well, as a comparison.
+        explanations: dict
+            The precomputed explanations of the models(ExplanationStore). The requests far from the stored cohort are explained live.
     """
+    if explanations is None:
+        explanations = {}
 
     st.set_page_config(layout="wide", page_title=title)
 
@@ -116,7 +122,9 @@ def classification_dashboard(
             if not hasattr(models[reason], "explain"):
                 continue
             try:
-                raw_interpretation = models[reason].explain(df)
+                raw_interpretation = explain(
+                    models[reason], df, explanations.get(reason)
+                )
                 if not isinstance(raw_interpretation, dict):
                     raise ValueError("raw_interpretation must be a dict")
             except BaseException:
@@ -1,5 +1,5 @@
 # stdlib
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
 # third party
 import numpy as np
@@ -12,6 +12,7 @@ from autoprognosis.apps.common.login import (
     is_authenticated,
     login,
 )
+from autoprognosis.deploy.explanations import explain
 import autoprognosis.logger as log
 from autoprognosis.plugins.explainers import Explainers
 from autoprognosis.studies._preprocessing import EncodersCallbacks
@@ -132,14 +133,21 @@ def generate_menu_items(menu_components):
 
 
 def generate_interpretation_plots(
-    models: list, df: pd.DataFrame, time_horizons: list, encoders_ctx
+    models: list,
+    df: pd.DataFrame,
+    time_horizons: list,
+    encoders_ctx: EncodersCallbacks,
+    explanations: Optional[Dict] = None,
 ) -> None:
+    if explanations is None:
+        explanations = {}
+
     figs = []
     for reason in models:
         if not hasattr(models[reason], "explain"):
             continue
         try:
-            raw_interpretation = models[reason].explain(df)
+            raw_interpretation = explain(models[reason], df, explanations.get(reason))
             if not isinstance(raw_interpretation, dict):
                 raise ValueError("raw_interpretation must be a dict")
         except BaseException:
@@ -274,6 +282,7 @@ def generate_survival_analysis_dashboard(
     time_horizons: List,
     plot_alternatives: Dict,
     extras_cbk: Callable = None,
+    explanations: Optional[Dict] = None,
 ) -> Any:
     """
     Streamlit helper for rendering the dashboard, using serialized models and menu components.
@@ -295,6 +304,8 @@ def generate_survival_analysis_dashboard(
             List of horizons to plot.
         plot_alternatives: list
             List of features where to plot alternative values. Example: if treatment == 0, it will plot alternative treatment == 1 as well, as a comparison.
+        explanations: dict
+            The precomputed explanations of the models(ExplanationStore). The requests far from the stored cohort are explained live.
     """
 
     menu, predictions = st.columns([1, 4])
@@ -346,7 +357,7 @@ def generate_survival_analysis_dashboard(
             # XAI data
             with st.spinner("Evaluating feature importance..."):
                 xai_figs = generate_interpretation_plots(
-                    models, df, time_horizons, encoders_ctx
+                    models, df, time_horizons, encoders_ctx, explanations
                 )
                 for xai_title, xai_fig in xai_figs:
                     st.subheader(xai_title)
@@ -365,6 +376,7 @@ def survival_analysis_dashboard(
     plot_alternatives: Dict,
     extras_cbk: Callable = None,
     auth: bool = False,
+    explanations: Optional[Dict] = None,
 ) -> Any:
     generate_page_config(title)
 
@@ -379,6 +391,7 @@ def survival_analysis_dashboard(
             time_horizons=time_horizons,
             plot_alternatives=plot_alternatives,
             extras_cbk=extras_cbk,
+            explanations=explanations,
         )
 
     login_key = "login_state"
@@ -398,6 +411,7 @@ def survival_analysis_dashboard(
             time_horizons=time_horizons,
             plot_alternatives=plot_alternatives,
             extras_cbk=extras_cbk,
+            explanations=explanations,
         )
 
     login_blocks = generate_login_block()
@@ -416,6 +430,7 @@ def survival_analysis_dashboard(
             time_horizons=time_horizons,
             plot_alternatives=plot_alternatives,
             extras_cbk=extras_cbk,
+            explanations=explanations,
         )
     elif password:
         st.info("Please enter a valid password")
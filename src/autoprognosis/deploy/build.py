@@ -14,10 +14,12 @@ import pandas as pd
 from autoprognosis.apps.common.pandas_to_streamlit import (
     generate_menu as generate_menu_with_streamlit,
 )
+from autoprognosis.deploy.explanations import ExplanationStore
 from autoprognosis.deploy.proto import (
     NewClassificationAppProto,
     NewRiskEstimationAppProto,
 )
+from autoprognosis.deploy.registry import write_manifest
 from autoprognosis.deploy.utils import file_copy, file_md5
 from autoprognosis.exceptions import BuildCancelled
 import autoprognosis.logger as log
@@ -322,6 +324,22 @@ class Builder:
 
         return app_models
 
+    def _precompute_explanations(self, app_models: dict, X: pd.DataFrame) -> dict:
+        explanations = {}
+        for name, model in app_models.items():
+            self._should_continue()
+            if not getattr(model, "explainers", None):
+                continue
+
+            try:
+                explanations[name] = ExplanationStore.build(
+                    model, X, cohort_size=self.task.explanations_cohort
+                )
+            except BaseException as e:
+                log.error(f"failed to precompute the explanations of {name}: {e}")
+
+        return explanations
+
     def _run(self, app_path: Path) -> str:
         self._should_continue()
         X, rawX, T, Y, encoders, checkboxes, sections = self._load_dataset()
@@ -349,6 +367,12 @@ class Builder:
 
         self._should_continue()
 
+        explanations: dict = {}
+        if self.task.explanations_cohort > 0:
+            explanations = self._precompute_explanations(app_models, X)
+
+        self._should_continue()
+
         app_title = self.task.name
         banner_title = f"{app_title} study"
 
@@ -376,6 +400,7 @@ class Builder:
                     "plot_alternatives": plot_alternatives,
                     "extras_cbk": self.task.extras_cbk,
                     "auth": self.task.auth,
+                    "explanations": explanations,
                 },
             )
         elif self.task.type == "classification":
@@ -390,9 +415,12 @@ class Builder:
                     "encoders": encoders,
                     "menu_components": menu_components,
                     "plot_alternatives": plot_alternatives,
+                    "explanations": explanations,
                 },
             )
         file_copy(app_path, self.app_backup_file)
+        # the models are unpacked for the lazy loading of the registry
+        write_manifest(self.app_backup_file)
         self.checkpoint = CHECKPOINT_DONE
 
         return str(self.app_backup_file)
@@ -0,0 +1,163 @@
+# stdlib
+from typing import Any, Dict, List, Optional
+
+# third party
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+
+DEFAULT_COHORT_SIZE = 1000
+
+
+class ExplanationStore:
+    """Precomputed explanations of a model over a cohort, for the dashboards.
+
+    The rows of the cohort are indexed on their standardized features. A request close to the cohort is answered from the explanations of its
+    nearest neighbours, weighted by inverse distance, and an exact match returns the stored explanation. The requests farther than
+    `max_distance` from the cohort are not answered: the caller falls back to the live explanation.
+
+    Args:
+        X: pd.DataFrame
+            The cohort, encoded like the input of the model.
+        explanations: dict
+            The output of `model.explain(X)`: the attributions of each explainer, with one row for each row of the cohort.
+        n_neighbors: int
+            Number of neighbours interpolated for each request.
+        max_distance: float
+            Maximum distance of a request to the cohort, in standardized units. Defaults to the 90th percentile of the distances between the
+            rows of the cohort and their nearest neighbour.
+        missing: list
+            The explainers of the model which could not be stored. If any, all the requests are explained live.
+    """
+
+    def __init__(
+        self,
+        X: pd.DataFrame,
+        explanations: Dict[str, Any],
+        n_neighbors: int = 5,
+        max_distance: Optional[float] = None,
+        missing: Optional[List[str]] = None,
+    ) -> None:
+        X = pd.DataFrame(X)
+        if len(X) == 0:
+            raise ValueError("Empty cohort")
+
+        self.columns = list(X.columns)
+
+        values = X.values.astype(float)
+        self.mean = np.nanmean(values, axis=0)
+        scale = np.nanstd(values, axis=0)
+        self.scale = np.where(scale > 0, scale, 1)
+
+        self.index = KDTree(self._points(X))
+        self.explanations = {
+            src: np.asarray(vals, dtype=np.float32)
+            for src, vals in explanations.items()
+        }
+        self.n_neighbors = min(n_neighbors, len(X))
+        self.missing = list(missing or [])
+
+        if max_distance is None:
+            max_distance = 0.0
+            if len(X) > 1:
+                dist, _ = self.index.query(self._points(X), k=2)
+                max_distance = float(np.quantile(dist[:, 1], 0.9))
+        self.max_distance = max_distance
+
+        self.hits = 0
+        self.misses = 0
+
+    def _points(self, X: pd.DataFrame) -> np.ndarray:
+        points = (X[self.columns].values.astype(float) - self.mean) / self.scale
+        # the missing values are imputed with the mean of the cohort
+        return np.nan_to_num(points, nan=0).astype(np.float32)
+
+    @classmethod
+    def build(
+        cls,
+        model: Any,
+        X: pd.DataFrame,
+        cohort_size: int = DEFAULT_COHORT_SIZE,
+        random_state: int = 0,
+        **kwargs: Any,
+    ) -> "ExplanationStore":
+        """Explain a cohort sampled from `X`, in a single call to `model.explain`.
+
+        Args:
+            model:
+                A model with explainers: `model.explain(X)` returns the attributions of each explainer.
+            X: pd.DataFrame
+                The training set, encoded like the input of the model.
+            cohort_size: int
+                Maximum number of rows of the cohort.
+            random_state: int
+                Seed of the sampling of the cohort.
+            kwargs:
+                Forwarded to the constructor.
+        """
+        cohort = pd.DataFrame(X).drop_duplicates()
+        if len(cohort) > cohort_size:
+            cohort = cohort.sample(cohort_size, random_state=random_state)
+
+        raw_explanations = model.explain(cohort)
+        if not isinstance(raw_explanations, dict):
+            raise ValueError("The explanations must be a dict")
+
+        explanations = {}
+        missing = []
+        for src, vals in raw_explanations.items():
+            vals = np.asarray(vals)
+            if len(vals) != len(cohort):
+                log.error(
+                    f"[explanations] {src} provided an invalid output {vals.shape} for {len(cohort)} rows: the requests will be explained live"
+                )
+                missing.append(src)
+                continue
+            explanations[src] = vals
+
+        log.info(
+            f"[explanations] precomputed {list(explanations.keys())} for {len(cohort)} rows"
+        )
+
+        return cls(cohort, explanations, missing=missing, **kwargs)
+
+    def lookup(self, X: pd.DataFrame) -> Optional[Dict[str, np.ndarray]]:
+        """The interpolated explanations of the rows, or None if a row is too far from the cohort, or if an explainer of the model is not stored."""
+        if (
+            len(self.explanations) == 0
+            or len(self.missing) > 0
+            or list(X.columns) != self.columns
+        ):
+            self.misses += 1
+            return None
+
+        dist, idx = self.index.query(self._points(X), k=self.n_neighbors)
+        if np.any(dist[:, 0] > self.max_distance):
+            self.misses += 1
+            return None
+        self.hits += 1
+
+        # inverse distance weights, and the stored explanation for the exact matches
+        exact = dist[:, :1] == 0
+        weights = np.where(
+            exact, (dist == 0).astype(float), 1 / np.maximum(dist, 1e-12)
+        )
+        weights = weights / weights.sum(axis=1, keepdims=True)
+
+        return {
+            src: np.einsum("nk,nk...->n...", weights, vals[idx]).astype(float)
+            for src, vals in self.explanations.items()
+        }
+
+
+def explain(model: Any, X: pd.DataFrame, store: Optional[ExplanationStore]) -> Any:
+    """The explanations of the rows: from the store if they are close to its cohort, else from the model."""
+    if store is not None:
+        explanations = store.lookup(X)
+        if explanations is not None:
+            return explanations
+
+    return model.explain(X)
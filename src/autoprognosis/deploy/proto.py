@@ -23,6 +23,8 @@ class BaseAppProto(BaseModel):
     explainers: list
     imputers: list
     plot_alternatives: list
+    # number of training rows with precomputed explanations, 0 to explain each request live
+    explanations_cohort: int = 0
 
 
 class NewRiskEstimationAppProto(BaseAppProto):
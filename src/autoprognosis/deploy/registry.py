@@ -0,0 +1,374 @@
+# stdlib
+from collections import OrderedDict
+import json
+import mmap
+import os
+from pathlib import Path
+import re
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+# third party
+import cloudpickle
+
+# autoprognosis absolute
+from autoprognosis.deploy.utils import process_rss
+import autoprognosis.logger as log
+from autoprognosis.plugins import Plugins
+from autoprognosis.utils.serialization import load_model_from_file, save_model_to_file
+
+MANIFEST_VERSION = 1
+
+chars = r"A-Za-z0-9/\-:.,_$%'()[\]<> "
+shortest_run = 4
+
+regexp = "[%s]{%d,}" % (chars, shortest_run)
+regexp_b = regexp.encode()
+pattern = re.compile(regexp_b)
+
+
+def scan_depends(app_path: Union[str, Path]) -> List[str]:
+    """The plugins referenced by a serialized artifact, found by scanning the pickle bytes for the plugin paths."""
+    depends: List[str] = []
+    with open(app_path, "rb") as f:
+        data = f.read()
+        strings = pattern.findall(data)
+        for string in strings:
+            decoded = string.decode()
+            if "plugin_" in decoded and "autoprognosis" in decoded:
+                path = Path(decoded)
+                plugin = path.stem.split("plugin_")[1]
+
+                if plugin in depends:
+                    continue
+                depends.append(plugin)
+
+    return depends
+
+
+def manifest_path(app_path: Union[str, Path]) -> Path:
+    app_path = Path(app_path)
+    return app_path.with_name(f"{app_path.stem}.manifest.json")
+
+
+def models_path(app_path: Union[str, Path]) -> Path:
+    app_path = Path(app_path)
+    return app_path.with_name(f"{app_path.stem}.models")
+
+
+def _source(app_path: Path) -> dict:
+    stat = app_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def read_manifest(app_path: Union[str, Path]) -> Optional[dict]:
+    """The manifest of an artifact, or None if it is missing or older than the artifact."""
+    path = manifest_path(app_path)
+    if not path.exists():
+        return None
+
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except BaseException as e:
+        log.error(f"[registry] invalid manifest {path}: {e}")
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    if manifest.get("source") != _source(Path(app_path)):
+        return None
+
+    return manifest
+
+
+def write_manifest(app_path: Union[str, Path]) -> dict:
+    """Unpack a deploy artifact for the lazy loading.
+
+    The models of the artifact are written to one pickle each, in the `<app>.models` folder, next to the other parameters of the artifact.
+    The manifest `<app>.manifest.json` lists the files, their sizes and the plugins to load before unpickling them.
+    The artifact itself is left untouched.
+
+    Args:
+        app_path: Path
+            The deploy artifact(`app.p`).
+    """
+    app_path = Path(app_path)
+    source = _source(app_path)
+
+    depends = scan_depends(app_path)
+    for plugin in depends:
+        Plugins().get_any_type(plugin)
+
+    app_params = load_model_from_file(app_path)
+
+    folder = models_path(app_path)
+    folder.mkdir(parents=True, exist_ok=True)
+
+    models = {}
+    for idx, (name, model) in enumerate(app_params["models"].items()):
+        path = folder / f"model_{idx}.p"
+        save_model_to_file(path, model)
+        models[name] = {"path": path.name, "bytes": path.stat().st_size}
+
+    params = {key: val for key, val in app_params.items() if key != "models"}
+    save_model_to_file(folder / "params.p", params)
+
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "source": source,
+        "type": app_params.get("type"),
+        "depends": depends,
+        "params": "params.p",
+        "models": models,
+    }
+
+    # the manifest is replaced atomically, for the concurrent readers
+    path = manifest_path(app_path)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+    log.info(f"[registry] wrote the manifest of {app_path}: {len(models)} models")
+
+    return manifest
+
+
+def _load_mapped(path: Path) -> Any:
+    # the pickle is read from the page cache, without an intermediate copy of the bytes
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise RuntimeError(f"empty model file {path}")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buff:
+            return cloudpickle.loads(buff)
+
+
+class LazyModels(Mapping):
+    """The models of a registered artifact. Each model is loaded from the registry on access."""
+
+    def __init__(self, registry: "ModelRegistry", app: str, names: List[str]) -> None:
+        self.registry = registry
+        self.app = app
+        self.names = names
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.names:
+            raise KeyError(name)
+        return self.registry.get(self.app, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __repr__(self) -> str:
+        return f"LazyModels({self.app}, {self.names})"
+
+
+class ModelRegistry:
+    """Process-wide cache of the models of the deploy artifacts.
+
+    The artifacts are registered from their manifest: the declared plugins are loaded once, and the models are unpickled on first use,
+    from their own memory-mapped file. The resident models are evicted in least-recently-used order, when the cache exceeds
+    `max_bytes` of resident memory or `max_models` models. The footprint of a model is the growth of the RSS of the process while
+    it is loaded, and at least the size of its pickle.
+
+    Args:
+        max_bytes: int
+            Memory budget of the resident models, in bytes. None for no limit.
+        max_models: int
+            Maximum number of resident models. None for no limit.
+    """
+
+    def __init__(
+        self, max_bytes: Optional[int] = None, max_models: Optional[int] = None
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_models = max_models
+
+        self._lock = threading.RLock()
+        # app -> (manifest, params)
+        self._apps: Dict[str, Tuple[dict, dict]] = {}
+        # (app, model) -> (model, footprint), in least-recently-used order
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[Any, int]]" = OrderedDict()
+        self._loading: Dict[Tuple[str, str], threading.Lock] = {}
+        self._plugins: set = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # (app, model) -> seconds, for the last load of each model
+        self.load_times: Dict[Tuple[str, str], float] = {}
+        # app -> seconds, for the registration(manifest and plugins)
+        self.register_times: Dict[str, float] = {}
+
+    @staticmethod
+    def _key(app_path: Union[str, Path]) -> str:
+        return str(Path(app_path).resolve())
+
+    def _stale(self, app: str) -> bool:
+        """If a registered artifact was rebuilt in place since its registration."""
+        manifest, _ = self._apps[app]
+        try:
+            return _source(Path(app)) != manifest["source"]
+        except OSError:
+            # the artifact was removed: the registered version is still served
+            return False
+
+    def register(self, app_path: Union[str, Path]) -> str:
+        """Register an artifact, without loading its models. The manifest is written on the first registration of each version
+        of the artifact, and an artifact rebuilt in place is registered again. Returns the key of the artifact in the registry."""
+        app = self._key(app_path)
+
+        with self._lock:
+            if app in self._apps:
+                if not self._stale(app):
+                    return app
+
+                log.info(f"[registry] {app} was rebuilt: registering the new version")
+                self.unregister(app)
+
+            start = time.perf_counter()
+            manifest = read_manifest(app)
+            if manifest is None:
+                manifest = write_manifest(app)
+
+            for plugin in manifest["depends"]:
+                if plugin in self._plugins:
+                    continue
+                Plugins().get_any_type(plugin)
+                self._plugins.add(plugin)
+
+            params = load_model_from_file(models_path(app) / manifest["params"])
+            self._apps[app] = (manifest, params)
+
+            self.register_times[app] = time.perf_counter() - start
+            log.info(
+                f"[registry] registered {app} in {self.register_times[app]:.3f}s: {len(manifest['models'])} models"
+            )
+
+        return app
+
+    def app_params(self, app_path: Union[str, Path]) -> dict:
+        """The content of an artifact, like `load_model_from_file(app_path)`, with the models loaded lazily from the registry."""
+        app = self.register(app_path)
+        manifest, params = self._apps[app]
+
+        return {
+            **params,
+            "models": LazyModels(self, app, list(manifest["models"].keys())),
+        }
+
+    def get(self, app_path: Union[str, Path], name: str) -> Any:
+        """A model of an artifact, loaded on first use."""
+        app = self.register(app_path)
+        key = (app, name)
+
+        with self._lock:
+            if key in self._cache:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return self._cache[key][0]
+
+            manifest, _ = self._apps[app]
+            if name not in manifest["models"]:
+                raise KeyError(f"unknown model {name} in {app}")
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        # the models are unpickled outside of the global lock: one load per model at a time
+        with key_lock:
+            with self._lock:
+                if key in self._cache:
+                    self.hits += 1
+                    self._cache.move_to_end(key)
+                    return self._cache[key][0]
+                self.misses += 1
+
+            info = manifest["models"][name]
+            start = time.perf_counter()
+            rss = process_rss()
+
+            model = _load_mapped(models_path(app) / info["path"])
+
+            footprint = max(process_rss() - rss, info["bytes"])
+            duration = time.perf_counter() - start
+
+            with self._lock:
+                self.load_times[key] = duration
+                self._cache[key] = (model, footprint)
+                self._evict_lru()
+
+        log.info(
+            f"[registry] loaded {name} from {app} in {duration:.3f}s, {footprint} bytes"
+        )
+
+        return model
+
+    def _resident_bytes(self) -> int:
+        return sum(footprint for _, footprint in self._cache.values())
+
+    def _evict_lru(self) -> None:
+        # the most recent model is always kept
+        while len(self._cache) > 1 and (
+            (self.max_models is not None and len(self._cache) > self.max_models)
+            or (self.max_bytes is not None and self._resident_bytes() > self.max_bytes)
+        ):
+            (app, name), _ = self._cache.popitem(last=False)
+            self.evictions += 1
+            log.debug(f"[registry] evicted {name} from {app}")
+
+    def evict(self, app_path: Optional[Union[str, Path]] = None) -> None:
+        """Drop the resident models of an artifact, or of all the artifacts. The artifacts stay registered."""
+        with self._lock:
+            if app_path is None:
+                self.evictions += len(self._cache)
+                self._cache.clear()
+                return
+
+            app = self._key(app_path)
+            for key in [key for key in self._cache if key[0] == app]:
+                del self._cache[key]
+                self.evictions += 1
+
+    def unregister(self, app_path: Union[str, Path]) -> None:
+        """Forget an artifact, for example after it was rebuilt."""
+        self.evict(app_path)
+        with self._lock:
+            self._apps.pop(self._key(app_path), None)
+
+    def stats(self) -> dict:
+        """The counters of the registry, and the load times of the models in seconds."""
+        with self._lock:
+            return {
+                "apps": len(self._apps),
+                "resident_models": len(self._cache),
+                "resident_bytes": self._resident_bytes(),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "register_times": dict(self.register_times),
+                "load_times": {
+                    f"{app}:{name}": duration
+                    for (app, name), duration in self.load_times.items()
+                },
+            }
+
+
+def _env_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except BaseException:
+        log.error(f"[registry] invalid {name}: {value}")
+        return None
+
+
+registry = ModelRegistry(
+    max_bytes=_env_int("AUTOPROGNOSIS_REGISTRY_MAX_BYTES"),
+    max_models=_env_int("AUTOPROGNOSIS_REGISTRY_MAX_MODELS"),
+)
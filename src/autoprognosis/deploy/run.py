@@ -2,13 +2,12 @@
 import multiprocessing
 import os
 from pathlib import Path
-import re
 
 # autoprognosis absolute
+from autoprognosis.deploy.registry import read_manifest, registry, scan_depends
 from autoprognosis.deploy.utils import get_ports
 import autoprognosis.logger as log
 from autoprognosis.plugins import Plugins
-from autoprognosis.utils.serialization import load_model_from_file
 
 try:
     port = os.getenv("PORT")
@@ -18,36 +17,19 @@ try:
 except BaseException:
     BASELINE_PORT = 9000
 
-chars = r"A-Za-z0-9/\-:.,_$%'()[\]<> "
-shortest_run = 4
-
-regexp = "[%s]{%d,}" % (chars, shortest_run)
-regexp_b = regexp.encode()
-pattern = re.compile(regexp_b)
-
 
 def load_depends(app_path: Path) -> None:
-    seen = set()
-    with open(app_path, "rb") as f:
-        data = f.read()
-        strings = pattern.findall(data)
-        for string in strings:
-            decoded = string.decode()
-            if "plugin_" in decoded and "autoprognosis" in decoded:
-                path = Path(decoded)
-                plugin = path.stem.split("plugin_")[1]
+    """Load the plugins used by an artifact: from its manifest if available, else by scanning the artifact."""
+    manifest = read_manifest(app_path)
+    depends = manifest["depends"] if manifest is not None else scan_depends(app_path)
 
-                if plugin in seen:
-                    continue
-                seen.add(plugin)
-
-                Plugins().get_any_type(plugin)
+    for plugin in depends:
+        Plugins().get_any_type(plugin)
 
 
 def run_server_streamlit(app_path: Path, port: int = 9000) -> None:
-    load_depends(app_path)
-
-    app_params = load_model_from_file(app_path)
+    # the models are loaded on first use, and shared with the other apps of the process
+    app_params = registry.app_params(app_path)
 
     if app_params["type"] == "risk_estimation":
         # autoprognosis absolute
@@ -66,6 +48,7 @@ def run_server_streamlit(app_path: Path, port: int = 9000) -> None:
             app_params["plot_alternatives"],
             app_params["extras_cbk"],
             app_params["auth"],
+            explanations=app_params.get("explanations", {}),
         )
     elif app_params["type"] == "classification":
         # autoprognosis absolute
@@ -81,6 +64,7 @@ def run_server_streamlit(app_path: Path, port: int = 9000) -> None:
             app_params["encoders"],
             app_params["menu_components"],
             app_params["plot_alternatives"],
+            explanations=app_params.get("explanations", {}),
         )
     else:
         raise RuntimeError(f"unsupported task {app.type}")
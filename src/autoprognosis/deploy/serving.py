@@ -0,0 +1,538 @@
+# stdlib
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import json
+from pathlib import Path
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+# third party
+import numpy as np
+import pandas as pd
+
+# autoprognosis absolute
+from autoprognosis.deploy.registry import registry
+from autoprognosis.deploy.run import BASELINE_PORT
+import autoprognosis.logger as log
+from autoprognosis.utils.parallel import resources
+from autoprognosis.utils.pip import install
+
+
+class ServingMetrics:
+    """Latency and throughput counters of the scoring server.
+
+    Args:
+        window: int
+            Number of recent requests and batches used for the latency percentiles and the batch sizes.
+    """
+
+    def __init__(self, window: int = 10000) -> None:
+        self.started = time.time()
+        self.requests = 0
+        self.rows = 0
+        self.errors = 0
+        self.batches = 0
+        self.latencies: deque = deque(maxlen=window)
+        self.batch_sizes: deque = deque(maxlen=window)
+
+    def record_batch(self, n_requests: int, n_rows: int) -> None:
+        self.batches += 1
+        self.batch_sizes.append((n_requests, n_rows))
+
+    def record_request(self, latency: float, n_rows: int, error: bool = False) -> None:
+        self.requests += 1
+        self.latencies.append(latency)
+        if error:
+            self.errors += 1
+        else:
+            self.rows += n_rows
+
+    def summary(self) -> dict:
+        uptime = max(time.time() - self.started, 1e-9)
+        latencies = np.asarray(self.latencies) * 1000
+        sizes = np.asarray(self.batch_sizes).reshape(-1, 2)
+
+        def _percentile(q: float) -> Optional[float]:
+            if len(latencies) == 0:
+                return None
+            return float(np.percentile(latencies, q))
+
+        return {
+            "uptime_s": uptime,
+            "requests": self.requests,
+            "rows": self.rows,
+            "errors": self.errors,
+            "batches": self.batches,
+            "requests_per_batch": float(sizes[:, 0].mean()) if len(sizes) else None,
+            "rows_per_batch": float(sizes[:, 1].mean()) if len(sizes) else None,
+            "latency_ms": {
+                "mean": float(latencies.mean()) if len(latencies) else None,
+                "p50": _percentile(50),
+                "p95": _percentile(95),
+                "p99": _percentile(99),
+            },
+            "throughput": {
+                "requests_per_s": self.requests / uptime,
+                "rows_per_s": self.rows / uptime,
+            },
+        }
+
+
+class _Request:
+    def __init__(self, key: Hashable, X: pd.DataFrame, future: asyncio.Future) -> None:
+        self.key = key
+        self.X = X
+        self.future = future
+
+
+class MicroBatcher:
+    """Group the concurrent requests into micro-batches, and run the model on each batch in a worker pool.
+
+    A batch is dispatched when it reaches `max_batch_size` rows, or `max_latency` seconds after its first request. The requests of a batch
+    are grouped by key(model, horizons), and each group is evaluated with a single call of `predict`. While all the workers are busy, the
+    requests keep accumulating in the next batch.
+
+    Args:
+        predict: Callable
+            predict(key, X) -> array with a row for each row of X.
+        max_batch_size: int
+            Maximum number of rows of a batch.
+        max_latency: float
+            Maximum waiting time of a request for its batch, in seconds.
+        workers: int
+            Number of batches evaluated in parallel. -1 uses the whole CPU budget.
+        metrics: ServingMetrics
+            The counters to update.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[Hashable, pd.DataFrame], Any],
+        max_batch_size: int = 256,
+        max_latency: float = 0.005,
+        workers: int = 1,
+        metrics: Optional[ServingMetrics] = None,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError(f"Invalid max_batch_size {max_batch_size}")
+
+        self.predict = predict
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.workers, self.per_worker = resources.split(workers, workers)
+        self.metrics = metrics if metrics is not None else ServingMetrics()
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._pending: set = set()
+
+    @property
+    def running(self) -> bool:
+        return self._collector is not None and not self._collector.done()
+
+    async def start(self) -> None:
+        if self.running:
+            return
+
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(self.workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._collector = asyncio.ensure_future(self._collect())
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+
+        await self._queue.put(None)
+        await self._collector
+        if len(self._pending) > 0:
+            await asyncio.gather(*self._pending)
+        self._executor.shutdown(wait=True)
+        self._collector = None
+
+    async def submit(self, key: Hashable, X: pd.DataFrame) -> np.ndarray:
+        """Queue the rows for the next batch, and wait for their predictions."""
+        if not self.running:
+            await self.start()
+
+        request = _Request(key, X, asyncio.get_running_loop().create_future())
+        await self._queue.put(request)
+
+        return await request.future
+
+    async def _next_batch(self) -> Tuple[List[_Request], bool]:
+        first = await self._queue.get()
+        if first is None:
+            return [], True
+
+        batch = [first]
+        n_rows = len(first.X)
+        deadline = asyncio.get_running_loop().time() + self.max_latency
+
+        while n_rows < self.max_batch_size:
+            if not self._queue.empty():
+                request = self._queue.get_nowait()
+            else:
+                timeout = deadline - asyncio.get_running_loop().time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            if request is None:
+                return batch, True
+
+            batch.append(request)
+            n_rows += len(request.X)
+
+        return batch, False
+
+    async def _collect(self) -> None:
+        stopping = False
+        while not stopping:
+            batch, stopping = await self._next_batch()
+
+            groups: Dict[Hashable, List[_Request]] = {}
+            for request in batch:
+                groups.setdefault(request.key, []).append(request)
+
+            for key, requests in groups.items():
+                # the next batch grows while the workers are busy
+                await self._slots.acquire()
+                task = asyncio.ensure_future(self._dispatch(key, requests))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+
+    def _scoped_predict(self, key: Hashable, X: pd.DataFrame) -> np.ndarray:
+        with resources.scope(self.per_worker, name="serving"):
+            return np.asarray(self.predict(key, X))
+
+    async def _dispatch(self, key: Hashable, requests: List[_Request]) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            X = pd.concat([request.X for request in requests], ignore_index=True)
+            self.metrics.record_batch(len(requests), len(X))
+
+            preds = await loop.run_in_executor(
+                self._executor, self._scoped_predict, key, X
+            )
+
+            offsets = np.cumsum([len(request.X) for request in requests])[:-1]
+            for request, pred in zip(requests, np.split(preds, offsets)):
+                if not request.future.done():
+                    request.future.set_result(pred)
+        except BaseException as e:
+            log.error(f"[serving] batch {key} failed: {e}")
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            self._slots.release()
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class ScoringApp:
+    """Headless ASGI scoring server for the deploy artifacts(`app.p`).
+
+    The models of the artifact are loaded once, and the concurrent requests are scored in micro-batches.
+    The raw inputs are encoded with the encoders of the artifact, like in the dashboards.
+
+    Routes:
+        GET /health: the task type, the models and the input columns.
+        GET /metrics: the latency and throughput counters.
+        POST /predict: {"instances": [{column: value}], "model": name, "time_horizons": [...]}. The model defaults to the first model of the artifact,
+        and the horizons to the horizons of the artifact. Returns {"model": name, "predictions": [[...]]}: the probabilities of each class,
+        or the risk at each horizon.
+
+    Args:
+        app_params: dict
+            The content of the artifact.
+        max_batch_size: int
+            Maximum number of rows of a micro-batch.
+        max_latency: float
+            Maximum waiting time of a request for its micro-batch, in seconds.
+        workers: int
+            Number of micro-batches evaluated in parallel.
+    """
+
+    def __init__(
+        self,
+        app_params: dict,
+        max_batch_size: int = 256,
+        max_latency: float = 0.005,
+        workers: int = 1,
+    ) -> None:
+        if app_params["type"] not in ["classification", "risk_estimation"]:
+            raise RuntimeError(f"unsupported task {app_params['type']}")
+
+        self.type = app_params["type"]
+        self.models = app_params["models"]
+        self.encoders = app_params["encoders"]
+        self.time_horizons = list(app_params.get("time_horizons") or [])
+        # the menu components, without the section headers
+        self.columns = [
+            name
+            for name, component in app_params.get("column_types") or []
+            if component.type != "header"
+        ]
+
+        self.metrics = ServingMetrics()
+        self.batcher = MicroBatcher(
+            self._predict,
+            max_batch_size=max_batch_size,
+            max_latency=max_latency,
+            workers=workers,
+            metrics=self.metrics,
+        )
+
+    def _predict(self, key: Hashable, X: pd.DataFrame) -> np.ndarray:
+        name, horizons = key
+        model = self.models[name]
+
+        if self.type == "risk_estimation":
+            return np.asarray(model.predict(X, list(horizons)))
+        return np.asarray(model.predict_proba(X))
+
+    def _parse(self, payload: Any) -> Tuple[Hashable, pd.DataFrame]:
+        if not isinstance(payload, dict) or "instances" not in payload:
+            raise _HTTPError(400, "the payload must contain a list of instances")
+
+        name = payload.get("model", next(iter(self.models)))
+        if name not in self.models:
+            raise _HTTPError(404, f"unknown model {name}")
+
+        horizons = None
+        if self.type == "risk_estimation":
+            horizons = tuple(payload.get("time_horizons") or self.time_horizons)
+
+        instances = payload["instances"]
+        if isinstance(instances, dict):
+            instances = [instances]
+        if not isinstance(instances, list) or len(instances) == 0:
+            raise _HTTPError(400, "the payload must contain a list of instances")
+
+        try:
+            X = pd.DataFrame(instances)
+            if self.encoders is not None:
+                X = self.encoders.encode(X)
+        except BaseException as e:
+            raise _HTTPError(400, f"invalid instances: {e}")
+
+        return (name, horizons), X
+
+    async def predict(self, payload: Any) -> dict:
+        key, X = self._parse(payload)
+
+        start = time.perf_counter()
+        try:
+            preds = await self.batcher.submit(key, X)
+        except BaseException:
+            self.metrics.record_request(time.perf_counter() - start, len(X), error=True)
+            raise
+        self.metrics.record_request(time.perf_counter() - start, len(X))
+
+        return {"model": key[0], "predictions": np.asarray(preds).tolist()}
+
+    def health(self) -> dict:
+        return {
+            "status": "ok",
+            "type": self.type,
+            "models": list(self.models.keys()),
+            "columns": self.columns,
+            "time_horizons": self.time_horizons,
+        }
+
+    async def _lifespan(self, receive: Callable, send: Callable) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await self.batcher.start()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.batcher.stop()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _body(self, receive: Callable) -> Any:
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        try:
+            return json.loads(body or b"null")
+        except ValueError:
+            raise _HTTPError(400, "invalid JSON payload")
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "lifespan":
+            return await self._lifespan(receive, send)
+        if scope["type"] != "http":
+            raise RuntimeError(f"unsupported scope {scope['type']}")
+
+        method, path = scope["method"], scope["path"].rstrip("/")
+        try:
+            if path == "/health" and method == "GET":
+                status, response = 200, self.health()
+            elif path == "/metrics" and method == "GET":
+                status, response = 200, self.metrics.summary()
+            elif path == "/predict" and method == "POST":
+                status, response = 200, await self.predict(await self._body(receive))
+            elif path in ["/health", "/metrics", "/predict"]:
+                raise _HTTPError(405, f"method {method} not allowed")
+            else:
+                raise _HTTPError(404, f"unknown route {path}")
+        except _HTTPError as e:
+            status, response = e.status, {"error": str(e)}
+        except BaseException as e:
+            log.error(f"[serving] {method} {path} failed: {e}")
+            status, response = 500, {"error": str(e)}
+
+        body = json.dumps(response).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def load_scoring_app(app_path: Path, **kwargs: Any) -> ScoringApp:
+    """Load a deploy artifact in a scoring server. The keyword arguments are forwarded to `ScoringApp`.
+
+    The models are served from the process-wide registry: they are loaded on first use, and shared with the other apps of the process.
+    """
+    app_params = registry.app_params(app_path)
+
+    return ScoringApp(app_params, **kwargs)
+
+
+def run_server_asgi(app_path: Path, port: int = BASELINE_PORT, **kwargs: Any) -> None:
+    """Serve a deploy artifact over HTTP, with uvicorn. The keyword arguments are forwarded to `ScoringApp`."""
+    try:
+        # third party
+        import uvicorn
+    except ImportError:
+        depends = ["uvicorn"]
+        install(depends)
+
+        # third party
+        import uvicorn
+
+    app = load_scoring_app(app_path, **kwargs)
+    uvicorn.run(app, host="0.0.0.0", port=port, lifespan="on")
+
+
+class LocalResponse:
+    def __init__(self, status_code: int, body: bytes) -> None:
+        self.status_code = status_code
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+class LocalClient:
+    """In-process client for an ASGI app, without network. The client runs the app in its own event loop, with the lifespan events.
+
+    Example:
+        >>> with LocalClient(load_scoring_app(app_path)) as client:
+        >>>     client.post("/predict", {"instances": [...]}).json()
+    """
+
+    def __init__(self, app: Callable) -> None:
+        self.app = app
+        self.loop = asyncio.new_event_loop()
+        self._lifespan: Optional[asyncio.Task] = None
+        self._lifespan_events: Optional[asyncio.Queue] = None
+        self._lifespan_completed: Optional[asyncio.Queue] = None
+
+    async def _start(self) -> None:
+        self._lifespan_events = asyncio.Queue()
+        self._lifespan_completed = asyncio.Queue()
+
+        self._lifespan = asyncio.ensure_future(
+            self.app(
+                {"type": "lifespan"},
+                self._lifespan_events.get,
+                self._lifespan_completed.put,
+            )
+        )
+
+        await self._lifespan_events.put({"type": "lifespan.startup"})
+        await self._lifespan_completed.get()
+
+    async def _stop(self) -> None:
+        await self._lifespan_events.put({"type": "lifespan.shutdown"})
+        await self._lifespan_completed.get()
+        await self._lifespan
+
+    def __enter__(self) -> "LocalClient":
+        self.loop.run_until_complete(self._start())
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.loop.run_until_complete(self._stop())
+        self.loop.close()
+
+    async def arequest(
+        self, method: str, path: str, payload: Any = None
+    ) -> LocalResponse:
+        body = b"" if payload is None else json.dumps(payload).encode()
+        scope = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "headers": [(b"content-type", b"application/json")],
+        }
+        request = [{"type": "http.request", "body": body, "more_body": False}]
+        messages: List[dict] = []
+
+        async def _receive() -> dict:
+            if len(request) > 0:
+                return request.pop()
+            return {"type": "http.disconnect"}
+
+        async def _send(message: dict) -> None:
+            messages.append(message)
+
+        await self.app(scope, _receive, _send)
+
+        status = messages[0]["status"]
+        body = b"".join(message.get("body", b"") for message in messages[1:])
+        return LocalResponse(status, body)
+
+    def request(self, method: str, path: str, payload: Any = None) -> LocalResponse:
+        return self.loop.run_until_complete(self.arequest(method, path, payload))
+
+    def get(self, path: str) -> LocalResponse:
+        return self.request("GET", path)
+
+    def post(self, path: str, payload: Any) -> LocalResponse:
+        return self.request("POST", path, payload)
+
+    def post_concurrent(self, path: str, payloads: List[Any]) -> List[LocalResponse]:
+        """Send the requests concurrently, like independent clients."""
+
+        async def _gather() -> List[LocalResponse]:
+            return await asyncio.gather(
+                *[self.arequest("POST", path, payload) for payload in payloads]
+            )
+
+        return self.loop.run_until_complete(_gather())
@@ -49,3 +49,8 @@ def file_md5(fname: Path) -> str:
         for chunk in iter(lambda: f.read(4096), b""):
             hash_md5.update(chunk)
     return hash_md5.hexdigest()
+
+
+def process_rss() -> int:
+    """Resident memory of the current process, in bytes."""
+    return psutil.Process().memory_info().rss
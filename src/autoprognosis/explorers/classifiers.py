@@ -1,9 +1,8 @@
 # stdlib
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 # third party
-from joblib import Parallel, delayed
 import numpy as np
 import pandas as pd
 from pydantic import validate_arguments
@@ -15,13 +14,18 @@ from autoprognosis.explorers.core.defaults import (
     default_feature_scaling_names,
 )
 from autoprognosis.explorers.core.optimizer import Optimizer
+from autoprognosis.explorers.core.scheduler import BanditScheduler, search_schedulers
 from autoprognosis.explorers.core.selector import PipelineSelector
 from autoprognosis.explorers.hooks import DefaultHooks
 from autoprognosis.hooks import Hooks
 import autoprognosis.logger as log
+from autoprognosis.utils.cache import EvaluationCache
+from autoprognosis.utils.dataset import share
+from autoprognosis.utils.parallel import resources
 from autoprognosis.utils.tester import evaluate_estimator
 
-dispatcher = Parallel(max_nbytes=None, backend="loky", n_jobs=2)
+# number of estimators searched concurrently, within the global CPU budget
+ESTIMATOR_SEARCH_N_JOBS = 2
 
 
 class ClassifierSeeker:
@@ -49,6 +53,15 @@ class ClassifierSeeker:
             Plugins to use in the pipeline for imputation.
         hooks: Hooks.
             Custom callbacks to be notified about the search progress.
+        trial_workers: int.
+            Number of optimization trials evaluated concurrently for each estimator(bayesian and asha optimizers).
+        cache: EvaluationCache.
+            Optional cache for the cross-validation folds, reused across searches on the same dataset.
+        fold_pruning: str.
+            none/median/percentile. Stop the cross-validation of the trials which fall behind the other trials after a fold(bayesian optimizer).
+        scheduler: str.
+            fixed/bandit. "fixed" gives each estimator its own num_iter/timeout budget. "bandit" pools the budgets of all the estimators into a global budget,
+            and reallocates it to the competitive estimators, stopping the others early(bayesian optimizer).
     """
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -66,6 +79,10 @@ class ClassifierSeeker:
         hooks: Hooks = DefaultHooks(),
         optimizer_type: str = "bayesian",
         strict: bool = False,
+        cache: Optional[EvaluationCache] = None,
+        trial_workers: int = 1,
+        fold_pruning: str = "none",
+        scheduler: str = "fixed",
     ) -> None:
         for int_val in [num_iter, CV, top_k, timeout]:
             if int_val <= 0 or type(int_val) != int:
@@ -75,6 +92,12 @@ class ClassifierSeeker:
         metrics = ["aucroc", "aucprc"]
         if metric not in metrics:
             raise ValueError(f"invalid input metric. Should be from {metrics}")
+        if scheduler not in search_schedulers:
+            raise ValueError(
+                f"invalid input scheduler. Should be from {search_schedulers}"
+            )
+        if scheduler == "bandit" and optimizer_type != "bayesian":
+            raise ValueError("the bandit scheduler requires the bayesian optimizer")
 
         self.study_name = study_name
         self.hooks = hooks
@@ -96,6 +119,13 @@ class ClassifierSeeker:
         self.top_k = top_k
         self.metric = metric
         self.optimizer_type = optimizer_type
+        self.trial_workers = trial_workers
+        self.fold_pruning = fold_pruning
+        self.scheduler = scheduler
+        self.cache = cache
+
+        # baseline score of each estimator, for the searches resumed by the scheduler
+        self._baselines: Dict[str, float] = {}
 
     def _should_continue(self) -> None:
         if self.hooks.cancel():
@@ -107,18 +137,34 @@ class ClassifierSeeker:
         X: pd.DataFrame,
         Y: pd.Series,
         group_ids: Optional[pd.Series] = None,
+        n_trials: Optional[int] = None,
+        timeout: Optional[int] = None,
     ) -> Tuple[float, float, Dict]:
         self._should_continue()
 
-        def evaluate_args(**kwargs: Any) -> float:
+        def evaluate_args(
+            fidelity: float = 1, fold_cbk: Optional[Callable] = None, **kwargs: Any
+        ) -> float:
             self._should_continue()
 
+            baseline = len(kwargs) == 0 and fidelity == 1
+            if baseline and estimator.name() in self._baselines:
+                return self._baselines[estimator.name()]
+
             start = time.time()
 
-            model = estimator.get_pipeline_from_named_args(**kwargs)
+            model = estimator.get_pipeline_from_named_args(fidelity=fidelity, **kwargs)
             try:
                 metrics = evaluate_estimator(
-                    model, X, Y, self.CV, metric=self.metric, group_ids=group_ids
+                    model,
+                    X,
+                    Y,
+                    estimator.fidelity_folds(fidelity, self.CV),
+                    metric=self.metric,
+                    group_ids=group_ids,
+                    cache=self.cache,
+                    subsample=estimator.fidelity_subsample(fidelity),
+                    fold_cbk=fold_cbk,
                 )
             except BaseException as e:
                 log.error(f"evaluate_estimator failed: {e}")
@@ -137,18 +183,51 @@ class ClassifierSeeker:
                 duration=time.time() - start,
                 aucroc=metrics["str"][self.metric],
             )
-            return metrics["clf"][self.metric][0]
+
+            score = metrics["clf"][self.metric][0]
+            if baseline:
+                self._baselines[estimator.name()] = score
+
+            return score
 
         study = Optimizer(
             study_name=f"{self.study_name}_classifiers_exploration_{estimator.name()}",
             estimator=estimator,
             evaluation_cbk=evaluate_args,
             optimizer_type=self.optimizer_type,
-            n_trials=self.num_iter,
-            timeout=self.timeout,
+            trial_workers=self.trial_workers,
+            fold_pruning=self.fold_pruning,
+            n_trials=n_trials if n_trials is not None else self.num_iter,
+            timeout=timeout if timeout is not None else self.timeout,
         )
         return study.evaluate()
 
+    def _scheduled_search(
+        self,
+        X: pd.DataFrame,
+        Y: pd.Series,
+        group_ids: Optional[pd.Series] = None,
+    ) -> List:
+        """Search the estimators with a global budget, allocated by the bandit scheduler."""
+        scheduler = BanditScheduler(
+            n_arms=len(self.estimators),
+            n_trials=self.num_iter * len(self.estimators),
+            timeout=self.timeout * len(self.estimators),
+        )
+
+        def step(arm: int, n_trials: int, timeout: int) -> Tuple[float, Dict]:
+            # the studies are persisted, so each step resumes the search of the estimator
+            return self.search_best_args_for_estimator(
+                self.estimators[arm],
+                X,
+                Y,
+                group_ids,
+                n_trials=n_trials,
+                timeout=timeout,
+            )
+
+        return scheduler.run(step)
+
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def search(
         self,
@@ -168,16 +247,33 @@ class ClassifierSeeker:
 
         """
         self._should_continue()
+        self._baselines = {}
 
-        search_results = dispatcher(
-            delayed(self.search_best_args_for_estimator)(estimator, X, Y, group_ids)
-            for estimator in self.estimators
-        )
+        if self.scheduler == "bandit":
+            search_results = self._scheduled_search(X, Y, group_ids)
+        else:
+            # the concurrent searches share a single copy of the dataset
+            data = share(X, ESTIMATOR_SEARCH_N_JOBS, len(self.estimators))
+
+            search_results = resources.parallel_map(
+                self.search_best_args_for_estimator,
+                [(estimator, data, Y, group_ids) for estimator in self.estimators],
+                n_jobs=ESTIMATOR_SEARCH_N_JOBS,
+                name="estimator_search",
+                max_nbytes=None,
+            )
 
         all_scores = []
         all_args = []
 
         for idx, (best_score, best_args) in enumerate(search_results):
+            if not np.isfinite(best_score):
+                # not searched before the timeout: the default arguments are not tuned
+                log.info(
+                    f"Evaluation for {self.estimators[idx].name()} skipped: the estimator was not searched"
+                )
+                best_score = -np.inf
+
             all_scores.append([best_score])
             all_args.append([best_args])
 
@@ -186,8 +282,12 @@ class ClassifierSeeker:
             )
 
         all_scores_np = np.array(all_scores)
-        selected_points = min(self.top_k, len(all_scores))
-        best_scores = np.sort(np.unique(all_scores_np.ravel()))[-selected_points:]
+        searched_scores = all_scores_np[np.isfinite(all_scores_np)]
+        if len(searched_scores) == 0:
+            raise RuntimeError("No estimator was searched before the timeout")
+
+        selected_points = min(self.top_k, len(searched_scores))
+        best_scores = np.sort(np.unique(searched_scores))[-selected_points:]
 
         result = []
         for score in reversed(best_scores):
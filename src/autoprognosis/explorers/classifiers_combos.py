@@ -7,6 +7,7 @@ import numpy as np
 import pandas as pd
 from pydantic import validate_arguments
 from sklearn.model_selection import StratifiedGroupKFold, StratifiedKFold
+from sklearn.preprocessing import LabelEncoder
 
 # autoprognosis absolute
 from autoprognosis.exceptions import StudyCancelled
@@ -24,6 +25,12 @@ from autoprognosis.plugins.ensemble.classifiers import (
     StackingEnsemble,
     WeightedEnsemble,
 )
+from autoprognosis.utils.cache import (
+    EvaluationCache,
+    dataset_fingerprint,
+    estimator_fingerprint,
+)
+from autoprognosis.utils.oof import ClassifierOOFPredictions
 from autoprognosis.utils.tester import evaluate_estimator
 
 # autoprognosis relative
@@ -59,6 +66,8 @@ class EnsembleSeeker:
             Plugins to use in the pipeline for imputation.
         hooks: Hooks.
             Custom callbacks to be notified about the search progress.
+        cache: EvaluationCache.
+            Optional cache for the cross-validation folds. The fitted fold models are reused by the weights search.
     """
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -76,6 +85,7 @@ class EnsembleSeeker:
         imputers: List[str] = [],
         hooks: Hooks = DefaultHooks(),
         optimizer_type: str = "bayesian",
+        cache: Optional[EvaluationCache] = None,
     ) -> None:
         self.num_iter = num_ensemble_iter
         self.timeout = timeout
@@ -85,6 +95,7 @@ class EnsembleSeeker:
         self.study_name = study_name
         self.hooks = hooks
         self.optimizer_type = optimizer_type
+        self.cache = cache
 
         self.seeker = ClassifierSeeker(
             study_name,
@@ -98,6 +109,7 @@ class EnsembleSeeker:
             hooks=hooks,
             imputers=imputers,
             optimizer_type=optimizer_type,
+            cache=cache,
         )
 
     def _should_continue(self) -> None:
@@ -114,6 +126,9 @@ class EnsembleSeeker:
     ) -> List:
         self._should_continue()
 
+        # the labels are encoded like in evaluate_estimator, which caches the fold models of the search
+        Y = pd.Series(LabelEncoder().fit_transform(Y), index=Y.index)
+
         if group_ids is not None:
             skf = StratifiedGroupKFold(
                 n_splits=self.CV, shuffle=True, random_state=seed
@@ -121,15 +136,33 @@ class EnsembleSeeker:
         else:
             skf = StratifiedKFold(n_splits=self.CV, shuffle=True, random_state=seed)
 
+        dataset_key: Optional[str] = None
+        if self.cache is not None:
+            dataset_key = dataset_fingerprint(X, Y, group_ids)
+
         folds = []
-        for train_index, _ in skf.split(X, Y, groups=group_ids):
+        for fold, (train_index, _) in enumerate(skf.split(X, Y, groups=group_ids)):
             X_train = X.loc[X.index[train_index]]
             Y_train = Y.loc[Y.index[train_index]]
 
             local_fold = []
             for estimator in ensemble:
+                fold_key: Optional[str] = None
+                estimator_key = estimator_fingerprint(estimator)
+                if dataset_key is not None and estimator_key is not None:
+                    fold_key = self.cache.key(
+                        dataset_key, estimator_key, self.CV, seed, fold
+                    )
+                    model = self.cache.get_model(fold_key)
+                    if model is not None:
+                        log.debug(f"pretrain_for_cv: {model.name()} loaded from cache")
+                        local_fold.append(model)
+                        continue
+
                 model = copy.deepcopy(estimator)
                 model.fit(X_train, Y_train)
+                if fold_key is not None:
+                    self.cache.put(fold_key, model=model)
                 local_fold.append(model)
             folds.append(local_fold)
         return folds
@@ -145,18 +178,22 @@ class EnsembleSeeker:
 
         pretrained_models = self.pretrain_for_cv(ensemble, X, Y, group_ids=group_ids)
 
+        # the base models predict each test fold once, and the weight trials only combine the predictions
+        oof_predictions = ClassifierOOFPredictions(
+            pretrained_models,
+            X,
+            Y,
+            self.CV,
+            metric=self.metric,
+            group_ids=group_ids,
+        )
+
         def evaluate(weights: List) -> float:
             self._should_continue()
 
-            folds = []
-            for fold in pretrained_models:
-                folds.append(WeightedEnsemble(fold, weights))
-
-            metrics = evaluate_estimator(
-                folds, X, Y, self.CV, pretrained=True, group_ids=group_ids
-            )
+            metrics = oof_predictions.evaluate(weights)
 
-            log.debug(f"ensemble {folds[0].name()} : results {metrics['clf']}")
+            log.debug(f"ensemble weights {weights} : results {metrics['clf']}")
             score = metrics["clf"][self.metric][0]
 
             return score
@@ -1,13 +1,16 @@
 # stdlib
-from typing import Any, Callable, Tuple
+from typing import Any, Callable, Optional, Tuple
 
 # third party
 from pydantic import validate_arguments
 
 # autoprognosis absolute
+from autoprognosis.explorers.core.optimizers.asha import AshaOptimizer
 from autoprognosis.explorers.core.optimizers.bayesian import BayesianOptimizer
 from autoprognosis.explorers.core.optimizers.hyperband import HyperbandOptimizer
 
+optimizer_types = ["bayesian", "hyperband", "asha"]
+
 
 class Optimizer:
     def __init__(
@@ -18,10 +21,15 @@ class Optimizer:
         optimizer_type: str = "bayesian",
         n_trials: int = 50,  # bayesian: number of trials
         timeout: int = 60,  # bayesian: timeout per search
-        max_iter: int = 27,  # hyperband: maximum iterations per configuration
-        eta: int = 3,  # hyperband: defines configuration downsampling rate (default = 3)
+        max_iter: int = 27,  # hyperband/asha: maximum iterations per configuration
+        eta: int = 3,  # hyperband/asha: defines configuration downsampling rate (default = 3)
+        trial_workers: int = 1,  # bayesian/asha: number of concurrent trials
+        trial_backend: str = "threading",  # bayesian: threading/loky workers for the concurrent trials
+        storage_type: Optional[str] = None,  # bayesian: redis/sqlite/journal/memory
+        fold_pruning: str = "none",  # bayesian: none/median/percentile pruning of the trials, after each fold
+        resume: bool = False,  # bayesian: continue the study with the same name from the storage, instead of replacing it
     ):
-        if optimizer_type not in ["bayesian", "hyperband"]:
+        if optimizer_type not in optimizer_types:
             raise RuntimeError(f"Invalid optimizer type {optimizer_type}")
 
         if optimizer_type == "bayesian":
@@ -31,6 +39,11 @@ class Optimizer:
                 evaluation_cbk=evaluation_cbk,
                 n_trials=n_trials,
                 timeout=timeout,
+                trial_workers=trial_workers,
+                trial_backend=trial_backend,
+                storage_type=storage_type,
+                fold_pruning=fold_pruning,
+                resume=resume,
             )
         elif optimizer_type == "hyperband":
             self.optimizer = HyperbandOptimizer(
@@ -40,6 +53,17 @@ class Optimizer:
                 max_iter=max_iter,
                 eta=eta,
             )
+        elif optimizer_type == "asha":
+            self.optimizer = AshaOptimizer(
+                study_name=study_name,
+                estimator=estimator,
+                evaluation_cbk=evaluation_cbk,
+                n_trials=n_trials,
+                timeout=timeout,
+                max_iter=max_iter,
+                eta=eta,
+                workers=trial_workers,
+            )
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def evaluate(
@@ -57,11 +81,12 @@ class EnsembleOptimizer:
         optimizer_type: str = "bayesian",
         n_trials: int = 50,  # bayesian: number of trials
         timeout: int = 60,  # bayesian: timeout per search
-        max_iter: int = 27,  # hyperband: maximum iterations per configuration
-        eta: int = 3,  # hyperband: defines configuration downsampling rate (default = 3)
+        max_iter: int = 27,  # hyperband/asha: maximum iterations per configuration
+        eta: int = 3,  # hyperband/asha: defines configuration downsampling rate (default = 3)
         skip_recap: bool = False,
+        trial_workers: int = 1,  # bayesian/asha: number of concurrent trials
     ):
-        if optimizer_type not in ["bayesian", "hyperband"]:
+        if optimizer_type not in optimizer_types:
             raise RuntimeError(f"Invalid optimizer type {optimizer_type}")
 
         if optimizer_type == "bayesian":
@@ -72,6 +97,7 @@ class EnsembleOptimizer:
                 n_trials=n_trials,
                 timeout=timeout,
                 skip_recap=skip_recap,
+                trial_workers=trial_workers,
             )
         elif optimizer_type == "hyperband":
             self.optimizer = HyperbandOptimizer(
@@ -81,6 +107,17 @@ class EnsembleOptimizer:
                 max_iter=max_iter,
                 eta=eta,
             )
+        elif optimizer_type == "asha":
+            self.optimizer = AshaOptimizer(
+                study_name=study_name,
+                ensemble_len=ensemble_len,
+                evaluation_cbk=evaluation_cbk,
+                n_trials=n_trials,
+                timeout=timeout,
+                max_iter=max_iter,
+                eta=eta,
+                workers=trial_workers,
+            )
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
     def evaluate(
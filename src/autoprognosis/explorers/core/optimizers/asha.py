@@ -0,0 +1,244 @@
+# stdlib
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import json
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+# third party
+import numpy as np
+from pydantic import validate_arguments
+
+# autoprognosis absolute
+from autoprognosis.explorers.core.optimizers.hyperband import NpEncoder
+import autoprognosis.logger as log
+from autoprognosis.utils.parallel import resources
+
+EPS = 1e-8
+
+
+class AshaOptimizer:
+    """Optimization helper based on Asynchronous Successive Halving(ASHA).
+
+    The configurations start on the lowest rung, at a fraction of the full training budget.
+    A configuration is promoted to the next rung as soon as it ranks in the top 1/eta of the results of its rung,
+    so the workers never wait for a whole bracket to complete.
+
+    Args:
+        study_name: str
+            ID
+        evaluation_cbk: Callable
+            Evaluation callback. Receives the fidelity of the evaluation, and the configuration.
+        estimator: Any
+            The PipelineSelector to optimize. Either the estimator or the ensemble_len must be provided.
+        ensemble_len: int
+            Number of ensemble weights to optimize.
+        n_trials: int
+            Maximum number of configurations to sample.
+        timeout: int
+            Maximum duration of the search, in seconds.
+        max_iter: int
+            maximum iterations per configuration
+        eta: int
+            reduction factor between the rungs
+        workers: int
+            Number of concurrent evaluations. Each worker gets an equal share of the CPU budget.
+        random_state: int
+            random seed
+    """
+
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def __init__(
+        self,
+        study_name: str,
+        evaluation_cbk: Callable,
+        estimator: Any = None,
+        ensemble_len: Optional[int] = None,
+        n_trials: int = 50,
+        timeout: int = 60,
+        max_iter: int = 27,
+        eta: int = 3,
+        workers: int = 1,
+        random_state: int = 0,
+    ) -> None:
+        if eta < 2:
+            raise ValueError(f"Invalid reduction factor {eta}")
+
+        self.study_name = study_name
+        self.evaluation_cbk = evaluation_cbk
+        self.estimator = estimator
+        self.ensemble_len = ensemble_len
+        self.n_trials = n_trials
+        self.timeout = timeout
+        self.max_iter = max_iter
+        self.eta = eta
+        self.workers = workers
+        self.random_state = random_state
+
+        def logeta(x: Any) -> int:
+            return int(math.log(x) / math.log(self.eta) + EPS)
+
+        # the sampling budget must be large enough for some configurations to reach the full fidelity
+        self.n_rungs = min(logeta(self.max_iter), logeta(self.n_trials)) + 1
+
+        self._reset()
+
+    def _reset(self) -> None:
+        self.visited: Set[str] = set()
+        self.configurations: List[Any] = []
+        # rung -> list of (score, configuration index)
+        self.rungs: List[List[Tuple[float, int]]] = [[] for _ in range(self.n_rungs)]
+        # rung -> configurations promoted from the rung
+        self.promoted: List[Set[int]] = [set() for _ in range(self.n_rungs)]
+
+    def fidelity(self, rung: int) -> float:
+        return float(self.eta ** (rung - self.n_rungs + 1))
+
+    def _sample(self) -> Optional[Any]:
+        # a few attempts to find an unseen configuration
+        for retry in range(10):
+            if self.estimator is not None:
+                params = self.estimator.sample_hyperparameters_np()
+            elif self.ensemble_len is not None:
+                params = np.random.rand(self.ensemble_len)
+                params = params / (np.sum(params) + EPS)
+            else:
+                raise RuntimeError("need to provide estimator of ensemble len")
+
+            hashed = json.dumps(params, sort_keys=True, cls=NpEncoder)
+            if hashed in self.visited:
+                continue
+
+            self.visited.add(hashed)
+            return params
+
+        return None
+
+    def _next_job(self, promote: bool = True) -> Optional[Tuple[int, int]]:
+        """The next (configuration index, rung) to evaluate: a promotion if any, else a new configuration."""
+        for rung in reversed(range(self.n_rungs - 1 if promote else 0)):
+            results = sorted(self.rungs[rung], key=lambda x: -x[0])
+            quota = len(results) // self.eta
+
+            for score, idx in results[:quota]:
+                if idx in self.promoted[rung]:
+                    continue
+                self.promoted[rung].add(idx)
+                return idx, rung + 1
+
+        if len(self.configurations) >= self.n_trials:
+            return None
+
+        params = self._sample()
+        if params is None:
+            return None
+
+        self.configurations.append(params)
+        return len(self.configurations) - 1, 0
+
+    def _search(
+        self, objective: Callable, candidate: dict, multi_fidelity: bool
+    ) -> dict:
+        workers, per_worker = resources.split(self.workers, self.n_trials)
+
+        def run(idx: int, rung: int) -> float:
+            fidelity = self.fidelity(rung) if multi_fidelity else 1
+            with resources.scope(per_worker, name="asha"):
+                return objective(self.configurations[idx], fidelity)
+
+        start = time.time()
+        running: Dict[Future, Tuple[int, int]] = {}
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while True:
+                while len(running) < workers and time.time() - start < self.timeout:
+                    job = self._next_job(promote=multi_fidelity)
+                    if job is None:
+                        break
+                    running[executor.submit(run, *job)] = job
+
+                if len(running) == 0:
+                    break
+
+                completed, _ = wait(list(running.keys()), return_when=FIRST_COMPLETED)
+                for future in completed:
+                    idx, rung = running.pop(future)
+                    score = future.result()
+
+                    self.rungs[rung].append((score, idx))
+
+                    # the low-fidelity scores are only used for the promotions
+                    full_fidelity = rung == self.n_rungs - 1 or not multi_fidelity
+                    if full_fidelity and score > candidate["score"]:
+                        candidate = {
+                            "score": score,
+                            "params": self.configurations[idx],
+                        }
+
+        log.info(
+            f"      >>> {self.study_name} -- evaluations per rung {[len(rung) for rung in self.rungs]}"
+        )
+        log.info(
+            f"      >>> {self.study_name} -- best candidate: ({candidate['params']}) --- score : {candidate['score']}"
+        )
+
+        return candidate
+
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def evaluate(self) -> Tuple[float, dict]:
+        self._reset()
+
+        baseline_score = self.evaluation_cbk()
+        candidate = {
+            "score": baseline_score,
+            "params": {},
+        }
+
+        if len(self.estimator.hyperparameter_space()) == 0:
+            return baseline_score, {}
+
+        def objective(model_params: dict, fidelity: float) -> float:
+            return self.evaluation_cbk(
+                random_state=self.random_state,
+                fidelity=fidelity,
+                **model_params,
+            )
+
+        candidate = self._search(objective, candidate, multi_fidelity=True)
+
+        return candidate["score"], candidate["params"]
+
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def evaluate_ensemble(self) -> Tuple[float, dict]:
+        self._reset()
+
+        candidate = {
+            "score": 0,
+            "params": {},
+        }
+
+        for pos in range(self.ensemble_len):
+            weights = np.zeros(self.ensemble_len)
+            weights[pos] = 1
+
+            baseline_score = self.evaluation_cbk(weights)
+
+            if baseline_score > candidate["score"]:
+                candidate = {
+                    "score": baseline_score,
+                    "params": weights,
+                }
+
+        log.info(f"Baseline ensemble candidate: {candidate}")
+
+        def objective(model_params: Any, fidelity: float) -> float:
+            return self.evaluation_cbk(model_params)
+
+        # the ensemble evaluations have no fidelity knob: the configurations are evaluated once, without promotions
+        candidate = self._search(objective, candidate, multi_fidelity=False)
+
+        out_weights = {}
+        for idx, w in enumerate(candidate["params"]):
+            out_weights[f"weight_{idx}"] = w
+
+        return candidate["score"], out_weights
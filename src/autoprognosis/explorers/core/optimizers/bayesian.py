@@ -1,6 +1,8 @@
 # stdlib
 import copy
+import threading
 from typing import Any, Callable, Optional, Tuple
+import uuid
 
 # third party
 import numpy as np
@@ -9,23 +11,63 @@ from pydantic import validate_arguments
 
 # autoprognosis absolute
 import autoprognosis.logger as log
-from autoprognosis.utils.redis import backend
+from autoprognosis.utils.parallel import resources
+from autoprognosis.utils.storage import (
+    StorageBackend,
+    default_storage_type,
+    get_backend,
+)
 
 threshold = 40
 EPS = 1e-8
 
+# study attribute holding the early stopping state, shared by the concurrent workers of a run, and how many reports are written at once
+PRUNER_STATE_ATTR = "pruner_state"
+PRUNER_SAVE_EVERY = 5
+
+# the finished trials, whose parameters are not evaluated again, and the trials which may still run
+DONE_STATES = (optuna.trial.TrialState.COMPLETE, optuna.trial.TrialState.PRUNED)
+PENDING_STATES = (optuna.trial.TrialState.RUNNING, optuna.trial.TrialState.WAITING)
+
+trial_backends = ["threading", "loky"]
+fold_pruners = ["none", "median", "percentile"]
+
 
 class EarlyStoppingExceeded(optuna.exceptions.OptunaError):
     pass
 
 
 class ParamRepeatPruner:
-    """Prunes reapeated trials, which means trials with the same paramters won't waste time/resources."""
+    """Prunes reapeated trials, which means trials with the same paramters won't waste time/resources.
+
+    The early stopping state of the shared pruners is kept in the study storage, so it is shared by the concurrent workers of a run, in
+    other processes. The reports are written in batches of PRUNER_SAVE_EVERY. A resumed run starts with its own patience, from the best
+    score of the earlier runs.
+
+    Args:
+        study: optuna.study.Study
+            The study to prune.
+        patience: int
+            How many trials without improvement to accept.
+        storage: optuna.storages.BaseStorage
+            The storage of the study, to read the trials of the other workers. None for the private studies, which are only checked against the trials of this pruner.
+        run_start: int
+            The number of the first trial of the current run. The trials still running from the earlier runs are ignored.
+        run_id: str
+            The ID of the current run. The early stopping state saved by the other runs is ignored.
+        shared: bool
+            Share the early stopping state with the pruners of the other processes, through the study. The threads of a process share
+            the pruner itself.
+    """
 
     def __init__(
         self,
         study: optuna.study.Study,
         patience: int,
+        storage: Optional[optuna.storages.BaseStorage] = None,
+        run_start: int = 0,
+        run_id: Optional[str] = None,
+        shared: bool = False,
     ) -> None:
         self.study = study
         self.seen: set = set()
@@ -34,27 +76,138 @@ class ParamRepeatPruner:
         self.no_improvement_for = 0
         self.patience = patience
 
+        self.storage = storage
+        self.run_start = run_start
+        self.run_id = run_id if run_id is not None else uuid.uuid4().hex
+        self.shared = shared
+        # the reports not written to the study yet, None for the pruned trials
+        self._unsaved: list = []
+        self._study_id: Optional[int] = None
+        # the last trial number read from the storage, and the trials which were not finished then
+        self._last_number = -1
+        self._pending: set = set()
+
+        self._lock = threading.Lock()
+
         if self.study is not None:
+            if self.storage is not None:
+                self._study_id = self.storage.get_study_id_from_name(
+                    self.study.study_name
+                )
             self.register_existing_trials()
+            self._load_state()
 
     def register_existing_trials(self) -> None:
-        for trial_idx, trial_past in enumerate(
-            self.study.get_trials(states=[optuna.trial.TrialState.COMPLETE])
-        ):
-            if trial_past.values[0] > self.best_score:
-                self.best_score = trial_past.values[0]
-                self.no_improvement_for = 0
-            else:
-                self.no_improvement_for += 1
-            self.seen.add(hash(frozenset(trial_past.params.items())))
+        for trial_past in self.study.get_trials(deepcopy=False):
+            self._last_number = max(self._last_number, trial_past.number)
+
+            if trial_past.state == optuna.trial.TrialState.COMPLETE:
+                self.best_score = max(self.best_score, trial_past.values[0])
+
+            if trial_past.state in DONE_STATES:
+                self.seen.add(hash(frozenset(trial_past.params.items())))
+            elif (
+                trial_past.state in PENDING_STATES
+                and trial_past.number >= self.run_start
+            ):
+                self._pending.add(trial_past.number)
+
+    def _load_state(self) -> None:
+        if self.study is None or not self.shared:
+            return
+
+        state = self.study.user_attrs.get(PRUNER_STATE_ATTR)
+        if state is not None and state.get("run") == self.run_id:
+            self.best_score = state["best_score"]
+            self.no_improvement_for = state["no_improvement_for"]
+            for score in self._unsaved:
+                self._update(score)
+
+    def _save_state(self) -> None:
+        if self.study is None or not self.shared:
+            return
+
+        self.study.set_user_attr(
+            PRUNER_STATE_ATTR,
+            {
+                "run": self.run_id,
+                "best_score": self.best_score,
+                "no_improvement_for": self.no_improvement_for,
+            },
+        )
+        self._unsaved = []
+
+    def _update(self, score: Optional[float]) -> None:
+        if score is not None and score > self.best_score:
+            self.best_score = score
+            self.no_improvement_for = 0
+        else:
+            self.no_improvement_for += 1
+
+    def _report(self, score: Optional[float]) -> None:
+        with self._lock:
+            self._load_state()
+            self._update(score)
+
+            self._unsaved.append(score)
+            if len(self._unsaved) >= PRUNER_SAVE_EVERY:
+                self._save_state()
+
+    def flush(self) -> None:
+        """Write the pending reports to the study."""
+        with self._lock:
+            if len(self._unsaved) == 0:
+                return
+
+            self._load_state()
+            self._save_state()
 
     def check_patience(
         self,
         trial: optuna.trial.Trial,
     ) -> None:
+        with self._lock:
+            self._load_state()
+
         if self.no_improvement_for > self.patience:
             raise EarlyStoppingExceeded()
 
+    def _is_repeated(self, trial: optuna.trial.Trial) -> bool:
+        if self.storage is None:
+            return False
+
+        # only the trials started since the last check, and the ones which were not finished then, are read from the storage
+        repeated = False
+        with self._lock:
+            numbers = sorted(
+                self._pending | set(range(self._last_number + 1, trial.number))
+            )
+            self._last_number = max(self._last_number, trial.number - 1)
+
+            for number in numbers:
+                trial_past = self.storage.get_trial(
+                    self.storage.get_trial_id_from_study_id_trial_number(
+                        self._study_id, number
+                    )
+                )
+
+                self._pending.discard(number)
+                if trial_past.state in DONE_STATES:
+                    self.seen.add(hash(frozenset(trial_past.params.items())))
+                elif trial_past.state in PENDING_STATES:
+                    self._pending.add(number)
+
+                # trials started earlier, by any worker, own their parameters
+                if (
+                    number < trial.number
+                    and trial_past.state
+                    in DONE_STATES + (optuna.trial.TrialState.RUNNING,)
+                    and trial_past.params == trial.params
+                ):
+                    repeated = True
+
+        return repeated
+
     def check_trial(
         self,
         trial: optuna.trial.Trial,
@@ -64,17 +217,38 @@ class ParamRepeatPruner:
         params = frozenset(trial.params.items())
 
         current_val = hash(params)
-        if current_val in self.seen:
-            raise optuna.exceptions.TrialPruned()
+        with self._lock:
+            repeated = current_val in self.seen
+            self.seen.add(current_val)
 
-        self.seen.add(current_val)
+        if repeated or self._is_repeated(trial):
+            raise optuna.exceptions.TrialPruned()
 
     def report_score(self, score: float) -> None:
-        if score > self.best_score:
-            self.best_score = score
-            self.no_improvement_for = 0
-        else:
-            self.no_improvement_for += 1
+        self._report(score)
+
+    def report_pruned(self) -> None:
+        # a pruned trial never improves the best score
+        self._report(None)
+
+
+class FoldReporter:
+    """Reports the running cross-validation score of a trial to the study, after each fold.
+
+    Called by the evaluation with the number of evaluated folds and their mean score. Returns True if the remaining folds should be skipped.
+    """
+
+    def __init__(self, trial: optuna.trial.Trial) -> None:
+        self.trial = trial
+        self.pruned = False
+
+    def __call__(self, step: int, score: float) -> bool:
+        self.trial.report(score, step)
+        if self.trial.should_prune():
+            log.debug(f"trial {self.trial.number} pruned after {step} folds: {score}")
+            self.pruned = True
+
+        return self.pruned
 
 
 class BayesianOptimizer:
@@ -85,6 +259,20 @@ class BayesianOptimizer:
             maximum iterations without any gain
         random_state: int
             random seed
+        trial_workers: int
+            Number of trials evaluated concurrently against the same study. The pending trials are taken into account by the sampler(constant liar).
+        trial_backend: str
+            threading/loky. The loky workers share the study through the storage, and fall back to threads for in-memory studies.
+        storage_type: str
+            redis/sqlite/journal/memory. Defaults to the AUTOPROGNOSIS_STORAGE environment variable.
+        fold_pruning: str
+            none/median/percentile. Prune the trials whose running cross-validation score falls behind the other trials at the same fold.
+            The evaluation callback must accept a `fold_cbk` argument, see `evaluate_estimator`.
+        fold_pruning_percentile: float
+            The percentile used by the percentile pruning. The trials below it are stopped.
+        resume: bool
+            Continue the study with the same name from the storage. By default, the study is replaced, as the studies are named after the
+            dataset and would otherwise return the results of an earlier search. The distributed workers of a single search must resume.
     """
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -97,7 +285,18 @@ class BayesianOptimizer:
         n_trials: int = 50,
         timeout: int = 60,
         skip_recap: bool = False,
+        trial_workers: int = 1,
+        trial_backend: str = "threading",
+        storage_type: Optional[str] = None,
+        fold_pruning: str = "none",
+        fold_pruning_percentile: float = 25,
+        resume: bool = False,
     ):
+        if trial_backend not in trial_backends:
+            raise ValueError(f"Invalid trial backend {trial_backend}")
+        if fold_pruning not in fold_pruners:
+            raise ValueError(f"Invalid fold pruning {fold_pruning}")
+
         self.study_name = study_name
         self.estimator = estimator
         self.ensemble_len = ensemble_len
@@ -105,13 +304,41 @@ class BayesianOptimizer:
         self.n_trials = n_trials
         self.timeout = timeout
         self.skip_recap = skip_recap
+        self.trial_workers = trial_workers
+        self.trial_backend = trial_backend
+        self.storage_type = storage_type
+        self.fold_pruning = fold_pruning
+        self.fold_pruning_percentile = fold_pruning_percentile
+        self.resume = resume
+
+        # the storage of the current study, None for the private in-memory studies, and the number of the first trial of the run
+        self._study_backend: Optional[StorageBackend] = None
+        self._run_start = 0
+        self._run_id = uuid.uuid4().hex
+
+    def _sampler(self) -> Optional[optuna.samplers.BaseSampler]:
+        if self.trial_workers == 1:
+            return None
+
+        return optuna.samplers.TPESampler(constant_liar=True)
+
+    def _trial_pruner(self) -> optuna.pruners.BasePruner:
+        # the first trials run all the folds, to have a reference for each fold
+        if self.fold_pruning == "median":
+            return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=0)
+        elif self.fold_pruning == "percentile":
+            return optuna.pruners.PercentilePruner(
+                self.fold_pruning_percentile, n_startup_trials=5, n_warmup_steps=0
+            )
+
+        return optuna.pruners.NopPruner()
 
     def create_study(
         self,
         study_name: str,
         direction: str = "maximize",
-        load_if_exists: bool = True,
-        storage_type: str = "redis",
+        load_if_exists: Optional[bool] = None,
+        storage_type: Optional[str] = None,
         patience: int = threshold,
     ) -> Tuple[optuna.Study, ParamRepeatPruner]:
         """Helper for creating a new study.
@@ -122,65 +349,221 @@ class BayesianOptimizer:
             direction: str
                 maximize/minimize
             load_if_exists: bool
-                If True, it tries to load previous trials from the storage.
+                If True, it tries to load previous trials from the storage. Otherwise, an existing study with the same name is deleted.
+                Defaults to the resume option of the optimizer.
             storage_type: str
-                redis/none
+                redis/sqlite/journal/memory, or none for a private in-memory study. Defaults to the storage of the optimizer.
+                If the storage is not reachable, the local SQLite storage is used instead.
             patience: int
                 How many trials without improvement to accept.
 
         """
-
-        storage_obj = None
-        if storage_type == "redis":
-            storage_obj = backend.optuna()
-
-        try:
+        if storage_type is None:
+            storage_type = self.storage_type
+        if storage_type is None:
+            storage_type = default_storage_type()
+        if load_if_exists is None:
+            load_if_exists = self.resume
+
+        candidates = []
+        if storage_type != "none":
+            candidates.append(storage_type)
+            if storage_type not in ["sqlite", "memory"]:
+                candidates.append("sqlite")
+
+        study = None
+        for candidate in candidates:
+            try:
+                storage_backend = get_backend(candidate)
+                if not load_if_exists:
+                    self._delete_study(study_name, storage_backend)
+                study = optuna.create_study(
+                    direction=direction,
+                    study_name=study_name,
+                    storage=storage_backend.optuna(),
+                    load_if_exists=load_if_exists,
+                    sampler=self._sampler(),
+                    pruner=self._trial_pruner(),
+                )
+                self._study_backend = storage_backend
+                break
+            except BaseException as e:
+                log.warning(f"create_study failed for the {candidate} storage: {e}")
+
+        if study is None:
+            if storage_type != "none":
+                log.warning(
+                    f"Using an in-memory study for {study_name}. The trials will not be persisted"
+                )
             study = optuna.create_study(
                 direction=direction,
                 study_name=study_name,
-                storage=storage_obj,
-                load_if_exists=load_if_exists,
+                sampler=self._sampler(),
+                pruner=self._trial_pruner(),
             )
-        except BaseException as e:
-            log.debug(f"create_study failed {e}")
-            study = optuna.create_study(
-                direction=direction,
-                study_name=study_name,
+            self._study_backend = None
+
+        self._run_start = len(study.get_trials(deepcopy=False))
+        self._run_id = uuid.uuid4().hex
+        if self._run_start > 0:
+            log.warning(
+                f"Resuming the study {study_name} from {self._run_start} earlier trials"
             )
 
-        return study, ParamRepeatPruner(study, patience=patience)
+        return study, ParamRepeatPruner(
+            study,
+            patience=patience,
+            storage=self._study_storage(),
+            run_start=self._run_start,
+            run_id=self._run_id,
+            shared=self._remote_workers(),
+        )
 
-    @validate_arguments(config=dict(arbitrary_types_allowed=True))
-    def evaluate(
-        self,
-    ) -> Tuple[float, dict]:
-        if self.estimator is None:
-            raise ValueError("Invalid estimator")
-        study, pruner = self.create_study(study_name=self.study_name)
+    def _remote_workers(self) -> bool:
+        """If the concurrent trials run in other processes, which share the study through the storage."""
+        return (
+            self.trial_backend == "loky"
+            and self.trial_workers > 1
+            and self._study_backend is not None
+            and self._study_backend.persistent()
+        )
 
-        baseline_score = self.evaluation_cbk()
-        pruner.report_score(baseline_score)
+    def _delete_study(self, study_name: str, storage_backend: StorageBackend) -> None:
+        try:
+            optuna.delete_study(study_name=study_name, storage=storage_backend.optuna())
+        except KeyError:
+            # no study with this name
+            return
 
-        log.info(f"baseline score for {self.estimator.name()} {baseline_score}")
+        log.info(f"Replaced the earlier study {study_name}")
 
-        if len(self.estimator.hyperparameter_space()) == 0:
-            return baseline_score, {}
+    def _study_storage(self) -> Optional[optuna.storages.BaseStorage]:
+        if self._study_backend is None:
+            return None
+
+        return self._study_backend.optuna()
 
+    def _estimator_objective(self, pruner: ParamRepeatPruner) -> Callable:
         def objective(trial: optuna.Trial) -> float:
             args = self.estimator.sample_hyperparameters(trial)
             pruner.check_trial(trial)
 
-            score = self.evaluation_cbk(**args)
+            if self.fold_pruning == "none":
+                score = self.evaluation_cbk(**args)
+            else:
+                reporter = FoldReporter(trial)
+                score = self.evaluation_cbk(fold_cbk=reporter, **args)
+
+                if reporter.pruned:
+                    pruner.report_pruned()
+                    raise optuna.exceptions.TrialPruned()
+
+            pruner.report_score(score)
+
+            return score
+
+        return objective
+
+    def _ensemble_objective(self, pruner: ParamRepeatPruner) -> Callable:
+        def objective(trial: optuna.Trial) -> float:
+            weights = [
+                trial.suggest_int(f"weight_{idx}", 0, 10)
+                for idx in range(self.ensemble_len)
+            ]
+            pruner.check_trial(trial)
+            weights = weights / (np.sum(weights) + EPS)
+
+            score = self.evaluation_cbk(weights)
 
             pruner.report_score(score)
 
             return score
 
+        return objective
+
+    def _optimize(
+        self, study: optuna.Study, pruner: ParamRepeatPruner, objective_type: str
+    ) -> None:
+        """Run the trials of the study, using up to `trial_workers` concurrent workers."""
+        objective = getattr(self, objective_type)(pruner)
+
         try:
-            study.optimize(objective, n_trials=self.n_trials, timeout=self.timeout)
+            if self.trial_workers == 1:
+                study.optimize(objective, n_trials=self.n_trials, timeout=self.timeout)
+                return
+
+            workers, per_worker = resources.split(self.trial_workers, self.n_trials)
+
+            if self._remote_workers() and workers > 1:
+                # the workers start from the baseline score
+                pruner.flush()
+
+                worker_trials = int(np.ceil(self.n_trials / workers))
+                resources.parallel_map(
+                    self._optimize_worker,
+                    [(objective_type, worker_trials) for _ in range(workers)],
+                    n_jobs=workers,
+                    name="trials",
+                    max_nbytes=None,
+                )
+                return
+
+            def budgeted_objective(trial: optuna.Trial) -> float:
+                with resources.scope(per_worker, name="trials"):
+                    return objective(trial)
+
+            study.optimize(
+                budgeted_objective,
+                n_trials=self.n_trials,
+                timeout=self.timeout,
+                n_jobs=workers,
+            )
         except EarlyStoppingExceeded:
             log.info("Early stopping triggered for search")
 
+    def _optimize_worker(self, objective_type: str, n_trials: int) -> None:
+        """Remote worker: runs its share of the trials against the study from the storage."""
+        study = optuna.load_study(
+            study_name=self.study_name,
+            storage=self._study_storage(),
+            sampler=self._sampler(),
+            pruner=self._trial_pruner(),
+        )
+        pruner = ParamRepeatPruner(
+            study,
+            patience=threshold,
+            storage=self._study_storage(),
+            run_start=self._run_start,
+            run_id=self._run_id,
+            shared=True,
+        )
+        objective = getattr(self, objective_type)(pruner)
+
+        try:
+            study.optimize(objective, n_trials=n_trials, timeout=self.timeout)
+        except EarlyStoppingExceeded:
+            log.info("Early stopping triggered for search worker")
+        finally:
+            pruner.flush()
+
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def evaluate(
+        self,
+    ) -> Tuple[float, dict]:
+        if self.estimator is None:
+            raise ValueError("Invalid estimator")
+        study, pruner = self.create_study(study_name=self.study_name)
+
+        baseline_score = self.evaluation_cbk()
+        pruner.report_score(baseline_score)
+
+        log.info(f"baseline score for {self.estimator.name()} {baseline_score}")
+
+        if len(self.estimator.hyperparameter_space()) == 0:
+            return baseline_score, {}
+
+        self._optimize(study, pruner, "_estimator_objective")
+
         if baseline_score > study.best_value:
             return baseline_score, {}
 
@@ -197,20 +580,6 @@ class BayesianOptimizer:
             study_name=self.study_name, load_if_exists=False, storage_type="none"
         )
 
-        def objective(trial: optuna.Trial) -> float:
-            weights = [
-                trial.suggest_int(f"weight_{idx}", 0, 10)
-                for idx in range(self.ensemble_len)
-            ]
-            pruner.check_trial(trial)
-            weights = weights / (np.sum(weights) + EPS)
-
-            score = self.evaluation_cbk(weights)
-
-            pruner.report_score(score)
-
-            return score
-
         if not self.skip_recap:
             initial_trials = []
 
@@ -226,9 +595,6 @@ class BayesianOptimizer:
             for trial in initial_trials:
                 study.enqueue_trial(trial)
 
-        try:
-            study.optimize(objective, n_trials=self.n_trials, timeout=self.timeout)
-        except EarlyStoppingExceeded:
-            log.info("Early stopping triggered for search")
+        self._optimize(study, pruner, "_ensemble_objective")
 
         return study.best_value, study.best_trial.params
@@ -114,14 +114,20 @@ class HyperbandOptimizer:
                 n_configs = int(math.ceil(n * self.eta ** (-i)))
                 n_iterations = r * self.eta ** (i)
 
+                # the configurations are evaluated on a fraction of the full training budget, until the last rung
+                fidelity = min(1.0, n_iterations / self.max_iter)
+
                 scores = []
 
                 for model_params in T:
                     score = objective(
                         hyperparam_search_iterations=n_iterations,
                         model_params=model_params,
+                        fidelity=fidelity,
                     )
-                    if score > candidate["score"]:
+                    # the low-fidelity scores are only used for the promotions
+                    full_fidelity = fidelity >= 1 or self.estimator is None
+                    if full_fidelity and score > candidate["score"]:
                         candidate = {
                             "score": score,
                             "params": model_params,
@@ -151,10 +157,13 @@ class HyperbandOptimizer:
             "params": {},
         }
 
-        def objective(hyperparam_search_iterations: int, model_params: dict) -> float:
+        def objective(
+            hyperparam_search_iterations: int, model_params: dict, fidelity: float = 1
+        ) -> float:
             return self.evaluation_cbk(
                 hyperparam_search_iterations=hyperparam_search_iterations,
                 random_state=self.random_state,
+                fidelity=fidelity,
                 **model_params,
             )
 
@@ -183,7 +192,9 @@ class HyperbandOptimizer:
 
         log.info(f"Baseline ensemble candidate: {candidate}")
 
-        def objective(hyperparam_search_iterations: int, model_params: dict) -> float:
+        def objective(
+            hyperparam_search_iterations: int, model_params: dict, fidelity: float = 1
+        ) -> float:
             return self.evaluation_cbk(
                 model_params,
             )
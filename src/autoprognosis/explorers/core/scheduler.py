@@ -0,0 +1,139 @@
+# stdlib
+import math
+import time
+from typing import Callable, List, Tuple
+
+# third party
+import numpy as np
+from pydantic import validate_arguments
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+
+search_schedulers = ["fixed", "bandit"]
+
+
+class BanditScheduler:
+    """Allocates a global search budget across the estimator families, as a multi-armed bandit.
+
+    Every family gets `min_steps` search steps. After that, each step goes to the family with the highest upper confidence bound(UCB) on its best score,
+    and the families whose upper bound falls below the best score of the leader are rejected(successive rejection).
+    The exploration bonus is scaled by the spread of the best scores of the families, so the bounds do not depend on the metric.
+
+    Args:
+        n_arms: int
+            Number of estimator families.
+        n_trials: int
+            Global number of trials, shared by all the families.
+        timeout: int
+            Global duration of the search, in seconds.
+        trials_per_step: int
+            Number of trials for each search step.
+        min_steps: int
+            Number of search steps for each family, before any rejection.
+        exploration: float
+            Weight of the UCB exploration bonus.
+    """
+
+    @validate_arguments
+    def __init__(
+        self,
+        n_arms: int,
+        n_trials: int,
+        timeout: int,
+        trials_per_step: int = 5,
+        min_steps: int = 1,
+        exploration: float = 0.5,
+    ) -> None:
+        if n_arms <= 0:
+            raise ValueError("The scheduler needs at least one estimator")
+
+        self.n_arms = n_arms
+        self.n_trials = n_trials
+        self.timeout = timeout
+        self.trials_per_step = trials_per_step
+        self.min_steps = min_steps
+        self.exploration = exploration
+
+        self.steps = np.zeros(n_arms, dtype=int)
+        self.scores = np.full(n_arms, -np.inf)
+        self.args: List[dict] = [{} for _ in range(n_arms)]
+        self.active = np.ones(n_arms, dtype=bool)
+
+    def bonus(self) -> np.ndarray:
+        """UCB exploration bonus of each family."""
+        observed = self.scores[np.isfinite(self.scores)]
+        spread = np.max(observed) - np.min(observed) if len(observed) > 1 else 0
+
+        total = max(np.sum(self.steps), 1)
+        return (
+            self.exploration
+            * spread
+            * np.sqrt(2 * math.log(total) / np.maximum(self.steps, 1))
+        )
+
+    def reject(self) -> None:
+        """Stop the families which cannot catch up with the leader."""
+        if np.any(self.steps[self.active] < self.min_steps):
+            return
+
+        upper = self.scores + self.bonus()
+        leader = np.max(self.scores[self.active])
+
+        for arm in np.where(self.active)[0]:
+            if self.scores[arm] == leader:
+                continue
+            if upper[arm] < leader:
+                log.info(
+                    f"[scheduler] rejecting estimator {arm}: {self.scores[arm]} + bonus < {leader}"
+                )
+                self.active[arm] = False
+
+    def next_arm(self) -> int:
+        # warm up: the families with the fewest steps first
+        pending = np.where(self.active & (self.steps < self.min_steps))[0]
+        if len(pending) > 0:
+            return int(pending[np.argmin(self.steps[pending])])
+
+        upper = np.where(self.active, self.scores + self.bonus(), -np.inf)
+        return int(np.argmax(upper))
+
+    def update(self, arm: int, score: float, args: dict) -> None:
+        self.steps[arm] += 1
+        if score > self.scores[arm] or not np.isfinite(self.scores[arm]):
+            self.scores[arm] = score
+            self.args[arm] = args
+
+    def run(self, step: Callable[[int, int, int], Tuple[float, dict]]) -> List:
+        """Run the search.
+
+        Args:
+            step: Callable
+                Runs a search step for a family: step(family index, number of trials, timeout) -> (best score so far, best args so far).
+
+        Returns:
+            The best (score, args) of each family. The families which were never searched have a score of -inf.
+        """
+        start = time.time()
+        trials_left = self.n_trials
+
+        while trials_left > 0 and np.any(self.active):
+            time_left = int(self.timeout - (time.time() - start))
+            if time_left <= 0:
+                log.info("[scheduler] global timeout reached")
+                break
+
+            arm = self.next_arm()
+            n_trials = min(self.trials_per_step, trials_left)
+
+            score, args = step(arm, n_trials, time_left)
+            trials_left -= n_trials
+
+            self.update(arm, score, args)
+            self.reject()
+
+        log.info(
+            f"[scheduler] steps per estimator {self.steps.tolist()}, scores {self.scores.tolist()}"
+        )
+
+        return list(zip(self.scores.tolist(), self.args))
@@ -1,4 +1,5 @@
 # stdlib
+import math
 from typing import Any, Dict, List, Tuple, Type, Union
 
 # third party
@@ -21,6 +22,9 @@ predefined_args = {
     "features_count": 10,
 }
 
+# smallest fraction of the rows used by the low-fidelity evaluations
+MIN_FIDELITY_SUBSAMPLE = 0.2
+
 
 class PipelineSelector:
     """AutoML wrapper for pipelines
@@ -222,7 +226,31 @@ class PipelineSelector:
     def get_pipeline_from_template(self, model_list: List, args: Dict) -> PipelineMeta:
         return Pipeline(model_list)(args)
 
-    def get_pipeline_from_named_args(self, **kwargs: Any) -> PipelineMeta:
+    @staticmethod
+    def fidelity_subsample(fidelity: float) -> float:
+        """Fraction of the rows used for evaluating a configuration at a fidelity level."""
+        if fidelity >= 1:
+            return 1
+
+        return max(MIN_FIDELITY_SUBSAMPLE, fidelity)
+
+    @staticmethod
+    def fidelity_folds(fidelity: float, n_folds: int) -> int:
+        """Number of cross-validation folds used for evaluating a configuration at a fidelity level."""
+        if fidelity >= 1 or n_folds <= 2:
+            return n_folds
+
+        return max(2, min(n_folds, int(math.ceil(fidelity * n_folds))))
+
+    def get_pipeline_from_named_args(
+        self, fidelity: float = 1, **kwargs: Any
+    ) -> PipelineMeta:
+        """Build the pipeline from the sampled arguments.
+
+        Args:
+            fidelity: float
+                Fraction of the full training budget, in (0, 1]. The low-fidelity pipelines scale down the training cost of the estimator(e.g. n_estimators, epochs).
+        """
         model_list = list()
 
         pipeline_args: dict = {}
@@ -267,4 +295,10 @@ class PipelineSelector:
         model_list.append(self.classifier.fqdn())
         add_stage_hp(self.classifier)
 
+        pipeline_args[self.classifier.name()].update(
+            self.classifier.fidelity_args(
+                fidelity, pipeline_args[self.classifier.name()]
+            )
+        )
+
         return Pipeline(model_list)(pipeline_args)
@@ -3,7 +3,6 @@ import time
 from typing import Any, Dict, List, Optional, Tuple
 
 # third party
-from joblib import Parallel, delayed
 import numpy as np
 import pandas as pd
 from pydantic import validate_arguments
@@ -19,9 +18,12 @@ from autoprognosis.explorers.core.selector import PipelineSelector
 from autoprognosis.explorers.hooks import DefaultHooks
 from autoprognosis.hooks import Hooks
 import autoprognosis.logger as log
+from autoprognosis.utils.dataset import share
+from autoprognosis.utils.parallel import resources
 from autoprognosis.utils.tester import evaluate_regression
 
-dispatcher = Parallel(max_nbytes=None, backend="loky", n_jobs=1)
+# number of estimators searched concurrently, within the global CPU budget
+ESTIMATOR_SEARCH_N_JOBS = 1
 
 
 class RegressionSeeker:
@@ -49,6 +51,8 @@ class RegressionSeeker:
             Plugins to use in the pipeline for imputation.
         hooks: Hooks.
             Custom callbacks to be notified about the search progress.
+        trial_workers: int.
+            Number of optimization trials evaluated concurrently for each estimator(bayesian and asha optimizers).
     """
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -66,6 +70,7 @@ class RegressionSeeker:
         hooks: Hooks = DefaultHooks(),
         optimizer_type: str = "bayesian",
         strict: bool = False,
+        trial_workers: int = 1,
     ) -> None:
         for int_val in [num_iter, CV, top_k, timeout]:
             if int_val <= 0 or type(int_val) != int:
@@ -96,6 +101,7 @@ class RegressionSeeker:
         self.top_k = top_k
         self.metric = metric
         self.optimizer_type = optimizer_type
+        self.trial_workers = trial_workers
         self.strict = strict
 
     def _should_continue(self) -> None:
@@ -111,14 +117,21 @@ class RegressionSeeker:
     ) -> Tuple[float, float, Dict]:
         self._should_continue()
 
-        def evaluate_args(**kwargs: Any) -> float:
+        def evaluate_args(fidelity: float = 1, **kwargs: Any) -> float:
             self._should_continue()
 
             start = time.time()
 
-            model = estimator.get_pipeline_from_named_args(**kwargs)
+            model = estimator.get_pipeline_from_named_args(fidelity=fidelity, **kwargs)
             try:
-                metrics = evaluate_regression(model, X, Y, self.CV, group_ids=group_ids)
+                metrics = evaluate_regression(
+                    model,
+                    X,
+                    Y,
+                    estimator.fidelity_folds(fidelity, self.CV),
+                    group_ids=group_ids,
+                    subsample=estimator.fidelity_subsample(fidelity),
+                )
             except BaseException as e:
                 log.error(f"evaluate_regression failed: {e}")
 
@@ -143,6 +156,7 @@ class RegressionSeeker:
             estimator=estimator,
             evaluation_cbk=evaluate_args,
             optimizer_type=self.optimizer_type,
+            trial_workers=self.trial_workers,
             n_trials=self.num_iter,
             timeout=self.timeout,
         )
@@ -154,11 +168,15 @@ class RegressionSeeker:
     ) -> List:
         self._should_continue()
 
-        search_results = dispatcher(
-            delayed(self.search_best_args_for_estimator)(
-                estimator, X, Y, group_ids=group_ids
-            )
-            for estimator in self.estimators
+        # the concurrent searches share a single copy of the dataset
+        data = share(X, ESTIMATOR_SEARCH_N_JOBS, len(self.estimators))
+
+        search_results = resources.parallel_map(
+            self.search_best_args_for_estimator,
+            [(estimator, data, Y, group_ids) for estimator in self.estimators],
+            n_jobs=ESTIMATOR_SEARCH_N_JOBS,
+            name="estimator_search",
+            max_nbytes=None,
         )
 
         all_scores = []
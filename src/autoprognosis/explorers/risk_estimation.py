@@ -4,7 +4,6 @@ import traceback
 from typing import Any, Dict, List, Optional, Tuple
 
 # third party
-from joblib import Parallel, delayed
 import numpy as np
 import pandas as pd
 from pydantic import validate_arguments
@@ -20,9 +19,12 @@ from autoprognosis.explorers.core.selector import PipelineSelector
 from autoprognosis.explorers.hooks import DefaultHooks
 from autoprognosis.hooks import Hooks
 import autoprognosis.logger as log
+from autoprognosis.utils.dataset import share
+from autoprognosis.utils.parallel import resources
 from autoprognosis.utils.tester import evaluate_survival_estimator
 
-dispatcher = Parallel(max_nbytes=None, backend="loky", n_jobs=2)
+# number of estimators searched concurrently, within the global CPU budget
+ESTIMATOR_SEARCH_N_JOBS = 2
 
 
 class RiskEstimatorSeeker:
@@ -50,6 +52,8 @@ class RiskEstimatorSeeker:
             Plugins to use in the pipeline for imputation.
         hooks: Hooks.
             Custom callbacks to be notified about the search progress.
+        trial_workers: int.
+            Number of optimization trials evaluated concurrently for each estimator(bayesian and asha optimizers).
     """
 
     @validate_arguments(config=dict(arbitrary_types_allowed=True))
@@ -67,6 +71,7 @@ class RiskEstimatorSeeker:
         hooks: Hooks = DefaultHooks(),
         optimizer_type: str = "bayesian",
         strict: bool = False,
+        trial_workers: int = 1,
     ) -> None:
         self.time_horizons = time_horizons
 
@@ -76,6 +81,7 @@ class RiskEstimatorSeeker:
         self.study_name = study_name
         self.hooks = hooks
         self.optimizer_type = optimizer_type
+        self.trial_workers = trial_workers
         self.strict = strict
         self.CV = CV
 
@@ -106,16 +112,22 @@ class RiskEstimatorSeeker:
     ) -> Tuple[float, float, Dict]:
         self._should_continue()
 
-        def evaluate_estimator(**kwargs: Any) -> float:
+        def evaluate_estimator(fidelity: float = 1, **kwargs: Any) -> float:
             self._should_continue()
             start = time.time()
             time_horizons = [time_horizon]
 
-            model = estimator.get_pipeline_from_named_args(**kwargs)
+            model = estimator.get_pipeline_from_named_args(fidelity=fidelity, **kwargs)
 
             try:
                 metrics = evaluate_survival_estimator(
-                    model, X, T, Y, time_horizons, group_ids=group_ids
+                    model,
+                    X,
+                    T,
+                    Y,
+                    time_horizons,
+                    group_ids=group_ids,
+                    subsample=estimator.fidelity_subsample(fidelity),
                 )
             except BaseException as e:
                 log.error(f"evaluate_survival_estimator failed {e}")
@@ -144,6 +156,7 @@ class RiskEstimatorSeeker:
             estimator=estimator,
             evaluation_cbk=evaluate_estimator,
             optimizer_type=self.optimizer_type,
+            trial_workers=self.trial_workers,
             n_trials=self.num_iter,
             timeout=self.timeout,
         )
@@ -162,11 +175,18 @@ class RiskEstimatorSeeker:
 
         log.info(f"Searching estimators for horizon {time_horizon}")
         try:
-            search_results = dispatcher(
-                delayed(self.search_best_args_for_estimator)(
-                    estimator, X, T, Y, time_horizon, group_ids=group_ids
-                )
-                for estimator in self.estimators
+            # the concurrent searches share a single copy of the dataset
+            data = share(X, ESTIMATOR_SEARCH_N_JOBS, len(self.estimators))
+
+            search_results = resources.parallel_map(
+                self.search_best_args_for_estimator,
+                [
+                    (estimator, data, T, Y, time_horizon, group_ids)
+                    for estimator in self.estimators
+                ],
+                n_jobs=ESTIMATOR_SEARCH_N_JOBS,
+                name="estimator_search",
+                max_nbytes=None,
             )
         except BaseException as e:
             print(traceback.format_exc())
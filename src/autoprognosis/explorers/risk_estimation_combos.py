@@ -20,12 +20,12 @@ from autoprognosis.explorers.hooks import DefaultHooks
 from autoprognosis.hooks import Hooks
 import autoprognosis.logger as log
 from autoprognosis.plugins.ensemble.risk_estimation import RiskEnsemble
-from autoprognosis.utils.tester import evaluate_survival_estimator
+from autoprognosis.utils.oof import RiskOOFPredictions
 
 # autoprognosis relative
 from .risk_estimation import RiskEstimatorSeeker
 
-EPS = 10 ** -8
+EPS = 10**-8
 
 
 class RiskEnsembleSeeker:
@@ -144,30 +144,42 @@ class RiskEnsembleSeeker:
         time_horizon: int,
         skip_recap: bool = False,
         group_ids: Optional[pd.Series] = None,
+        oof_predictions: Optional[RiskOOFPredictions] = None,
     ) -> List[float]:
         self._should_continue()
 
-        pretrained_models = self.pretrain_for_cv(
-            ensemble, X, T, Y, time_horizon, group_ids=group_ids
-        )
+        if oof_predictions is None:
+            pretrained_models = self.pretrain_for_cv(
+                ensemble, X, T, Y, time_horizon, group_ids=group_ids
+            )
+
+            # the base models predict each test fold once, and the weight trials only combine the predictions
+            oof_predictions = RiskOOFPredictions(
+                pretrained_models,
+                X,
+                T,
+                Y,
+                [time_horizon],
+                n_folds=self.CV,
+                group_ids=group_ids,
+            )
 
         def evaluate(weights: list) -> float:
             self._should_continue()
             start = time.time()
 
-            cv_folds = []
-            for fold in pretrained_models:
-                cv_folds.append(RiskEnsemble(fold, [weights], [time_horizon]))
-
-            metrics = evaluate_survival_estimator(
-                cv_folds, X, T, Y, [time_horizon], pretrained=True, group_ids=group_ids
+            metrics = oof_predictions.evaluate(weights, [time_horizon])
+            name = " + ".join(
+                f"{round(weight, 2)} * {model.name()}"
+                for model, weight in zip(ensemble, weights)
+                if weight != 0
             )
 
             self.hooks.heartbeat(
                 topic="risk_estimation",
                 subtopic="ensemble_search",
                 event_type="performance",
-                name=cv_folds[0].name(short=True),
+                name=str([name]),
                 duration=time.time() - start,
                 horizon=time_horizon,
                 aucroc=metrics["str"]["aucroc"],
@@ -175,9 +187,7 @@ class RiskEnsembleSeeker:
                 brier_score=metrics["str"]["brier_score"],
             )
 
-            log.debug(
-                f"Ensemble {cv_folds[0].name()} : results {metrics['clf']['c_index'][0]}"
-            )
+            log.debug(f"Ensemble {name} : results {metrics['clf']['c_index'][0]}")
             return metrics["clf"]["c_index"][0] - metrics["clf"]["brier_score"][0]
 
         study = EnsembleOptimizer(
@@ -216,6 +226,20 @@ class RiskEnsembleSeeker:
             model for horizon_models in best_horizon_models for model in horizon_models
         ]
 
+        # the fold models do not depend on the horizon: they are trained, and predict their test folds, once for all the horizons
+        pretrained_models = self.pretrain_for_cv(
+            all_models, X, T, Y, self.time_horizons[0], group_ids=group_ids
+        )
+        oof_predictions = RiskOOFPredictions(
+            pretrained_models,
+            X,
+            T,
+            Y,
+            self.time_horizons,
+            n_folds=self.CV,
+            group_ids=group_ids,
+        )
+
         weights: List[List[float]] = []
 
         for idx, horizon in enumerate(self.time_horizons):
@@ -229,6 +253,7 @@ class RiskEnsembleSeeker:
                 horizon,
                 skip_recap=skip_recap,
                 group_ids=group_ids,
+                oof_predictions=oof_predictions,
             )
             weights.append(local_weights)
 
@@ -2,6 +2,7 @@
 from abc import ABCMeta, abstractmethod
 from importlib.abc import Loader
 import importlib.util
+import inspect
 from os.path import basename
 from pathlib import Path
 from typing import Any, Dict, Generator, List, Optional, Type
@@ -15,6 +16,7 @@ from sklearn.preprocessing import LabelEncoder
 # autoprognosis absolute
 import autoprognosis.logger as log
 import autoprognosis.plugins.utils.cast as cast
+from autoprognosis.utils.parallel import limit_model_threads
 from autoprognosis.utils.tester import constant_columns
 
 # autoprognosis relative
@@ -36,8 +38,13 @@ class Plugin(metaclass=ABCMeta):
         load/save - serialization methods
 
     If any method implementation is missing, the class constructor will fail.
+
+    Optionally, `fidelity_param` names the constructor argument which controls the training cost(e.g. n_estimators, epochs).
+    The multi-fidelity searches scale it down for the cheap evaluations.
     """
 
+    fidelity_param: Optional[str] = None
+
     def __init__(self) -> None:
         self.output = pd.DataFrame
         self._backup_encoders: Optional[Dict[str, LabelEncoder]] = {}
@@ -105,6 +112,28 @@ class Plugin(metaclass=ABCMeta):
 
         return results
 
+    @classmethod
+    def fidelity_args(cls, fidelity: float, args: Dict[str, Any]) -> Dict[str, Any]:
+        """Constructor arguments for training at a fraction of the full cost.
+
+        Args:
+            fidelity: float
+                Fraction of the full training budget, in (0, 1].
+            args: dict
+                The constructor arguments of the full-cost plugin.
+        """
+        if cls.fidelity_param is None or fidelity >= 1:
+            return {}
+
+        full = args.get(cls.fidelity_param)
+        if full is None:
+            default = inspect.signature(cls.__init__).parameters.get(cls.fidelity_param)
+            full = default.default if default is not None else None
+        if not isinstance(full, (int, np.integer)):
+            return {}
+
+        return {cls.fidelity_param: max(1, int(round(full * fidelity)))}
+
     @staticmethod
     @abstractmethod
     def name() -> str:
@@ -131,29 +160,43 @@ class Plugin(metaclass=ABCMeta):
         return pd.DataFrame(self.fit(X, *args, *kwargs).predict(X))
 
     def _fit_input(self, X: pd.DataFrame) -> pd.DataFrame:
-        X = cast.to_dataframe(X).copy()
+        # the model threads share the CPU budget of the caller(estimator search, folds etc.)
+        limit_model_threads(getattr(self, "model", None))
+
+        X = cast.to_dataframe(X)
         self._backup_encoders = {}
         self._drop_features = []
 
-        for col in X.columns:
-            if X[col].dtype.name not in ["object", "category"]:
-                continue
+        categorical = [
+            col for col in X.columns if X[col].dtype.name in ["object", "category"]
+        ]
+        if len(categorical) > 0:
+            # copy on write: the input is shared with the caller
+            X = X.copy()
 
+        for col in categorical:
             encoder = LabelEncoder()
             X[col] = encoder.fit_transform(X[col])
 
             self._backup_encoders[col] = encoder
         self._drop_features = constant_columns(X)
+        if len(self._drop_features) == 0:
+            return X
+
         return X.drop(columns=self._drop_features)
 
     def _transform_input(self, X: pd.DataFrame) -> pd.DataFrame:
-        X = cast.to_dataframe(X).copy()
+        X = cast.to_dataframe(X)
 
         if self._backup_encoders is None:
             self._backup_encoders = {}
         if self._drop_features is None:
             self._drop_features = []
 
+        if len(self._backup_encoders) > 0:
+            # copy on write: the input is shared with the caller
+            X = X.copy()
+
         for col in self._backup_encoders:
             X[col] = self._backup_encoders[col].transform(X[col])
         for col in self._drop_features:
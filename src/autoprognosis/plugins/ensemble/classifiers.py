@@ -1,24 +1,38 @@
 # stdlib
 from abc import ABCMeta, abstractmethod
 import copy
-from typing import Any, Dict, List, Optional, Tuple, Union
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 # third party
-from joblib import Parallel, delayed
 import numpy as np
 import pandas as pd
 from sklearn.model_selection import StratifiedKFold
 
 # autoprognosis absolute
+from autoprognosis.exceptions import StudyCancelled
+from autoprognosis.explorers.hooks import DefaultHooks
+from autoprognosis.hooks import Hooks
 import autoprognosis.logger as log
 from autoprognosis.plugins.ensemble.combos import SimpleClassifierAggregator, Stacking
 from autoprognosis.plugins.explainers import Explainers
 from autoprognosis.plugins.pipeline import Pipeline, PipelineMeta
-from autoprognosis.utils.parallel import cpu_count
+from autoprognosis.utils.dataset import SharedDataset, share, take_rows
+from autoprognosis.utils.parallel import resources
 import autoprognosis.utils.serialization as serialization
+import autoprognosis.utils.streaming as streaming
 from autoprognosis.utils.tester import classifier_evaluator
 
-dispatcher = Parallel(max_nbytes=None, backend="loky", n_jobs=cpu_count())
+
+def _fit_fold_model(
+    model: Any,
+    X: Union[pd.DataFrame, SharedDataset],
+    Y: pd.DataFrame,
+    train_index: np.ndarray,
+) -> Any:
+    # the folds can share the same base model instances
+    model = copy.deepcopy(model)
+    return model.fit(take_rows(X, train_index), Y.iloc[train_index])
 
 
 class BaseEnsemble(metaclass=ABCMeta):
@@ -46,6 +60,32 @@ class BaseEnsemble(metaclass=ABCMeta):
         self.explainer_plugins = explainer_plugins
         self.explanations_nepoch = explanations_nepoch
 
+    def predict_proba_batches(
+        self,
+        source: Any,
+        batch_size: int = streaming.DEFAULT_BATCH_SIZE,
+        output_path: Optional[Union[str, Path]] = None,
+    ) -> Union[Iterator[pd.DataFrame], int]:
+        """Streaming predict_proba, for datasets which do not fit in memory.
+
+        Args:
+            source: str, Path, DataFrame, or iterable
+                The covariates: a CSV or Parquet file, an in-memory dataset, or an iterable of chunks.
+            batch_size: int
+                Number of rows of each chunk, for the files and the in-memory datasets.
+            output_path: str or Path
+                If set, the predictions are written to this Parquet file as they are produced.
+
+        Returns:
+            The number of rows written if `output_path` is set, else a lazy iterator over the predictions of each chunk.
+        """
+        return streaming.stream(
+            self.predict_proba,
+            source,
+            batch_size=batch_size,
+            output_path=output_path,
+        )
+
     def score(self, X: pd.DataFrame, y: pd.DataFrame, metric: str = "aucroc") -> float:
         ev = classifier_evaluator(metric)
         preds = self.predict_proba(X)
@@ -97,13 +137,24 @@ class WeightedEnsemble(BaseEnsemble):
             self.models.append(models[idx])
             self.weights.append(weights[idx])
 
-    def fit(self, X: pd.DataFrame, Y: pd.DataFrame) -> "WeightedEnsemble":
+    def fit(
+        self, X: pd.DataFrame, Y: pd.DataFrame, n_jobs: int = -1
+    ) -> "WeightedEnsemble":
         def fit_model(k: int) -> Any:
             return self.models[k].fit(X, Y)
 
         log.info("Fitting the WeightedEnsemble")
-        self.models = dispatcher(delayed(fit_model)(k) for k in range(len(self.models)))
+        self.models = resources.parallel_map(
+            fit_model,
+            [(k,) for k in range(len(self.models))],
+            n_jobs=n_jobs,
+            name="ensemble",
+            max_nbytes=None,
+        )
+
+        return self._fit_explainers(X, Y)
 
+    def _fit_explainers(self, X: pd.DataFrame, Y: pd.DataFrame) -> "WeightedEnsemble":
         if self.explainers:
             return self
 
@@ -177,6 +228,8 @@ class WeightedEnsembleCV(BaseEnsemble):
         models: list. List of base models.
         weights: list. The weights for each base model.
         explainer_plugins: list. List of explainers attached to the ensemble.
+        n_jobs: int. Number of models of all the folds to train in parallel. -1 uses the whole CPU budget.
+        hooks: Hooks. Cancellation hooks, checked between the training batches.
     """
 
     def __init__(
@@ -188,6 +241,8 @@ class WeightedEnsembleCV(BaseEnsemble):
         explainer_plugins: list = [],
         explainers: Optional[dict] = None,
         explanations_nepoch: int = 10000,
+        n_jobs: int = -1,
+        hooks: Hooks = DefaultHooks(),
     ) -> None:
         super().__init__()
 
@@ -218,18 +273,60 @@ class WeightedEnsembleCV(BaseEnsemble):
 
         self.n_folds = n_folds
         self.seed = 42
+        self.n_jobs = n_jobs
+        self.hooks = hooks
+
+    def _should_continue(self) -> None:
+        if self.hooks.cancel():
+            raise StudyCancelled("WeightedEnsembleCV: cancelled")
 
     def fit(self, X: pd.DataFrame, Y: pd.DataFrame) -> "WeightedEnsembleCV":
+        self._should_continue()
+
         skf = StratifiedKFold(
             n_splits=self.n_folds, shuffle=True, random_state=self.seed
         )
-        cv_idx = 0
-        for train_index, test_index in skf.split(X, Y):
-            X_train = X.loc[X.index[train_index]]
-            Y_train = Y.loc[Y.index[train_index]]
-
-            self.models[cv_idx].fit(X_train, Y_train)
-            cv_idx += 1
+        folds = [train_index for train_index, _ in skf.split(X, Y)]
+
+        # the base models of all the folds are trained in a single pool, on the shared dataset
+        tasks: List[Tuple[int, Optional[int]]] = []
+        for cv_idx, ensemble in enumerate(self.models):
+            if isinstance(ensemble, WeightedEnsemble):
+                tasks.extend((cv_idx, k) for k in range(len(ensemble.models)))
+            else:
+                tasks.append((cv_idx, None))
+
+        def _unit(cv_idx: int, k: Optional[int]) -> Any:
+            if k is None:
+                return self.models[cv_idx]
+            return self.models[cv_idx].models[k]
+
+        data = share(X, self.n_jobs, len(tasks))
+
+        log.info(f"Fitting the WeightedEnsembleCV: {len(tasks)} models")
+        fitted = resources.parallel_map(
+            _fit_fold_model,
+            [(_unit(cv_idx, k), data, Y, folds[cv_idx]) for cv_idx, k in tasks],
+            n_jobs=self.n_jobs,
+            name="ensemble_cv",
+            should_stop=self.hooks.cancel,
+            max_nbytes=None,
+        )
+        if len(fitted) < len(tasks):
+            raise StudyCancelled("WeightedEnsembleCV: cancelled")
+
+        for (cv_idx, k), model in zip(tasks, fitted):
+            if k is None:
+                self.models[cv_idx] = model
+            else:
+                self.models[cv_idx].models[k] = model
+
+        for cv_idx, train_index in enumerate(folds):
+            self._should_continue()
+            if isinstance(self.models[cv_idx], WeightedEnsemble):
+                self.models[cv_idx]._fit_explainers(
+                    X.iloc[train_index], Y.iloc[train_index]
+                )
 
         if self.explainers:
             return self
@@ -4,7 +4,6 @@ import copy
 from typing import Any, Dict, List, Optional
 
 # third party
-from joblib import Parallel, delayed
 import numpy as np
 import pandas as pd
 
@@ -12,11 +11,9 @@ import pandas as pd
 import autoprognosis.logger as log
 from autoprognosis.plugins.explainers import Explainers
 from autoprognosis.plugins.pipeline import PipelineMeta
-from autoprognosis.utils.parallel import cpu_count
+from autoprognosis.utils.parallel import resources
 import autoprognosis.utils.serialization as serialization
 
-dispatcher = Parallel(max_nbytes=None, backend="loky", n_jobs=cpu_count())
-
 
 class BaseRegressionEnsemble(metaclass=ABCMeta):
     """
@@ -94,7 +91,13 @@ class WeightedRegressionEnsemble(BaseRegressionEnsemble):
             return self.models[k].fit(X, Y)
 
         log.info("Fitting the WeightedRegressionEnsemble")
-        self.models = dispatcher(delayed(fit_model)(k) for k in range(len(self.models)))
+        self.models = resources.parallel_map(
+            fit_model,
+            [(k,) for k in range(len(self.models))],
+            n_jobs=-1,
+            name="ensemble",
+            max_nbytes=None,
+        )
 
         if self.explainers:
             return self
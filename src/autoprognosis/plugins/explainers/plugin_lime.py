@@ -1,13 +1,15 @@
 # stdlib
 import copy
-from typing import Any, List, Optional
+from typing import Any, List, Optional, Tuple
 
 # third party
 import numpy as np
 import pandas as pd
+from sklearn.metrics import pairwise_distances
 
 # autoprognosis absolute
 from autoprognosis.plugins.explainers.base import ExplainerPlugin
+from autoprognosis.utils.parallel import resources
 from autoprognosis.utils.pip import install
 
 for retry in range(2):
@@ -22,6 +24,96 @@ for retry in range(2):
         install(depends)
 
 
+# number of features in each explanation, the default of LimeTabularExplainer.explain_instance
+NUM_FEATURES = 10
+
+
+def _sample(explainer: Any, row: np.ndarray, num_samples: int) -> Tuple:
+    """The perturbations of a dense row, drawn from the RNG of the explainer like in `LimeTabularExplainer.explain_instance`.
+
+    Returns:
+        (data, inverse): the representation fitted by the surrogate, and the samples scored by the model. The first sample is the row.
+    """
+    num_cols = row.shape[0]
+    data = np.zeros((num_samples, num_cols))
+    categorical_features: Any = range(num_cols)
+    if explainer.discretizer is None:
+        data = explainer.random_state.normal(0, 1, num_samples * num_cols).reshape(
+            num_samples, num_cols
+        )
+        if explainer.sample_around_instance:
+            data = data * explainer.scaler.scale_ + row
+        else:
+            data = data * explainer.scaler.scale_ + explainer.scaler.mean_
+        categorical_features = explainer.categorical_features
+        first_row = row
+    else:
+        first_row = explainer.discretizer.discretize(row)
+
+    data[0] = row.copy()
+    inverse = data.copy()
+    for column in categorical_features:
+        inverse_column = explainer.random_state.choice(
+            explainer.feature_values[column],
+            size=num_samples,
+            replace=True,
+            p=explainer.feature_frequencies[column],
+        )
+        binary_column = (inverse_column == first_row[column]).astype(int)
+        binary_column[0] = 1
+        inverse_column[0] = data[0, column]
+        data[:, column] = binary_column
+        inverse[:, column] = inverse_column
+
+    if explainer.discretizer is not None:
+        inverse[1:] = explainer.discretizer.undiscretize(inverse[1:])
+    inverse[0] = row
+
+    return data, inverse
+
+
+def _feature_names(explainer: Any, row: np.ndarray) -> List[str]:
+    """The names of the features in the explanation of a row, e.g. the bins of the discretized features."""
+    names = list(explainer.feature_names)
+
+    for idx in explainer.categorical_features:
+        if explainer.discretizer is not None and idx in explainer.discretizer.lambdas:
+            continue
+        names[idx] = f"{names[idx]}={int(row[idx])}"
+
+    if explainer.discretizer is not None:
+        discretized = explainer.discretizer.discretize(row)
+        for idx in explainer.discretizer.names:
+            names[idx] = explainer.discretizer.names[idx][int(discretized[idx])]
+
+    return names
+
+
+def _fit_surrogates(
+    base: Any,
+    neighborhoods: List[Tuple],
+    label: int,
+    num_features: int,
+    feature_selection: str,
+) -> List[list]:
+    """Worker task: fits the local surrogates of a chunk of rows.
+
+    Returns:
+        The (feature index, weight) pairs of each row.
+    """
+    return [
+        base.explain_instance_with_data(
+            scaled_data,
+            yss,
+            distances,
+            label,
+            num_features,
+            feature_selection=feature_selection,
+        )[1]
+        for scaled_data, yss, distances in neighborhoods
+    ]
+
+
 class LimePlugin(ExplainerPlugin):
     """
     Interpretability plugin based on LIME.
@@ -35,6 +127,10 @@ class LimePlugin(ExplainerPlugin):
         n_epoch: int. training epochs
         time_to_event: dataframe. Used for risk estimation tasks.
         eval_times: list. Used for risk estimation tasks.
+        random_state: int. Seed of the perturbations.
+        num_samples: int. Number of perturbations for each explained row.
+        batch_size: int. Maximum number of perturbations scored in a single predict call.
+        n_jobs: int. Number of workers for the fitting of the local surrogates. -1 means all the available cores.
     """
 
     def __init__(
@@ -50,11 +146,17 @@ class LimePlugin(ExplainerPlugin):
         time_to_event: Optional[pd.DataFrame] = None,  # for survival analysis
         eval_times: Optional[List] = None,  # for survival analysis
         random_state: int = 0,
+        num_samples: int = 5000,
+        batch_size: int = 100000,
+        n_jobs: int = -1,
     ) -> None:
         if task_type not in ["classification", "risk_estimation"]:
             raise RuntimeError("invalid task type")
 
         self.task_type = task_type
+        self.num_samples = num_samples
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
         self.feature_names = list(
             feature_names if feature_names is not None else pd.DataFrame(X).columns
         )
@@ -85,24 +187,86 @@ class LimePlugin(ExplainerPlugin):
 
         if task_type == "classification":
             self.explainer = lime.lime_tabular.LimeTabularExplainer(
-                np.asarray(X), feature_names=self.feature_names
+                np.asarray(X),
+                feature_names=self.feature_names,
+                random_state=random_state,
             )
         else:
             self.explainer = lime.lime_tabular.LimeTabularExplainer(
-                np.asarray(X), feature_names=self.feature_names, mode="regression"
+                np.asarray(X),
+                feature_names=self.feature_names,
+                mode="regression",
+                random_state=random_state,
+            )
+
+    def _explain_batch(self, X: np.ndarray) -> List[list]:
+        """Explain a batch of rows: the perturbations of all the rows are scored at once, and the surrogates are fitted in parallel."""
+        explainer = self.explainer
+
+        samples = [_sample(explainer, row, self.num_samples) for row in X]
+        yss = self.predict_fn(np.concatenate([inverse for _, inverse in samples]))
+
+        if explainer.mode == "classification":
+            label = 1
+        else:
+            # the first output, like explain_instance
+            label = 0
+            if yss.ndim == 2:
+                yss = yss[:, 0]
+            yss = yss[:, np.newaxis]
+
+        neighborhoods = []
+        for idx, (data, _) in enumerate(samples):
+            scaled_data = (data - explainer.scaler.mean_) / explainer.scaler.scale_
+            distances = pairwise_distances(
+                scaled_data, scaled_data[0].reshape(1, -1), metric="euclidean"
+            ).ravel()
+            neighborhoods.append(
+                (
+                    scaled_data,
+                    yss[idx * self.num_samples : (idx + 1) * self.num_samples],
+                    distances,
+                )
             )
 
+        # one task per worker
+        workers, _ = resources.split(self.n_jobs, len(neighborhoods))
+        chunks = np.array_split(np.arange(len(neighborhoods)), workers)
+        results = resources.parallel_map(
+            _fit_surrogates,
+            [
+                (
+                    explainer.base,
+                    [neighborhoods[idx] for idx in chunk],
+                    label,
+                    NUM_FEATURES,
+                    explainer.feature_selection,
+                )
+                for chunk in chunks
+            ],
+            n_jobs=workers,
+            name="lime",
+        )
+        local_exps = [local_exp for result in results for local_exp in result]
+
+        importances = []
+        for row, local_exp in zip(X, local_exps):
+            names = _feature_names(explainer, row)
+            importances.append([(names[idx], float(val)) for idx, val in local_exp])
+
+        return importances
+
     def explain(self, X: pd.DataFrame) -> pd.DataFrame:
         X = np.asarray(X)
-        results = []
 
-        for v in X:
-            expl = self.explainer.explain_instance(
-                v,
-                self.predict_fn,  # labels=self.feature_names,# top_labels=self.feature_names
-            )
-            importance = expl.as_list(label=1)
+        rows_per_batch = max(1, self.batch_size // self.num_samples)
 
+        importances = []
+        for start in range(0, len(X), rows_per_batch):
+            importances.extend(self._explain_batch(X[start : start + rows_per_batch]))
+
+        results = []
+        for importance in importances:
             vals = [x[1] for x in importance]
             cols = [x[0] for x in importance]
             results.append(vals)
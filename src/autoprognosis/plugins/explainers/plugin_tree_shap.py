@@ -0,0 +1,366 @@
+# stdlib
+import copy
+from typing import Any, Callable, List, Optional
+
+# third party
+import numpy as np
+import pandas as pd
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+from autoprognosis.plugins.ensemble.classifiers import (
+    WeightedEnsemble,
+    WeightedEnsembleCV,
+)
+from autoprognosis.plugins.ensemble.risk_estimation import RiskEnsemble, RiskEnsembleCV
+from autoprognosis.plugins.explainers.base import ExplainerPlugin
+from autoprognosis.plugins.explainers.plugin_kernel_shap import (
+    background_summary,
+    kernel_shap_values,
+)
+from autoprognosis.plugins.pipeline.compiled import _fusable, _FusedSegment
+from autoprognosis.utils.pip import install
+
+for retry in range(2):
+    try:
+        # third party
+        import shap
+
+        break
+    except ImportError:
+        depends = ["shap"]
+        install(depends)
+
+
+def _model_input(pipeline: Any, X: pd.DataFrame) -> pd.DataFrame:
+    """The input of the predictor of a pipeline."""
+    for stage in pipeline.stages[:-1]:
+        X = stage.transform(X)
+
+    return pipeline.stages[-1]._transform_input(X)
+
+
+def _feature_index(pipeline: Any, columns: List) -> Optional[np.ndarray]:
+    """The input column of each feature of the predictor of a pipeline.
+
+    The SHAP values are invariant to the per-feature transforms(scaling, label encoding), and the dropped columns get null attributions.
+    Returns None if the preprocessing mixes the features(e.g. PCA), or cannot be composed.
+    """
+    stages = pipeline.stages[:-1]
+    labels = list(columns)
+    index = np.arange(len(labels))
+
+    if len(stages) > 0:
+        if not all(_fusable(stage, first=idx == 0) for idx, stage in enumerate(stages)):
+            return None
+
+        plan, labels, _ = _FusedSegment(stages).plan(labels)
+        if plan.weights is not None:
+            return None
+        index = plan.index
+
+    drop = set(pipeline.stages[-1]._drop_features or [])
+
+    return np.asarray(
+        [index[idx] for idx, label in enumerate(labels) if label not in drop],
+        dtype=int,
+    )
+
+
+class _TreeMember:
+    """Interventional TreeSHAP on the probability of the positive class, for a pipeline ending with a tree model."""
+
+    def __init__(
+        self,
+        pipeline: Any,
+        index: np.ndarray,
+        background: pd.DataFrame,
+        n_features: int,
+    ) -> None:
+        self.pipeline = pipeline
+        self.index = index
+        self.n_features = n_features
+
+        self.explainer = shap.TreeExplainer(
+            pipeline.stages[-1].model,
+            data=_model_input(pipeline, background),
+            feature_perturbation="interventional",
+            model_output="probability",
+        )
+
+    def attributions(self, X: pd.DataFrame) -> np.ndarray:
+        values = self.explainer.shap_values(_model_input(self.pipeline, X))
+        expected_value = np.atleast_1d(self.explainer.expected_value)
+
+        # one array for each class(sklearn), or the positive class only(boosting)
+        if isinstance(values, list):
+            values = values[1]
+        elif np.ndim(values) == 3:
+            values = values[..., 1]
+
+        result = np.zeros((len(X), self.n_features + 1, 1))
+        result[:, self.index, 0] = values
+        result[:, -1, 0] = expected_value[-1]
+
+        return result
+
+
+class _KernelMember:
+    """KernelSHAP on all the outputs of a model."""
+
+    def __init__(
+        self,
+        model_fn: Callable,
+        background: Any,
+        max_coalitions: Optional[int],
+        random_state: int,
+        batch_size: int,
+        n_jobs: int,
+    ) -> None:
+        self.explainer = shap.KernelExplainer(model_fn, background)
+        self.max_coalitions = max_coalitions
+        self.random_state = random_state
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+
+    def attributions(self, X: pd.DataFrame) -> np.ndarray:
+        # [n_outputs x n_samples x n_features]
+        values = kernel_shap_values(
+            self.explainer,
+            np.asarray(X),
+            max_coalitions=self.max_coalitions,
+            random_state=self.random_state,
+            batch_size=self.batch_size,
+            n_jobs=self.n_jobs,
+        )
+        values = np.transpose(values, (1, 2, 0))
+
+        expected_value = np.broadcast_to(
+            np.atleast_1d(self.explainer.expected_value),
+            (len(X), 1, values.shape[-1]),
+        )
+
+        return np.concatenate([values, expected_value], axis=1)
+
+
+class _WeightedMembers:
+    """Weighted sum of the attributions of the members: WeightedEnsemble, and the averages of the CV ensembles."""
+
+    def __init__(self, members: List, weights: List[float]) -> None:
+        self.members = members
+        self.weights = weights
+
+    def attributions(self, X: pd.DataFrame) -> np.ndarray:
+        return np.sum(
+            [
+                weight * member.attributions(X)
+                for member, weight in zip(self.members, self.weights)
+            ],
+            axis=0,
+        )
+
+
+class _RiskMembers:
+    """The horizon-wise combination of RiskEnsemble, applied to the attributions of the members at each evaluation horizon."""
+
+    def __init__(
+        self,
+        members: List,
+        weights: np.ndarray,
+        time_horizons: List,
+        eval_times: List,
+    ) -> None:
+        self.members = members
+        self.weights = weights
+        self.time_horizons = time_horizons
+        self.eval_times = eval_times
+
+    def attributions(self, X: pd.DataFrame) -> np.ndarray:
+        # [N x n_samples x (n_features + 1) x |eval_times|]
+        values = np.asarray([member.attributions(X) for member in self.members])
+        n_models, n_samples, n_features, n_times = values.shape
+
+        # RiskEnsemble.combine is linear in the predictions of the models
+        combined = RiskEnsemble.combine(
+            values.reshape(n_models, n_samples * n_features, n_times),
+            self.weights,
+            self.time_horizons,
+            self.eval_times,
+        )
+
+        return combined.reshape(n_samples, n_features, n_times)
+
+
+class TreeSHAPPlugin(ExplainerPlugin):
+    """
+    Interpretability plugin based on TreeSHAP.
+
+    The pipelines which end with a tree model(xgboost, lgbm, catboost, random_forest etc.) are explained with the native TreeSHAP routines,
+    through the preprocessing stages which transform each feature independently(scalers, feature selection, label encoding).
+    The attributions of the members of `WeightedEnsemble`, `WeightedEnsembleCV`, `RiskEnsemble` and `RiskEnsembleCV` are combined with the weights of the ensemble.
+    The other models, and the risk estimation pipelines, are explained with KernelSHAP.
+
+    The classifiers are explained on the probability of the positive class, and the risk estimators on the risk at the last evaluation time.
+
+    Args:
+        estimator: model. The model to explain.
+        X: dataframe. Training set
+        y: dataframe. Training labels
+        task_type: str. classification or risk_estimation
+        prefit: bool. If true, the estimator won't be trained.
+        n_epoch: int. training epochs
+        subsample: int. Number of background samples for KernelSHAP.
+        time_to_event: dataframe. Used for risk estimation tasks.
+        eval_times: list. Used for risk estimation tasks.
+        random_state: int. Seed of the background samples and of the KernelSHAP coalitions.
+        n_background: int. Number of background samples for TreeSHAP.
+        max_coalitions: int. Maximum number of coalitions evaluated for each row by KernelSHAP.
+        batch_size: int. Maximum number of synthetic samples scored in a single predict call by KernelSHAP.
+        n_jobs: int. Number of workers for KernelSHAP. -1 means all the available cores.
+    """
+
+    def __init__(
+        self,
+        estimator: Any,
+        X: pd.DataFrame,
+        y: pd.DataFrame,
+        task_type: str = "classification",
+        feature_names: Optional[List] = None,
+        subsample: int = 10,
+        prefit: bool = False,
+        n_epoch: int = 10000,
+        # risk estimation
+        time_to_event: Optional[pd.DataFrame] = None,  # for survival analysis
+        eval_times: Optional[List] = None,  # for survival analysis
+        random_state: int = 0,
+        n_background: int = 100,
+        max_coalitions: Optional[int] = None,
+        batch_size: int = 100000,
+        n_jobs: int = -1,
+    ) -> None:
+        if task_type not in ["classification", "risk_estimation"]:
+            raise RuntimeError("invalid task type")
+
+        self.task_type = task_type
+        self.feature_names = list(
+            feature_names if feature_names is not None else pd.DataFrame(X).columns
+        )
+        super().__init__(self.feature_names)
+
+        self.eval_times = eval_times
+        self.random_state = random_state
+        self.max_coalitions = max_coalitions
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+
+        X = pd.DataFrame(X, columns=self.feature_names)
+        self.X_background = shap.sample(X, n_background, random_state=random_state)
+        self.X_summary = background_summary(X, subsample)
+
+        model = copy.deepcopy(estimator)
+        if task_type == "classification":
+            if not prefit:
+                model.fit(X, y)
+        elif task_type == "risk_estimation":
+            if time_to_event is None or eval_times is None:
+                raise RuntimeError("Invalid input for risk estimation interpretability")
+
+            if not prefit:
+                model.fit(X, time_to_event, y)
+
+        self.explainer = self._member(model)
+
+    def _member(self, model: Any) -> Any:
+        if isinstance(model, WeightedEnsembleCV):
+            return _WeightedMembers(
+                [self._member(fold) for fold in model.models],
+                [1 / len(model.models)] * len(model.models),
+            )
+        if isinstance(model, WeightedEnsemble):
+            members = [
+                (self._member(member), weight)
+                for member, weight in zip(model.models, model.weights)
+                if weight != 0
+            ]
+            return _WeightedMembers(
+                [member for member, _ in members], [weight for _, weight in members]
+            )
+        if isinstance(model, RiskEnsembleCV):
+            return _WeightedMembers(
+                [self._member(fold) for fold in model.models],
+                [1 / len(model.models)] * len(model.models),
+            )
+        if isinstance(model, RiskEnsemble):
+            # the models without weight at any horizon do not contribute to the ensemble
+            active = np.flatnonzero(np.any(model.weights != 0, axis=0))
+            if len(active) == 0:
+                active = np.arange(len(model.models))
+
+            return _RiskMembers(
+                [self._member(model.models[idx]) for idx in active],
+                model.weights[:, active],
+                model.time_horizons,
+                self.eval_times,
+            )
+
+        if self.task_type == "classification" and hasattr(model, "stages"):
+            index = _feature_index(model, self.feature_names)
+            if index is not None:
+                try:
+                    member = _TreeMember(
+                        model, index, self.X_background, len(self.feature_names)
+                    )
+                    log.debug(f"[tree_shap] TreeSHAP for {model.name()}")
+                    return member
+                except BaseException as e:
+                    log.debug(f"[tree_shap] TreeSHAP failed for {model.name()}: {e}")
+
+        log.debug(f"[tree_shap] KernelSHAP for {model.name()}")
+
+        return _KernelMember(
+            self._model_fn(model),
+            self.X_summary,
+            max_coalitions=self.max_coalitions,
+            random_state=self.random_state,
+            batch_size=self.batch_size,
+            n_jobs=self.n_jobs,
+        )
+
+    def _model_fn(self, model: Any) -> Callable:
+        # the model functions are shipped to the workers: they don't reference the plugin
+        feature_names = self.feature_names
+        eval_times = self.eval_times
+
+        if self.task_type == "classification":
+
+            def model_fn(X: pd.DataFrame) -> np.ndarray:
+                X = pd.DataFrame(X, columns=feature_names)
+                return np.asarray(model.predict_proba(X))[:, 1:2]
+
+        else:
+
+            def model_fn(X: pd.DataFrame) -> np.ndarray:
+                X = pd.DataFrame(X, columns=feature_names)
+                return np.asarray(model.predict(X, eval_times), dtype=float)
+
+        return model_fn
+
+    def explain(self, X: pd.DataFrame) -> np.ndarray:
+        X = pd.DataFrame(X, columns=self.feature_names)
+
+        # [n_samples x (n_features + 1) x n_outputs], the last feature is the expected value
+        attributions = self.explainer.attributions(X)[..., -1]
+        self.expected_value = attributions[0, -1]
+
+        return attributions[:, :-1]
+
+    @staticmethod
+    def name() -> str:
+        return "tree_shap"
+
+    @staticmethod
+    def pretty_name() -> str:
+        return "Tree SHAP"
+
+
+plugin = TreeSHAPPlugin
@@ -1,5 +1,5 @@
 # stdlib
-from typing import Any, Dict, List, Tuple, Type
+from typing import Any, Dict, Iterator, List, Tuple, Type
 
 # third party
 from optuna.trial import Trial
@@ -9,8 +9,10 @@ import pandas as pd
 from autoprognosis.plugins import group
 
 # autoprognosis relative
+from .compiled import CompiledPipeline
 from .generators import (
     _generate_change_output,
+    _generate_compile,
     _generate_constructor,
     _generate_fit,
     _generate_get_args,
@@ -21,7 +23,9 @@ from .generators import (
     _generate_load_template,
     _generate_name_impl,
     _generate_predict,
+    _generate_predict_iter,
     _generate_predict_proba,
+    _generate_predict_proba_batches,
     _generate_sample_param_impl,
     _generate_save,
     _generate_save_template,
@@ -39,7 +43,10 @@ class PipelineMeta(type):
         dct["fit"] = _generate_fit()
         dct["predict"] = _generate_predict()
         dct["predict_proba"] = _generate_predict_proba()
+        dct["predict_iter"] = _generate_predict_iter()
+        dct["predict_proba_batches"] = _generate_predict_proba_batches()
         dct["score"] = _generate_score()
+        dct["compile"] = _generate_compile()
         dct["name"] = _generate_name_impl(plugins)
         dct["type"] = _generate_type_impl(plugins)
         dct["hyperparameter_space"] = _generate_hyperparameter_space_impl(plugins)
@@ -90,6 +97,15 @@ class PipelineMeta(type):
     def predict_proba(*args: Any, **kwargs: Any) -> pd.DataFrame:
         raise NotImplementedError("not implemented")
 
+    def predict_iter(*args: Any, **kwargs: Any) -> Iterator[pd.DataFrame]:
+        raise NotImplementedError("not implemented")
+
+    def predict_proba_batches(*args: Any, **kwargs: Any) -> Iterator[pd.DataFrame]:
+        raise NotImplementedError("not implemented")
+
+    def compile(*args: Any, **kwargs: Any) -> CompiledPipeline:
+        raise NotImplementedError("not implemented")
+
     def save_template(*args: Any, **kwargs: Any) -> bytes:
         raise NotImplementedError("not implemented")
 
@@ -0,0 +1,352 @@
+# stdlib
+from typing import Any, Dict, List, Optional, Tuple
+
+# third party
+import numpy as np
+import pandas as pd
+from scipy.special import expit, softmax
+from sklearn.decomposition import PCA
+from sklearn.feature_selection import VarianceThreshold
+from sklearn.linear_model import LogisticRegression
+from sklearn.preprocessing import MaxAbsScaler, MinMaxScaler, StandardScaler
+
+# the transformers which reduce to a column selection and an affine transform
+FUSED_TRANSFORMERS = (
+    StandardScaler,
+    MinMaxScaler,
+    MaxAbsScaler,
+    VarianceThreshold,
+    PCA,
+)
+
+
+class _LinearPlan:
+    """Fused column selection and affine transform of a segment of stages.
+
+    The plan computes X[:, index] * scale + offset, or X[:, index] @ weights + bias once a dense projection(PCA, linear model) is fused.
+    """
+
+    def __init__(self, n_features: int) -> None:
+        self.n_features = n_features
+        self.index = np.arange(n_features)
+        self.scale = np.ones(n_features)
+        self.offset = np.zeros(n_features)
+        self.weights: Optional[np.ndarray] = None
+        self.bias: Optional[np.ndarray] = None
+
+    def select(self, keep: np.ndarray) -> None:
+        keep = np.asarray(keep, dtype=int)
+        if self.weights is None:
+            self.index = self.index[keep]
+            self.scale = self.scale[keep]
+            self.offset = self.offset[keep]
+        else:
+            self.weights = self.weights[:, keep]
+            self.bias = self.bias[keep]
+
+    def affine(self, scale: np.ndarray, offset: np.ndarray) -> None:
+        if self.weights is None:
+            self.scale = self.scale * scale
+            self.offset = self.offset * scale + offset
+        else:
+            self.weights = self.weights * scale
+            self.bias = self.bias * scale + offset
+
+    def project(self, weights: np.ndarray, bias: np.ndarray) -> None:
+        if self.weights is None:
+            self.weights = self.scale.reshape(-1, 1) * weights
+            self.bias = self.offset @ weights + bias
+        else:
+            self.weights = self.weights @ weights
+            self.bias = self.bias @ weights + bias
+
+    def freeze(self) -> "_LinearPlan":
+        if self.weights is not None:
+            # the column selection is folded in the projection: the dropped columns get null weights
+            weights = np.zeros((self.n_features, self.weights.shape[1]))
+            weights[self.index] = self.weights
+            self.weights = weights
+            self.index = np.arange(self.n_features)
+
+        self._gather = not np.array_equal(self.index, np.arange(self.n_features))
+        self._identity = bool(np.all(self.scale == 1) and np.all(self.offset == 0))
+
+        return self
+
+    def __call__(self, X: np.ndarray) -> np.ndarray:
+        if self.weights is not None:
+            return X @ self.weights + self.bias
+
+        if self._gather:
+            X = np.take(X, self.index, axis=1)
+        if self._identity:
+            return X
+
+        return X * self.scale + self.offset
+
+
+def _is_nop(stage: Any) -> bool:
+    return stage.type() == "preprocessor" and stage.name() == "nop"
+
+
+def _fusable(stage: Any, first: bool) -> bool:
+    # the label encoders are applied on the input of the segment
+    if len(stage._backup_encoders or {}) > 0 and not first:
+        return False
+
+    if stage.type() == "prediction":
+        return type(getattr(stage, "model", None)) is LogisticRegression
+
+    if _is_nop(stage):
+        return True
+
+    model = getattr(stage, "model", None)
+    if isinstance(model, MinMaxScaler) and model.clip:
+        return False
+
+    return isinstance(model, FUSED_TRANSFORMERS)
+
+
+def _fuse(stage: Any, plan: _LinearPlan, labels: list) -> list:
+    """Add a stage to the plan. Returns the column labels of the output of the stage."""
+    # Plugin._transform_input
+    drop = set(stage._drop_features or [])
+    keep = [idx for idx, label in enumerate(labels) if label not in drop]
+    if len(keep) < len(labels):
+        plan.select(keep)
+        labels = [labels[idx] for idx in keep]
+
+    if _is_nop(stage):
+        return labels
+
+    model = stage.model
+    if isinstance(model, StandardScaler):
+        # mean_ is fitted even if the scaler does not center the data
+        scale = (
+            1 / model.scale_
+            if model.with_std and model.scale_ is not None
+            else np.ones(len(labels))
+        )
+        offset = (
+            -model.mean_ * scale
+            if model.with_mean and model.mean_ is not None
+            else np.zeros(len(labels))
+        )
+        plan.affine(scale, offset)
+    elif isinstance(model, MinMaxScaler):
+        plan.affine(model.scale_, model.min_)
+    elif isinstance(model, MaxAbsScaler):
+        plan.affine(1 / model.scale_, np.zeros(len(labels)))
+    elif isinstance(model, VarianceThreshold):
+        # the plugin keeps the labels of the selected columns
+        keep = np.flatnonzero(model.get_support())
+        plan.select(keep)
+        return [labels[idx] for idx in keep]
+    elif isinstance(model, PCA):
+        weights = model.components_.T
+        if model.whiten:
+            weights = weights / np.sqrt(model.explained_variance_)
+        plan.project(weights, -model.mean_ @ weights)
+    elif isinstance(model, LogisticRegression):
+        plan.project(model.coef_.T, model.intercept_)
+    else:
+        raise RuntimeError(f"stage {stage.name()} cannot be fused")
+
+    # the sklearn transformers return arrays
+    return list(
+        range(plan.weights.shape[1] if plan.weights is not None else len(labels))
+    )
+
+
+class _FusedSegment:
+    """Consecutive stages, evaluated as a single linear plan on NumPy arrays.
+
+    The plan depends on the column labels of the input of the segment: it is built once for each input schema.
+    """
+
+    def __init__(self, stages: List) -> None:
+        self.stages = stages
+        self._plans: Dict[tuple, Tuple[_LinearPlan, list, list]] = {}
+
+    def plan(self, labels: list) -> Tuple[_LinearPlan, list, list]:
+        key = tuple(labels)
+        if key not in self._plans:
+            encoders = self.stages[0]._backup_encoders or {}
+            encoded = [
+                (idx, encoders[label].classes_)
+                for idx, label in enumerate(labels)
+                if label in encoders
+            ]
+
+            plan = _LinearPlan(len(labels))
+            out_labels = list(labels)
+            for stage in self.stages:
+                out_labels = _fuse(stage, plan, out_labels)
+
+            self._plans[key] = (plan.freeze(), out_labels, encoded)
+
+        return self._plans[key]
+
+    def __call__(self, X: Any, labels: Optional[list]) -> Tuple[np.ndarray, list]:
+        if isinstance(X, pd.DataFrame):
+            labels = list(X.columns)
+            X = X.to_numpy()
+
+        plan, out_labels, encoded = self.plan(labels)
+
+        if len(encoded) > 0:
+            X = np.array(X, dtype=object)
+            for idx, classes in encoded:
+                X[:, idx] = _encode(X[:, idx], classes)
+
+        return plan(np.asarray(X, dtype=float)), out_labels
+
+
+def _encode(values: np.ndarray, classes: np.ndarray) -> np.ndarray:
+    # LabelEncoder.transform, for the sorted classes of the encoder
+    values = values.astype(classes.dtype)
+    codes = np.searchsorted(classes, values)
+    codes[codes >= len(classes)] = 0
+    if np.any(classes[codes] != values):
+        raise ValueError("y contains previously unseen labels")
+
+    return codes
+
+
+def _frame(X: Any, labels: Optional[list]) -> pd.DataFrame:
+    if isinstance(X, pd.DataFrame):
+        return X
+    return pd.DataFrame(X, columns=labels, copy=False)
+
+
+class CompiledPipeline:
+    """Inference plan of a fitted pipeline, for low-latency scoring.
+
+    The consecutive stages which reduce to column selections and affine transforms(scalers, variance threshold, PCA, nop) are fused in a single
+    NumPy transform, with the column indices and the label encoders resolved in advance. A logistic regression predictor is fused in the same transform.
+    The other stages run with their own `transform` and `predict_proba`, on DataFrames.
+
+    The compiled pipeline accepts a DataFrame with the training columns, a 2D array with the columns in the training order, or a single row.
+    The predictions are returned as NumPy arrays.
+
+    Args:
+        pipeline: PipelineMeta
+            The fitted pipeline.
+        columns: list
+            The columns of the training dataset of the pipeline.
+    """
+
+    def __init__(self, pipeline: Any, columns: List) -> None:
+        self.name = pipeline.name()
+        self.columns = list(columns)
+        self._columns_index = pd.Index(self.columns)
+
+        # list of (fused, stages) segments
+        segments: List[Tuple[bool, List]] = []
+        for stage in pipeline.stages:
+            if len(segments) > 0 and segments[-1][0] and _fusable(stage, first=False):
+                segments[-1][1].append(stage)
+            elif _fusable(stage, first=True):
+                segments.append((True, [stage]))
+            else:
+                segments.append((False, [stage]))
+
+        self.predictor = pipeline.stages[-1]
+        self._fused_predictor = segments[-1][0]
+        if not self._fused_predictor:
+            # the predictor runs on its own
+            segments = segments[:-1]
+
+        self.segments: List[Tuple[bool, Any]] = [
+            (fused, _FusedSegment(stages) if fused else stages)
+            for fused, stages in segments
+        ]
+
+        # the plan of the first segment is built in advance
+        if len(self.segments) > 0 and self.segments[0][0]:
+            self.segments[0][1].plan(self.columns)
+
+    def _input(self, X: Any) -> Any:
+        if isinstance(X, pd.DataFrame):
+            if not X.columns.equals(self._columns_index):
+                X = X[self.columns]
+            # the fused segments use the values, the other stages the original DataFrame
+            if len(self.segments) > 0 and self.segments[0][0]:
+                return X.to_numpy()
+            return X
+
+        X = np.asarray(X)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != len(self.columns):
+            raise ValueError(
+                f"Invalid input: expected {len(self.columns)} columns, got {X.shape[1]}"
+            )
+
+        return X
+
+    def _run(self, X: Any) -> Tuple[Any, Optional[list]]:
+        X = self._input(X)
+        labels: Optional[list] = self.columns
+
+        for fused, segment in self.segments:
+            if fused:
+                X, labels = segment(X, labels)
+                continue
+
+            X = _frame(X, labels)
+            for stage in segment:
+                X = stage.transform(X)
+            labels = None
+
+        return X, labels
+
+    def _decision(self, X: Any) -> np.ndarray:
+        decision, _ = self._run(X)
+        if decision.shape[1] == 1:
+            return decision.ravel()
+        return decision
+
+    def predict_proba(self, X: Any) -> np.ndarray:
+        if self._fused_predictor:
+            result = _logistic_proba(self.predictor.model, self._decision(X))
+        else:
+            X, labels = self._run(X)
+            result = np.asarray(self.predictor.predict_proba(_frame(X, labels)))
+
+        if np.isnan(result).any():
+            raise ValueError(
+                f"compiled pipeline ({self.name}) failed: nan in predict_proba output"
+            )
+
+        return result
+
+    def predict(self, X: Any, *args: Any, **kwargs: Any) -> np.ndarray:
+        if self._fused_predictor:
+            decision = self._decision(X)
+            if decision.ndim == 1:
+                indices = (decision > 0).astype(int)
+            else:
+                indices = decision.argmax(axis=1)
+            # the column of labels of the pipeline
+            return self.predictor.model.classes_[indices].reshape(-1, 1)
+
+        X, labels = self._run(X)
+        return np.asarray(self.predictor.predict(_frame(X, labels), *args, **kwargs))
+
+
+def _logistic_proba(model: LogisticRegression, decision: np.ndarray) -> np.ndarray:
+    # LogisticRegression.predict_proba, from the decision function
+    ovr = model.multi_class in ["ovr", "warn"] or (
+        model.multi_class == "auto"
+        and (model.classes_.size <= 2 or model.solver == "liblinear")
+    )
+    if ovr:
+        prob = expit(decision)
+        if prob.ndim == 1:
+            return np.vstack([1 - prob, prob]).T
+        return prob / prob.sum(axis=1).reshape(-1, 1)
+
+    if decision.ndim == 1:
+        decision = np.c_[-decision, decision]
+    return softmax(decision, axis=1)
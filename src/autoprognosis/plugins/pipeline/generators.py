@@ -1,5 +1,6 @@
 # stdlib
-from typing import Any, Callable, Dict, Tuple, Type
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 # third party
 import numpy as np
@@ -7,8 +8,13 @@ from optuna.trial import Trial
 import pandas as pd
 
 # autoprognosis absolute
+import autoprognosis.plugins.utils.cast as cast
 import autoprognosis.plugins.utils.decorators as decorators
 import autoprognosis.utils.serialization as serialization
+import autoprognosis.utils.streaming as streaming
+
+# autoprognosis relative
+from .compiled import CompiledPipeline
 
 
 def _generate_name_impl(plugins: Tuple[Type, ...]) -> Callable:
@@ -116,7 +122,11 @@ def _generate_get_args() -> Callable:
 
 def _generate_fit() -> Callable:
     def fit_impl(self: Any, X: pd.DataFrame, *args: Any, **kwargs: Any) -> Any:
-        local_X = X.copy()
+        # the input schema, for the compiled inference plan
+        self.input_columns = list(cast.to_dataframe(X).columns)
+
+        # the stages copy their input only if they modify it
+        local_X = X
         for stage in self.stages[:-1]:
             local_X = pd.DataFrame(local_X)
             local_X = stage.fit_transform(local_X)
@@ -133,7 +143,8 @@ def _generate_predict() -> Callable:
     def predict_impl(
         self: Any, X: pd.DataFrame, *args: Any, **kwargs: Any
     ) -> pd.DataFrame:
-        local_X = X.copy()
+        # the stages copy their input only if they modify it
+        local_X = X
         for stage in self.stages[:-1]:
             local_X = stage.transform(local_X)
 
@@ -149,7 +160,8 @@ def _generate_predict_proba() -> Callable:
     def predict_proba_impl(
         self: Any, X: pd.DataFrame, *args: Any, **kwargs: Any
     ) -> pd.DataFrame:
-        local_X = X.copy()
+        # the stages copy their input only if they modify it
+        local_X = X
         for stage in self.stages[:-1]:
             local_X = stage.transform(local_X, *args, **kwargs)
 
@@ -166,10 +178,64 @@ def _generate_predict_proba() -> Callable:
     return predict_proba_impl
 
 
+def _generate_predict_iter() -> Callable:
+    def predict_iter_impl(
+        self: Any,
+        source: Any,
+        *args: Any,
+        batch_size: int = streaming.DEFAULT_BATCH_SIZE,
+        output_path: Optional[Union[str, Path]] = None,
+        **kwargs: Any,
+    ) -> Union[Iterator[pd.DataFrame], int]:
+        # each chunk goes through all the stages before the next one is read
+        return streaming.stream(
+            lambda X: self.predict(X, *args, **kwargs),
+            source,
+            batch_size=batch_size,
+            output_path=output_path,
+        )
+
+    return predict_iter_impl
+
+
+def _generate_predict_proba_batches() -> Callable:
+    def predict_proba_batches_impl(
+        self: Any,
+        source: Any,
+        *args: Any,
+        batch_size: int = streaming.DEFAULT_BATCH_SIZE,
+        output_path: Optional[Union[str, Path]] = None,
+        **kwargs: Any,
+    ) -> Union[Iterator[pd.DataFrame], int]:
+        return streaming.stream(
+            lambda X: self.predict_proba(X, *args, **kwargs),
+            source,
+            batch_size=batch_size,
+            output_path=output_path,
+        )
+
+    return predict_proba_batches_impl
+
+
+def _generate_compile() -> Callable:
+    def compile_impl(self: Any, columns: Optional[List] = None) -> CompiledPipeline:
+        if columns is None:
+            columns = getattr(self, "input_columns", None)
+        if columns is None:
+            raise ValueError(
+                "The pipeline must be fitted before compilation, or the input columns provided"
+            )
+
+        return CompiledPipeline(self, columns)
+
+    return compile_impl
+
+
 def _generate_score() -> Callable:
     @decorators.benchmark
     def predict_score(self: Any, X: pd.DataFrame, y: pd.DataFrame) -> float:
-        local_X = X.copy()
+        # the stages copy their input only if they modify it
+        local_X = X
         for stage in self.stages[:-1]:
             local_X = stage.transform(local_X)
 
@@ -251,6 +317,9 @@ __all__ = [
     "_generate_fit",
     "_generate_predict",
     "_generate_predict_proba",
+    "_generate_predict_iter",
+    "_generate_predict_proba_batches",
+    "_generate_compile",
     "_generate_score",
     "_generate_get_args",
     "_generate_load_template",
@@ -4,24 +4,22 @@ from typing import Any
 # third party
 from sklearn.calibration import CalibratedClassifierCV
 
-# autoprognosis absolute
-from autoprognosis.utils.parallel import cpu_count
-
 calibrations = ["none", "sigmoid", "isotonic"]
 
 
 def calibrated_model(model: Any, calibration: int = 1, **kwargs: Any) -> Any:
+    # n_jobs is clamped to the CPU budget of the caller on fit(see limit_model_threads)
     if calibration >= len(calibrations):
         raise RuntimeError("invalid calibration value")
 
     if not hasattr(model, "predict_proba"):
-        return CalibratedClassifierCV(base_estimator=model, n_jobs=cpu_count())
+        return CalibratedClassifierCV(base_estimator=model, n_jobs=-1)
 
     if calibration != 0:
         return CalibratedClassifierCV(
             base_estimator=model,
             method=calibrations[calibration],
-            n_jobs=cpu_count(),
+            n_jobs=-1,
         )
 
     return model
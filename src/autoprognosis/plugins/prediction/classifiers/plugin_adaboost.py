@@ -67,6 +67,8 @@ class AdaBoostPlugin(base.ClassifierPlugin):
     ]
     calibrations = ["none", "sigmoid", "isotonic"]
 
+    fidelity_param = "n_estimators"
+
     def __init__(
         self,
         base_estimator: int = 0,
@@ -70,6 +70,8 @@ class BaggingPlugin(base.ClassifierPlugin):
         LogisticRegression(max_iter=10000),
     ]
 
+    fidelity_param = "n_estimators"
+
     def __init__(
         self,
         n_estimators: int = 10,
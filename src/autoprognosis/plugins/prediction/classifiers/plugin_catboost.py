@@ -45,6 +45,8 @@ class CatBoostPlugin(base.ClassifierPlugin):
 
     grow_policies = ["Depthwise", "SymmetricTree", "Lossguide"]
 
+    fidelity_param = "n_estimators"
+
     def __init__(
         self,
         n_estimators: int = 100,
@@ -37,6 +37,8 @@ class GradientBoostingPlugin(base.ClassifierPlugin):
         >>> plugin.fit_predict(X, y) # returns the probabilities for each class
     """
 
+    fidelity_param = "n_estimators"
+
     def __init__(
         self,
         n_estimators: int = 100,
@@ -45,6 +45,8 @@ class RandomForestPlugin(base.ClassifierPlugin):
     criterions = ["gini", "entropy"]
     features = ["auto", "sqrt", "log2"]
 
+    fidelity_param = "n_estimators"
+
     def __init__(
         self,
         n_estimators: int = 50,
@@ -38,6 +38,8 @@ class TabNetPlugin(base.ClassifierPlugin):
         >>> plugin.fit_predict(X, y) # returns the probabilities for each class
     """
 
+    fidelity_param = "max_epochs"
+
     def __init__(
         self,
         n_d: int = 64,
@@ -73,6 +73,8 @@ class XGBoostPlugin(base.ClassifierPlugin):
 
     booster = ["gbtree", "gblinear", "dart"]
 
+    fidelity_param = "n_estimators"
+
     def __init__(
         self,
         n_estimators: int = 100,
@@ -37,6 +37,8 @@ class CatBoostRegressorPlugin(base.RegressionPlugin):
 
     grow_policies = ["Depthwise", "SymmetricTree", "Lossguide"]
 
+    fidelity_param = "n_estimators"
+
     def __init__(
         self,
         depth: int = 5,
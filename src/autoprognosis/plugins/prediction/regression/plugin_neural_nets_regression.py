@@ -234,6 +234,8 @@ class NeuralNetsRegressionPlugin(base.RegressionPlugin):
         >>> plugin.fit_predict(X, y) # returns the probabilities for each class
     """
 
+    fidelity_param = "n_iter"
+
     def __init__(
         self,
         n_layers_hidden: int = 1,
@@ -42,6 +42,8 @@ class RandomForestRegressionPlugin(base.RegressionPlugin):
     criterions = ["mse", "mae"]
     features = ["auto", "sqrt", "log2"]
 
+    fidelity_param = "n_estimators"
+
     def __init__(
         self,
         n_estimators: int = 50,
@@ -38,6 +38,8 @@ class TabNetRegressorPlugin(base.RegressionPlugin):
         >>> plugin.fit_predict(X, y) # returns the probabilities for each class
     """
 
+    fidelity_param = "n_iter"
+
     def __init__(
         self,
         n_d: int = 64,
@@ -66,6 +66,8 @@ class XGBoostRegressorPlugin(base.RegressionPlugin):
         >>> plugin.fit_predict(X, y)
     """
 
+    fidelity_param = "n_estimators"
+
     def __init__(
         self,
         reg_lambda: Optional[float] = None,
@@ -86,8 +86,61 @@ SURV_MEN_W = 0.9144
 SURV_MEN_B = 0.8954
 
 
+# (gender, race) -> (coefficients, mean score, baseline survival)
+EQUATIONS = {
+    ("F", "W"): (BETA_WOMEN_W, -29.18, SURV_WOMEN_W),
+    ("F", "B"): (BETA_WOMEN_B, 86.61, SURV_WOMEN_B),
+    ("M", "W"): (BETA_MEN_W, 61.18, SURV_MEN_W),
+    ("M", "B"): (BETA_MEN_B, 19.54, SURV_MEN_B),
+}
+
+
 def _calc_frs(X: np.ndarray, beta: np.ndarray) -> np.ndarray:
-    return np.sum(X.dot(beta))
+    # the same summation order for a single patient and for a cohort, unlike the BLAS dot product
+    return np.sum(X * beta, axis=-1)
+
+
+def _women_features(
+    age: Any, tchol: Any, hdlc: Any, sbp: Any, smoking: Any, diab: Any, ht_treat: Any
+) -> np.ndarray:
+    return np.stack(
+        [
+            np.log(age),
+            np.square(np.log(age)),
+            np.log(tchol),
+            np.log(age) * np.log(tchol),
+            np.log(hdlc),
+            np.log(age) * np.log(hdlc),
+            np.log(sbp) * ht_treat,
+            np.log(age) * np.log(sbp) * ht_treat,
+            np.log(sbp) * (1 - ht_treat),
+            np.log(age) * np.log(sbp) * (1 - ht_treat),
+            smoking,
+            np.log(age) * smoking,
+            diab,
+        ],
+        axis=-1,
+    ).astype(float)
+
+
+def _men_features(
+    age: Any, tchol: Any, hdlc: Any, sbp: Any, smoking: Any, diab: Any, ht_treat: Any
+) -> np.ndarray:
+    return np.stack(
+        [
+            np.log(age),
+            np.log(tchol),
+            np.log(age) * np.log(tchol),
+            np.log(hdlc),
+            np.log(age) * np.log(hdlc),
+            np.log(sbp) * ht_treat,
+            np.log(sbp) * (1 - ht_treat),
+            smoking,
+            np.log(age) * smoking,
+            diab,
+        ],
+        axis=-1,
+    ).astype(float)
 
 
 def inference(
@@ -113,62 +166,67 @@ def inference(
     :param race:
     :return:
     """
-    if gender.upper() == "F":
-        X_women = np.array(
-            [
-                np.log(age),
-                np.square(np.log(age)),
-                np.log(tchol),
-                np.log(age) * np.log(tchol),
-                np.log(hdlc),
-                np.log(age) * np.log(hdlc),
-                np.log(sbp) * bool(ht_treat),
-                np.log(age) * np.log(sbp) * bool(ht_treat),
-                np.log(sbp) * (1 - bool(ht_treat)),
-                np.log(age) * np.log(sbp) * (1 - bool(ht_treat)),
-                bool(smoking),
-                np.log(age) * bool(smoking),
-                bool(diab),
-            ]
-        )
-        if race.upper() == "W":
-            ind_frs = _calc_frs(X_women, BETA_WOMEN_W)
-            mean_frs = -29.18
-            score = 1 - np.power(SURV_WOMEN_W, np.exp(ind_frs - mean_frs))
-        elif race.upper() == "B":
-            ind_frs = _calc_frs(X_women, BETA_WOMEN_B)
-            mean_frs = 86.61
-            score = 1 - np.power(SURV_WOMEN_B, np.exp(ind_frs - mean_frs))
-        else:
-            raise ValueError("Race must be specified as W or B")
-    elif gender.upper() == "M":
-
-        X_men = np.array(
-            [
-                np.log(age),
-                np.log(tchol),
-                np.log(age) * np.log(tchol),
-                np.log(hdlc),
-                np.log(age) * np.log(hdlc),
-                np.log(sbp) * bool(ht_treat),
-                np.log(sbp) * (1 - bool(ht_treat)),
-                bool(smoking),
-                np.log(age) * bool(smoking),
-                bool(diab),
-            ]
-        )
-        if race.upper() == "W":
-            ind_frs = _calc_frs(X_men, BETA_MEN_W)
-            mean_frs = 61.18
-            score = 1 - np.power(SURV_MEN_W, np.exp(ind_frs - mean_frs))
-        elif race.upper() == "B":
-            ind_frs = _calc_frs(X_men, BETA_MEN_B)
-            mean_frs = 19.54
-            score = 1 - np.power(SURV_MEN_B, np.exp(ind_frs - mean_frs))
-        else:
-            raise ValueError("Race must be specified as W or B")
-    else:
+    gender = gender.upper()
+    race = race.upper()
+    if gender not in ["F", "M"]:
+        raise ValueError("Gender must be specified as M or F")
+    if race not in ["W", "B"]:
+        raise ValueError("Race must be specified as W or B")
+
+    features = _women_features if gender == "F" else _men_features
+    X = features(age, tchol, hdlc, sbp, bool(smoking), bool(diab), bool(ht_treat))
+    beta, mean_frs, surv = EQUATIONS[(gender, race)]
+
+    ind_frs = _calc_frs(X, beta)
+    score = 1 - np.power(surv, np.exp(ind_frs - mean_frs))
+
+    return score
+
+
+def batch_inference(
+    gender: Any,
+    age: Any,
+    tchol: Any,
+    hdlc: Any,
+    sbp: Any,
+    smoking: Any,
+    diab: Any,
+    ht_treat: Any,
+    race: Any,
+) -> np.ndarray:
+    """Array-native `inference`, for whole cohorts.
+
+    The arguments are the arguments of `inference`, as columns. Each (gender, race) equation is evaluated once, on its rows,
+    with the same operations as the scalar version: the scores are identical.
+    """
+    gender = np.char.upper(np.asarray(gender, dtype=str))
+    race = np.char.upper(np.asarray(race, dtype=str))
+    if not np.isin(gender, ["F", "M"]).all():
         raise ValueError("Gender must be specified as M or F")
+    if not np.isin(race, ["W", "B"]).all():
+        raise ValueError("Race must be specified as W or B")
+
+    columns = [
+        np.asarray(age, dtype=float),
+        np.asarray(tchol, dtype=float),
+        np.asarray(hdlc, dtype=float),
+        np.asarray(sbp, dtype=float),
+        np.asarray(smoking).astype(bool),
+        np.asarray(diab).astype(bool),
+        np.asarray(ht_treat).astype(bool),
+    ]
+
+    score = np.zeros(len(gender))
+    for (key_gender, key_race), (beta, mean_frs, surv) in EQUATIONS.items():
+        rows = (gender == key_gender) & (race == key_race)
+        if not rows.any():
+            continue
+
+        features = _women_features if key_gender == "F" else _men_features
+        X = features(*[column[rows] for column in columns])
+
+        ind_frs = _calc_frs(X, beta)
+        score[rows] = 1 - np.power(surv, np.exp(ind_frs - mean_frs))
 
     return score
 
@@ -198,23 +256,16 @@ class AHAModel:
     def predict(
         self, df: pd.DataFrame, times: list = []
     ) -> pd.DataFrame:  # times is considered always ten years
-        def aha_inference(row: pd.DataFrame) -> pd.DataFrame:
-            tchol = mmolL_to_mgdl(row["tchol"])
-            hdlc = mmolL_to_mgdl(row["hdl"])
-
-            score = inference(
-                gender=row["sex"],
-                age=row["age"],
-                tchol=tchol,
-                hdlc=hdlc,
-                sbp=row["sbp"],
-                smoking=row["smoker"],
-                diab=row["diabetes"],
-                ht_treat=row["ht_treat"],
-                race=row["race"],
-            )
-            return score
-
-        scores = df.apply(lambda row: aha_inference(row), axis=1)
-
-        return pd.DataFrame(scores, columns=[10 * 365])
+        scores = batch_inference(
+            gender=df["sex"],
+            age=df["age"],
+            tchol=mmolL_to_mgdl(df["tchol"]),
+            hdlc=mmolL_to_mgdl(df["hdl"]),
+            sbp=df["sbp"],
+            smoking=df["smoker"],
+            diab=df["diabetes"],
+            ht_treat=df["ht_treat"],
+            race=df["race"],
+        )
+
+        return pd.DataFrame(scores, index=df.index, columns=[10 * 365])
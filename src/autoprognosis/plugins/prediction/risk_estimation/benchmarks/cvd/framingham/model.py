@@ -2,6 +2,7 @@
 from typing import Any
 
 # third party
+import numpy as np
 import pandas as pd
 
 # autoprognosis absolute
@@ -359,6 +360,150 @@ def inference(
     return percent_risk / 100.0
 
 
+# The points tables of `inference`, indexed by band. The last entry of each table is used for the values outside of the bands,
+# the gaps of the scalar conditions(for example a total cholesterol between 279 and 289 mg/dL).
+# age bands: <=34, 35-39, 40-44, 45-49, 50-54, 55-59, 60-64, 65-69, 70-74, >=75
+AGE_POINTS = {
+    "M": np.array([-9, -4, 0, 3, 6, 8, 10, 12, 14, 16, 0]),
+    "F": np.array([-7, -3, 0, 3, 6, 8, 10, 12, 14, 16, 0]),
+}
+# age groups: <=39, 40-49, 50-59, 60-69, >=70. total cholesterol bands: <160, 160-199, 200-239, 240-279, >289
+CHOLESTEROL_POINTS = {
+    "M": np.array(
+        [
+            [0, 4, 7, 9, 11, 0],
+            [0, 3, 5, 6, 8, 0],
+            [0, 2, 3, 4, 5, 0],
+            [0, 1, 1, 2, 3, 0],
+            [0, 0, 0, 1, 1, 0],
+            [0, 0, 0, 0, 0, 0],
+        ]
+    ),
+    "F": np.array(
+        [
+            [0, 4, 8, 11, 13, 0],
+            [0, 3, 6, 8, 10, 0],
+            [0, 2, 4, 5, 7, 0],
+            [0, 1, 2, 3, 4, 0],
+            [0, 1, 1, 2, 2, 0],
+            [0, 0, 0, 0, 0, 0],
+        ]
+    ),
+}
+# age groups, for the smokers
+SMOKER_POINTS = {
+    "M": np.array([8, 5, 3, 1, 1, 0]),
+    "F": np.array([9, 7, 4, 2, 1, 0]),
+}
+# hdl bands: >60, 50-59, 40-49, <40
+HDL_POINTS = np.array([-1, 0, 1, 2, 0])
+# untreated/treated x systolic blood pressure bands: <120, 120-129, 130-139, 140-159, >=160
+SBP_POINTS = {
+    "M": np.array([[0, 0, 1, 1, 2, 0], [0, 1, 1, 2, 3, 0]]),
+    "F": np.array([[0, 1, 2, 3, 4, 0], [0, 3, 4, 5, 6, 0]]),
+}
+# % risk, for the points clipped to [0, 17] for males, and to [9, 25] for females
+RISK_MIN_POINTS = {"M": 0, "F": 9}
+PERCENT_RISK = {
+    "M": np.array([0.1, 1, 1, 1, 1, 2, 2, 2, 2, 5, 6, 8, 10, 12, 16, 20, 25, 30]),
+    "F": np.array([0.1, 1, 1, 1, 2, 2, 3, 4, 5, 6, 8, 11, 14, 17, 22, 27, 30]),
+}
+
+
+def _band(conditions: list) -> np.ndarray:
+    """Index of the first true condition, or -1(the last entry of the tables) if none."""
+    return np.select(conditions, np.arange(len(conditions)), default=-1)
+
+
+def batch_inference(
+    sex: Any,
+    age: Any,
+    total_cholesterol: Any,  # mg/dL
+    hdl_cholesterol: Any,  # mg/dL
+    systolic_blood_pressure: Any,
+    smoker: Any,
+    blood_pressure_med_treatment: Any,
+) -> np.ndarray:
+    """Array-native `inference`, for whole cohorts.
+
+    The arguments are the arguments of `inference`, as columns. The points are looked up in the tables of the scalar conditions,
+    with the same bands and gaps: the scores are identical.
+    """
+    age = np.asarray(age, dtype=float)
+    total_cholesterol = np.asarray(total_cholesterol, dtype=float)
+    hdl_cholesterol = np.asarray(hdl_cholesterol, dtype=float)
+    systolic_blood_pressure = np.asarray(systolic_blood_pressure, dtype=float)
+    smoker = np.asarray(smoker).astype(bool)
+    treated = np.asarray(blood_pressure_med_treatment).astype(bool).astype(int)
+
+    male = np.char.lower(np.asarray(sex, dtype=str)) == "m"
+
+    age_band = _band(
+        [
+            age <= 34,
+            (35 <= age) & (age <= 39),
+            (40 <= age) & (age <= 44),
+            (45 <= age) & (age <= 49),
+            (50 <= age) & (age <= 54),
+            (55 <= age) & (age <= 59),
+            (60 <= age) & (age <= 64),
+            (65 <= age) & (age <= 69),
+            (70 <= age) & (age <= 74),
+            75 <= age,
+        ]
+    )
+    age_group = _band(
+        [
+            age <= 39,
+            (40 <= age) & (age <= 49),
+            (50 <= age) & (age <= 59),
+            (60 <= age) & (age <= 69),
+            70 <= age,
+        ]
+    )
+    cholesterol_band = _band(
+        [
+            total_cholesterol < 160,
+            (160 <= total_cholesterol) & (total_cholesterol <= 199),
+            (200 <= total_cholesterol) & (total_cholesterol <= 239),
+            (240 <= total_cholesterol) & (total_cholesterol <= 279),
+            total_cholesterol > 289,
+        ]
+    )
+    hdl_band = _band(
+        [
+            hdl_cholesterol > 60,
+            (50 <= hdl_cholesterol) & (hdl_cholesterol <= 59),
+            (40 <= hdl_cholesterol) & (hdl_cholesterol <= 49),
+            hdl_cholesterol < 40,
+        ]
+    )
+    sbp_band = _band(
+        [
+            systolic_blood_pressure < 120,
+            (120 <= systolic_blood_pressure) & (systolic_blood_pressure <= 129),
+            (130 <= systolic_blood_pressure) & (systolic_blood_pressure <= 139),
+            (140 <= systolic_blood_pressure) & (systolic_blood_pressure <= 159),
+            systolic_blood_pressure >= 160,
+        ]
+    )
+
+    percent_risk = np.zeros(len(age))
+    for key, rows in [("M", male), ("F", ~male)]:
+        points = (
+            AGE_POINTS[key][age_band[rows]]
+            + CHOLESTEROL_POINTS[key][age_group[rows], cholesterol_band[rows]]
+            + SMOKER_POINTS[key][age_group[rows]] * smoker[rows]
+            + HDL_POINTS[hdl_band[rows]]
+            + SBP_POINTS[key][treated[rows], sbp_band[rows]]
+        )
+        low = RISK_MIN_POINTS[key]
+        high = low + len(PERCENT_RISK[key]) - 1
+        percent_risk[rows] = PERCENT_RISK[key][np.clip(points, low, high) - low]
+
+    return percent_risk / 100.0
+
+
 def mmolL_to_mgdl(val: float) -> float:
     return val * 18.0182
 
@@ -384,21 +529,14 @@ class FraminghamModel:
     def predict(
         self, df: pd.DataFrame, times: list = []
     ) -> pd.DataFrame:  # times is considered always ten years
-        def fram_inference(row: pd.DataFrame) -> pd.DataFrame:
-            tchol = mmolL_to_mgdl(row["tchol"])
-            hdlc = mmolL_to_mgdl(row["hdl"])
-
-            score = inference(
-                sex=row["sex"],
-                age=row["age"],
-                total_cholesterol=tchol,
-                hdl_cholesterol=hdlc,
-                systolic_blood_pressure=row["sbp"],
-                smoker=row["smoker"],
-                blood_pressure_med_treatment=row["ht_treat"],
-            )
-            return score
-
-        scores = df.apply(lambda row: fram_inference(row), axis=1)
-
-        return pd.DataFrame(scores, columns=[10 * 365])
+        scores = batch_inference(
+            sex=df["sex"],
+            age=df["age"],
+            total_cholesterol=mmolL_to_mgdl(df["tchol"]),
+            hdl_cholesterol=mmolL_to_mgdl(df["hdl"]),
+            systolic_blood_pressure=df["sbp"],
+            smoker=df["smoker"],
+            blood_pressure_med_treatment=df["ht_treat"],
+        )
+
+        return pd.DataFrame(scores, index=df.index, columns=[10 * 365])
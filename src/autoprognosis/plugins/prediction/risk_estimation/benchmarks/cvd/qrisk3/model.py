@@ -96,12 +96,12 @@ def cvd_female_raw(
 
     dage = age
     dage = dage / 10
-    age_1 = pow(dage, -2)
+    age_1 = np.power(dage, -2)
     age_2 = dage
     dbmi = bmi
     dbmi = dbmi / 10
-    bmi_1 = pow(dbmi, -2)
-    bmi_2 = pow(dbmi, -2) * np.log(dbmi)
+    bmi_1 = np.power(dbmi, -2)
+    bmi_2 = np.power(dbmi, -2) * np.log(dbmi)
 
     # /* Centring the continuous variables */
 
@@ -119,8 +119,8 @@ def cvd_female_raw(
 
     # /* The conditional sums */
 
-    a += Iethrisk[ethrisk]
-    a += Ismoke[smoke_cat]
+    a += np.asarray(Iethrisk)[ethrisk]
+    a += np.asarray(Ismoke)[smoke_cat]
 
     # /* Sum from continuous values */
 
@@ -186,7 +186,7 @@ def cvd_female_raw(
     a += age_2 * town * -0.0315934146749623290000000
 
     # /* Calculate the score itself */
-    score = 100.0 * (1 - survivor[surv] ** np.exp(a))
+    score = 100.0 * (1 - np.power(survivor[surv], np.exp(a)))
     return score
 
 
@@ -279,12 +279,12 @@ def cvd_male_raw(
 
     dage = age
     dage = dage / 10
-    age_1 = pow(dage, -1)
-    age_2 = pow(dage, 3)
+    age_1 = np.power(dage, -1)
+    age_2 = np.power(dage, 3)
     dbmi = bmi
     dbmi = dbmi / 10
-    bmi_2 = pow(dbmi, -2) * np.log(dbmi)
-    bmi_1 = pow(dbmi, -2)
+    bmi_2 = np.power(dbmi, -2) * np.log(dbmi)
+    bmi_1 = np.power(dbmi, -2)
 
     # /* Centring the continuous variables */
 
@@ -302,8 +302,8 @@ def cvd_male_raw(
 
     # /* The conditional sums */
 
-    a += Iethrisk[ethrisk]
-    a += Ismoke[smoke_cat]
+    a += np.asarray(Iethrisk)[ethrisk]
+    a += np.asarray(Ismoke)[smoke_cat]
 
     # /* Sum from continuous values */
 
@@ -370,7 +370,7 @@ def cvd_male_raw(
     a += age_2 * town * -0.0000932996423232728880000
 
     # /* Calculate the score itself */
-    score = 100.0 * (1 - survivor[surv] ** np.exp(a))
+    score = 100.0 * (1 - np.power(survivor[surv], np.exp(a)))
     return score
 
 
@@ -453,6 +453,35 @@ def inference(
     return pct / 100.0
 
 
+def batch_inference(gender: Any, surv: int = 10, **columns: Any) -> np.ndarray:
+    """Array-native `inference`, for whole cohorts.
+
+    The arguments are the arguments of `inference`, as columns. The male and the female equations are evaluated once each, on their rows,
+    with the same operations as the scalar version: the scores are identical.
+    """
+    columns = {name: np.asarray(value, dtype=float) for name, value in columns.items()}
+    # the indices of the lookup tables
+    columns["ethrisk"] = columns["ethrisk"].astype(int)
+    columns["smoke_cat"] = columns["smoke_cat"].astype(int)
+
+    male = np.asarray(gender) == "M"
+
+    pct = np.zeros(len(male))
+    pct[male] = cvd_male_raw(
+        surv=surv, **{name: value[male] for name, value in columns.items()}
+    )
+    pct[~male] = cvd_female_raw(
+        surv=surv,
+        **{
+            name: value[~male]
+            for name, value in columns.items()
+            if name != "b_impotence2"
+        },
+    )
+
+    return pct / 100.0
+
+
 def mmolL_to_mgdl(val: float) -> float:
     return val * 18.0182
 
@@ -478,45 +507,6 @@ class QRisk3Model:
     def predict(
         self, df: pd.DataFrame, times: list = []
     ) -> Any:  # times is considered always ten years
-        def qrisk3_inference(row: pd.DataFrame) -> Any:
-            score = inference(
-                gender=row["sex"],  # M/F
-                age=row["age"],  # age value
-                b_AF=row["b_atrial_fibr"],  # bool, Atrial fibrillation
-                b_atypicalantipsy=row[
-                    "b_antipsychotic_use"
-                ],  # bool, On atypical antipsychotic medication
-                b_corticosteroids=row[
-                    "b_steroid_treat"
-                ],  # Are you on regular steroid tablets?
-                b_impotence2=row[
-                    "b_erectile_disf"
-                ],  # A diagnosis of or treatment for erectile disfunction?
-                b_migraine=row["b_had_migraine"],  # bool, Do you have migraines?
-                b_ra=row["b_rheumatoid_arthritis"],  # Rheumatoid arthritis?
-                b_renal=row["b_renal"],  # Chronic kidney disease (stage 3, 4 or 5)?
-                b_semi=row["b_mental_illness"],  # Severe mental illness?
-                b_sle=row["b_sle"],  # Systemic lupus erythematosus
-                b_treatedhyp=row["ht_treat"],  # On blood pressure treatment?
-                b_type1=row["b_diab_type1"],  # Diabetes status: type 1
-                b_type2=row["b_diab_type2"],  # Diabetes status: type 2
-                bmi=row["bmi"],  # Body mass index = kg/m^2
-                ethrisk=row["ethrisk"],  # ethnic risk
-                fh_cvd=row[
-                    "family_cvd"
-                ],  # Angina or heart attack in a 1st degree relative < 60?
-                rati=row["chol_ratio"],  # Cholesterol/HDL ratio
-                sbp=row["sbp"],  # Systolic blood pressure
-                sbps5=row[
-                    "sbps5"
-                ],  # Standard deviation of at least two most recent systolic blood pressure readings (mmHg)
-                smoke_cat=row[
-                    "smoker"
-                ],  # smoking category: non-smoker, ex-smoker, light-smoker(less than 10/), moderate smoker(10-      19), heavy smoker(20 or over)
-                town=row["town_depr_index"],  # Townsend deprivation score
-            )
-            return score
-
         expected_cols = [
             "sex",
             "age",
@@ -546,6 +536,41 @@ class QRisk3Model:
                 log.error(f"[QRisk3] missing {col}")
                 df[col] = 0
 
-        scores = df.apply(lambda row: qrisk3_inference(row), axis=1)
+        scores = batch_inference(
+            gender=df["sex"],  # M/F
+            age=df["age"],  # age value
+            b_AF=df["b_atrial_fibr"],  # bool, Atrial fibrillation
+            b_atypicalantipsy=df[
+                "b_antipsychotic_use"
+            ],  # bool, On atypical antipsychotic medication
+            b_corticosteroids=df[
+                "b_steroid_treat"
+            ],  # Are you on regular steroid tablets?
+            b_impotence2=df[
+                "b_erectile_disf"
+            ],  # A diagnosis of or treatment for erectile disfunction?
+            b_migraine=df["b_had_migraine"],  # bool, Do you have migraines?
+            b_ra=df["b_rheumatoid_arthritis"],  # Rheumatoid arthritis?
+            b_renal=df["b_renal"],  # Chronic kidney disease (stage 3, 4 or 5)?
+            b_semi=df["b_mental_illness"],  # Severe mental illness?
+            b_sle=df["b_sle"],  # Systemic lupus erythematosus
+            b_treatedhyp=df["ht_treat"],  # On blood pressure treatment?
+            b_type1=df["b_diab_type1"],  # Diabetes status: type 1
+            b_type2=df["b_diab_type2"],  # Diabetes status: type 2
+            bmi=df["bmi"],  # Body mass index = kg/m^2
+            ethrisk=df["ethrisk"],  # ethnic risk
+            fh_cvd=df[
+                "family_cvd"
+            ],  # Angina or heart attack in a 1st degree relative < 60?
+            rati=df["chol_ratio"],  # Cholesterol/HDL ratio
+            sbp=df["sbp"],  # Systolic blood pressure
+            sbps5=df[
+                "sbps5"
+            ],  # Standard deviation of at least two most recent systolic blood pressure readings (mmHg)
+            smoke_cat=df[
+                "smoker"
+            ],  # smoking category: non-smoker, ex-smoker, light-smoker(less than 10/), moderate smoker(10-      19), heavy smoker(20 or over)
+            town=df["town_depr_index"],  # Townsend deprivation score
+        )
 
-        return pd.DataFrame(scores, columns=[10 * 365])
+        return pd.DataFrame(scores, index=df.index, columns=[10 * 365])
@@ -2,6 +2,7 @@
 from typing import Any
 
 # third party
+import numpy as np
 import pandas as pd
 
 # autoprognosis absolute
@@ -51,6 +52,32 @@ def inference(
     return 0.01
 
 
+def batch_inference(
+    gender: Any,
+    age: Any,
+    fh_diab: Any,
+    b_treatedhyp: Any,
+    b_daily_exercise: Any,
+    bmi: Any,
+) -> np.ndarray:
+    """Array-native `inference`, for whole cohorts. The arguments are the arguments of `inference`, as columns."""
+    age = np.asarray(age, dtype=float)
+    bmi = np.asarray(bmi, dtype=float)
+
+    score = 1 * (np.asarray(gender) == "M")
+    score += np.select(
+        [(age >= 40) & (age < 50), (age >= 50) & (age < 60), age >= 60], [1, 2, 3], 0
+    )
+    score += 1 * np.asarray(fh_diab).astype(bool)
+    score += 1 * np.asarray(b_treatedhyp).astype(bool)
+    score += 1 * ~np.asarray(b_daily_exercise).astype(bool)
+    score += np.select(
+        [(bmi >= 25) & (bmi < 30), (bmi >= 30) & (bmi < 40), bmi >= 40], [1, 2, 3], 0
+    )
+
+    return np.where(score > 5, 0.2, 0.01)
+
+
 class ADAModel:
     def __init__(self) -> None:
         pass
@@ -72,25 +99,21 @@ class ADAModel:
     def predict(
         self, df: pd.DataFrame, times: list = []
     ) -> Any:  # times is considered always ten years
-        def qdiabetes_inference(row: pd.DataFrame) -> Any:
-            score = inference(
-                gender=row["sex"],  # M/F
-                age=row["age"],  # age value
-                fh_diab=row[
-                    "fh_diab"
-                ],  # Do immediate family (mother, father, brothers or sisters) have diabetes?
-                b_treatedhyp=row["ht_treat"],  # On blood pressure treatment?
-                b_daily_exercise=row["b_daily_exercise"],
-                bmi=row["bmi"],  # Body mass index = kg/m^2
-            )
-            return score
-
         expected_cols = ["sex", "age", "fh_diab", "ht_treat", "b_daily_exercise", "bmi"]
         for col in expected_cols:
             if col not in df.columns:
                 log.error(f"[ADA] missing {col}")
                 df[col] = 0
 
-        scores = df.apply(lambda row: qdiabetes_inference(row), axis=1)
-
-        return pd.DataFrame(scores, columns=[10 * 365])
+        scores = batch_inference(
+            gender=df["sex"],  # M/F
+            age=df["age"],  # age value
+            fh_diab=df[
+                "fh_diab"
+            ],  # Do immediate family (mother, father, brothers or sisters) have diabetes?
+            b_treatedhyp=df["ht_treat"],  # On blood pressure treatment?
+            b_daily_exercise=df["b_daily_exercise"],
+            bmi=df["bmi"],  # Body mass index = kg/m^2
+        )
+
+        return pd.DataFrame(scores, index=df.index, columns=[10 * 365])
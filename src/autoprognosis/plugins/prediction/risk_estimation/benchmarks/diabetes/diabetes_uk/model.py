@@ -2,6 +2,7 @@
 from typing import Any
 
 # third party
+import numpy as np
 import pandas as pd
 
 # autoprognosis absolute
@@ -62,6 +63,43 @@ def inference(
         return 1 / 3
 
 
+def batch_inference(
+    gender: Any,
+    age: Any,
+    ethrisk: Any,
+    fh_diab: Any,
+    waist: Any,
+    bmi: Any,
+    b_treatedhyp: Any,
+) -> np.ndarray:
+    """Array-native `inference`, for whole cohorts. The arguments are the arguments of `inference`, as columns."""
+    age = np.asarray(age, dtype=float)
+    waist = np.asarray(waist, dtype=float)
+    bmi = np.asarray(bmi, dtype=float)
+
+    score = np.select(
+        [(age >= 50) & (age <= 59), (age >= 60) & (age <= 69), age >= 70],
+        [5, 9, 13],
+        0,
+    )
+    score += 1 * (np.asarray(gender) == "M")
+    score += 6 * (np.asarray(ethrisk) != 0)
+    score += 5 * (np.asarray(fh_diab) > 0)
+    score += np.select(
+        [(waist >= 90) & (waist < 100), (waist >= 100) & (waist < 110), waist >= 110],
+        [4, 6, 9],
+        0,
+    )
+    score += np.select(
+        [(bmi >= 25) & (bmi < 30), (bmi >= 30) & (bmi < 35), bmi >= 35], [3, 5, 8], 0
+    )
+    score += 5 * np.asarray(b_treatedhyp).astype(bool)
+
+    return np.select(
+        [score <= 6, score <= 15, score <= 24], [1 / 20, 1 / 10, 1 / 7], 1 / 3
+    )
+
+
 class DiabetesUKModel:
     def __init__(self) -> None:
         pass
@@ -83,20 +121,16 @@ class DiabetesUKModel:
     def predict(
         self, df: pd.DataFrame, times: list = []
     ) -> Any:  # times is considered always ten years
-        def qdiabetes_inference(row: pd.DataFrame) -> Any:
-            score = inference(
-                gender=row["sex"],  # M/F
-                age=row["age"],  # age value
-                ethrisk=row["ethrisk"],  # ethnic risk
-                fh_diab=row[
-                    "fh_diab"
-                ],  # Do immediate family (mother, father, brothers or sisters) have diabetes?
-                waist=row["waist"],
-                bmi=row["bmi"],  # Body mass index = kg/m^2
-                b_treatedhyp=row["ht_treat"],  # On blood pressure treatment?
-            )
-            return score
-
-        scores = df.apply(lambda row: qdiabetes_inference(row), axis=1)
-
-        return pd.DataFrame(scores, columns=[10 * 365])
+        scores = batch_inference(
+            gender=df["sex"],  # M/F
+            age=df["age"],  # age value
+            ethrisk=df["ethrisk"],  # ethnic risk
+            fh_diab=df[
+                "fh_diab"
+            ],  # Do immediate family (mother, father, brothers or sisters) have diabetes?
+            waist=df["waist"],
+            bmi=df["bmi"],  # Body mass index = kg/m^2
+            b_treatedhyp=df["ht_treat"],  # On blood pressure treatment?
+        )
+
+        return pd.DataFrame(scores, index=df.index, columns=[10 * 365])
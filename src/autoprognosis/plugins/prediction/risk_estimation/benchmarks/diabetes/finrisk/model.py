@@ -2,6 +2,7 @@
 from typing import Any
 
 # third party
+import numpy as np
 import pandas as pd
 
 # autoprognosis absolute
@@ -73,6 +74,45 @@ def inference(
         return 1 / 2
 
 
+def batch_inference(
+    gender: Any,
+    age: Any,
+    bmi: Any,
+    waist: Any,
+    b_daily_exercise: Any,
+    b_daily_vegs: Any,
+    b_treatedhyp: Any,
+    b_ever_had_high_glucose: Any,
+    fh_diab: Any,
+) -> np.ndarray:
+    """Array-native `inference`, for whole cohorts. The arguments are the arguments of `inference`, as columns."""
+    age = np.asarray(age, dtype=float)
+    bmi = np.asarray(bmi, dtype=float)
+    waist = np.asarray(waist, dtype=float)
+    male = np.asarray(gender) == "M"
+
+    score = np.select(
+        [(age >= 45) & (age < 55), (age >= 55) & (age < 65), age >= 65], [2, 3, 4], 0
+    )
+    score += np.select([(bmi >= 25) & (bmi <= 30), bmi > 30], [1, 3], 0)
+    score += np.where(
+        male,
+        np.select([(waist >= 94) & (waist <= 102), waist > 102], [3, 4], 0),
+        np.select([(waist >= 80) & (waist <= 88), waist > 88], [3, 4], 0),
+    )
+    score += 2 * ~np.asarray(b_daily_exercise).astype(bool)
+    score += 1 * ~np.asarray(b_daily_vegs).astype(bool)
+    score += 2 * np.asarray(b_treatedhyp).astype(bool)
+    score += 5 * np.asarray(b_ever_had_high_glucose).astype(bool)
+    score += 5 * np.asarray(fh_diab).astype(bool)
+
+    return np.select(
+        [score < 7, score <= 11, score <= 14, score <= 20],
+        [1 / 100, 1 / 25, 1 / 6, 1 / 3],
+        1 / 2,
+    )
+
+
 class FINRISKModel:
     def __init__(self) -> None:
         pass
@@ -94,22 +134,6 @@ class FINRISKModel:
     def predict(
         self, df: pd.DataFrame, times: list = []
     ) -> Any:  # times is considered always ten years
-        def qdiabetes_inference(row: pd.DataFrame) -> Any:
-            score = inference(
-                gender=row["sex"],  # M/F
-                age=row["age"],  # age value
-                bmi=row["bmi"],  # Body mass index = kg/m^2
-                waist=row["waist"],
-                b_daily_exercise=row["b_daily_exercise"],
-                b_daily_vegs=row["b_daily_vegs"],
-                b_treatedhyp=row["ht_treat"],  # On blood pressure treatment?
-                b_ever_had_high_glucose=row["b_ever_had_high_glucose"],
-                fh_diab=row[
-                    "fh_diab"
-                ],  # Do immediate family (mother, father, brothers or sisters) have diabetes?
-            )
-            return score
-
         expected_cols = [
             "sex",
             "age",
@@ -126,6 +150,18 @@ class FINRISKModel:
                 log.error(f"[ADA] missing {col}")
                 df[col] = 0
 
-        scores = df.apply(lambda row: qdiabetes_inference(row), axis=1)
-
-        return pd.DataFrame(scores, columns=[10 * 365])
+        scores = batch_inference(
+            gender=df["sex"],  # M/F
+            age=df["age"],  # age value
+            bmi=df["bmi"],  # Body mass index = kg/m^2
+            waist=df["waist"],
+            b_daily_exercise=df["b_daily_exercise"],
+            b_daily_vegs=df["b_daily_vegs"],
+            b_treatedhyp=df["ht_treat"],  # On blood pressure treatment?
+            b_ever_had_high_glucose=df["b_ever_had_high_glucose"],
+            fh_diab=df[
+                "fh_diab"
+            ],  # Do immediate family (mother, father, brothers or sisters) have diabetes?
+        )
+
+        return pd.DataFrame(scores, index=df.index, columns=[10 * 365])
@@ -60,12 +60,12 @@ def type2_female_model_a(
 
     dage = age
     dage = dage / 10
-    age_2 = pow(dage, 3)
-    age_1 = pow(dage, 0.5)
+    age_2 = np.power(dage, 3)
+    age_1 = np.power(dage, 0.5)
     dbmi = bmi
     dbmi = dbmi / 10
     bmi_1 = dbmi
-    bmi_2 = pow(dbmi, 3)
+    bmi_2 = np.power(dbmi, 3)
 
     # /* Centring the continuous variables */
 
@@ -80,8 +80,8 @@ def type2_female_model_a(
 
     # /* The conditional sums */
 
-    a += Iethrisk[ethrisk]
-    a += Ismoke[smoke_cat]
+    a += np.asarray(Iethrisk)[ethrisk]
+    a += np.asarray(Ismoke)[smoke_cat]
 
     # /* Sum from continuous values */
 
@@ -120,7 +120,7 @@ def type2_female_model_a(
     a += age_2 * fh_diab * 0.0004161025828904768300000
 
     # /* Calculate the score itself */
-    score = 100.0 * (1 - pow(survivor[surv], np.exp(a)))
+    score = 100.0 * (1 - np.power(survivor[surv], np.exp(a)))
     return score
 
 
@@ -170,12 +170,12 @@ def type2_male_model_a(
 
     dage = age
     dage = dage / 10
-    age_2 = pow(dage, 3)
+    age_2 = np.power(dage, 3)
     age_1 = np.log(dage)
     dbmi = bmi
     dbmi = dbmi / 10
-    bmi_2 = pow(dbmi, 3)
-    bmi_1 = pow(dbmi, 2)
+    bmi_2 = np.power(dbmi, 3)
+    bmi_1 = np.power(dbmi, 2)
 
     # /* Centring the continuous variables */
 
@@ -190,8 +190,8 @@ def type2_male_model_a(
 
     # /* The conditional sums */
 
-    a += Iethrisk[ethrisk]
-    a += Ismoke[smoke_cat]
+    a += np.asarray(Iethrisk)[ethrisk]
+    a += np.asarray(Ismoke)[smoke_cat]
 
     # /* Sum from continuous values */
 
@@ -228,7 +228,7 @@ def type2_male_model_a(
     a += age_2 * fh_diab * 0.0004914185594087803400000
 
     # /* Calculate the score itself */
-    score = 100.0 * (1 - pow(survivor[surv], np.exp(a)))
+    score = 100.0 * (1 - np.power(survivor[surv], np.exp(a)))
     return score
 
 
@@ -284,16 +284,16 @@ def type2_female_model_b(
 
     dage = age
     dage = dage / 10
-    age_1 = pow(dage, 0.5)
-    age_2 = pow(dage, 3)
+    age_1 = np.power(dage, 0.5)
+    age_2 = np.power(dage, 3)
     dbmi = bmi
     dbmi = dbmi / 10
-    bmi_2 = pow(dbmi, 3)
+    bmi_2 = np.power(dbmi, 3)
     bmi_1 = dbmi
     dfbs = fbs
 
-    fbs_2 = pow(dfbs, -1) * np.log(dfbs)
-    fbs_1 = pow(dfbs, -1)
+    fbs_2 = np.power(dfbs, -1) * np.log(dfbs)
+    fbs_1 = np.power(dfbs, -1)
 
     # /* Centring the continuous variables */
 
@@ -310,8 +310,8 @@ def type2_female_model_b(
 
     # /* The conditional sums */
 
-    a += Iethrisk[ethrisk]
-    a += Ismoke[smoke_cat]
+    a += np.asarray(Iethrisk)[ethrisk]
+    a += np.asarray(Ismoke)[smoke_cat]
 
     # /* Sum from continuous values */
 
@@ -356,7 +356,7 @@ def type2_female_model_b(
     a += age_2 * fh_diab * 0.0004523639671202325400000
 
     # /* Calculate the score itself */
-    score = 100.0 * (1 - pow(survivor[surv], np.exp(a)))
+    score = 100.0 * (1 - np.power(survivor[surv], np.exp(a)))
     return score
 
 
@@ -408,14 +408,14 @@ def type2_male_model_b(
     dage = age
     dage = dage / 10
     age_1 = np.log(dage)
-    age_2 = pow(dage, 3)
+    age_2 = np.power(dage, 3)
     dbmi = bmi
     dbmi = dbmi / 10
-    bmi_1 = pow(dbmi, 2)
-    bmi_2 = pow(dbmi, 3)
+    bmi_1 = np.power(dbmi, 2)
+    bmi_2 = np.power(dbmi, 3)
     dfbs = fbs
-    fbs_1 = pow(dfbs, -0.5)
-    fbs_2 = pow(dfbs, -0.5) * np.log(dfbs)
+    fbs_1 = np.power(dfbs, -0.5)
+    fbs_2 = np.power(dfbs, -0.5) * np.log(dfbs)
 
     # /* Centring the continuous variables */
 
@@ -432,8 +432,8 @@ def type2_male_model_b(
 
     # /* The conditional sums */
 
-    a += Iethrisk[ethrisk]
-    a += Ismoke[smoke_cat]
+    a += np.asarray(Iethrisk)[ethrisk]
+    a += np.asarray(Ismoke)[smoke_cat]
 
     # /* Sum from continuous values */
 
@@ -476,7 +476,7 @@ def type2_male_model_b(
     a += age_2 * fh_diab * 0.0006257588248859499300000
 
     # /* Calculate the score itself */
-    score = 100.0 * (1 - pow(survivor[surv], np.exp(a)))
+    score = 100.0 * (1 - np.power(survivor[surv], np.exp(a)))
     return score
 
 
@@ -530,15 +530,15 @@ def type2_female_model_c(
 
     dage = age
     dage = dage / 10
-    age_1 = pow(dage, 0.5)
-    age_2 = pow(dage, 3)
+    age_1 = np.power(dage, 0.5)
+    age_2 = np.power(dage, 3)
     dbmi = bmi
     dbmi = dbmi / 10
-    bmi_2 = pow(dbmi, 3)
+    bmi_2 = np.power(dbmi, 3)
     bmi_1 = dbmi
     dhba1c = hba1c
     dhba1c = dhba1c / 10
-    hba1c_1 = pow(dhba1c, 0.5)
+    hba1c_1 = np.power(dhba1c, 0.5)
     hba1c_2 = dhba1c
 
     # /* Centring the continuous variables */
@@ -556,8 +556,8 @@ def type2_female_model_c(
 
     # /* The conditional sums */
 
-    a += Iethrisk[ethrisk]
-    a += Ismoke[smoke_cat]
+    a += np.asarray(Iethrisk)[ethrisk]
+    a += np.asarray(Ismoke)[smoke_cat]
 
     # /* Sum from continuous values */
 
@@ -602,7 +602,7 @@ def type2_female_model_c(
     a += age_2 * hba1c_2 * 0.0140548259061144530000000
 
     # /* Calculate the score itself */
-    score = 100.0 * (1 - pow(survivor[surv], np.exp(a)))
+    score = 100.0 * (1 - np.power(survivor[surv], np.exp(a)))
     return score
 
 
@@ -654,14 +654,14 @@ def type2_male_model_c(
     dage = age
     dage = dage / 10
     age_1 = np.log(dage + 1e-8)
-    age_2 = pow(dage, 3)
+    age_2 = np.power(dage, 3)
     dbmi = bmi
     dbmi = dbmi / 10
-    bmi_1 = pow(dbmi, 2)
-    bmi_2 = pow(dbmi, 3)
+    bmi_1 = np.power(dbmi, 2)
+    bmi_2 = np.power(dbmi, 3)
     dhba1c = hba1c
     dhba1c = dhba1c / 10
-    hba1c_1 = pow(dhba1c, 0.5)
+    hba1c_1 = np.power(dhba1c, 0.5)
     hba1c_2 = dhba1c
 
     # /* Centring the continuous variables */
@@ -679,8 +679,8 @@ def type2_male_model_c(
 
     # /* The conditional sums */
 
-    a += Iethrisk[ethrisk]
-    a += Ismoke[smoke_cat]
+    a += np.asarray(Iethrisk)[ethrisk]
+    a += np.asarray(Ismoke)[smoke_cat]
 
     # /* Sum from continuous values */
 
@@ -723,7 +723,7 @@ def type2_male_model_c(
     a += age_2 * hba1c_2 * 0.0155920894851499880000000
 
     # /* Calculate the score itself */
-    score = 100.0 * (1 - pow(survivor[surv], np.exp(a)))
+    score = 100.0 * (1 - np.power(survivor[surv], np.exp(a)))
     return score
 
 
@@ -869,6 +869,58 @@ def inference(
     return pct / 100.0
 
 
+# model -> (male equation, female equation, the biomarker of the model)
+EQUATIONS = {
+    "A": (type2_male_model_a, type2_female_model_a, None),
+    "B": (type2_male_model_b, type2_female_model_b, "fbs"),
+    "C": (type2_male_model_c, type2_female_model_c, "hba1c"),
+}
+
+# the arguments of the female equations only
+FEMALE_ONLY = ["b_gestdiab", "b_pos"]
+
+
+def batch_inference(
+    model: str, gender: Any, surv: int = 10, **columns: Any
+) -> np.ndarray:
+    """Array-native `inference`, for whole cohorts.
+
+    The arguments are the arguments of `inference`, as columns. The male and the female equations are evaluated once each, on their rows,
+    with the same operations as the scalar version: the scores are identical.
+    """
+    if model not in EQUATIONS:
+        raise ValueError(f"Invalid QDiabetes model {model}")
+    male_equation, female_equation, biomarker = EQUATIONS[model]
+
+    # the biomarkers of the other models
+    unused = [key for _, _, key in EQUATIONS.values() if key != biomarker]
+    columns = {
+        name: np.asarray(value, dtype=float)
+        for name, value in columns.items()
+        if name not in unused
+    }
+    # the indices of the lookup tables
+    columns["ethrisk"] = columns["ethrisk"].astype(int)
+    columns["smoke_cat"] = columns["smoke_cat"].astype(int)
+
+    male = np.asarray(gender) == "M"
+
+    pct = np.zeros(len(male))
+    pct[male] = male_equation(
+        surv=surv,
+        **{
+            name: value[male]
+            for name, value in columns.items()
+            if name not in FEMALE_ONLY
+        },
+    )
+    pct[~male] = female_equation(
+        surv=surv, **{name: value[~male] for name, value in columns.items()}
+    )
+
+    return pct / 100.0
+
+
 class QDiabetesModel:
     def __init__(self, model_type: str) -> None:
         self.model_type = model_type
@@ -890,42 +942,6 @@ class QDiabetesModel:
     def predict(
         self, df: pd.DataFrame, times: list = []
     ) -> Any:  # times is considered always ten years
-        def qdiabetes_inference(row: pd.DataFrame) -> Any:
-            score = inference(
-                model=self.model_type,
-                gender=row["sex"],  # M/F
-                age=row["age"],  # age value
-                b_atypicalantipsy=row[
-                    "b_antipsychotic_use"
-                ],  # bool, On atypical antipsychotic medication
-                b_corticosteroids=row[
-                    "b_steroid_treat"
-                ],  # Are you on regular steroid tablets?
-                b_cvd=row[
-                    "b_cvd"
-                ],  # Have you had a heart attack, angina, stroke or TIA?
-                b_gestdiab=row[
-                    "b_gestdiab"
-                ],  # Women: Do you have gestational diabetes ?
-                b_learning=row["b_learning"],  # Learning disabilities?
-                b_manicschiz=row["b_manicschiz"],  # Manic depression or schizophrenia?
-                b_pos=row["b_pos"],  # Do you have polycystic ovaries?
-                b_statin=row["b_statin"],  # Are you on statins?
-                b_treatedhyp=row["ht_treat"],  # On blood pressure treatment?
-                bmi=row["bmi"],  # Body mass index = kg/m^2
-                ethrisk=row["ethrisk"],  # ethnic risk
-                fbs=row["fbs"],  # fasting blood glucose
-                fh_diab=row[
-                    "fh_diab"
-                ],  # Do immediate family (mother, father, brothers or sisters) have diabetes?
-                hba1c=row["hba1c"],  # HBA1c (mmol/mol)
-                smoke_cat=row[
-                    "smoker"
-                ],  # smoking category: non-smoker, ex-smoker, light-smoker(less than 10/), moderate smoker(10-      19), heavy smoker(20 or over)
-                town=row["town_depr_index"],  # Townsend deprivation score
-            )
-            return score
-
         expected_cols = [
             "sex",
             "age",
@@ -950,6 +966,34 @@ class QDiabetesModel:
                 log.error(f"[QDiab] missing {col}")
                 df[col] = 0
 
-        scores = df.apply(lambda row: qdiabetes_inference(row), axis=1)
-
-        return pd.DataFrame(scores, columns=[10 * 365])
+        scores = batch_inference(
+            model=self.model_type,
+            gender=df["sex"],  # M/F
+            age=df["age"],  # age value
+            b_atypicalantipsy=df[
+                "b_antipsychotic_use"
+            ],  # bool, On atypical antipsychotic medication
+            b_corticosteroids=df[
+                "b_steroid_treat"
+            ],  # Are you on regular steroid tablets?
+            b_cvd=df["b_cvd"],  # Have you had a heart attack, angina, stroke or TIA?
+            b_gestdiab=df["b_gestdiab"],  # Women: Do you have gestational diabetes ?
+            b_learning=df["b_learning"],  # Learning disabilities?
+            b_manicschiz=df["b_manicschiz"],  # Manic depression or schizophrenia?
+            b_pos=df["b_pos"],  # Do you have polycystic ovaries?
+            b_statin=df["b_statin"],  # Are you on statins?
+            b_treatedhyp=df["ht_treat"],  # On blood pressure treatment?
+            bmi=df["bmi"],  # Body mass index = kg/m^2
+            ethrisk=df["ethrisk"],  # ethnic risk
+            fbs=df["fbs"],  # fasting blood glucose
+            fh_diab=df[
+                "fh_diab"
+            ],  # Do immediate family (mother, father, brothers or sisters) have diabetes?
+            hba1c=df["hba1c"],  # HBA1c (mmol/mol)
+            smoke_cat=df[
+                "smoker"
+            ],  # smoking category: non-smoker, ex-smoker, light-smoker(less than 10/), moderate smoker(10-      19), heavy smoker(20 or over)
+            town=df["town_depr_index"],  # Townsend deprivation score
+        )
+
+        return pd.DataFrame(scores, index=df.index, columns=[10 * 365])
@@ -49,8 +49,8 @@ class CoxPHPlugin(base.RiskEstimationPlugin):
         return self
 
     def _predict(self, X: pd.DataFrame, *args: Any, **kwargs: Any) -> pd.DataFrame:
-        X = pd.DataFrame(X)
-        X.columns = self.features
+        # set_axis returns a new frame: the input is shared with the caller
+        X = pd.DataFrame(X).set_axis(self.features, axis=1)
         return self.model.predict(X, *args, **kwargs)
 
     @staticmethod
@@ -30,6 +30,8 @@ DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
 
 
 class DeepHitRiskEstimationPlugin(base.RiskEstimationPlugin):
+    fidelity_param = "epochs"
+
     def __init__(
         self,
         model: Any = None,
@@ -9,6 +9,7 @@ from sklearn.model_selection import train_test_split
 # autoprognosis absolute
 import autoprognosis.plugins.core.params as params
 import autoprognosis.plugins.prediction.risk_estimation.base as base
+from autoprognosis.utils.parallel import resources
 from autoprognosis.utils.pip import install
 import autoprognosis.utils.serialization as serialization
 
@@ -27,6 +28,8 @@ for retry in range(2):
 class XGBoostRiskEstimationPlugin(base.RiskEstimationPlugin):
     booster = ["gbtree", "gblinear", "dart"]
 
+    fidelity_param = "n_estimators"
+
     def __init__(
         self,
         n_estimators: int = 100,
@@ -81,12 +84,10 @@ class XGBoostRiskEstimationPlugin(base.RiskEstimationPlugin):
             "tree_method": tree_method,
             "booster": XGBoostRiskEstimationPlugin.booster[booster],
             "random_state": random_state,
-            "n_jobs": -1,
         }
         lr_params = {
             "C": 1e-3,
             "max_iter": 10000,
-            "n_jobs": -1,
         }
         if strategy == "debiased_bce":
             base_model = XGBSEDebiasedBCE(xgboost_params, lr_params)
@@ -113,6 +114,12 @@ class XGBoostRiskEstimationPlugin(base.RiskEstimationPlugin):
 
         y = convert_to_structured(T, E)
 
+        # the threads are set on fit, from the CPU budget of the caller(folds, trials etc.)
+        n_jobs = resources.available()
+        self.model.xgb_params["n_jobs"] = n_jobs
+        if hasattr(self.model, "lr_params"):
+            self.model.lr_params["n_jobs"] = n_jobs
+
         (X_train, X_valid, y_train, y_valid) = train_test_split(
             X, y, test_size=0.2, random_state=42
         )
@@ -11,6 +11,7 @@ from sklearn.preprocessing import LabelEncoder
 import autoprognosis.logger as log
 from autoprognosis.plugins.imputers import Imputers
 from autoprognosis.plugins.preprocessors import Preprocessors
+from autoprognosis.utils.pandas import dataframe_hash  # noqa: F401
 
 CATEGORICAL_THRESHOLD = 10
 ONEHOT_ENCODE_THRESHOLD = 3
@@ -142,10 +143,6 @@ class EncodersCallbacks:
         return self.encoders[key]
 
 
-def dataframe_hash(df: pd.DataFrame) -> str:
-    return str(abs(pd.util.hash_pandas_object(df).sum()))
-
-
 def dataframe_remove_zeros(df: pd.DataFrame, column: str) -> pd.DataFrame:
     keep = df[column] > 0
     return df[keep]
@@ -18,6 +18,7 @@ from autoprognosis.hooks import Hooks
 import autoprognosis.logger as log
 from autoprognosis.studies._base import DefaultHooks, Study
 from autoprognosis.studies._preprocessing import dataframe_hash, dataframe_preprocess
+from autoprognosis.utils.cache import EvaluationCache
 from autoprognosis.utils.serialization import load_model_from_file, save_model_to_file
 from autoprognosis.utils.tester import evaluate_estimator
 
@@ -61,6 +62,8 @@ class ClassifierStudy(Study):
             The minimum metric score for a candidate.
         id: str.
             The id column in the dataset.
+        use_cache: bool.
+            If True, the cross-validation folds(scores and fitted models) are cached in the workspace and reused across study iterations and resumed studies.
     """
 
     def __init__(
@@ -80,6 +83,7 @@ class ClassifierStudy(Study):
         score_threshold: float = SCORE_THRESHOLD,
         group_id: Optional[str] = None,
         nan_placeholder: Any = None,
+        use_cache: bool = False,
     ) -> None:
         super().__init__()
 
@@ -118,6 +122,10 @@ class ClassifierStudy(Study):
         self.score_threshold = score_threshold
         self.group_ids = group_ids
 
+        self.cache: Optional[EvaluationCache] = None
+        if use_cache:
+            self.cache = EvaluationCache(self.output_folder / "cache")
+
         self.seeker = EnsembleSeeker(
             self.internal_name,
             num_iter=10,
@@ -128,6 +136,7 @@ class ClassifierStudy(Study):
             classifiers=classifiers,
             imputers=imputers,
             hooks=self.hooks,
+            cache=self.cache,
         )
 
     def _should_continue(self) -> None:
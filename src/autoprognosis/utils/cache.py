@@ -0,0 +1,226 @@
+# stdlib
+import hashlib
+import json
+import os
+from pathlib import Path
+import tempfile
+from typing import Any, Optional, Union
+
+# third party
+import numpy as np
+import pandas as pd
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+from autoprognosis.utils.pandas import dataframe_hash
+import autoprognosis.utils.serialization as serialization
+
+CACHE_SUFFIX = ".fold"
+DEFAULT_CACHE_SIZE = 2 * 1024 ** 3  # bytes
+
+
+def dataset_fingerprint(
+    X: pd.DataFrame,
+    Y: Union[pd.Series, np.ndarray],
+    group_ids: Optional[pd.Series] = None,
+) -> str:
+    """Content hash of an evaluation dataset: features, labels and optional groups."""
+    X = pd.DataFrame(X).reset_index(drop=True)
+    Y = pd.Series(np.asarray(Y).ravel())
+
+    parts = [
+        dataframe_hash(X),
+        dataframe_hash(Y),
+        str(X.shape),
+        json.dumps([str(col) for col in X.columns]),
+    ]
+    if group_ids is not None:
+        parts.append(dataframe_hash(pd.Series(group_ids).reset_index(drop=True)))
+
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()
+
+
+def estimator_fingerprint(estimator: Any) -> Optional[str]:
+    """Canonical representation of a pipeline template and its arguments.
+
+    Returns None for estimators which cannot be described by their arguments(e.g. ensembles).
+    """
+    if not hasattr(estimator, "plugin_types") or not hasattr(estimator, "get_args"):
+        return None
+
+    try:
+        return json.dumps(
+            {
+                "plugins": [plugin.fqdn() for plugin in estimator.plugin_types],
+                "args": estimator.get_args(),
+            },
+            sort_keys=True,
+            default=_json_default,
+        )
+    except BaseException as e:
+        log.debug(f"failed to fingerprint estimator {e}")
+        return None
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return str(obj)
+
+
+class EvaluationCache:
+    """Persistent, content-addressed cache for the cross-validation folds.
+
+    Each entry is keyed by the dataset fingerprint, the pipeline template and arguments, the fold seed and the fold index.
+    An entry stores the fold scores, by metric, and optionally the fitted fold model.
+    The least recently used entries are evicted once the cache exceeds `max_size` bytes.
+
+    Args:
+        path: Path
+            The folder where to store the cache entries.
+        max_size: int
+            Maximum size of the cache, in bytes.
+        store_models: bool
+            If True, the fitted fold models are cached as well, and can be reused by the ensemble search.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_size: int = DEFAULT_CACHE_SIZE,
+        store_models: bool = True,
+    ) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.store_models = store_models
+
+    def key(
+        self,
+        dataset: str,
+        estimator: str,
+        n_folds: int,
+        seed: int,
+        fold: int,
+    ) -> str:
+        raw = json.dumps(
+            {
+                "dataset": dataset,
+                "estimator": estimator,
+                "n_folds": n_folds,
+                "seed": seed,
+                "fold": fold,
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / f"{key}{CACHE_SUFFIX}"
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = serialization.load(f.read())
+            os.utime(path)  # mark the entry as recently used
+        except FileNotFoundError:
+            return None
+        except BaseException as e:
+            log.debug(f"evaluation cache: failed to load {key}: {e}")
+            return None
+
+        return entry
+
+    def get_score(self, key: str, metric: str) -> Optional[float]:
+        entry = self.get(key)
+        if entry is None:
+            return None
+
+        return entry["scores"].get(metric)
+
+    def get_model(self, key: str) -> Any:
+        entry = self.get(key)
+        if entry is None:
+            return None
+
+        return entry.get("model")
+
+    def put(
+        self,
+        key: str,
+        scores: Optional[dict] = None,
+        model: Any = None,
+    ) -> None:
+        entry = self.get(key)
+        if entry is None:
+            entry = {"scores": {}, "model": None}
+
+        if scores is not None:
+            entry["scores"].update(scores)
+        if model is not None and self.store_models:
+            entry["model"] = model
+
+        try:
+            buff = serialization.save(entry)
+        except BaseException as e:
+            log.debug(f"evaluation cache: failed to serialize {key}: {e}")
+            return
+
+        # write to a temporary file first, so that concurrent readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(buff)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException as e:
+            log.debug(f"evaluation cache: failed to store {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+
+        self.evict()
+
+    def size(self) -> int:
+        total = 0
+        for path in self.path.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                continue
+        return total
+
+    def evict(self) -> None:
+        """Remove the least recently used entries until the cache fits in `max_size`."""
+        entries = []
+        total = 0
+        for path in self.path.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        if total <= self.max_size:
+            return
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self) -> None:
+        for path in self.path.glob(f"*{CACHE_SUFFIX}"):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
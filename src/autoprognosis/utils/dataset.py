@@ -0,0 +1,170 @@
+# stdlib
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Any, List, Optional, Tuple, Union
+import weakref
+
+# third party
+import numpy as np
+import pandas as pd
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+from autoprognosis.utils.parallel import resources
+
+# smaller datasets are cheaper to pickle than to map
+MIN_SHARED_BYTES = 1024 * 1024
+
+
+def _shared_folder() -> Path:
+    # RAM-backed filesystem if available, like joblib
+    for candidate in ["/dev/shm", tempfile.gettempdir()]:
+        if os.path.isdir(candidate) and os.access(candidate, os.W_OK):
+            return Path(tempfile.mkdtemp(prefix="autoprognosis_", dir=candidate))
+
+    return Path(tempfile.mkdtemp(prefix="autoprognosis_"))
+
+
+def reset_index(X: Any) -> Any:
+    """reset_index(drop=True), without copying the data if the index is already a range index."""
+    if isinstance(X.index, pd.RangeIndex) and X.index.equals(pd.RangeIndex(len(X))):
+        return X
+    return X.reset_index(drop=True)
+
+
+class SharedDataset:
+    """Feature matrix stored once, and shared by the cross-validation folds and workers.
+
+    The numeric columns are stored as one read-only block per dtype. For large datasets, the blocks live in memory-mapped files, preferably in shared memory,
+    and the dataset is pickled as the paths of the files: the workers map the same pages instead of receiving a copy.
+    The folds get the rows they need with `rows`, which copies only the selected rows.
+
+    Args:
+        X: pd.DataFrame
+            The covariates.
+        shared: bool
+            Map the blocks to files. If False, the dataset is kept in memory, and pickled as a regular DataFrame.
+    """
+
+    def __init__(self, X: pd.DataFrame, shared: bool = True) -> None:
+        X = pd.DataFrame(X)
+
+        self.columns = X.columns
+        self.index = X.index
+        self.folder: Optional[Path] = None
+
+        # the non-numeric columns, and the pandas extension dtypes, are kept in a DataFrame
+        is_numeric = [
+            isinstance(dtype, np.dtype) and (dtype.kind in "biuf") for dtype in X.dtypes
+        ]
+        other = X.columns[[not val for val in is_numeric]]
+        self._other: Optional[pd.DataFrame] = X[other] if len(other) > 0 else None
+
+        numeric = X[X.columns[is_numeric]]
+        self._blocks: List[Tuple[pd.Index, np.ndarray]] = []
+        for dtype in numeric.dtypes.unique():
+            cols = numeric.columns[numeric.dtypes == dtype]
+            self._blocks.append((cols, numeric[cols].to_numpy()))
+
+        self._paths: List[Optional[str]] = [None] * len(self._blocks)
+
+        nbytes = sum(block.nbytes for _, block in self._blocks)
+        if shared and nbytes >= MIN_SHARED_BYTES:
+            self._share()
+
+    def _share(self) -> None:
+        self.folder = _shared_folder()
+        # only the owner removes the files. The workers which already mapped them keep their pages.
+        weakref.finalize(self, shutil.rmtree, str(self.folder), ignore_errors=True)
+
+        for idx, (cols, block) in enumerate(self._blocks):
+            path = str(self.folder / f"block_{idx}.npy")
+
+            mapped = np.lib.format.open_memmap(
+                path, mode="w+", dtype=block.dtype, shape=block.shape
+            )
+            mapped[:] = block
+            mapped.flush()
+            del mapped
+
+            self._blocks[idx] = (cols, np.load(path, mmap_mode="r"))
+            self._paths[idx] = path
+
+        log.debug(f"shared dataset {self.shape} in {self.folder}")
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (len(self.index), len(self.columns))
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def _assemble(self, parts: List[pd.DataFrame]) -> pd.DataFrame:
+        if len(parts) == 1:
+            return parts[0]
+
+        return pd.concat(parts, axis=1)[self.columns]
+
+    def frame(self) -> pd.DataFrame:
+        """The full dataset. The single-dtype datasets are returned as a read-only view, without copies."""
+        parts = [
+            pd.DataFrame(block, columns=cols, index=self.index, copy=False)
+            for cols, block in self._blocks
+        ]
+        if self._other is not None:
+            parts.append(self._other)
+
+        return self._assemble(parts)
+
+    def rows(self, index: np.ndarray) -> pd.DataFrame:
+        """Copy of the selected rows, by position. The copy is writable."""
+        row_index = self.index[index]
+
+        parts = [
+            pd.DataFrame(np.take(block, index, axis=0), columns=cols, index=row_index)
+            for cols, block in self._blocks
+        ]
+        if self._other is not None:
+            parts.append(self._other.iloc[index])
+
+        return self._assemble(parts)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        # the mapped blocks are sent as paths
+        state["_blocks"] = [
+            (cols, block if path is None else None)
+            for (cols, block), path in zip(self._blocks, self._paths)
+        ]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._blocks = [
+            (cols, block if path is None else np.load(path, mmap_mode="r"))
+            for (cols, block), path in zip(self._blocks, self._paths)
+        ]
+
+
+def take_rows(X: Any, index: np.ndarray) -> Any:
+    """Select rows by position from a DataFrame/Series or a SharedDataset."""
+    if isinstance(X, SharedDataset):
+        return X.rows(index)
+
+    return X.iloc[index]
+
+
+def share(
+    X: pd.DataFrame, n_jobs: int, n_tasks: int
+) -> Union[pd.DataFrame, SharedDataset]:
+    """The covariates for `n_tasks` tasks dispatched over `n_jobs` workers.
+
+    The dataset is shared only if the tasks run in more than one worker, the sequential tasks use it directly.
+    """
+    workers, _ = resources.split(n_jobs, n_tasks)
+    if workers == 1:
+        return X
+
+    return SharedDataset(X)
@@ -3,7 +3,6 @@ from typing import Tuple
 
 # third party
 import numpy as np
-import pandas as pd
 from sklearn.metrics import (
     auc,
     average_precision_score,
@@ -88,6 +87,17 @@ def evaluate_auc(
     return aucroc, aucprc
 
 
+def survival_structured(T: np.ndarray, Y: np.ndarray) -> np.ndarray:
+    """Structured (status, time) array, the survival target format of the C-index and Brier score kernels."""
+    T = np.asarray(T)
+    Y = np.asarray(Y)
+
+    out = np.empty(len(T), dtype=[("status", "bool"), ("time", "<f8")])
+    out["status"] = Y
+    out["time"] = T
+    return out
+
+
 def evaluate_skurv_c_index(
     T_train: np.ndarray,
     Y_train: np.ndarray,
@@ -97,23 +107,10 @@ def evaluate_skurv_c_index(
     Time: float,
 ) -> float:
     """Helper for evaluating the C-INDEX metric."""
-    T_train = pd.Series(T_train)
-    Y_train = pd.Series(Y_train)
-    T_test = pd.Series(T_test)
-    Y_test = pd.Series(Y_test)
     Prediction = np.asarray(Prediction).squeeze()
 
-    Y_train_structured = [
-        (Y_train.iloc[i], T_train.iloc[i]) for i in range(len(Y_train))
-    ]
-    Y_train_structured = np.array(
-        Y_train_structured, dtype=[("status", "bool"), ("time", "<f8")]
-    )
-
-    Y_test_structured = [(Y_test.iloc[i], T_test.iloc[i]) for i in range(len(Y_test))]
-    Y_test_structured = np.array(
-        Y_test_structured, dtype=[("status", "bool"), ("time", "<f8")]
-    )
+    Y_train_structured = survival_structured(T_train, Y_train)
+    Y_test_structured = survival_structured(T_test, Y_test)
 
     # concordance_index_ipcw expects risk scores
     return concordance_index_ipcw(
@@ -130,22 +127,8 @@ def evaluate_skurv_brier_score(
     Time: float,
 ) -> float:
     """Helper for evaluating the Brier score."""
-    T_train = pd.Series(T_train)
-    Y_train = pd.Series(Y_train)
-    T_test = pd.Series(T_test)
-    Y_test = pd.Series(Y_test)
-
-    Y_train_structured = [
-        (Y_train.iloc[i], T_train.iloc[i]) for i in range(len(Y_train))
-    ]
-    Y_train_structured = np.array(
-        Y_train_structured, dtype=[("status", "bool"), ("time", "<f8")]
-    )
-
-    Y_test_structured = [(Y_test.iloc[i], T_test.iloc[i]) for i in range(len(Y_test))]
-    Y_test_structured = np.array(
-        Y_test_structured, dtype=[("status", "bool"), ("time", "<f8")]
-    )
+    Y_train_structured = survival_structured(T_train, Y_train)
+    Y_test_structured = survival_structured(T_test, Y_test)
 
     # brier_score expects survival scores
     return brier_score(
@@ -0,0 +1,278 @@
+# stdlib
+from typing import Any, Dict, List, Optional, Union
+
+# third party
+import numpy as np
+import pandas as pd
+from pydantic import validate_arguments
+from sklearn.model_selection import (
+    StratifiedGroupKFold,
+    StratifiedKFold,
+    train_test_split,
+)
+from sklearn.preprocessing import LabelEncoder
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+from autoprognosis.plugins.ensemble.risk_estimation import RiskEnsemble
+from autoprognosis.utils.dataset import reset_index, take_rows
+from autoprognosis.utils.metrics import generate_score, print_score
+from autoprognosis.utils.tester import (
+    _survival_scores,
+    classifier_evaluator,
+    survival_supported_metrics,
+)
+
+EPS = 1e-8
+
+
+def _splitter(n_folds: int, seed: int, group_ids: Optional[pd.Series]) -> Any:
+    if group_ids is not None:
+        return StratifiedGroupKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+    return StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
+
+
+class ClassifierOOFPredictions:
+    """Out-of-fold predictions of the base models of a weighted ensemble.
+
+    The pretrained fold models predict their test fold once. A set of ensemble weights is then scored with a weighted sum of the cached predictions,
+    with the same folds and metric as `evaluate_estimator(..., pretrained=True)` on the equivalent `WeightedEnsemble` folds.
+
+    Args:
+        fold_models: list [n_folds x N]
+            The base models, pretrained on the train split of each fold.
+        X: DataFrame
+            The covariates
+        Y: Series
+            The labels
+        n_folds: int
+            cross-validation folds
+        metric: str
+            The metric to use: aucroc or aucprc
+        seed: int
+            Random seed
+        group_ids: pd.Series
+            The group_ids to use for stratified cross-validation
+    """
+
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def __init__(
+        self,
+        fold_models: List,
+        X: Union[pd.DataFrame, np.ndarray],
+        Y: Union[pd.Series, np.ndarray],
+        n_folds: int = 3,
+        metric: str = "aucroc",
+        seed: int = 0,
+        group_ids: Optional[pd.Series] = None,
+    ) -> None:
+        if len(fold_models) != n_folds:
+            raise ValueError("Invalid number of pretrained folds")
+
+        X = reset_index(pd.DataFrame(X))
+        Y = pd.Series(LabelEncoder().fit_transform(Y))
+        if group_ids is not None:
+            group_ids = pd.Series(group_ids).reset_index(drop=True)
+
+        self.metric = metric
+        self.evaluator = classifier_evaluator(metric)
+
+        # fold -> [N x n_test x n_classes]
+        self.predictions: List[np.ndarray] = []
+        self.labels: List[pd.Series] = []
+
+        splitter = _splitter(n_folds, seed, group_ids)
+        for fold, (_, test_index) in enumerate(splitter.split(X, Y, groups=group_ids)):
+            X_test = take_rows(X, test_index)
+
+            self.predictions.append(
+                np.asarray(
+                    [
+                        np.asarray(model.predict_proba(X_test), dtype=float)
+                        for model in fold_models[fold]
+                    ]
+                )
+            )
+            self.labels.append(take_rows(Y, test_index))
+
+        log.debug(
+            f"cached the out-of-fold predictions of {len(fold_models[0])} models on {n_folds} folds"
+        )
+
+    def evaluate(self, weights: Any) -> Dict:
+        """Score the ensemble with the given weights. The output has the format of `evaluate_estimator`."""
+        weights = np.asarray(weights, dtype=float)
+
+        metric_ = np.zeros(len(self.predictions))
+        for fold, (preds, labels) in enumerate(zip(self.predictions, self.labels)):
+            metric_[fold] = self.evaluator.score_proba(
+                labels, np.tensordot(weights, preds, axes=1)
+            )
+
+        output_clf = generate_score(metric_)
+
+        return {
+            "clf": {
+                self.metric: output_clf,
+            },
+            "str": {
+                self.metric: print_score(output_clf),
+            },
+        }
+
+
+class RiskOOFPredictions:
+    """Out-of-fold predictions of the base models of a risk ensemble, at a set of horizons.
+
+    The pretrained fold models predict their test fold once, at all the horizons. A set of ensemble weights is then scored from the cached predictions,
+    with the same folds and metrics as `evaluate_survival_estimator(..., pretrained=True)` on the equivalent `RiskEnsemble` folds.
+    The same cache serves the evaluations of any subset of the horizons.
+
+    Args:
+        fold_models: list [n_folds x N]
+            The base models, pretrained on the train split of each fold.
+        X: DataFrame
+            The covariates
+        T: Series
+            time to event
+        Y: Series
+            event or censored
+        time_horizons: list
+            Horizons where to evaluate the performance.
+        n_folds: int
+            Number of folds for cross validation
+        metrics: list
+            Available metrics: "c_index", "brier_score", "aucroc" etc.
+        seed: int
+            Random seed
+        risk_threshold: float
+            The risk threshold for the classification metrics.
+        group_ids:
+            Group labels for the samples used while splitting the dataset into train/test set.
+    """
+
+    @validate_arguments(config=dict(arbitrary_types_allowed=True))
+    def __init__(
+        self,
+        fold_models: List,
+        X: Union[pd.DataFrame, np.ndarray],
+        T: Union[pd.Series, np.ndarray],
+        Y: Union[pd.Series, np.ndarray],
+        time_horizons: Union[List[float], np.ndarray],
+        n_folds: int = 3,
+        metrics: List[str] = survival_supported_metrics,
+        seed: int = 0,
+        risk_threshold: float = 0.5,
+        group_ids: Optional[pd.Series] = None,
+    ) -> None:
+        if len(fold_models) != n_folds:
+            raise ValueError("Invalid number of pretrained folds")
+        for metric in metrics:
+            if metric not in survival_supported_metrics:
+                raise ValueError(f"Metric {metric} not supported")
+
+        X = reset_index(pd.DataFrame(X))
+        T = pd.Series(T).reset_index(drop=True)
+        Y = pd.Series(Y).reset_index(drop=True)
+        if group_ids is not None:
+            group_ids = pd.Series(group_ids).reset_index(drop=True)
+
+        self.time_horizons = list(time_horizons)
+        self.n_folds = n_folds
+        self.metrics = metrics
+        self.risk_threshold = risk_threshold
+
+        def _predict(models: List, X_test: pd.DataFrame, horizons: list) -> np.ndarray:
+            # N x n_test x |horizons|
+            return np.asarray(
+                [
+                    np.asarray(model.predict(X_test, horizons), dtype=float).reshape(
+                        len(X_test), len(horizons)
+                    )
+                    for model in models
+                ]
+            )
+
+        if n_folds == 1:
+            surv_folds = [train_test_split(np.arange(len(X)), random_state=seed)]
+        else:
+            splitter = _splitter(n_folds, seed, group_ids)
+            surv_folds = list(splitter.split(X, Y, groups=group_ids))
+
+        # the predictions are cached at all the horizons, and sliced for the horizons of each evaluation
+        self.surv_folds = []
+        for fold, (train_index, test_index) in enumerate(surv_folds):
+            self.surv_folds.append(
+                {
+                    "predictions": _predict(
+                        fold_models[fold],
+                        take_rows(X, test_index),
+                        self.time_horizons,
+                    ),
+                    "T_train": take_rows(T, train_index),
+                    "Y_train": take_rows(Y, train_index),
+                    "T_test": take_rows(T, test_index),
+                    "Y_test": take_rows(Y, test_index),
+                }
+            )
+
+        log.debug(
+            f"cached the out-of-fold predictions of {len(fold_models[0])} models on {n_folds} folds"
+        )
+
+    def evaluate(self, weights: Any, time_horizons: Optional[List] = None) -> Dict:
+        """Score the ensemble with the given weights(one row per horizon, or a single row for all). The output has the format of `evaluate_survival_estimator`.
+
+        Args:
+            weights: list
+                The ensemble weights.
+            time_horizons: list
+                Evaluate only a subset of the cached horizons, like `evaluate_survival_estimator` with these horizons. Defaults to all the horizons.
+        """
+        if time_horizons is None:
+            time_horizons = self.time_horizons
+        time_horizons = list(time_horizons)
+        for horizon in time_horizons:
+            if horizon not in self.time_horizons:
+                raise ValueError(f"Horizon {horizon} not cached")
+
+        weights = np.asarray(weights, dtype=float)
+        if weights.ndim == 1:
+            weights = np.tile(weights, (len(time_horizons), 1))
+        # the normalization of RiskEnsemble
+        weights = weights / np.sum(weights + EPS, axis=-1).reshape(-1, 1)
+
+        results = {}
+        for metric in self.metrics:
+            results[metric] = np.zeros(self.n_folds)
+
+        columns = [self.time_horizons.index(t) for t in time_horizons]
+        for fold, data in enumerate(self.surv_folds):
+            pred = RiskEnsemble.combine(
+                data["predictions"][:, :, columns],
+                weights,
+                time_horizons,
+                time_horizons,
+            )
+            fold_scores = _survival_scores(
+                pred,
+                data["T_train"],
+                data["Y_train"],
+                data["T_test"],
+                data["Y_test"],
+                time_horizons,
+                self.risk_threshold,
+            )
+            for metric in self.metrics:
+                results[metric][fold] = fold_scores[metric]
+
+        output: dict = {
+            "clf": {},
+            "str": {},
+        }
+
+        for metric in self.metrics:
+            output["clf"][metric] = generate_score(results[metric])
+            output["str"][metric] = print_score(output["clf"][metric])
+
+        return output
@@ -41,3 +41,7 @@ def read_csv_compressed(path: str) -> pd.DataFrame:
     df = pd.read_csv(path)
 
     return compress_df(df)
+
+
+def dataframe_hash(df: pd.DataFrame) -> str:
+    return str(abs(pd.util.hash_pandas_object(df).sum()))
@@ -1,10 +1,20 @@
 # stdlib
+from contextlib import contextmanager
 import multiprocessing
 import os
+import threading
+import time
+from typing import Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple
+
+# third party
+from joblib import Parallel, delayed, parallel_backend
 
 # autoprognosis absolute
 import autoprognosis.logger as log
 
+# model parameters which control the native threading of the plugins
+THREAD_PARAMS = ["n_jobs", "nthread", "thread_count", "num_threads"]
+
 
 def cpu_count() -> int:
     try:
@@ -14,3 +24,269 @@ def cpu_count() -> int:
         n_jobs = multiprocessing.cpu_count()
     log.info(f"Using {n_jobs} cores")
     return n_jobs
+
+
+class ResourceManager:
+    """Hierarchical CPU budget for the nested parallelism of the AutoML search.
+
+    The cores are handed out top-down: estimator search -> cross-validation folds -> model threads.
+    Each dispatcher splits the budget of its caller between its workers, and each worker runs inside a scope limited to its share.
+    The plugins consult the budget of the current scope for their internal threading(n_jobs, nthread etc.).
+
+    Args:
+        total: int
+            Total number of cores. Defaults to the N_JOBS environment variable, or to all the cores of the machine.
+    """
+
+    def __init__(self, total: Optional[int] = None) -> None:
+        self._total = total
+        self._local = threading.local()
+        self._usage: Dict[str, Dict[str, float]] = {}
+        self._usage_lock = threading.Lock()
+
+    def total(self) -> int:
+        if self._total is None:
+            self._total = max(1, cpu_count())
+        return self._total
+
+    def available(self) -> int:
+        """CPU budget of the current scope."""
+        stack = getattr(self._local, "budgets", [])
+        if len(stack) == 0:
+            return self.total()
+        return stack[-1]
+
+    def clamp(self, n_jobs: Optional[int]) -> int:
+        """Translate a requested number of threads(-1/None meaning all) to the current budget."""
+        budget = self.available()
+        if n_jobs is None or n_jobs <= 0:
+            return budget
+        return min(n_jobs, budget)
+
+    def split(self, n_jobs: int, n_tasks: int) -> Tuple[int, int]:
+        """Split the current budget between `n_jobs` workers(-1 means all).
+
+        Returns:
+            The number of workers and the CPU budget for each worker.
+        """
+        available = self.available()
+        if n_jobs < 0:
+            n_jobs = max(1, available + 1 + n_jobs)
+
+        workers = max(1, min(n_jobs, n_tasks, available))
+        return workers, max(1, available // workers)
+
+    @contextmanager
+    def scope(self, n_jobs: int, name: str = "default") -> Generator:
+        """Limit the CPU budget of the enclosed code.
+
+        The budget is local to the calling thread. The native thread pools(BLAS, OpenMP) are process-wide: they are only limited by the
+        outermost scope of the main thread, i.e. the top-level call, or the task of a remote worker. The scopes entered by concurrent threads
+        would otherwise restore each other's limits out of order.
+        """
+        budget = self.clamp(n_jobs)
+
+        if not hasattr(self._local, "budgets"):
+            self._local.budgets = []
+
+        limits = None
+        if (
+            len(self._local.budgets) == 0
+            and threading.current_thread() is threading.main_thread()
+        ):
+            limits = _threadpool_limits(budget)
+
+        self._local.budgets.append(budget)
+
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        try:
+            yield budget
+        finally:
+            self._local.budgets.pop()
+            if limits is not None:
+                limits.restore_original_limits()
+
+            self._record(
+                name,
+                wall=time.perf_counter() - start_wall,
+                cpu=time.process_time() - start_cpu,
+                budget=budget,
+            )
+
+    def bind(self, fn: Callable, n_jobs: int, name: str = "default") -> Callable:
+        """Wrap `fn` to run within a budget scope, in a remote worker. The wrapper returns the result and the worker usage."""
+
+        manager = self
+
+        def budgeted(*args: Any, **kwargs: Any) -> Tuple[Any, Dict]:
+            before = manager.usage()
+            with manager.scope(n_jobs, name=name):
+                result = fn(*args, **kwargs)
+
+            return result, _usage_delta(manager.usage(), before)
+
+        return budgeted
+
+    def parallel_map(
+        self,
+        fn: Callable,
+        tasks: Iterable[tuple],
+        n_jobs: int = -1,
+        name: str = "default",
+        should_stop: Optional[Callable[[], bool]] = None,
+        **kwargs: Any,
+    ) -> List:
+        """Run `fn` over the tasks, using up to `n_jobs` workers from the current budget.
+
+        The results are returned in the order of the tasks.
+
+        If `should_stop` is provided, the tasks run in batches of one task per worker, and `should_stop` is checked before each batch.
+        When it returns True, the remaining tasks are skipped, and only the results of the completed tasks are returned.
+        """
+        tasks = list(tasks)
+        workers, per_worker = self.split(n_jobs, len(tasks))
+
+        if should_stop is not None:
+            results: List = []
+            for start in range(0, len(tasks), workers):
+                if should_stop():
+                    log.info(
+                        f"[resources] {name}: stopped after {start}/{len(tasks)} tasks"
+                    )
+                    break
+                results.extend(
+                    self.parallel_map(
+                        fn,
+                        tasks[start : start + workers],
+                        n_jobs=n_jobs,
+                        name=name,
+                        **kwargs,
+                    )
+                )
+            return results
+
+        if workers == 1:
+            with self.scope(per_worker, name=name):
+                return [fn(*task) for task in tasks]
+
+        remote_fn = self.bind(fn, per_worker, name=name)
+        with parallel_backend("loky", inner_max_num_threads=per_worker):
+            outputs = Parallel(n_jobs=workers, **kwargs)(
+                delayed(remote_fn)(*task) for task in tasks
+            )
+
+        results = []
+        for result, usage in outputs:
+            results.append(result)
+            self._merge(usage)
+        return results
+
+    def _record(self, name: str, wall: float, cpu: float, budget: int) -> None:
+        self._merge(
+            {
+                name: {
+                    "calls": 1,
+                    "wall_time": wall,
+                    "cpu_time": cpu,
+                    "budget_time": wall * budget,
+                }
+            }
+        )
+        if wall > 0:
+            log.debug(
+                f"[resources] {name}: budget {budget} cores, utilization {cpu / (wall * budget):.2f}"
+            )
+
+    def _merge(self, usage: Dict[str, Dict[str, float]]) -> None:
+        with self._usage_lock:
+            for name, stats in usage.items():
+                if name not in self._usage:
+                    self._usage[name] = {
+                        "calls": 0,
+                        "wall_time": 0,
+                        "cpu_time": 0,
+                        "budget_time": 0,
+                    }
+                for key, val in stats.items():
+                    if key in self._usage[name]:
+                        self._usage[name][key] += val
+
+    def usage(self) -> Dict[str, Dict[str, float]]:
+        """Accumulated usage per scope name: calls, wall time, CPU time and the allocated core-seconds.
+
+        The utilization of a scope is cpu_time / budget_time.
+        """
+        with self._usage_lock:
+            return {name: dict(stats) for name, stats in self._usage.items()}
+
+    def utilization(self) -> Dict[str, float]:
+        result = {}
+        for name, stats in self.usage().items():
+            if stats["budget_time"] > 0:
+                result[name] = stats["cpu_time"] / stats["budget_time"]
+        return result
+
+    def reset_usage(self) -> None:
+        with self._usage_lock:
+            self._usage = {}
+
+    def __reduce__(self) -> tuple:
+        # the default manager is process-wide: remote workers use their own instance, which the plugins consult.
+        if self is resources:
+            return (_default_resources, ())
+        return (ResourceManager, (self._total,))
+
+
+def _default_resources() -> ResourceManager:
+    return resources
+
+
+def _usage_delta(after: Dict, before: Dict) -> Dict:
+    delta = {}
+    for name, stats in after.items():
+        prev = before.get(name, {})
+        delta[name] = {key: val - prev.get(key, 0) for key, val in stats.items()}
+    return delta
+
+
+def _threadpool_limits(n_threads: int) -> Any:
+    try:
+        # third party
+        from threadpoolctl import threadpool_limits
+
+        return threadpool_limits(limits=n_threads)
+    except BaseException as e:
+        log.debug(f"failed to limit the native thread pools {e}")
+        return None
+
+
+def limit_model_threads(model: Any) -> None:
+    """Cap the threading parameters of a model(and its nested estimators) to the current CPU budget.
+
+    The originally requested values are kept on the model, so that a model clamped in a small scope gets its threads back in a larger one.
+    """
+    if model is None or not hasattr(model, "get_params"):
+        return
+
+    try:
+        requested = getattr(model, "_requested_threads", None)
+        if requested is None:
+            requested = {}
+            for key, val in model.get_params(deep=True).items():
+                if key.split("__")[-1] not in THREAD_PARAMS:
+                    continue
+                if val is not None and not isinstance(val, int):
+                    continue
+                requested[key] = val
+            model._requested_threads = requested
+
+        if len(requested) > 0:
+            model.set_params(
+                **{key: resources.clamp(val) for key, val in requested.items()}
+            )
+    except BaseException as e:
+        log.debug(f"failed to limit the model threads {e}")
+
+
+resources = ResourceManager()
@@ -50,6 +50,30 @@ def generate_dataset_for_horizon(
     )
 
 
+def horizon_labels(
+    T: pd.Series, Y: pd.Series, horizon_days: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    The rows and the labels of `generate_dataset_for_horizon`, without copying the features.
+
+    Args:
+        T: pd.Series, days to event or censoring
+        Y: pd.Series, outcome or censoring
+        horizon_days: int, days to the expected horizon
+
+    Returns:
+        mask: the rows kept at that horizon: all but the samples censored before the horizon
+        labels: the outcome at that horizon, for the kept rows
+    """
+    T = np.asarray(T)
+    Y = np.asarray(Y)
+
+    mask = ~((Y == 0) & (T <= horizon_days))
+    labels = ((Y == 1) & (T <= horizon_days)).astype(int)
+
+    return mask, labels[mask]
+
+
 def survival_probability_calibration(
     name: str,
     y_pred: pd.DataFrame,
@@ -0,0 +1,283 @@
+# stdlib
+from abc import ABCMeta, abstractmethod
+import os
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+# third party
+import optuna
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+
+REDIS_HOST = os.getenv("REDIS_HOST", "127.0.0.1")
+
+storage_types = ["redis", "sqlite", "journal", "memory"]
+
+
+def default_storage_type() -> str:
+    """The storage selected by the AUTOPROGNOSIS_STORAGE environment variable. Defaults to a local SQLite database."""
+    storage_type = os.getenv("AUTOPROGNOSIS_STORAGE", "sqlite")
+    if storage_type not in storage_types:
+        raise ValueError(
+            f"Invalid storage type {storage_type}. Available: {storage_types}"
+        )
+    return storage_type
+
+
+def default_storage_path() -> Path:
+    """The folder for the local storages, from the AUTOPROGNOSIS_STORAGE_PATH environment variable.
+
+    Defaults to the user cache folder(XDG_CACHE_HOME, or ~/.cache), independently of the working directory.
+    """
+    path = os.getenv("AUTOPROGNOSIS_STORAGE_PATH")
+    if path is not None:
+        return Path(path).expanduser().resolve()
+
+    cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return (Path(cache_home) / "autoprognosis" / "studies").resolve()
+
+
+class StorageBackend(metaclass=ABCMeta):
+    """Base class for the study storages.
+
+    The connection is created lazily, on the first use, and shared by all the studies of the process.
+    """
+
+    def __init__(self) -> None:
+        self._storage: Optional[optuna.storages.BaseStorage] = None
+        self._lock = threading.RLock()
+
+    @staticmethod
+    @abstractmethod
+    def name() -> str:
+        ...
+
+    @staticmethod
+    def persistent() -> bool:
+        return True
+
+    @abstractmethod
+    def _connect(self) -> optuna.storages.BaseStorage:
+        ...
+
+    def optuna(self) -> optuna.storages.BaseStorage:
+        with self._lock:
+            if self._storage is None:
+                log.debug(f"connecting to the {self.name()} storage")
+                self._storage = self._connect()
+            return self._storage
+
+    def __getstate__(self) -> dict:
+        # the connections are not shared between processes
+        state = self.__dict__.copy()
+        state["_storage"] = None
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+
+class RedisBackend(StorageBackend):
+    """Redis storage, for the deployments where the studies are shared between nodes.
+
+    Args:
+        host: str
+            Redis host. Defaults to the REDIS_HOST environment variable.
+        port: str
+            Redis port.
+        max_connections: int
+            Size of the connection pool, shared by the Optuna storage and the client.
+    """
+
+    def __init__(
+        self,
+        host: str = REDIS_HOST,
+        port: str = "6379",
+        auth: bool = False,
+        max_connections: int = 32,
+    ):
+        super().__init__()
+
+        self.url = f"redis://{host}:{port}/"
+        self.max_connections = max_connections
+        self._client: Any = None
+
+    @staticmethod
+    def name() -> str:
+        return "redis"
+
+    def client(self) -> Any:
+        # third party
+        import redis
+
+        with self._lock:
+            if self._client is None:
+                pool = redis.ConnectionPool.from_url(
+                    self.url, max_connections=self.max_connections
+                )
+                self._client = redis.Redis(connection_pool=pool)
+            return self._client
+
+    def _connect(self) -> optuna.storages.BaseStorage:
+        storage = optuna.storages.RedisStorage(url=self.url)
+
+        # share the connection pool of the client, instead of a dedicated connection
+        if hasattr(storage, "_redis"):
+            storage._redis = self.client()
+
+        return storage
+
+    def __getstate__(self) -> dict:
+        state = super().__getstate__()
+        state["_client"] = None
+        return state
+
+
+class SQLiteBackend(StorageBackend):
+    """Local SQLite storage, for single-node deployments.
+
+    The database runs in WAL mode, which lets concurrent workers read while a trial is written, and with synchronous=NORMAL, which syncs
+    the disk at the WAL checkpoints instead of at every commit. The connections are pooled, instead of opened for each storage call.
+    Each trial update of Optuna is still a separate transaction.
+
+    Args:
+        path: Path
+            The folder of the database.
+        max_connections: int
+            Size of the connection pool of the process.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_connections: int = 8) -> None:
+        super().__init__()
+
+        self.path = Path(path) if path is not None else default_storage_path()
+        self.max_connections = max_connections
+
+    @staticmethod
+    def name() -> str:
+        return "sqlite"
+
+    def db_path(self) -> Path:
+        return self.path / "optuna.db"
+
+    def _connect(self) -> optuna.storages.BaseStorage:
+        # third party
+        from sqlalchemy import event
+        from sqlalchemy.pool import QueuePool
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # the journal mode is persistent, and must be set before the first transaction
+        with sqlite3.connect(self.db_path(), timeout=60) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+
+        storage = optuna.storages.RDBStorage(
+            url=f"sqlite:///{self.db_path()}",
+            engine_kwargs={
+                "connect_args": {"timeout": 60, "check_same_thread": False},
+                "poolclass": QueuePool,
+                "pool_size": self.max_connections,
+                "max_overflow": 0,
+                "pool_timeout": 60,
+            },
+        )
+
+        def _on_connect(dbapi_conn: Any, conn_record: Any) -> None:
+            dbapi_conn.execute("PRAGMA synchronous=NORMAL")
+
+        event.listen(storage.engine, "connect", _on_connect)
+
+        return storage
+
+
+class JournalBackend(StorageBackend):
+    """Optuna journal file storage on the local disk.
+
+    Requires optuna>=3.1. The older versions use the SQLite storage from the same folder.
+
+    Args:
+        path: Path
+            The folder of the journal file.
+    """
+
+    def __init__(self, path: Optional[Path] = None) -> None:
+        super().__init__()
+
+        self.path = Path(path) if path is not None else default_storage_path()
+
+    @staticmethod
+    def name() -> str:
+        return "journal"
+
+    def _connect(self) -> optuna.storages.BaseStorage:
+        if not hasattr(optuna.storages, "JournalStorage"):
+            log.warning(
+                f"optuna {optuna.__version__} does not support journal storages. Using SQLite"
+            )
+            return SQLiteBackend(self.path)._connect()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        return optuna.storages.JournalStorage(
+            optuna.storages.JournalFileStorage(str(self.path / "optuna.log"))
+        )
+
+
+class InMemoryBackend(StorageBackend):
+    """In-memory storage, shared by the studies of the current process. Nothing is persisted."""
+
+    @staticmethod
+    def name() -> str:
+        return "memory"
+
+    @staticmethod
+    def persistent() -> bool:
+        return False
+
+    def _connect(self) -> optuna.storages.BaseStorage:
+        return optuna.storages.InMemoryStorage()
+
+
+_backends: Dict[Tuple[str, Optional[str]], StorageBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(
+    storage_type: Optional[str] = None, path: Optional[Path] = None
+) -> StorageBackend:
+    """Return the storage backend for a storage type. The backends are created once per process, and connect lazily.
+
+    Args:
+        storage_type: str
+            redis/sqlite/journal/memory. Defaults to the AUTOPROGNOSIS_STORAGE environment variable.
+        path: Path
+            The folder for the local storages. Defaults to the AUTOPROGNOSIS_STORAGE_PATH environment variable.
+    """
+    if storage_type is None:
+        storage_type = default_storage_type()
+    if storage_type not in storage_types:
+        raise ValueError(
+            f"Invalid storage type {storage_type}. Available: {storage_types}"
+        )
+
+    if storage_type in ["sqlite", "journal"] and path is None:
+        path = default_storage_path()
+
+    key = (storage_type, str(path) if path is not None else None)
+    with _backends_lock:
+        if key not in _backends:
+            if storage_type == "redis":
+                _backends[key] = RedisBackend()
+            elif storage_type == "sqlite":
+                _backends[key] = SQLiteBackend(path)
+            elif storage_type == "journal":
+                _backends[key] = JournalBackend(path)
+            else:
+                _backends[key] = InMemoryBackend()
+
+        return _backends[key]
@@ -0,0 +1,148 @@
+# stdlib
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+
+# third party
+import numpy as np
+import pandas as pd
+
+# autoprognosis absolute
+import autoprognosis.logger as log
+from autoprognosis.utils.pip import install
+
+DEFAULT_BATCH_SIZE = 10000
+
+PARQUET_SUFFIXES = [".parquet", ".pq"]
+
+
+def _parquet() -> Any:
+    # optional dependency, only for the Parquet files
+    try:
+        # third party
+        import pyarrow.parquet
+    except ImportError:
+        depends = ["pyarrow"]
+        install(depends)
+
+        # third party
+        import pyarrow.parquet
+
+    return pyarrow
+
+
+def _slices(X: pd.DataFrame, batch_size: int) -> Iterator[pd.DataFrame]:
+    for start in range(0, len(X), batch_size):
+        yield X.iloc[start : start + batch_size]
+
+
+def _read_parquet(path: Path, batch_size: int, **kwargs: Any) -> Iterator[pd.DataFrame]:
+    pa = _parquet()
+
+    # the row groups are decoded one batch at a time. The batches are numbered like the rows of the file.
+    offset = 0
+    for batch in pa.parquet.ParquetFile(path).iter_batches(
+        batch_size=batch_size, **kwargs
+    ):
+        chunk = batch.to_pandas()
+        chunk.index = pd.RangeIndex(offset, offset + len(chunk))
+        offset += len(chunk)
+
+        yield chunk
+
+
+def iter_batches(
+    source: Any, batch_size: int = DEFAULT_BATCH_SIZE, **kwargs: Any
+) -> Iterator[pd.DataFrame]:
+    """Iterate over a dataset in chunks of rows, without loading it in memory.
+
+    Args:
+        source: str, Path, DataFrame, or iterable
+            A CSV or Parquet file, read lazily with `batch_size` rows per chunk, an in-memory dataset, split into views of `batch_size` rows,
+            or an iterable of chunks, like `pd.read_csv(..., chunksize=...)`, used as it is.
+        batch_size: int
+            Number of rows of each chunk, for the files and the in-memory datasets.
+        kwargs:
+            Forwarded to the file reader: `pd.read_csv` or `pyarrow.parquet.ParquetFile.iter_batches`.
+    """
+    if batch_size < 1:
+        raise ValueError(f"Invalid batch_size {batch_size}")
+
+    if isinstance(source, (str, Path)):
+        path = Path(source)
+        if path.suffix in PARQUET_SUFFIXES:
+            return _read_parquet(path, batch_size, **kwargs)
+        return iter(pd.read_csv(path, chunksize=batch_size, **kwargs))
+
+    if isinstance(source, (pd.DataFrame, np.ndarray)):
+        return _slices(pd.DataFrame(source), batch_size)
+
+    return (pd.DataFrame(chunk) for chunk in source)
+
+
+def predict_batches(
+    predict: Callable[[pd.DataFrame], Any], batches: Iterable[pd.DataFrame]
+) -> Iterator[pd.DataFrame]:
+    """Apply `predict` to each chunk, lazily. The predictions keep the index of their chunk."""
+    for chunk in batches:
+        result = pd.DataFrame(predict(chunk))
+        if len(result) == len(chunk):
+            result.index = chunk.index
+
+        yield result
+
+
+def write_parquet(batches: Iterable[pd.DataFrame], path: Union[str, Path]) -> int:
+    """Write the chunks to a Parquet file as they are produced, one row group per chunk. Returns the number of rows written.
+
+    The column names are stored as strings, and the index is not stored: the rows keep the order of the chunks.
+    """
+    pa = _parquet()
+
+    writer = None
+    n_rows = 0
+    try:
+        for chunk in batches:
+            chunk = chunk.rename(columns=str)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pa.parquet.ParquetWriter(str(path), table.schema)
+            else:
+                # the schema of the file is set by the first chunk
+                table = table.cast(writer.schema)
+            writer.write_table(table)
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+
+    log.debug(f"wrote {n_rows} predictions to {path}")
+
+    return n_rows
+
+
+def stream(
+    predict: Callable[[pd.DataFrame], Any],
+    source: Any,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    output_path: Optional[Union[str, Path]] = None,
+) -> Union[Iterator[pd.DataFrame], int]:
+    """Streaming inference: read `source` in chunks, and predict each chunk before reading the next one.
+
+    Args:
+        predict: Callable
+            The inference function, for a DataFrame.
+        source: str, Path, DataFrame, or iterable
+            The covariates. See `iter_batches`.
+        batch_size: int
+            Number of rows of each chunk, for the files and the in-memory datasets.
+        output_path: str or Path
+            If set, the predictions are written to this Parquet file as they are produced.
+
+    Returns:
+        The number of rows written if `output_path` is set, else a lazy iterator over the predictions of each chunk.
+    """
+    results = predict_batches(predict, iter_batches(source, batch_size))
+    if output_path is None:
+        return results
+
+    return write_parquet(results, output_path)
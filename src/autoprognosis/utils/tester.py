@@ -1,6 +1,6 @@
 # stdlib
 import copy
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 # third party
 import numpy as np
@@ -24,14 +24,21 @@ from sklearn.preprocessing import LabelEncoder
 
 # autoprognosis absolute
 import autoprognosis.logger as log
+from autoprognosis.utils.cache import (
+    EvaluationCache,
+    dataset_fingerprint,
+    estimator_fingerprint,
+)
+from autoprognosis.utils.dataset import SharedDataset, reset_index, share, take_rows
 from autoprognosis.utils.metrics import (
     evaluate_auc,
-    evaluate_skurv_brier_score,
-    evaluate_skurv_c_index,
     generate_score,
     print_score,
+    survival_structured,
 )
-from autoprognosis.utils.risk_estimation import generate_dataset_for_horizon
+from autoprognosis.utils.parallel import resources
+from autoprognosis.utils.risk_estimation import horizon_labels
+from autoprognosis.utils.third_party.metrics import SurvivalMetricsEvaluator
 
 survival_supported_metrics = [
     "c_index",
@@ -90,16 +97,108 @@ class classifier_evaluator:
         return evaluate_auc(y_test, y_pred_proba)[1]
 
 
+def _dispatch_folds(
+    fn: Callable,
+    tasks: List[tuple],
+    n_jobs: int = 1,
+    on_result: Optional[Callable[[int, Any], bool]] = None,
+) -> list:
+    """Run the cross-validation folds, optionally in parallel.
+
+    The results are returned in the order of the tasks. The folds share the CPU budget of the caller,
+    and each worker gets an equal share of the budget for the plugins' internal threading.
+
+    If `on_result` is provided, it is called with the position and the result of each task, and the remaining tasks are skipped when it returns True.
+    The tasks then run in batches of `n_jobs`, and only the results of the completed tasks are returned.
+    """
+    if on_result is None:
+        if n_jobs == 1 or len(tasks) < 2:
+            return [fn(*task) for task in tasks]
+
+        return resources.parallel_map(fn, tasks, n_jobs=n_jobs, name="folds")
+
+    workers, _ = resources.split(n_jobs, len(tasks))
+
+    results: list = []
+    for start in range(0, len(tasks), workers):
+        batch = tasks[start : start + workers]
+        results.extend(_dispatch_folds(fn, batch, n_jobs=n_jobs))
+
+        stop = False
+        for pos in range(start, len(results)):
+            stop = on_result(pos, results[pos]) or stop
+        if stop:
+            break
+
+    return results
+
+
+def _covariates(X: Union[pd.DataFrame, np.ndarray, SharedDataset]) -> pd.DataFrame:
+    if isinstance(X, SharedDataset):
+        X = X.frame()
+
+    return reset_index(pd.DataFrame(X))
+
+
+def _subsample_rows(
+    n_rows: int, fraction: float, seed: int, stratify: Optional[pd.Series] = None
+) -> Optional[np.ndarray]:
+    """Indices of a random subset of the rows, used by the low-fidelity evaluations. None for the full dataset."""
+    if fraction >= 1:
+        return None
+
+    rows = np.arange(n_rows)
+    try:
+        subset, _ = train_test_split(
+            rows, train_size=fraction, random_state=seed, stratify=stratify
+        )
+    except ValueError:
+        # too few samples for some strata
+        subset, _ = train_test_split(rows, train_size=fraction, random_state=seed)
+
+    return np.sort(subset)
+
+
+def _evaluate_classifier_fold(
+    estimator: Any,
+    fit: bool,
+    X: Union[pd.DataFrame, SharedDataset],
+    Y: pd.Series,
+    train_index: np.ndarray,
+    test_index: np.ndarray,
+    metric: str,
+    return_model: bool = False,
+) -> Tuple[float, Any]:
+    X_train = take_rows(X, train_index)
+    Y_train = take_rows(Y, train_index)
+    X_test = take_rows(X, test_index)
+    Y_test = take_rows(Y, test_index)
+
+    model = estimator
+    if fit:
+        model = copy.deepcopy(estimator)
+        model.fit(X_train, Y_train)
+
+    preds = model.predict_proba(X_test)
+    score = classifier_evaluator(metric).score_proba(Y_test, preds)
+
+    return score, model if return_model else None
+
+
 @validate_arguments(config=dict(arbitrary_types_allowed=True))
 def evaluate_estimator(
     estimator: Any,
-    X: Union[pd.DataFrame, np.ndarray],
+    X: Union[pd.DataFrame, np.ndarray, SharedDataset],
     Y: Union[pd.Series, np.ndarray],
     n_folds: int = 3,
     metric: str = "aucroc",
     seed: int = 0,
     pretrained: bool = False,
     group_ids: Optional[pd.Series] = None,
+    cache: Optional[EvaluationCache] = None,
+    n_jobs: int = 1,
+    subsample: float = 1,
+    fold_cbk: Optional[Callable[[int, float], bool]] = None,
     *args: Any,
     **kwargs: Any,
 ) -> Dict:
@@ -122,47 +221,119 @@ def evaluate_estimator(
             If the estimator was already trained or not.
         group_ids: pd.Series
             The group_ids to use for stratified cross-validation
+        cache: EvaluationCache
+            Optional fold cache. The fold scores(and models) of a pipeline are reused across evaluations on the same dataset.
+        n_jobs: int
+            Number of folds to evaluate in parallel. -1 uses all the cores.
+        subsample: float
+            Fraction of the rows to evaluate on. Used by the low-fidelity evaluations of the multi-fidelity searches.
+        fold_cbk: Callable
+            Optional callback, notified after each fold with the number of evaluated folds and their mean score.
+            If it returns True, the remaining folds are skipped, and the score is computed on the evaluated folds only.
 
     """
-    X = pd.DataFrame(X).reset_index(drop=True)
+    X = _covariates(X)
     Y = LabelEncoder().fit_transform(Y)
     Y = pd.Series(Y).reset_index(drop=True)
     if group_ids is not None:
         group_ids = pd.Series(group_ids).reset_index(drop=True)
 
+    rows = _subsample_rows(len(X), subsample, seed, stratify=Y)
+    if rows is not None:
+        X = X.iloc[rows].reset_index(drop=True)
+        Y = Y.iloc[rows].reset_index(drop=True)
+        if group_ids is not None:
+            group_ids = group_ids.iloc[rows].reset_index(drop=True)
+
     log.debug(f"evaluate_estimator shape x:{X.shape} y:{Y.shape}")
 
     metric_ = np.zeros(n_folds)
+    evaluated = np.zeros(n_folds, dtype=bool)
 
-    indx = 0
     if group_ids is not None:
         skf = StratifiedGroupKFold(n_splits=n_folds, shuffle=True, random_state=seed)
     else:
         skf = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
 
-    ev = classifier_evaluator(metric)
-
-    # group_ids is always ignored for StratifiedKFold so safe to pass None
-    for train_index, test_index in skf.split(X, Y, groups=group_ids):
+    dataset_key: Optional[str] = None
+    estimator_key: Optional[str] = None
+    if cache is not None and not pretrained:
+        estimator_key = estimator_fingerprint(estimator)
+        if estimator_key is not None:
+            dataset_key = dataset_fingerprint(X, Y, group_ids)
 
-        X_train = X.loc[X.index[train_index]]
-        Y_train = Y.loc[Y.index[train_index]]
-        X_test = X.loc[X.index[test_index]]
-        Y_test = Y.loc[Y.index[test_index]]
+    # the parallel folds share a single copy of the dataset
+    data = share(X, n_jobs, n_folds)
 
+    pending = []
+    tasks = []
+    # group_ids is always ignored for StratifiedKFold so safe to pass None
+    for indx, (train_index, test_index) in enumerate(skf.split(X, Y, groups=group_ids)):
+        fold_key: Optional[str] = None
+        if cache is not None and dataset_key is not None and estimator_key is not None:
+            fold_key = cache.key(dataset_key, estimator_key, n_folds, seed, indx)
+            cached_score = cache.get_score(fold_key, metric)
+            if cached_score is not None:
+                log.debug(f"evaluate_estimator: fold {indx} loaded from cache")
+                metric_[indx] = cached_score
+                evaluated[indx] = True
+                continue
+
+        model = None
         if pretrained:
             model = estimator[indx]
-        else:
-            model = copy.deepcopy(estimator)
-            model.fit(X_train, Y_train)
+        elif fold_key is not None:
+            model = cache.get_model(fold_key)
+
+        fit = model is None
+        if fit:
+            model = estimator
+
+        pending.append((indx, fold_key))
+        tasks.append(
+            (
+                model,
+                fit,
+                data,
+                Y,
+                train_index,
+                test_index,
+                metric,
+                fit and fold_key is not None and cache.store_models,
+            )
+        )
 
-        preds = model.predict_proba(X_test)
+    def _on_fold(pos: int, result: Tuple[float, Any]) -> bool:
+        indx, fold_key = pending[pos]
+        score, model = result
 
-        metric_[indx] = ev.score_proba(Y_test, preds)
+        metric_[indx] = score
+        evaluated[indx] = True
 
-        indx += 1
+        if fold_key is not None:
+            cache.put(fold_key, scores={metric: float(score)}, model=model)
 
-    output_clf = generate_score(metric_)
+        if fold_cbk is None:
+            return False
+
+        return bool(fold_cbk(int(evaluated.sum()), float(metric_[evaluated].mean())))
+
+    if fold_cbk is not None:
+        # the folds are reported as they complete, and the evaluation can stop early
+        _dispatch_folds(
+            _evaluate_classifier_fold, tasks, n_jobs=n_jobs, on_result=_on_fold
+        )
+    else:
+        results = _dispatch_folds(_evaluate_classifier_fold, tasks, n_jobs=n_jobs)
+        for pos, result in enumerate(results):
+            _on_fold(pos, result)
+
+    if not evaluated.all():
+        log.debug(
+            f"evaluate_estimator: stopped after {evaluated.sum()}/{n_folds} folds"
+        )
+
+    output_clf = generate_score(metric_[evaluated])
 
     return {
         "clf": {
@@ -174,10 +345,161 @@ def evaluate_estimator(
     }
 
 
+def _evaluate_survival_fold(
+    estimator: Any,
+    pretrained: bool,
+    X: Union[pd.DataFrame, SharedDataset],
+    T: pd.Series,
+    Y: pd.Series,
+    train_index: np.ndarray,
+    test_index: np.ndarray,
+    time_horizons: list,
+    risk_threshold: float,
+) -> Dict[str, float]:
+    X_train = take_rows(X, train_index)
+    Y_train = take_rows(Y, train_index)
+    T_train = take_rows(T, train_index)
+    X_test = take_rows(X, test_index)
+    Y_test = take_rows(Y, test_index)
+    T_test = take_rows(T, test_index)
+
+    if pretrained:
+        model = estimator
+    else:
+        model = copy.deepcopy(estimator)
+
+        constant_cols = constant_columns(X_train)
+        X_train = X_train.drop(columns=constant_cols)
+        X_test = X_test.drop(columns=constant_cols)
+
+        model.fit(X_train, T_train, Y_train)
+
+    # a single prediction for all the horizons
+    pred = np.asarray(model.predict(X_test, time_horizons), dtype=float)
+
+    return _survival_scores(
+        pred, T_train, Y_train, T_test, Y_test, time_horizons, risk_threshold
+    )
+
+
+def _survival_scores(
+    pred: np.ndarray,
+    T_train: pd.Series,
+    Y_train: pd.Series,
+    T_test: pd.Series,
+    Y_test: pd.Series,
+    time_horizons: list,
+    risk_threshold: float,
+) -> Dict[str, float]:
+    """All the survival metrics of the predictions of a fold, at all the horizons.
+
+    The C-index and the Brier score are averaged over the horizons after the first test event time.
+    The classification metrics are averaged over the horizons, on the test samples not censored before each horizon.
+    """
+    pred = pred.reshape(len(T_test), len(time_horizons))
+
+    local_columns = [idx for idx, t in enumerate(time_horizons) if t > np.min(T_test)]
+    T_test_clipped = T_test.clip(upper=T_train.max())
+
+    c_index, brier_score = _survival_fold_scores(
+        pred[:, local_columns],
+        T_train,
+        Y_train,
+        T_test_clipped,
+        Y_test,
+        [time_horizons[idx] for idx in local_columns],
+    )
+    scores = {
+        "c_index": c_index,
+        "brier_score": brier_score,
+    }
+
+    horizon_scores = []
+    for k, horizon in enumerate(time_horizons):
+        mask, labels = horizon_labels(T_test, Y_test, horizon)
+        if len(np.unique(labels)) < 2:
+            log.debug(f"no events or no controls at horizon {horizon}, skipping")
+            continue
+
+        horizon_scores.append(
+            _survival_horizon_fold_scores(
+                pred[mask], pd.Series(labels), k, 1, risk_threshold
+            )
+        )
+
+    for metric in survival_supported_metrics:
+        if metric in scores:
+            continue
+        values = [horizon[metric] for horizon in horizon_scores]
+        if len(values) == 0:
+            scores[metric] = 0
+        elif metric == "predicted_cases":
+            scores[metric] = np.sum(values)
+        else:
+            scores[metric] = np.mean(values)
+
+    return scores
+
+
+def _survival_fold_scores(
+    pred: np.ndarray,
+    T_train: pd.Series,
+    Y_train: pd.Series,
+    T_test: pd.Series,
+    Y_test: pd.Series,
+    time_horizons: list,
+) -> Tuple[float, float]:
+    """C-index and Brier score of the predictions of a fold, averaged over the horizons."""
+    c_index = 0.0
+    brier_score = 0.0
+
+    if len(time_horizons) == 0:
+        return c_index, brier_score
+
+    # the censoring distribution is estimated once for all the horizons
+    evaluator = SurvivalMetricsEvaluator(
+        survival_structured(T_train, Y_train), survival_structured(T_test, Y_test)
+    )
+
+    for k in range(len(time_horizons)):
+        eval_horizon = min(time_horizons[k], np.max(T_test) - 1)
+
+        # the C-index expects risk scores, the Brier score expects survival scores
+        c_index += evaluator.concordance_index(pred[:, k], tau=eval_horizon) / len(
+            time_horizons
+        )
+        brier_score += evaluator.brier_score(1 - pred[:, k], eval_horizon)[0] / len(
+            time_horizons
+        )
+
+    return c_index, brier_score
+
+
+def _survival_horizon_fold_scores(
+    pred: np.ndarray,
+    Y_test: pd.Series,
+    horizon_idx: int,
+    n_horizons: int,
+    risk_threshold: float,
+) -> Dict[str, float]:
+    """Classification metrics of the predictions of a fold, at a horizon."""
+    local_scores = pd.DataFrame(pred[:, horizon_idx]).squeeze()
+    local_preds = (local_scores > risk_threshold).astype(int)
+
+    return {
+        "aucroc": roc_auc_score(Y_test, local_scores) / n_horizons,
+        "specificity": recall_score(Y_test, local_preds, pos_label=0) / n_horizons,
+        "sensitivity": recall_score(Y_test, local_preds, pos_label=1) / n_horizons,
+        "PPV": precision_score(Y_test, local_preds, pos_label=1) / n_horizons,
+        "NPV": precision_score(Y_test, local_preds, pos_label=0) / n_horizons,
+        "predicted_cases": local_preds.sum(),
+    }
+
+
 @validate_arguments(config=dict(arbitrary_types_allowed=True))
 def evaluate_survival_estimator(
     estimator: Any,
-    X: Union[pd.DataFrame, np.ndarray],
+    X: Union[pd.DataFrame, np.ndarray, SharedDataset],
     T: Union[pd.Series, np.ndarray],
     Y: Union[pd.Series, np.ndarray],
     time_horizons: Union[List[float], np.ndarray],
@@ -187,6 +509,8 @@ def evaluate_survival_estimator(
     pretrained: bool = False,
     risk_threshold: float = 0.5,
     group_ids: Optional[pd.Series] = None,
+    n_jobs: int = 1,
+    subsample: float = 1,
 ) -> Dict:
     """Helper for evaluating survival analysis tasks.
 
@@ -209,166 +533,42 @@ def evaluate_survival_estimator(
             If the estimator was trained or not
         group_ids:
             Group labels for the samples used while splitting the dataset into train/test set.
+        n_jobs: int
+            Number of folds to evaluate in parallel. -1 uses all the cores.
+        subsample: float
+            Fraction of the rows to evaluate on. Used by the low-fidelity evaluations of the multi-fidelity searches.
     """
 
     results = {}
-    X = pd.DataFrame(X).reset_index(drop=True)
+    X = _covariates(X)
     Y = pd.Series(Y).reset_index(drop=True)
     T = pd.Series(T).reset_index(drop=True)
     if group_ids is not None:
         group_ids = pd.Series(group_ids).reset_index(drop=True)
 
+    rows = _subsample_rows(len(X), subsample, seed, stratify=Y)
+    if rows is not None:
+        X = X.iloc[rows].reset_index(drop=True)
+        T = T.iloc[rows].reset_index(drop=True)
+        Y = Y.iloc[rows].reset_index(drop=True)
+        if group_ids is not None:
+            group_ids = group_ids.iloc[rows].reset_index(drop=True)
+
     for metric in metrics:
         if metric not in survival_supported_metrics:
             raise ValueError(f"Metric {metric} not supported")
 
         results[metric] = np.zeros(n_folds)
 
-    def _get_surv_metrics(
-        cv_idx: int,
-        X_train: pd.DataFrame,
-        X_test: pd.DataFrame,
-        T_train: pd.DataFrame,
-        T_test: pd.DataFrame,
-        Y_train: pd.DataFrame,
-        Y_test: pd.DataFrame,
-        time_horizons: list,
-    ) -> tuple:
-        train_max = T_train.max()
-        T_test[T_test > train_max] = train_max
-
+    def _fold_model(cv_idx: int) -> Any:
         if pretrained:
-            model = estimator[cv_idx]
-        else:
-            model = copy.deepcopy(estimator)
-
-            constant_cols = constant_columns(X_train)
-            X_train = X_train.drop(columns=constant_cols)
-            X_test = X_test.drop(columns=constant_cols)
-
-            model.fit(X_train, T_train, Y_train)
-
-        try:
-            pred = model.predict(X_test, time_horizons).to_numpy()
-        except BaseException as e:
-            raise e
-
-        c_index = 0.0
-        brier_score = 0.0
-
-        for k in range(len(time_horizons)):
-            eval_horizon = min(time_horizons[k], np.max(T_test) - 1)
-
-            def get_score(fn: Callable) -> float:
-                return (
-                    fn(
-                        T_train,
-                        Y_train,
-                        pred[:, k],
-                        T_test,
-                        Y_test,
-                        eval_horizon,
-                    )
-                    / (len(time_horizons))
-                )
-
-            c_index += get_score(evaluate_skurv_c_index)
-            brier_score += get_score(evaluate_skurv_brier_score)
-
-        return c_index, brier_score
-
-    def _get_clf_metrics(
-        cv_idx: int,
-        X_train: pd.DataFrame,
-        X_test: pd.DataFrame,
-        T_train: pd.DataFrame,
-        T_test: pd.DataFrame,
-        Y_train: pd.DataFrame,
-        Y_test: pd.DataFrame,
-        time_horizons: list,
-    ) -> Dict[str, float]:
-        cv_idx = 0
-
-        train_max = T_train.max()
-        T_test[T_test > train_max] = train_max
-
-        if pretrained:
-            model = estimator[cv_idx]
-        else:
-            model = copy.deepcopy(estimator)
-
-            constant_cols = constant_columns(X_train)
-            X_train = X_train.drop(columns=constant_cols)
-            X_test = X_test.drop(columns=constant_cols)
-
-            model.fit(X_train, T_train, Y_train)
-
-        try:
-            pred = model.predict(X_test, time_horizons).to_numpy()
-        except BaseException as e:
-            raise e
-
-        local_scores = pd.DataFrame(pred[:, k]).squeeze()
-        local_preds = (local_scores > risk_threshold).astype(int)
-
-        return {
-            "aucroc": roc_auc_score(Y_test, local_scores) / (len(time_horizons)),
-            "specificity": recall_score(Y_test, local_preds, pos_label=0)
-            / (len(time_horizons)),
-            "sensitivity": recall_score(Y_test, local_preds, pos_label=1)
-            / (len(time_horizons)),
-            "PPV": precision_score(Y_test, local_preds, pos_label=1)
-            / (len(time_horizons)),
-            "NPV": precision_score(Y_test, local_preds, pos_label=0)
-            / (len(time_horizons)),
-            "predicted_cases": local_preds.sum(),
-        }
+            return estimator[cv_idx]
+        return estimator
 
+    surv_folds = []
     if n_folds == 1:
-        cv_idx = 0
-        X_train, X_test, T_train, T_test, Y_train, Y_test = train_test_split(X, T, Y)
-        local_time_horizons = [t for t in time_horizons if t > np.min(T_test)]
-
-        c_index, brier_score = _get_surv_metrics(
-            cv_idx,
-            X_train,
-            X_test,
-            T_train,
-            T_test,
-            Y_train,
-            Y_test,
-            local_time_horizons,
-        )
-        for metric in metrics:
-            if metric == "c_index":
-                results[metric][cv_idx] = c_index
-            elif metric == "brier_score":
-                results[metric][cv_idx] = brier_score
-
-        for k in range(len(time_horizons)):
-            cv_idx = 0
-
-            X_horizon, T_horizon, Y_horizon = generate_dataset_for_horizon(
-                X, T, Y, time_horizons[k]
-            )
-            X_train, X_test, T_train, T_test, Y_train, Y_test = train_test_split(
-                X_horizon, T_horizon, Y_horizon
-            )
-
-            clf_metrics = _get_clf_metrics(
-                cv_idx,
-                X_train,
-                X_test,
-                T_train,
-                T_test,
-                Y_train,
-                Y_test,
-                local_time_horizons,
-            )
-            for metric in clf_metrics:
-                if metric in metrics:
-                    results[metric][cv_idx] += clf_metrics[metric]
-
+        train_index, test_index = train_test_split(np.arange(len(X)))
+        surv_folds.append((train_index, test_index))
     else:
         if group_ids is not None:
             skf = StratifiedGroupKFold(
@@ -377,68 +577,32 @@ def evaluate_survival_estimator(
         else:
             skf = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=seed)
 
-        cv_idx = 0
         for train_index, test_index in skf.split(X, Y, groups=group_ids):
-
-            X_train = X.loc[X.index[train_index]]
-            Y_train = Y.loc[Y.index[train_index]]
-            T_train = T.loc[T.index[train_index]]
-            X_test = X.loc[X.index[test_index]]
-            Y_test = Y.loc[Y.index[test_index]]
-            T_test = T.loc[T.index[test_index]]
-
-            local_time_horizons = [t for t in time_horizons if t > np.min(T_test)]
-
-            c_index, brier_score = _get_surv_metrics(
-                cv_idx,
-                X_train,
-                X_test,
-                T_train,
-                T_test,
-                Y_train,
-                Y_test,
-                local_time_horizons,
+            surv_folds.append((train_index, test_index))
+
+    data = share(X, n_jobs, len(surv_folds))
+
+    # each fold model is trained once, and predicts all the horizons once. The classification metrics of each horizon are derived from the same predictions.
+    surv_tasks = []
+    for cv_idx, (train_index, test_index) in enumerate(surv_folds):
+        surv_tasks.append(
+            (
+                _fold_model(cv_idx),
+                pretrained,
+                data,
+                T,
+                Y,
+                train_index,
+                test_index,
+                list(time_horizons),
+                risk_threshold,
             )
-            for metric in metrics:
-                if metric == "c_index":
-                    results[metric][cv_idx] = c_index
-                elif metric == "brier_score":
-                    results[metric][cv_idx] = brier_score
-
-            cv_idx += 1
-
-        for k in range(len(time_horizons)):
-            cv_idx = 0
+        )
 
-            X_horizon, T_horizon, Y_horizon = generate_dataset_for_horizon(
-                X, T, Y, time_horizons[k]
-            )
-            for train_index, test_index in skf.split(
-                X_horizon, Y_horizon, groups=group_ids
-            ):
-
-                X_train = X_horizon.loc[X_horizon.index[train_index]]
-                Y_train = Y_horizon.loc[Y_horizon.index[train_index]]
-                T_train = T_horizon.loc[T_horizon.index[train_index]]
-                X_test = X_horizon.loc[X_horizon.index[test_index]]
-                Y_test = Y_horizon.loc[Y_horizon.index[test_index]]
-                T_test = T_horizon.loc[T_horizon.index[test_index]]
-
-                clf_metrics = _get_clf_metrics(
-                    cv_idx,
-                    X_train,
-                    X_test,
-                    T_train,
-                    T_test,
-                    Y_train,
-                    Y_test,
-                    local_time_horizons,
-                )
-                for metric in clf_metrics:
-                    if metric in metrics:
-                        results[metric][cv_idx] += clf_metrics[metric]
-
-                cv_idx += 1
+    surv_results = _dispatch_folds(_evaluate_survival_fold, surv_tasks, n_jobs=n_jobs)
+    for cv_idx, fold_scores in enumerate(surv_results):
+        for metric in metrics:
+            results[metric][cv_idx] = fold_scores[metric]
 
     output: dict = {
         "clf": {},
@@ -452,16 +616,42 @@ def evaluate_survival_estimator(
     return output
 
 
+def _evaluate_regression_fold(
+    estimator: Any,
+    pretrained: bool,
+    X: Union[pd.DataFrame, SharedDataset],
+    Y: pd.Series,
+    train_index: np.ndarray,
+    test_index: np.ndarray,
+) -> Tuple[float, float]:
+    X_train = take_rows(X, train_index)
+    Y_train = take_rows(Y, train_index)
+    X_test = take_rows(X, test_index)
+    Y_test = take_rows(Y, test_index)
+
+    if pretrained:
+        model = estimator
+    else:
+        model = copy.deepcopy(estimator)
+        model.fit(X_train, Y_train)
+
+    preds = model.predict(X_test)
+
+    return mean_squared_error(Y_test, preds), r2_score(Y_test, preds)
+
+
 @validate_arguments(config=dict(arbitrary_types_allowed=True))
 def evaluate_regression(
     estimator: Any,
-    X: Union[pd.DataFrame, np.ndarray],
+    X: Union[pd.DataFrame, np.ndarray, SharedDataset],
     Y: Union[pd.Series, np.ndarray],
     n_folds: int = 3,
     metrics: str = ["rmse", "r2"],
     seed: int = 0,
     pretrained: bool = False,
     group_ids: Optional[pd.Series] = None,
+    n_jobs: int = 1,
+    subsample: float = 1,
     *args: Any,
     **kwargs: Any,
 ) -> Dict:
@@ -482,44 +672,46 @@ def evaluate_regression(
             Random seed
         group_ids: pd.Series
             Optional group_ids for stratified cross-validation
+        n_jobs: int
+            Number of folds to evaluate in parallel. -1 uses all the cores.
+        subsample: float
+            Fraction of the rows to evaluate on. Used by the low-fidelity evaluations of the multi-fidelity searches.
 
     """
-    X = pd.DataFrame(X).reset_index(drop=True)
+    X = _covariates(X)
     Y = pd.Series(Y).reset_index(drop=True)
     if group_ids is not None:
         group_ids = pd.Series(group_ids).reset_index(drop=True)
 
+    rows = _subsample_rows(len(X), subsample, seed)
+    if rows is not None:
+        X = X.iloc[rows].reset_index(drop=True)
+        Y = Y.iloc[rows].reset_index(drop=True)
+        if group_ids is not None:
+            group_ids = group_ids.iloc[rows].reset_index(drop=True)
+
     log.debug(f"evaluate_estimator shape x:{X.shape} y:{Y.shape}")
 
     metrics_ = {}
     for metric in metrics:
         metrics_[metric] = np.zeros(n_folds)
 
-    indx = 0
     if group_ids is not None:
         kf = GroupKFold(n_splits=n_folds)
     else:
         kf = KFold(n_splits=n_folds, shuffle=True, random_state=seed)
 
-    for train_index, test_index in kf.split(X, Y, groups=group_ids):
-
-        X_train = X.loc[X.index[train_index]]
-        Y_train = Y.loc[Y.index[train_index]]
-        X_test = X.loc[X.index[test_index]]
-        Y_test = Y.loc[Y.index[test_index]]
-
-        if pretrained:
-            model = estimator[indx]
-        else:
-            model = copy.deepcopy(estimator)
-            model.fit(X_train, Y_train)
-
-        preds = model.predict(X_test)
+    data = share(X, n_jobs, n_folds)
 
-        metrics_["rmse"][indx] = mean_squared_error(Y_test, preds)
-        metrics_["r2"][indx] = r2_score(Y_test, preds)
+    tasks = []
+    for indx, (train_index, test_index) in enumerate(kf.split(X, Y, groups=group_ids)):
+        model = estimator[indx] if pretrained else estimator
+        tasks.append((model, pretrained, data, Y, train_index, test_index))
 
-        indx += 1
+    results = _dispatch_folds(_evaluate_regression_fold, tasks, n_jobs=n_jobs)
+    for indx, (rmse, r2) in enumerate(results):
+        metrics_["rmse"][indx] = rmse
+        metrics_["r2"][indx] = r2
 
     output_rmse = generate_score(metrics_["rmse"])
     output_r2 = generate_score(metrics_["r2"])
@@ -13,6 +13,7 @@ __all__ = [
     "brier_score",
     "concordance_index_censored",
     "concordance_index_ipcw",
+    "SurvivalMetricsEvaluator",
 ]
 
 
@@ -79,70 +80,107 @@ def _check_estimate_2d(estimate: np.ndarray, test_time: np.ndarray, time_points:
     return estimate, time_points
 
 
-def _get_comparable(event_indicator: np.ndarray, event_time: np.ndarray, order: np.ndarray) -> np.ndarray:
-    n_samples = len(event_time)
-    tied_time = 0
-    comparable = {}
-    i = 0
-    while i < n_samples - 1:
-        time_i = event_time[order[i]]
-        start = i + 1
-        end = start
-        while end < n_samples and event_time[order[end]] == time_i:
-            end += 1
-
-        # check for tied event times
-        event_at_same_time = event_indicator[order[i:end]]
-        censored_at_same_time = ~event_at_same_time
-        for j in range(i, end):
-            if event_indicator[order[j]]:
-                mask = np.zeros(n_samples, dtype=bool)
-                mask[end:] = True
-                # an event is comparable to censored samples at same time point
-                mask[i:end] = censored_at_same_time
-                comparable[j] = mask
-                tied_time += censored_at_same_time.sum()
-        i = end
-
-    return comparable, tied_time
+def _count_smaller(rank: np.ndarray, limit: np.ndarray, threshold: np.ndarray) -> np.ndarray:
+    """Count, for each query q, the samples j < limit[q] with rank[j] < threshold[q].
+
+    The ranks are decomposed bit by bit: rank[j] < threshold[q] iff, for exactly one bit b,
+    both share the bits above b, and bit b is 0 in rank[j] and 1 in threshold[q].
+    Each bit is a sorted search, so the whole count is O(n log^2 n) and vectorised.
+
+    Parameters
+    ----------
+    rank : array, shape = (n_samples,)
+        Integer ranks in [0, n_samples[, in insertion order.
+
+    limit : array, shape = (n_queries,)
+        Number of inserted samples visible to each query.
+
+    threshold : array, shape = (n_queries,)
+        Integer thresholds in [0, n_samples].
+
+    Returns
+    -------
+    counts : array, shape = (n_queries,)
+    """
+    n_samples = rank.shape[0]
+    stride = n_samples + 1
+    position = np.arange(n_samples, dtype=np.int64)
+    rank = rank.astype(np.int64)
+    limit = limit.astype(np.int64)
+    threshold = threshold.astype(np.int64)
+
+    counts = np.zeros(threshold.shape[0], dtype=np.int64)
+    for bit in range(max(int(n_samples).bit_length(), 1)):
+        keys = np.sort((rank >> bit) * stride + position)
+
+        prefix = threshold >> bit
+        sel = (prefix & 1) == 1
+        base = (prefix[sel] - 1) * stride
+
+        counts[sel] += np.searchsorted(keys, base + limit[sel]) - np.searchsorted(
+            keys, base
+        )
+
+    return counts
 
 
 def _estimate_concordance_index(
         event_indicator: np.ndarray, event_time: np.ndarray, estimate: np.ndarray, weights: np.ndarray, tied_tol: float=1e-8
 ) -> float:
-    order = np.argsort(event_time)
-
-    comparable, tied_time = _get_comparable(event_indicator, event_time, order)
+    """Weighted concordance index, in O(n log^2 n).
 
-    if len(comparable) == 0:
+    An event i is comparable with the samples with a longer time, and with the censored samples at the same time.
+    The samples are ordered by decreasing time, with the censored samples first for each time point,
+    so the comparable samples of i are a prefix of that order, and the concordant/tied pairs are counted with `_count_smaller`.
+    """
+    event_indicator = np.asarray(event_indicator, dtype=bool)
+    event_time = np.asarray(event_time, dtype=float)
+    estimate = np.asarray(estimate, dtype=float)
+    weights = np.asarray(weights, dtype=float)
+
+    # no events, or a single event after all the other samples
+    n_events = event_indicator.sum()
+    last_event_only = (
+        n_events == 1
+        and (event_time < event_time[event_indicator][0]).sum() == len(event_time) - 1
+    )
+    if n_events == 0 or last_event_only:
         raise RuntimeError(
             "Data has no comparable pairs, cannot estimate concordance index."
         )
 
-    concordant = 0
-    discordant = 0
-    tied_risk = 0
-    numerator = 0.0
-    denominator = 0.0
-    for ind, mask in comparable.items():
-        est_i = estimate[order[ind]]
-        event_i = event_indicator[order[ind]]
-        w_i = weights[order[ind]]
-
-        est = estimate[order[mask]]
-
-        ties = np.absolute(est - est_i) <= tied_tol
-        n_ties = ties.sum()
-        # an event should have a higher score
-        con = est < est_i
-        n_con = con[~ties].sum()
+    # insertion order: decreasing time, censored samples first
+    order = np.lexsort((event_indicator, -event_time))
+    sorted_estimate = np.sort(estimate)
+    rank = np.searchsorted(sorted_estimate, estimate[order], side="left")
+
+    # number of comparable samples of each event
+    event_est = estimate[event_indicator]
+    event_times = event_time[event_indicator]
+    w_i = weights[event_indicator]
+
+    all_times = np.sort(event_time)
+    censored_times = np.sort(event_time[~event_indicator])
+    limit = (len(event_time) - np.searchsorted(all_times, event_times, side="right")) + (
+        np.searchsorted(censored_times, event_times, side="right")
+        - np.searchsorted(censored_times, event_times, side="left")
+    )
 
-        numerator += w_i * n_con + 0.5 * w_i * n_ties
-        denominator += w_i * mask.sum()
+    # an event should have a higher score
+    n_con = _count_smaller(
+        rank, limit, np.searchsorted(sorted_estimate, event_est - tied_tol, side="left")
+    )
+    n_ties = (
+        _count_smaller(
+            rank,
+            limit,
+            np.searchsorted(sorted_estimate, event_est + tied_tol, side="right"),
+        )
+        - n_con
+    )
 
-        tied_risk += n_ties
-        concordant += n_con
-        discordant += est.size - n_con - n_ties
+    numerator = np.sum(w_i * n_con + 0.5 * w_i * n_ties)
+    denominator = np.sum(w_i * limit)
 
     cindex = numerator / denominator
     return cindex
@@ -261,27 +299,10 @@ def concordance_index_ipcw(
         Concordance index
 
     """
-    test_event, test_time = check_y_survival(survival_test)
-
-    if tau is not None:
-        mask = test_time < tau
-        survival_test = survival_test[mask]
-
-    estimate = _check_estimate_1d(estimate, test_time)
-
-    cens = CensoringDistributionEstimator()
-    cens.fit(survival_train)
-    ipcw_test = cens.predict_ipcw(survival_test)
-    if tau is None:
-        ipcw = ipcw_test
-    else:
-        ipcw = np.empty(estimate.shape[0], dtype=ipcw_test.dtype)
-        ipcw[mask] = ipcw_test
-        ipcw[~mask] = 0
-
-    w = np.square(ipcw)
+    return SurvivalMetricsEvaluator(survival_train, survival_test).concordance_index(
+        estimate, tau=tau, tied_tol=tied_tol
+    )
 
-    return _estimate_concordance_index(test_event, test_time, estimate, w, tied_tol)
 
 def brier_score(survival_train: np.ndarray, survival_test: np.ndarray, estimate: np.ndarray, times: np.ndarray) -> np.ndarray:
     """Estimate the time-dependent Brier score for right censored data.
@@ -372,31 +393,135 @@ def brier_score(survival_train: np.ndarray, survival_test: np.ndarray, estimate:
            "Assessment and comparison of prognostic classification schemes for survival data,"
            Statistics in Medicine, vol. 18, no. 17-18, pp. 2529–2545, 1999.
     """
-    test_event, test_time = check_y_survival(survival_test)
-    train_event, train_time = check_y_survival(survival_train)
-    estimate, times = _check_estimate_2d(estimate, test_time, times)
-    if estimate.ndim == 1 and times.shape[0] == 1:
-        estimate = estimate.reshape(-1, 1)
-
-    # fit IPCW estimator
-    cens = CensoringDistributionEstimator().fit(survival_train)
-    # calculate inverse probability of censoring weight at current time point t.
-    prob_cens_t = cens.predict_proba(times)
-    prob_cens_t[prob_cens_t == 0] = np.inf
-    # calculate inverse probability of censoring weights at observed time point
-    prob_cens_y = cens.predict_proba(test_time)
-    prob_cens_y[prob_cens_y == 0] = np.inf
-
-    # Calculating the brier scores at each time point
-    brier_scores = np.empty(times.shape[0], dtype=float)
-    for i, t in enumerate(times):
-        est = estimate[:, i]
-        is_case = (test_time <= t) & test_event
-        is_control = test_time > t
-
-        brier_scores[i] = np.mean(
-            np.square(est) * is_case.astype(int) / prob_cens_y
-            + np.square(1.0 - est) * is_control.astype(int) / prob_cens_t[i]
+    return SurvivalMetricsEvaluator(survival_train, survival_test).brier_score(
+        estimate, times
+    )
+
+
+class SurvivalMetricsEvaluator:
+    """Batched IPCW metrics for a train/test split.
+
+    The censoring distribution is estimated once from the training data, and the
+    inverse probability of censoring weights of the test data are cached, so many
+    horizons and many candidate predictions are scored without refitting it.
+
+    Parameters
+    ----------
+    survival_train : structured array, shape = (n_train_samples,)
+        Survival times for training data to estimate the censoring
+        distribution from.
+
+    survival_test : structured array, shape = (n_samples,)
+        Survival times of test data.
+    """
+
+    def __init__(self, survival_train: np.ndarray, survival_test: np.ndarray) -> None:
+        self.survival_test = survival_test
+        self.test_event, self.test_time = check_y_survival(survival_test)
+        check_y_survival(survival_train)
+
+        self.cens = CensoringDistributionEstimator().fit(survival_train)
+
+        # inverse probability of censoring weights at the observed time points
+        self.prob_cens_y = self.cens.predict_proba(self.test_time)
+        self.prob_cens_y[self.prob_cens_y == 0] = np.inf
+
+        self._ipcw: dict = {}
+
+    def ipcw(self, tau: Optional[float] = None) -> np.ndarray:
+        """Squared inverse probability of censoring weights of the test data, truncated at `tau`."""
+        if tau in self._ipcw:
+            return self._ipcw[tau]
+
+        if tau is None:
+            ipcw = self.cens.predict_ipcw(self.survival_test)
+        else:
+            mask = self.test_time < tau
+            ipcw_test = self.cens.predict_ipcw(self.survival_test[mask])
+            ipcw = np.empty(self.test_time.shape[0], dtype=ipcw_test.dtype)
+            ipcw[mask] = ipcw_test
+            ipcw[~mask] = 0
+
+        self._ipcw[tau] = np.square(ipcw)
+        return self._ipcw[tau]
+
+    def concordance_index(
+        self, estimate: np.ndarray, tau: Optional[float] = None, tied_tol: float = 1e-8
+    ) -> np.ndarray:
+        """IPCW concordance index, see :func:`concordance_index_ipcw`.
+
+        Parameters
+        ----------
+        estimate : array-like, shape = (n_samples,) or (n_candidates, n_samples)
+            Estimated risk of experiencing an event of test data.
+
+        Returns
+        -------
+        cindex : float, or array of shape = (n_candidates,)
+        """
+        estimate = np.asarray(estimate, dtype=float)
+        if estimate.ndim == 1:
+            return self.concordance_index(estimate.reshape(1, -1), tau, tied_tol)[0]
+
+        w = self.ipcw(tau)
+
+        return np.asarray(
+            [
+                _estimate_concordance_index(
+                    self.test_event,
+                    self.test_time,
+                    _check_estimate_1d(candidate, self.test_time),
+                    w,
+                    tied_tol,
+                )
+                for candidate in estimate
+            ]
         )
 
-    return brier_scores
+    def brier_score(self, estimate: np.ndarray, times: np.ndarray) -> np.ndarray:
+        """Time-dependent Brier score, see :func:`brier_score`.
+
+        Parameters
+        ----------
+        estimate : array-like, shape = (n_samples, n_times) or (n_candidates, n_samples, n_times)
+            Estimated probability of remaining event-free at `times`.
+
+        times : array-like, shape = (n_times,)
+            The time points for which to estimate the Brier score.
+
+        Returns
+        -------
+        brier_scores : array, shape = (n_times,) or (n_candidates, n_times)
+        """
+        estimate = np.asarray(estimate, dtype=float)
+        if estimate.ndim == 3:
+            estimate = check_array(estimate, ensure_2d=False, allow_nd=True)
+            times = _check_times(self.test_time, times)
+            check_consistent_length(self.test_time, estimate[0])
+            if estimate.shape[2] != times.shape[0]:
+                raise ValueError(
+                    "expected estimate with {} columns, but got {}".format(
+                        times.shape[0], estimate.shape[2]
+                    )
+                )
+        else:
+            estimate, times = _check_estimate_2d(estimate, self.test_time, times)
+            if estimate.ndim == 1 and times.shape[0] == 1:
+                estimate = estimate.reshape(-1, 1)
+
+        # calculate inverse probability of censoring weight at current time point t.
+        prob_cens_t = self.cens.predict_proba(times)
+        prob_cens_t[prob_cens_t == 0] = np.inf
+
+        # n_samples x n_times
+        is_case = (self.test_time[:, None] <= times[None, :]) & self.test_event[:, None]
+        is_control = self.test_time[:, None] > times[None, :]
+
+        case_weights = is_case.astype(int) / self.prob_cens_y[:, None]
+        control_weights = is_control.astype(int) / prob_cens_t[None, :]
+
+        return np.mean(
+            np.square(estimate) * case_weights
+            + np.square(1.0 - estimate) * control_weights,
+            axis=-2,
+        )
@@ -31,7 +31,7 @@ def _compute_counts(event: np.ndarray, time: np.ndarray, order: Optional[np.ndar
 
     order : array or None
         Indices to order time in ascending order.
-        If None, order will be computed.
+        Not required, the unique time points are sorted.
 
     Returns
     -------
@@ -49,39 +49,9 @@ def _compute_counts(event: np.ndarray, time: np.ndarray, order: Optional[np.ndar
     """
     n_samples = event.shape[0]
 
-    if order is None:
-        order = np.argsort(time, kind="mergesort")
-
-    uniq_times = np.empty(n_samples, dtype=time.dtype)
-    uniq_events = np.empty(n_samples, dtype=int)
-    uniq_counts = np.empty(n_samples, dtype=int)
-
-    i = 0
-    prev_val = time[order[0]]
-    j = 0
-    while True:
-        count_event = 0
-        count = 0
-        while i < n_samples and prev_val == time[order[i]]:
-            if event[order[i]]:
-                count_event += 1
-
-            count += 1
-            i += 1
-
-        uniq_times[j] = prev_val
-        uniq_events[j] = count_event
-        uniq_counts[j] = count
-        j += 1
-
-        if i == n_samples:
-            break
-
-        prev_val = time[order[i]]
-
-    times = np.resize(uniq_times, j)
-    n_events = np.resize(uniq_events, j)
-    total_count = np.resize(uniq_counts, j)
+    times, inverse = np.unique(time, return_inverse=True)
+    total_count = np.bincount(inverse)
+    n_events = np.bincount(inverse, weights=event).astype(int)
     n_censored = total_count - n_events
 
     # offset cumulative sum by one
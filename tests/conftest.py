@@ -1,7 +1,11 @@
 # stdlib
+from pathlib import Path
 import sys
 import warnings
 
+# third party
+import pytest
+
 # autoprognosis absolute
 import autoprognosis.logger as log
 
@@ -9,3 +13,10 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
 
 log.add(sink=sys.stderr, level="ERROR")
+
+
+@pytest.fixture(autouse=True)
+def isolated_study_storage(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # each test gets its own local study storage
+    monkeypatch.setenv("AUTOPROGNOSIS_STORAGE", "sqlite")
+    monkeypatch.setenv("AUTOPROGNOSIS_STORAGE_PATH", str(tmp_path / "studies"))
@@ -0,0 +1,97 @@
+# stdlib
+from typing import Any, Tuple
+
+# third party
+import numpy as np
+import pandas as pd
+from sklearn.datasets import load_breast_cancer
+
+# autoprognosis absolute
+from autoprognosis.deploy.explanations import ExplanationStore, explain
+from autoprognosis.plugins.ensemble.classifiers import WeightedEnsemble
+from autoprognosis.plugins.pipeline import Pipeline
+from autoprognosis.utils.serialization import load_model, save_model
+
+
+def _model() -> Tuple[Any, pd.DataFrame]:
+    X, y = load_breast_cancer(return_X_y=True, as_frame=True)
+    X = X.iloc[:, :6]
+
+    model = WeightedEnsemble(
+        [Pipeline(["prediction.classifier.xgboost"])()],
+        [1],
+        explainer_plugins=["tree_shap"],
+    ).fit(X, y)
+
+    return model, X
+
+
+def test_store_lookup() -> None:
+    model, X = _model()
+
+    store = ExplanationStore.build(model, X, cohort_size=200)
+    assert list(store.explanations.keys()) == ["tree_shap"]
+    assert store.explanations["tree_shap"].shape == (200, X.shape[1])
+    assert store.max_distance > 0
+
+    # the rows of the cohort are answered with their stored explanation
+    dist, idx = store.index.query(store._points(X), k=1)
+    row = X[dist[:, 0] == 0].head(1)
+
+    cached = store.lookup(row)
+    live = model.explain(row)
+    assert np.allclose(cached["tree_shap"], live["tree_shap"], atol=1e-6)
+
+    # the neighbours are interpolated
+    close = row + 1e-3 * X.std()
+    assert store.lookup(close)["tree_shap"].shape == (1, X.shape[1])
+    assert store.hits == 2
+
+    # the requests far from the cohort are explained live
+    far = row + 100 * X.std()
+    assert store.lookup(far) is None
+    assert store.misses == 1
+    assert np.allclose(
+        explain(model, far, store)["tree_shap"], model.explain(far)["tree_shap"]
+    )
+
+
+def test_store_serialization() -> None:
+    model, X = _model()
+
+    store = ExplanationStore.build(model, X, cohort_size=50, max_distance=10.0)
+    loaded = load_model(save_model(store))
+
+    assert loaded.max_distance == 10
+    assert np.array_equal(
+        loaded.lookup(X.head(10))["tree_shap"], store.lookup(X.head(10))["tree_shap"]
+    )
+
+
+class _PartialModel:
+    """A model whose second explainer has no row per input."""
+
+    def __init__(self, model: Any) -> None:
+        self.model = model
+
+    def explain(self, X: pd.DataFrame) -> dict:
+        return {
+            "tree_shap": self.model.explain(X)["tree_shap"],
+            "risk_effect_size": pd.Series(np.ones(X.shape[1]), index=X.columns),
+        }
+
+
+def test_store_missing_explainer() -> None:
+    model, X = _model()
+    partial = _PartialModel(model)
+
+    store = ExplanationStore.build(partial, X, cohort_size=50)
+    assert list(store.explanations.keys()) == ["tree_shap"]
+    assert store.missing == ["risk_effect_size"]
+
+    # all the explainers are shown: the requests are explained live
+    assert store.lookup(X.head(1)) is None
+    assert set(explain(partial, X.head(1), store).keys()) == {
+        "tree_shap",
+        "risk_effect_size",
+    }
@@ -0,0 +1,185 @@
+# stdlib
+import json
+from pathlib import Path
+import threading
+from typing import Any
+
+# third party
+import numpy as np
+import pytest
+from sklearn.datasets import load_breast_cancer
+
+# autoprognosis absolute
+from autoprognosis.deploy import registry as registry_module
+from autoprognosis.deploy.registry import (
+    ModelRegistry,
+    manifest_path,
+    read_manifest,
+    scan_depends,
+    write_manifest,
+)
+from autoprognosis.deploy.serving import LocalClient, load_scoring_app
+from autoprognosis.plugins.pipeline import Pipeline
+from autoprognosis.studies._preprocessing import EncodersCallbacks
+from autoprognosis.utils.serialization import save_model_to_file
+
+
+def _artifact(path: Path, n_models: int = 3) -> Any:
+    X, y = load_breast_cancer(return_X_y=True, as_frame=True)
+
+    models = {}
+    for idx in range(n_models):
+        models[f"model {idx}"] = Pipeline(
+            [
+                "preprocessor.feature_scaling.scaler",
+                "prediction.classifier.logistic_regression",
+            ]
+        )().fit(X, y)
+
+    save_model_to_file(
+        path,
+        {
+            "type": "classification",
+            "title": "test",
+            "models": models,
+            "encoders": EncodersCallbacks({}),
+            "column_types": [],
+        },
+    )
+
+    return X, models
+
+
+def test_manifest(tmp_path: Path) -> None:
+    app_path = tmp_path / "app.p"
+    _artifact(app_path)
+
+    assert read_manifest(app_path) is None
+
+    manifest = write_manifest(app_path)
+    assert manifest_path(app_path).exists()
+    assert read_manifest(app_path) == manifest
+    assert manifest["depends"] == scan_depends(app_path)
+    assert "logistic_regression" in manifest["depends"]
+    assert list(manifest["models"].keys()) == ["model 0", "model 1", "model 2"]
+
+    # the manifest of a rebuilt artifact is stale
+    _artifact(app_path, n_models=2)
+    assert read_manifest(app_path) is None
+
+    with open(manifest_path(app_path)) as f:
+        assert json.load(f)["version"] == manifest["version"]
+
+
+def test_registry_lazy_loading(tmp_path: Path, monkeypatch: Any) -> None:
+    app_path = tmp_path / "app.p"
+    X, models = _artifact(app_path)
+    write_manifest(app_path)
+
+    # the plugins are preloaded from the manifest, without scanning the artifact
+    def _scan(app_path: Path) -> list:
+        raise AssertionError("unexpected scan")
+
+    monkeypatch.setattr(registry_module, "scan_depends", _scan)
+
+    registry = ModelRegistry()
+    app_params = registry.app_params(app_path)
+    assert app_params["title"] == "test"
+    assert list(app_params["models"].keys()) == list(models.keys())
+    assert registry.stats()["resident_models"] == 0
+
+    for name, model in models.items():
+        assert np.allclose(
+            app_params["models"][name].predict_proba(X), model.predict_proba(X)
+        )
+    app_params["models"]["model 0"]
+
+    stats = registry.stats()
+    assert stats["resident_models"] == 3
+    assert stats["misses"] == 3
+    assert stats["hits"] == 1
+    assert len(stats["load_times"]) == 3
+    assert stats["resident_bytes"] > 0
+
+    with pytest.raises(KeyError):
+        app_params["models"]["unknown"]
+
+
+def test_registry_lru_eviction(tmp_path: Path) -> None:
+    app_path = tmp_path / "app.p"
+    _artifact(app_path)
+
+    registry = ModelRegistry(max_models=2)
+    registry.get(app_path, "model 0")
+    registry.get(app_path, "model 1")
+    registry.get(app_path, "model 0")
+    registry.get(app_path, "model 2")
+
+    # model 1 is the least recently used
+    assert [name for _, name in registry._cache] == ["model 0", "model 2"]
+    assert registry.stats()["evictions"] == 1
+
+    # the budget in bytes keeps at least the last model
+    registry.max_bytes = 1
+    registry.get(app_path, "model 1")
+    assert [name for _, name in registry._cache] == ["model 1"]
+
+    registry.evict(app_path)
+    assert registry.stats()["resident_models"] == 0
+
+
+def test_registry_rebuilt_artifact(tmp_path: Path) -> None:
+    app_path = tmp_path / "app.p"
+    _artifact(app_path)
+
+    registry = ModelRegistry()
+    assert len(registry.app_params(app_path)["models"]) == 3
+    registry.get(app_path, "model 2")
+
+    # the artifact is rebuilt in place, without unregistering it
+    _artifact(app_path, n_models=2)
+
+    app_params = registry.app_params(app_path)
+    assert list(app_params["models"].keys()) == ["model 0", "model 1"]
+    assert registry.stats()["resident_models"] == 0
+    with pytest.raises(KeyError):
+        registry.get(app_path, "model 2")
+
+
+def test_registry_concurrent_loads(tmp_path: Path) -> None:
+    app_path = tmp_path / "app.p"
+    _artifact(app_path, n_models=1)
+
+    registry = ModelRegistry()
+    results: list = []
+
+    def _load() -> None:
+        results.append(registry.get(app_path, "model 0"))
+
+    threads = [threading.Thread(target=_load) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # the model is unpickled once, and shared
+    assert registry.stats()["misses"] == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_scoring_app_registry(tmp_path: Path) -> None:
+    app_path = tmp_path / "app.p"
+    X, models = _artifact(app_path)
+
+    with LocalClient(load_scoring_app(app_path)) as client:
+        response = client.post(
+            "/predict",
+            {"instances": X.iloc[:3].to_dict(orient="records"), "model": "model 2"},
+        )
+        assert response.status_code == 200
+        assert np.allclose(
+            response.json()["predictions"],
+            models["model 2"].predict_proba(X.iloc[:3]),
+        )
+
+    assert manifest_path(app_path).exists()
@@ -0,0 +1,169 @@
+# stdlib
+import asyncio
+from pathlib import Path
+from typing import Any
+
+# third party
+from lifelines.datasets import load_rossi
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_breast_cancer
+
+# autoprognosis absolute
+from autoprognosis.deploy.serving import (
+    LocalClient,
+    MicroBatcher,
+    ScoringApp,
+    load_scoring_app,
+)
+from autoprognosis.plugins.ensemble.risk_estimation import RiskEnsembleCV
+from autoprognosis.plugins.pipeline import Pipeline
+from autoprognosis.plugins.prediction import Predictions
+from autoprognosis.studies._preprocessing import EncodersCallbacks
+from autoprognosis.utils.serialization import save_model_to_file
+
+
+class _CountingModel:
+    def __init__(self, model: Any) -> None:
+        self.model = model
+        self.calls = 0
+
+    def predict_proba(self, X: pd.DataFrame) -> pd.DataFrame:
+        self.calls += 1
+        return self.model.predict_proba(X)
+
+
+def _classification_app() -> Any:
+    X, y = load_breast_cancer(return_X_y=True, as_frame=True)
+    model = Pipeline(
+        [
+            "preprocessor.feature_scaling.scaler",
+            "prediction.classifier.logistic_regression",
+        ]
+    )()
+    model.fit(X, y)
+
+    return X, {
+        "type": "classification",
+        "models": {"AutoPrognosis model": _CountingModel(model)},
+        "encoders": EncodersCallbacks({}),
+        "column_types": [],
+    }
+
+
+def test_scoring_app_classification() -> None:
+    X, app_params = _classification_app()
+    model = app_params["models"]["AutoPrognosis model"]
+
+    with LocalClient(ScoringApp(app_params, max_latency=0.05)) as client:
+        health = client.get("/health")
+        assert health.status_code == 200
+        assert health.json()["models"] == ["AutoPrognosis model"]
+
+        response = client.post(
+            "/predict", {"instances": X.iloc[:3].to_dict(orient="records")}
+        )
+        assert response.status_code == 200
+        assert np.allclose(
+            response.json()["predictions"],
+            model.model.predict_proba(X.iloc[:3]).to_numpy(),
+        )
+
+        # the concurrent requests share the model calls
+        model.calls = 0
+        responses = client.post_concurrent(
+            "/predict",
+            [
+                {"instances": X.iloc[[idx]].to_dict(orient="records")}
+                for idx in range(20)
+            ],
+        )
+        assert all(response.status_code == 200 for response in responses)
+        assert model.calls < 20
+
+        reference = model.model.predict_proba(X.iloc[:20]).to_numpy()
+        for idx, response in enumerate(responses):
+            assert np.allclose(response.json()["predictions"], reference[[idx]])
+
+        metrics = client.get("/metrics").json()
+        assert metrics["requests"] == 21
+        assert metrics["rows"] == 23
+        assert metrics["requests_per_batch"] > 1
+        assert metrics["latency_ms"]["p95"] > 0
+
+        # errors
+        assert client.post("/predict", {"rows": []}).status_code == 400
+        assert (
+            client.post("/predict", {"instances": [{}], "model": "unknown"}).status_code
+            == 404
+        )
+        assert client.get("/predict").status_code == 405
+        assert client.get("/unknown").status_code == 404
+        assert client.post("/predict", {"instances": [{"a": 1}]}).status_code == 500
+
+
+def test_micro_batcher_max_batch_size() -> None:
+    sizes = []
+
+    def predict(key: Any, X: pd.DataFrame) -> np.ndarray:
+        sizes.append(len(X))
+        return X.to_numpy() * 2
+
+    batcher = MicroBatcher(predict, max_batch_size=4, max_latency=0.1)
+
+    async def _run() -> list:
+        results = await asyncio.gather(
+            *[batcher.submit("model", pd.DataFrame({"a": [idx]})) for idx in range(10)]
+        )
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(_run())
+
+    assert [int(result[0, 0]) for result in results] == [2 * idx for idx in range(10)]
+    assert max(sizes) <= 4
+    assert sum(sizes) == 10
+
+
+def test_scoring_app_risk_estimation(tmp_path: Path) -> None:
+    rossi = load_rossi()
+    X = rossi.drop(["week", "arrest"], axis=1)
+    horizons = [10, 20, 30]
+
+    model = RiskEnsembleCV(
+        time_horizons=horizons,
+        ensemble=Predictions(category="risk_estimation").get("cox_ph"),
+        n_folds=2,
+    ).fit(X, rossi["week"], rossi["arrest"])
+
+    app_path = tmp_path / "app.p"
+    save_model_to_file(
+        app_path,
+        {
+            "type": "risk_estimation",
+            "models": {"AutoPrognosis model": model},
+            "encoders": EncodersCallbacks({}),
+            "column_types": [],
+            "time_horizons": horizons,
+        },
+    )
+
+    with LocalClient(load_scoring_app(app_path)) as client:
+        instances = X.iloc[:5].to_dict(orient="records")
+
+        response = client.post("/predict", {"instances": instances})
+        assert response.status_code == 200
+        assert np.allclose(
+            response.json()["predictions"], model.predict(X.iloc[:5], horizons)
+        )
+
+        response = client.post(
+            "/predict", {"instances": instances, "time_horizons": [15]}
+        )
+        assert np.asarray(response.json()["predictions"]).shape == (5, 1)
+
+
+def test_scoring_app_invalid() -> None:
+    with pytest.raises(RuntimeError):
+        ScoringApp({"type": "regression", "models": {}, "encoders": None})
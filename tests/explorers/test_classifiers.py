@@ -14,7 +14,7 @@ from autoprognosis.explorers.classifiers import ClassifierSeeker
 from autoprognosis.utils.metrics import evaluate_auc
 
 
-@pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband"])
+@pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband", "asha"])
 def test_sanity(optimizer_type: str) -> None:
     model = ClassifierSeeker(
         study_name="test_classifiers",
@@ -56,7 +56,7 @@ def test_fails() -> None:
 
 @pytest.mark.parametrize(
     "optimizer_type,group_id",
-    [("bayesian", False), ("bayesian", True), ("hyperband", False)],
+    [("bayesian", False), ("bayesian", True), ("hyperband", False), ("asha", False)],
 )
 def test_search(optimizer_type: str, group_id: Optional[bool]) -> None:
     X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
@@ -98,7 +98,68 @@ def test_search(optimizer_type: str, group_id: Optional[bool]) -> None:
         assert evaluate_auc(Y, y_pred_proba)[0] > 0.9
 
 
-@pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband"])
+def test_search_bandit_scheduler() -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+
+    seeker = ClassifierSeeker(
+        study_name="test_classifiers_bandit",
+        num_iter=5,
+        top_k=2,
+        feature_scaling=["scaler"],
+        classifiers=[
+            "logistic_regression",
+            "lda",
+            "perceptron",
+        ],
+        scheduler="bandit",
+        strict=True,
+    )
+    best_models = seeker.search(X, Y)
+
+    assert len(best_models) == 2
+
+    for model in best_models:
+        model.fit(X, Y)
+        assert evaluate_auc(Y, model.predict_proba(X))[0] > 0.9
+
+    with pytest.raises(ValueError):
+        ClassifierSeeker(
+            study_name="test_classifiers", scheduler="bandit", optimizer_type="asha"
+        )
+
+
+def test_search_bandit_skipped_estimators(monkeypatch: pytest.MonkeyPatch) -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+
+    seeker = ClassifierSeeker(
+        study_name="test_classifiers_bandit_skipped",
+        top_k=3,
+        feature_scaling=["scaler"],
+        classifiers=[
+            "logistic_regression",
+            "lda",
+            "perceptron",
+        ],
+        scheduler="bandit",
+    )
+
+    # the global timeout expired before the warm up of the last families
+    monkeypatch.setattr(
+        seeker,
+        "_scheduled_search",
+        lambda *args: [(0.9, {}), (-np.inf, {}), (-np.inf, {})],
+    )
+    best_models = seeker.search(X, Y)
+
+    assert len(best_models) == 1
+    assert best_models[0].name().endswith("logistic_regression")
+
+    monkeypatch.setattr(seeker, "_scheduled_search", lambda *args: [(-np.inf, {})] * 3)
+    with pytest.raises(RuntimeError):
+        seeker.search(X, Y)
+
+
+@pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband", "asha"])
 def test_hooks(optimizer_type: str) -> None:
     hook = MockHook()
 
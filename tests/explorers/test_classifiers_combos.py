@@ -1,5 +1,6 @@
 # stdlib
-from typing import Optional
+from pathlib import Path
+from typing import Any, Optional
 
 # third party
 from explorers_mocks import MockHook
@@ -11,7 +12,9 @@ from sklearn.datasets import load_breast_cancer
 # autoprognosis absolute
 from autoprognosis.exceptions import StudyCancelled
 from autoprognosis.explorers.classifiers_combos import EnsembleSeeker
+from autoprognosis.utils.cache import EvaluationCache
 from autoprognosis.utils.metrics import evaluate_auc
+from autoprognosis.utils.tester import evaluate_estimator
 
 
 @pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband"])
@@ -90,6 +93,44 @@ def test_search(optimizer_type: str, group_id: Optional[bool]) -> None:
     assert evaluate_auc(Y, y_pred_proba)[0] > 0.9
 
 
+def test_pretrain_for_cv_cache(tmp_path: Path) -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+    # labels other than 0..K-1
+    Y = Y.map({0: "malignant", 1: "benign"})
+
+    cache = EvaluationCache(tmp_path / "cache")
+    eseeker = EnsembleSeeker(
+        study_name="test_classifiers_combos_cache",
+        CV=3,
+        feature_scaling=[],
+        classifiers=["logistic_regression"],
+        cache=cache,
+    )
+
+    # the fold models stored by the estimator search
+    best_models = [
+        estimator.get_pipeline_from_named_args()
+        for estimator in eseeker.seeker.estimators
+    ]
+    for model in best_models:
+        evaluate_estimator(model, X, Y, eseeker.CV, cache=cache)
+
+    hits = []
+    get_model = cache.get_model
+
+    def counted_get_model(key: str) -> Any:
+        model = get_model(key)
+        hits.append(model is not None)
+        return model
+
+    cache.get_model = counted_get_model  # type: ignore
+
+    folds = eseeker.pretrain_for_cv(best_models, X, Y)
+
+    assert len(folds) == 3
+    assert hits == [True] * 3
+
+
 @pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband"])
 def test_hooks(optimizer_type: str) -> None:
     hook = MockHook()
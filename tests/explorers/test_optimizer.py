@@ -0,0 +1,336 @@
+# stdlib
+from typing import Any
+
+# third party
+import optuna
+import pytest
+
+# autoprognosis absolute
+from autoprognosis.explorers.core.optimizer import EnsembleOptimizer, Optimizer
+from autoprognosis.explorers.core.optimizers.bayesian import (
+    PRUNER_STATE_ATTR,
+    BayesianOptimizer,
+    EarlyStoppingExceeded,
+    ParamRepeatPruner,
+)
+from autoprognosis.explorers.core.selector import PipelineSelector
+
+
+def test_repeat_pruner_shared_state() -> None:
+    study = optuna.create_study(direction="maximize")
+
+    pruner = ParamRepeatPruner(study, patience=2, run_id="run", shared=True)
+    pruner.report_score(0.5)
+    pruner.report_score(0.4)
+    pruner.flush()
+
+    assert study.user_attrs[PRUNER_STATE_ATTR] == {
+        "run": "run",
+        "best_score": 0.5,
+        "no_improvement_for": 1,
+    }
+
+    # a second worker of the run on the same study resumes from the shared state
+    other = ParamRepeatPruner(study, patience=2, run_id="run", shared=True)
+    assert other.best_score == 0.5
+    assert other.no_improvement_for == 1
+
+    other.report_score(0.3)
+    other.flush()
+    assert pruner.no_improvement_for == 1
+    pruner.report_score(0.2)
+    assert pruner.no_improvement_for == 3
+
+    # the next run starts with its own patience
+    resumed = ParamRepeatPruner(study, patience=2, run_id="next", shared=True)
+    assert resumed.no_improvement_for == 0
+    resumed.check_patience(None)
+
+
+def test_repeat_pruner_batched_writes() -> None:
+    study = optuna.create_study(direction="maximize")
+    writes = []
+    set_user_attr = study.set_user_attr
+
+    def _set_user_attr(key: str, value: Any) -> None:
+        writes.append(value)
+        set_user_attr(key, value)
+
+    study.set_user_attr = _set_user_attr
+
+    pruner = ParamRepeatPruner(study, patience=100, run_id="run", shared=True)
+    other = ParamRepeatPruner(study, patience=100, run_id="run", shared=True)
+    for score in [0.5, 0.1, 0.1, 0.1, 0.1, 0.1, 0.1]:
+        pruner.report_score(score)
+    assert len(writes) == 1
+
+    # the reports of the batch are visible to the other workers
+    other.report_pruned()
+    assert other.no_improvement_for == 5
+    assert len(writes) == 1
+
+    pruner.flush()
+    other.flush()
+    assert len(writes) == 3
+    assert study.user_attrs[PRUNER_STATE_ATTR]["no_improvement_for"] == 7
+
+    # the pruners of a single process keep their state
+    local = ParamRepeatPruner(study, patience=100)
+    local.report_score(0.9)
+    local.flush()
+    assert len(writes) == 3
+
+
+def test_repeat_pruner_across_workers() -> None:
+    storage = optuna.storages.InMemoryStorage()
+    study = optuna.create_study(direction="maximize", storage=storage)
+    first = ParamRepeatPruner(study, patience=10, storage=storage)
+    second = ParamRepeatPruner(study, patience=10, storage=storage)
+
+    def objective(trial: optuna.Trial) -> float:
+        trial.suggest_int("x", 0, 1)
+        pruner = first if trial.number % 2 == 0 else second
+        pruner.check_trial(trial)
+        return 0
+
+    for val in [0, 0, 1, 1]:
+        study.enqueue_trial({"x": val})
+    study.optimize(objective, n_trials=4)
+
+    states = [trial.state for trial in study.trials]
+    assert states == [
+        optuna.trial.TrialState.COMPLETE,
+        optuna.trial.TrialState.PRUNED,
+        optuna.trial.TrialState.COMPLETE,
+        optuna.trial.TrialState.PRUNED,
+    ]
+
+
+class _CountingStorage(optuna.storages.InMemoryStorage):
+    def __init__(self) -> None:
+        super().__init__()
+        self.reads = 0
+
+    def get_trial_id_from_study_id_trial_number(
+        self, study_id: int, trial_number: int
+    ) -> int:
+        self.reads += 1
+        return super().get_trial_id_from_study_id_trial_number(study_id, trial_number)
+
+
+def test_repeat_pruner_incremental() -> None:
+    storage = _CountingStorage()
+    study = optuna.create_study(direction="maximize", storage=storage)
+
+    # an earlier run, which crashed with a running trial
+    study.enqueue_trial({"x": 0})
+    stale = study.ask()
+    stale.suggest_int("x", 0, 100)
+    study.enqueue_trial({"x": 1})
+    done = study.ask()
+    done.suggest_int("x", 0, 100)
+    study.tell(done, 0.5)
+
+    run_start = len(study.trials)
+    pruner = ParamRepeatPruner(
+        study, patience=100, storage=storage, run_start=run_start
+    )
+
+    def objective(trial: optuna.Trial) -> float:
+        trial.suggest_int("x", 0, 100)
+        pruner.check_trial(trial)
+        return 0
+
+    # the parameters of the stale trial are evaluated again, the finished ones are not
+    study.enqueue_trial({"x": 0})
+    study.enqueue_trial({"x": 1})
+    study.optimize(objective, n_trials=2)
+    assert [trial.state for trial in study.trials[run_start:]] == [
+        optuna.trial.TrialState.COMPLETE,
+        optuna.trial.TrialState.PRUNED,
+    ]
+
+    # each trial of the run is read once, instead of the whole study per check
+    storage.reads = 0
+    n_trials = 30
+    for idx in range(n_trials):
+        study.enqueue_trial({"x": idx + 2})
+    study.optimize(objective, n_trials=n_trials)
+    assert storage.reads <= n_trials + 1
+
+
+@pytest.mark.parametrize("resume", [False, True])
+def test_bayesian_resume(resume: bool) -> None:
+    def _objective(trial: optuna.Trial) -> float:
+        return -abs(trial.suggest_float("x", 0, 1))
+
+    # an earlier search on the same data, which stopped early
+    earlier = BayesianOptimizer(study_name="resume", evaluation_cbk=lambda: 0)
+    study, pruner = earlier.create_study("resume", patience=2)
+    study.optimize(_objective, n_trials=5)
+    for score in [0.5, 0.1, 0.1, 0.1]:
+        pruner.report_score(score)
+    with pytest.raises(EarlyStoppingExceeded):
+        pruner.check_patience(None)
+
+    optimizer = BayesianOptimizer(
+        study_name="resume", evaluation_cbk=lambda: 0, resume=resume
+    )
+    study, pruner = optimizer.create_study("resume", patience=2)
+
+    if resume:
+        assert len(study.trials) == 5
+        assert pruner.best_score == max(trial.value for trial in study.trials)
+    else:
+        assert len(study.trials) == 0
+
+    # the patience of the earlier search is not inherited
+    assert pruner.no_improvement_for == 0
+    pruner.check_patience(None)
+
+
+@pytest.mark.parametrize("trial_workers", [1, 3])
+def test_bayesian_concurrent_trials(trial_workers: int) -> None:
+    estimator = PipelineSelector("logistic_regression")
+
+    def evaluate(**kwargs: Any) -> float:
+        return -abs(kwargs.get("prediction.classifier.logistic_regression.C", 0) - 1)
+
+    study = Optimizer(
+        study_name=f"test_bayesian_concurrent_trials_{trial_workers}",
+        estimator=estimator,
+        evaluation_cbk=evaluate,
+        n_trials=12,
+        timeout=60,
+        trial_workers=trial_workers,
+    )
+    score, args = study.evaluate()
+
+    assert score <= 0
+    assert isinstance(args, dict)
+
+
+def test_bayesian_concurrent_ensemble() -> None:
+    def evaluate(weights: Any) -> float:
+        return float(weights[0])
+
+    study = EnsembleOptimizer(
+        study_name="test_bayesian_concurrent_ensemble",
+        ensemble_len=3,
+        evaluation_cbk=evaluate,
+        n_trials=10,
+        trial_workers=2,
+    )
+    score, args = study.evaluate()
+
+    assert 0 <= score <= 1
+    assert set(args.keys()) == {"weight_0", "weight_1", "weight_2"}
+
+
+def test_hyperband_fidelity() -> None:
+    estimator = PipelineSelector("random_forest")
+    evaluations = []
+
+    def evaluate(fidelity: float = 1, **kwargs: Any) -> float:
+        evaluations.append(fidelity)
+        # the cheap evaluations look better, but must not be selected
+        return 1 - fidelity
+
+    study = Optimizer(
+        study_name="test_hyperband_fidelity",
+        estimator=estimator,
+        evaluation_cbk=evaluate,
+        optimizer_type="hyperband",
+        max_iter=9,
+        eta=3,
+    )
+    score, _ = study.evaluate()
+
+    assert min(evaluations) < 1
+    assert evaluations.count(1) < len(evaluations)
+    assert score == 0
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_asha(workers: int) -> None:
+    estimator = PipelineSelector("random_forest")
+    evaluations = []
+
+    def evaluate(fidelity: float = 1, **kwargs: Any) -> float:
+        evaluations.append(fidelity)
+        if len(kwargs) == 0:
+            return 0.1  # baseline
+        return (
+            fidelity
+            * kwargs["prediction.classifier.random_forest.min_samples_split"]
+            / 10
+        )
+
+    study = Optimizer(
+        study_name="test_asha",
+        estimator=estimator,
+        evaluation_cbk=evaluate,
+        optimizer_type="asha",
+        n_trials=27,
+        max_iter=9,
+        eta=3,
+        trial_workers=workers,
+    )
+    score, args = study.evaluate()
+
+    # every configuration starts on the lowest rung, and at least the top 1/eta of each rung is promoted
+    assert evaluations.count(1 / 9) == 27
+    assert 9 <= evaluations.count(1 / 3) < 27
+    assert 3 <= evaluations.count(1) - 1 < evaluations.count(1 / 3)
+    assert score >= 0.1
+    assert len(args) > 0
+
+
+def test_asha_ensemble() -> None:
+    def evaluate(weights: Any) -> float:
+        return float(weights[0])
+
+    study = EnsembleOptimizer(
+        study_name="test_asha_ensemble",
+        ensemble_len=3,
+        evaluation_cbk=evaluate,
+        optimizer_type="asha",
+        n_trials=10,
+    )
+    score, args = study.evaluate()
+
+    assert score == 1
+    assert set(args.keys()) == {"weight_0", "weight_1", "weight_2"}
+
+
+@pytest.mark.parametrize("fold_pruning", ["median", "percentile"])
+def test_bayesian_fold_pruning(fold_pruning: str) -> None:
+    estimator = PipelineSelector("logistic_regression")
+    folds = []
+
+    def evaluate(fold_cbk: Any = None, **kwargs: Any) -> float:
+        score = -abs(kwargs.get("prediction.classifier.logistic_regression.C", 0) - 1)
+        if fold_cbk is None:
+            # baseline
+            return score
+
+        for step in range(1, 6):
+            folds.append(step)
+            if fold_cbk(step, score):
+                break
+        return score
+
+    study = Optimizer(
+        study_name=f"test_bayesian_fold_pruning_{fold_pruning}",
+        estimator=estimator,
+        evaluation_cbk=evaluate,
+        n_trials=30,
+        timeout=60,
+        fold_pruning=fold_pruning,
+    )
+    score, args = study.evaluate()
+
+    assert score <= 0
+    assert len(args) > 0
+    # some trials stopped before the last fold
+    assert folds.count(5) < folds.count(1)
@@ -85,7 +85,7 @@ def test_search(group_id: Optional[bool]) -> None:
         assert len(y_pred) == len(Y)
 
 
-@pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband"])
+@pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband", "asha"])
 def test_hooks(optimizer_type: str) -> None:
     hook = MockHook()
 
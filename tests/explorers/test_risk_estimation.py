@@ -111,7 +111,7 @@ def test_eval_surv_estimator() -> None:
     evaluate_survival_estimator(estimator, X, T, Y, eval_time_horizons, 5)
 
 
-@pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband"])
+@pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband", "asha"])
 def test_hooks(optimizer_type: str) -> None:
     hooks = MockHook()
     rossi = load_rossi()
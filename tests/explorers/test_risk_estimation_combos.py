@@ -1,5 +1,5 @@
 # stdlib
-from typing import Optional
+from typing import Any, List, Optional
 
 # third party
 from explorers_mocks import MockHook
@@ -118,6 +118,44 @@ def test_search(group_id: Optional[bool]) -> None:
         ), f"The ensemble should have a better c_index. horizon {eval_time}"
 
 
+def test_search_pretrains_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    rossi = load_rossi()
+
+    X = rossi.drop(["week", "arrest"], axis=1)
+    Y = rossi["arrest"]
+    T = rossi["week"]
+
+    eval_time_horizons = [
+        int(T[Y.iloc[:] == 1].quantile(0.25)),
+        int(T[Y.iloc[:] == 1].quantile(0.50)),
+    ]
+    sq = RiskEnsembleSeeker(
+        study_name="test_risk_estimation_pretrain",
+        time_horizons=eval_time_horizons,
+        num_iter=5,
+        num_ensemble_iter=3,
+        CV=3,
+        ensemble_size=3,
+        timeout=10,
+        estimators=["lognormal_aft", "loglogistic_aft"],
+    )
+
+    calls = []
+    pretrain_for_cv = sq.pretrain_for_cv
+
+    def counted(*args: Any, **kwargs: Any) -> List:
+        calls.append(1)
+        return pretrain_for_cv(*args, **kwargs)
+
+    monkeypatch.setattr(sq, "pretrain_for_cv", counted)
+
+    ensemble = sq.search(X, T, Y)
+
+    # the fold models are shared by the weight searches of all the horizons
+    assert len(calls) == 1
+    assert len(ensemble.weights) == len(eval_time_horizons)
+
+
 @pytest.mark.parametrize("optimizer_type", ["bayesian", "hyperband"])
 def test_hooks(optimizer_type: str) -> None:
     hooks = MockHook()
@@ -0,0 +1,51 @@
+# stdlib
+from typing import Dict, Tuple
+
+# third party
+import numpy as np
+
+# autoprognosis absolute
+from autoprognosis.explorers.core.scheduler import BanditScheduler
+
+
+def test_scheduler_budget() -> None:
+    scheduler = BanditScheduler(n_arms=3, n_trials=20, timeout=60, trials_per_step=5)
+    calls = []
+
+    def step(arm: int, n_trials: int, timeout: int) -> Tuple[float, Dict]:
+        calls.append((arm, n_trials))
+        return 0.5, {"arm": arm}
+
+    results = scheduler.run(step)
+
+    # each estimator gets a step, then the remaining trials go to the leaders
+    assert [arm for arm, _ in calls[:3]] == [0, 1, 2]
+    assert sum(n_trials for _, n_trials in calls) == 20
+    assert len(results) == 3
+    assert results[1] == (0.5, {"arm": 1})
+
+
+def test_scheduler_rejects_weak_estimators() -> None:
+    scheduler = BanditScheduler(
+        n_arms=3, n_trials=200, timeout=60, trials_per_step=5, min_steps=2
+    )
+    quality = [0.9, 0.85, 0.5]
+    rng = np.random.RandomState(0)
+
+    def step(arm: int, n_trials: int, timeout: int) -> Tuple[float, Dict]:
+        return quality[arm] + 0.01 * rng.rand(), {}
+
+    results = scheduler.run(step)
+
+    assert not scheduler.active[2]
+    assert scheduler.steps[2] < scheduler.steps[0]
+    assert np.argmax([score for score, _ in results]) == 0
+
+
+def test_scheduler_timeout() -> None:
+    scheduler = BanditScheduler(n_arms=2, n_trials=100, timeout=0)
+
+    results = scheduler.run(lambda arm, n_trials, timeout: (1, {}))
+
+    assert scheduler.steps.sum() == 0
+    assert results == [(-np.inf, {}), (-np.inf, {})]
@@ -12,3 +12,23 @@ def test_sanity() -> None:
     assert clf.name() == "lda"
 
     assert len(clf.hyperparameter_space()) > 0
+
+
+def test_fidelity() -> None:
+    clf = PipelineSelector("random_forest")
+
+    full = clf.get_pipeline_from_named_args()
+    assert full.get_args()["random_forest"].get("n_estimators", 50) == 50
+
+    cheap = clf.get_pipeline_from_named_args(fidelity=0.2)
+    assert cheap.get_args()["random_forest"]["n_estimators"] == 10
+
+    # plugins without a fidelity knob are unchanged
+    lda = PipelineSelector("lda").get_pipeline_from_named_args(fidelity=0.2)
+    assert lda.get_args()["lda"] == {}
+
+    assert clf.fidelity_folds(1, 5) == 5
+    assert clf.fidelity_folds(0.2, 5) == 2
+    assert clf.fidelity_folds(0.5, 5) == 3
+    assert clf.fidelity_subsample(1) == 1
+    assert clf.fidelity_subsample(0.01) == 0.2
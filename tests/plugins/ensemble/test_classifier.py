@@ -2,11 +2,16 @@
 from typing import Any, List
 
 # third party
+import numpy as np
+import pandas as pd
 import pytest
 from sklearn.datasets import load_breast_cancer
 from sklearn.model_selection import train_test_split
 
 # autoprognosis absolute
+from autoprognosis.exceptions import StudyCancelled
+from autoprognosis.explorers.hooks import DefaultHooks
+from autoprognosis.hooks import Hooks
 from autoprognosis.plugins.ensemble.classifiers import (
     AggregatingEnsemble,
     StackingEnsemble,
@@ -114,6 +119,67 @@ def test_weighted_ensemble_cv_sanity(serialize: bool) -> None:
     assert y_pred.shape == (len(X_test), 2)
 
 
+class _CancelAfter(Hooks):
+    def __init__(self, checks: int) -> None:
+        self.checks = checks
+
+    def cancel(self) -> bool:
+        self.checks -= 1
+        return self.checks < 0
+
+    def heartbeat(
+        self, topic: str, subtopic: str, event_type: str, **kwargs: Any
+    ) -> None:
+        pass
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_weighted_ensemble_cv_parallel_fit(n_jobs: int) -> None:
+    X, y = load_breast_cancer(return_X_y=True, as_frame=True)
+
+    def _ensemble(hooks: Hooks = DefaultHooks()) -> WeightedEnsembleCV:
+        return WeightedEnsembleCV(
+            models=[
+                Pipeline(["prediction.classifier.logistic_regression"])(),
+                Pipeline(["prediction.classifier.random_forest"])(),
+            ],
+            weights=[0.5, 0.5],
+            n_folds=3,
+            n_jobs=n_jobs,
+            hooks=hooks,
+        )
+
+    ens = _ensemble().fit(X, y)
+
+    # each fold has its own base models
+    assert len({id(fold.models[0]) for fold in ens.models}) == 3
+
+    reference = _ensemble().fit(X, y)
+    assert np.allclose(ens.predict_proba(X), reference.predict_proba(X))
+
+    with pytest.raises(StudyCancelled):
+        _ensemble(hooks=_CancelAfter(1)).fit(X, y)
+
+
+def test_weighted_ensemble_predict_batches() -> None:
+    X, y = load_breast_cancer(return_X_y=True, as_frame=True)
+    models = [
+        Pipeline(["prediction.classifier.logistic_regression"])(),
+        Pipeline(["prediction.classifier.random_forest"])(),
+    ]
+
+    for ens in [
+        WeightedEnsemble(models, [0.5, 0.5]),
+        WeightedEnsembleCV(models=models, weights=[0.5, 0.5], n_folds=2),
+    ]:
+        ens.fit(X, y)
+
+        streamed = pd.concat(ens.predict_proba_batches(X, batch_size=100))
+
+        assert (streamed.index == X.index).all()
+        assert np.allclose(streamed.to_numpy(), ens.predict_proba(X).to_numpy())
+
+
 @pytest.mark.slow
 def test_weighted_ensemble_cv_explainer() -> None:
     dtype = Pipeline(
@@ -1,11 +1,19 @@
+# stdlib
+from typing import Any
+
 # third party
 from lifelines.datasets import load_rossi
 import numpy as np
+import pandas as pd
 import pytest
 from sklearn.model_selection import train_test_split
 
 # autoprognosis absolute
+from autoprognosis.exceptions import StudyCancelled
+from autoprognosis.explorers.hooks import DefaultHooks
+from autoprognosis.hooks import Hooks
 from autoprognosis.plugins.ensemble.risk_estimation import RiskEnsemble, RiskEnsembleCV
+from autoprognosis.plugins.pipeline import Pipeline
 from autoprognosis.plugins.prediction import Predictions
 from autoprognosis.utils.metrics import (
     evaluate_skurv_brier_score,
@@ -169,3 +177,140 @@ def test_risk_estimation_cv_fit_predict(src: str) -> None:
 
     assert mean.shape == (len(X), len(eval_time_horizons))
     assert uncert.shape == (len(X), len(eval_time_horizons))
+
+
+def test_risk_estimation_ensemble_predict_batched() -> None:
+    # the ensemble merges the models with the same args
+    cox_ph = Pipeline(["prediction.risk_estimation.cox_ph"])(
+        {"cox_ph": {"penalizer": 0.1}}
+    )
+    lognormal_aft = Pipeline(["prediction.risk_estimation.lognormal_aft"])(
+        {"lognormal_aft": {"alpha": 0.1}}
+    )
+    weibull_aft = Pipeline(["prediction.risk_estimation.weibull_aft"])()
+
+    # the same weights at all the horizons: the ensemble is the weighted mean of the models
+    weights = np.asarray([[0.3, 0.7, 0]] * len(eval_time_horizons))
+    surv_ensemble = RiskEnsemble(
+        [cox_ph, lognormal_aft, weibull_aft],
+        weights,
+        eval_time_horizons,
+    ).fit(tr_X, tr_T, tr_Y)
+
+    reference = sum(
+        weight * np.asarray(model.predict(te_X, eval_time_horizons))
+        for weight, model in zip(surv_ensemble.weights[0], surv_ensemble.models)
+        if weight != 0
+    )
+
+    pred = surv_ensemble.predict(te_X, eval_time_horizons)
+    batched = surv_ensemble.predict(te_X, eval_time_horizons, n_jobs=2, batch_size=7)
+
+    assert pred.shape == (len(te_X), len(eval_time_horizons))
+    assert np.allclose(pred.to_numpy(), reference)
+    assert np.allclose(batched.to_numpy(), reference)
+
+    # the model without weight is not evaluated
+    surv_ensemble.models[2] = None
+    assert np.allclose(surv_ensemble.predict(te_X, eval_time_horizons), reference)
+
+
+def test_risk_estimation_cv_predict_iter() -> None:
+    ens = RiskEnsembleCV(
+        time_horizons=eval_time_horizons,
+        models=[
+            Pipeline(["prediction.risk_estimation.cox_ph"])(
+                {"cox_ph": {"penalizer": 0.1}}
+            ),
+            Pipeline(["prediction.risk_estimation.weibull_aft"])(),
+        ],
+        weights=[[0.5, 0.5]] * len(eval_time_horizons),
+        n_folds=2,
+    ).fit(tr_X, tr_T, tr_Y)
+
+    reference = ens.predict(te_X, eval_time_horizons)
+    streamed = pd.concat(ens.predict_iter(te_X, eval_time_horizons, batch_size=10))
+
+    assert (streamed.index == te_X.index).all()
+    assert np.allclose(streamed.to_numpy(), reference.to_numpy())
+
+
+class _CancelAfter(Hooks):
+    def __init__(self, checks: int) -> None:
+        self.checks = checks
+
+    def cancel(self) -> bool:
+        self.checks -= 1
+        return self.checks < 0
+
+    def heartbeat(
+        self, topic: str, subtopic: str, event_type: str, **kwargs: Any
+    ) -> None:
+        pass
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_risk_estimation_cv_parallel_fit(n_jobs: int) -> None:
+    def _ensemble(hooks: Hooks = DefaultHooks()) -> RiskEnsembleCV:
+        models = [
+            Pipeline(["prediction.risk_estimation.cox_ph"])(
+                {"cox_ph": {"penalizer": 0.1}}
+            ),
+            Pipeline(["prediction.risk_estimation.weibull_aft"])(),
+        ]
+        return RiskEnsembleCV(
+            time_horizons=eval_time_horizons,
+            models=models,
+            weights=[[0.5, 0.5]] * len(eval_time_horizons),
+            n_folds=3,
+            n_jobs=n_jobs,
+            hooks=hooks,
+        )
+
+    ens = _ensemble().fit(X, T, Y)
+    assert len({id(fold.models[0]) for fold in ens.models}) == 3
+
+    reference = _ensemble().fit(X, T, Y)
+    assert np.allclose(
+        ens.predict(X, eval_time_horizons), reference.predict(X, eval_time_horizons)
+    )
+
+    # a single model, as in the comparative models of the builder
+    single = RiskEnsembleCV(
+        time_horizons=eval_time_horizons,
+        ensemble=Predictions(category="risk_estimation").get("cox_ph"),
+        n_jobs=n_jobs,
+    ).fit(X, T, Y)
+    assert single.predict(X, eval_time_horizons).shape == (
+        len(X),
+        len(eval_time_horizons),
+    )
+
+    with pytest.raises(StudyCancelled):
+        _ensemble(hooks=_CancelAfter(1)).fit(X, T, Y)
+
+
+def test_risk_estimation_cv_plain_plugin_args() -> None:
+    # the comparative models of the builder wrap plain plugins
+    ens = RiskEnsembleCV(
+        time_horizons=eval_time_horizons,
+        ensemble=Predictions(category="risk_estimation").get("cox_ph"),
+        n_folds=2,
+    ).fit(tr_X, tr_T, tr_Y)
+
+    calls = []
+    for fold in ens.models:
+        _predict = fold._predict
+
+        def _recorded(X: pd.DataFrame, *args: Any, _predict: Any = _predict) -> Any:
+            calls.append(args)
+            return _predict(X, *args)
+
+        fold._predict = _recorded
+
+    mean, uncert = ens.predict_with_uncertainty(
+        te_X, eval_time_horizons, n_jobs=2, batch_size=7
+    )
+
+    assert mean.shape == (len(te_X), len(eval_time_horizons))
+    assert calls == [(eval_time_horizons,)] * 2
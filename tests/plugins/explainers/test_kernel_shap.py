@@ -1,15 +1,20 @@
 # stdlib
-from typing import Tuple
+from typing import Any, Dict, Tuple
 
 # third party
 from lifelines.datasets import load_rossi
 import numpy as np
+import pandas as pd
 import pytest
 from sklearn.datasets import load_breast_cancer
 from sklearn.model_selection import train_test_split
 
 # autoprognosis absolute
-from autoprognosis.plugins.explainers.plugin_kernel_shap import plugin
+from autoprognosis.plugins.explainers.plugin_kernel_shap import (
+    background_summary,
+    plugin,
+)
+import autoprognosis.plugins.explainers.plugin_kernel_shap as kernel_shap
 from autoprognosis.plugins.pipeline import Pipeline
 from autoprognosis.plugins.prediction.classifiers import Classifiers
 from autoprognosis.plugins.prediction.risk_estimation.plugin_cox_ph import (
@@ -46,6 +51,156 @@ def test_plugin_sanity(classifier: str) -> None:
     assert result.shape == X_test.shape
 
 
+def _fitted(n_features: int) -> Tuple:
+    X_train, X_test, y_train, y_test = dataset()
+    X_train, X_test = X_train[:, :n_features], X_test[:, :n_features]
+
+    pipeline = Pipeline(
+        [
+            Preprocessors().get_type("minmax_scaler").fqdn(),
+            Classifiers().get_type("logistic_regression").fqdn(),
+        ]
+    )().fit(X_train, y_train)
+
+    return pipeline, X_train, X_test, y_train
+
+
+def test_plugin_batched_exact() -> None:
+    # all the coalitions of 5 features are enumerated: the sampling has no effect
+    pipeline, X_train, X_test, y_train = _fitted(5)
+
+    explainer = plugin(
+        pipeline,
+        X_train,
+        y_train,
+        task_type="classification",
+        prefit=True,
+        batch_size=64,
+    )
+    result = explainer.explain(X_test[:10])
+
+    assert result.shape == (10, 5)
+    assert np.allclose(result, explainer.explainer.shap_values(X_test[:10])[1])
+
+    # the background summary is shared by the explainers of the same training set
+    assert background_summary(pd.DataFrame(X_train), 10) is explainer.explainer.data
+
+
+def test_plugin_max_coalitions() -> None:
+    pipeline, X_train, X_test, y_train = _fitted(30)
+
+    explainer = plugin(
+        pipeline,
+        X_train,
+        y_train,
+        task_type="classification",
+        prefit=True,
+        max_coalitions=40,
+    )
+    result = explainer.explain(X_test[:10])
+
+    assert result.shape == (10, 30)
+    assert np.array_equal(result, explainer.explain(X_test[:10]))
+
+    # the SHAP values add up to the output of the model
+    expected = pipeline.predict_proba(pd.DataFrame(X_test[:10])).values[:, 1]
+    assert np.allclose(
+        result.sum(axis=1) + explainer.explainer.expected_value[1], expected
+    )
+
+
+def test_plugin_unsupported_shap(monkeypatch: pytest.MonkeyPatch) -> None:
+    pipeline, X_train, X_test, y_train = _fitted(30)
+
+    explainer = plugin(
+        pipeline,
+        X_train,
+        y_train,
+        task_type="classification",
+        prefit=True,
+        max_coalitions=40,
+        n_jobs=1,
+    )
+    min_version, max_version = kernel_shap.REPLAY_SHAP_VERSIONS
+    if min_version <= kernel_shap._shap_version() < max_version:
+        assert kernel_shap._replay_supported(explainer.explainer)
+
+    batched = explainer.explain(X_test[:10])
+
+    # the plain shap_values, with the same coalitions
+    monkeypatch.setattr(kernel_shap, "REPLAY_SHAP_VERSIONS", ((0, 0), (0, 0)))
+    assert not kernel_shap._replay_supported(explainer.explainer)
+
+    assert np.allclose(explainer.explain(X_test[:10]), batched)
+
+
+def test_plugin_workers(monkeypatch: pytest.MonkeyPatch) -> None:
+    # enough coalitions to skip the feature selection, which is sensitive to the BLAS threads of the workers
+    pipeline, X_train, X_test, y_train = _fitted(10)
+
+    tasks = []
+    parallel_map = kernel_shap.resources.parallel_map
+
+    def _parallel_map(fn: Any, fn_tasks: Any, **kwargs: Any) -> Any:
+        tasks.append(len(fn_tasks))
+        return parallel_map(fn, fn_tasks, **kwargs)
+
+    monkeypatch.setattr(kernel_shap.resources, "parallel_map", _parallel_map)
+
+    results = []
+    for n_jobs in [1, 2]:
+        explainer = plugin(
+            pipeline,
+            X_train,
+            y_train,
+            task_type="classification",
+            prefit=True,
+            max_coalitions=500,
+            n_jobs=n_jobs,
+        )
+        results.append(explainer.explain(X_test[:20]))
+
+    # one task per worker, with the same chunks and seeds
+    assert tasks == [1, 2]
+    assert np.allclose(results[0], results[1])
+
+
+def test_replay_cost() -> None:
+    pipeline, X_train, X_test, y_train = _fitted(30)
+    explainer = plugin(
+        pipeline, X_train, y_train, task_type="classification", prefit=True
+    ).explainer
+
+    model_f = explainer.model.f
+    shap_values = explainer.shap_values
+    calls: Dict[str, list] = {"model": [], "passes": []}
+
+    def _model(X: np.ndarray) -> np.ndarray:
+        calls["model"].append(len(X))
+        return model_f(X)
+
+    def _shap_values(*args: Any, **kwargs: Any) -> Any:
+        calls["passes"].append(1)
+        return shap_values(*args, **kwargs)
+
+    explainer.model.f = _model
+    explainer.shap_values = _shap_values
+
+    X = X_test[: kernel_shap.ROWS_PER_CHUNK]
+    replay = kernel_shap._explain_rows(explainer, X, "auto", 0, 100000)
+    replay_calls = {key: list(val) for key, val in calls.items()}
+
+    calls = {"model": [], "passes": []}
+    plain = kernel_shap._shap_values(explainer, X, "auto", 0)
+
+    assert np.allclose(np.asarray(replay), np.asarray(plain))
+
+    # the model scores the same samples, in a few large calls, but the sampling of shap runs twice
+    assert sum(replay_calls["model"]) == sum(calls["model"])
+    assert len(replay_calls["model"]) < len(calls["model"]) == 2 * len(X)
+    assert len(replay_calls["passes"]) == 2 * len(calls["passes"]) == 2
+
+
 def test_plugin_name() -> None:
     assert plugin.name() == "kernel_shap"
 
@@ -44,6 +44,118 @@ def test_plugin_sanity(classifier: str) -> None:
     assert len(result) == 2
 
 
+def test_plugin_batched_parity() -> None:
+    X_train, X_test, y_train, y_test = dataset()
+
+    pipeline = Pipeline(
+        [
+            Preprocessors().get_type("minmax_scaler").fqdn(),
+            Classifiers().get_type("logistic_regression").fqdn(),
+        ]
+    )().fit(X_train, y_train)
+
+    explainer = plugin(
+        pipeline,
+        X_train,
+        y_train,
+        task_type="classification",
+        prefit=True,
+        num_samples=1000,
+        batch_size=2500,
+    )
+    result = explainer.explain(X_test[:5])
+
+    assert result.shape == (5, 10)
+
+    # the reference: one explain_instance call per row, with the same seed
+    reference = plugin(
+        pipeline, X_train, y_train, task_type="classification", prefit=True
+    )
+    for idx, row in enumerate(X_test[:5]):
+        expected = reference.explainer.explain_instance(
+            row, reference.predict_fn, num_samples=1000
+        ).as_list(label=1)
+
+        assert np.allclose(result.iloc[idx].values, [val for _, val in expected])
+    assert list(result.columns) == [col for col, _ in expected]
+
+    # the RNG of the explainer is consumed like in the sequential explanations
+    assert np.array_equal(
+        explainer.explainer.random_state.get_state()[1],
+        reference.explainer.random_state.get_state()[1],
+    )
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_plugin_batched_workers(n_jobs: int) -> None:
+    X_train, X_test, y_train, y_test = dataset()
+
+    pipeline = Pipeline(
+        [
+            Preprocessors().get_type("minmax_scaler").fqdn(),
+            Classifiers().get_type("logistic_regression").fqdn(),
+        ]
+    )().fit(X_train, y_train)
+
+    def _explainer(n_jobs: int) -> plugin:
+        return plugin(
+            pipeline,
+            X_train,
+            y_train,
+            task_type="classification",
+            prefit=True,
+            num_samples=500,
+            batch_size=1500,
+            n_jobs=n_jobs,
+        )
+
+    # the perturbations are sampled once, in the process of the explainer
+    reference = _explainer(1).explain(X_test[:7])
+    result = _explainer(n_jobs).explain(X_test[:7])
+
+    assert np.allclose(result.values, reference.values)
+    assert list(result.columns) == list(reference.columns)
+
+
+def test_plugin_batched_risk_estimation() -> None:
+    rossi = load_rossi()
+
+    X = rossi.drop(["week", "arrest"], axis=1)
+    Y = rossi["arrest"]
+    T = rossi["week"]
+    eval_times = [
+        int(T[Y.iloc[:] == 1].quantile(0.50)),
+        int(T[Y.iloc[:] == 1].quantile(0.75)),
+    ]
+
+    surv = CoxPH().fit(X, T, Y)
+
+    def _explainer() -> plugin:
+        return plugin(
+            surv,
+            X,
+            Y,
+            time_to_event=T,
+            eval_times=eval_times,
+            task_type="risk_estimation",
+            prefit=True,
+            num_samples=500,
+            batch_size=1000,
+        )
+
+    result = _explainer().explain(X.head(3))
+    assert result.shape == (3, X.shape[1])
+
+    reference = _explainer()
+    for idx, row in enumerate(X.head(3).values):
+        expected = reference.explainer.explain_instance(
+            row, reference.predict_fn, num_samples=500
+        ).as_list(label=1)
+
+        assert np.allclose(result.iloc[idx].values, [val for _, val in expected])
+    assert list(result.columns) == [col for col, _ in expected]
+
+
 def test_plugin_name() -> None:
     assert plugin.name() == "lime"
 
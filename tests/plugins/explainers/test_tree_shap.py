@@ -0,0 +1,122 @@
+# stdlib
+from typing import Any, Tuple
+
+# third party
+from lifelines.datasets import load_rossi
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_breast_cancer
+
+# autoprognosis absolute
+from autoprognosis.plugins.ensemble.classifiers import WeightedEnsemble
+from autoprognosis.plugins.ensemble.risk_estimation import RiskEnsemble
+from autoprognosis.plugins.explainers.plugin_tree_shap import (
+    _KernelMember,
+    _TreeMember,
+    plugin,
+)
+from autoprognosis.plugins.pipeline import Pipeline
+
+
+def dataset() -> Tuple[pd.DataFrame, pd.Series]:
+    X, y = load_breast_cancer(return_X_y=True, as_frame=True)
+    # few features: the KernelSHAP coalitions are enumerated
+    return X.iloc[:, :6], y
+
+
+def _pipeline(*plugins: str) -> Any:
+    return Pipeline(list(plugins))()
+
+
+def test_plugin_name() -> None:
+    assert plugin.name() == "tree_shap"
+
+
+@pytest.mark.parametrize("classifier", ["xgboost", "lgbm", "random_forest"])
+def test_plugin_tree_pipeline(classifier: str) -> None:
+    X, y = dataset()
+
+    pipeline = _pipeline(
+        "preprocessor.feature_scaling.minmax_scaler",
+        f"prediction.classifier.{classifier}",
+    ).fit(X, y)
+
+    explainer = plugin(pipeline, X, y, task_type="classification", prefit=True)
+    assert isinstance(explainer.explainer, _TreeMember)
+
+    result = explainer.explain(X[:20])
+    assert result.shape == (20, X.shape[1])
+
+    # the SHAP values add up to the probability of the positive class
+    expected = pipeline.predict_proba(X[:20]).values[:, 1]
+    assert np.allclose(result.sum(axis=1) + explainer.expected_value, expected)
+
+
+def test_plugin_weighted_ensemble() -> None:
+    X, y = dataset()
+
+    ensemble = WeightedEnsemble(
+        [
+            _pipeline(
+                "preprocessor.feature_scaling.scaler", "prediction.classifier.xgboost"
+            ),
+            _pipeline("prediction.classifier.logistic_regression"),
+            # the projection mixes the features
+            _pipeline(
+                "preprocessor.dimensionality_reduction.pca",
+                "prediction.classifier.random_forest",
+            ),
+        ],
+        [0.5, 0.3, 0.2],
+    ).fit(X, y)
+
+    explainer = plugin(ensemble, X, y, task_type="classification", prefit=True)
+    assert [type(member) for member in explainer.explainer.members] == [
+        _TreeMember,
+        _KernelMember,
+        _KernelMember,
+    ]
+
+    result = explainer.explain(X[:5])
+    assert result.shape == (5, X.shape[1])
+
+    expected = ensemble.predict_proba(X[:5]).values[:, 1]
+    assert np.allclose(result.sum(axis=1) + explainer.expected_value, expected)
+
+
+def test_plugin_risk_ensemble() -> None:
+    rossi = load_rossi()
+
+    X = rossi.drop(["week", "arrest"], axis=1)
+    Y = rossi["arrest"]
+    T = rossi["week"]
+    eval_times = [int(T[Y == 1].quantile(q)) for q in [0.25, 0.5, 0.75]]
+
+    ensemble = RiskEnsemble(
+        [
+            _pipeline(
+                "preprocessor.feature_scaling.scaler",
+                "prediction.risk_estimation.cox_ph",
+            ).fit(X, T, Y),
+            _pipeline("prediction.risk_estimation.weibull_aft").fit(X, T, Y),
+        ],
+        [[0.2, 0.8], [0.5, 0.5], [0.9, 0.1]],
+        eval_times,
+    )
+
+    explainer = plugin(
+        ensemble,
+        X,
+        Y,
+        time_to_event=T,
+        eval_times=eval_times,
+        task_type="risk_estimation",
+        prefit=True,
+    )
+    result = explainer.explain(X.head(4))
+    assert result.shape == (4, X.shape[1])
+
+    # the risk at the last evaluation time
+    expected = ensemble.predict(X.head(4), eval_times).values[:, -1]
+    assert np.allclose(result.sum(axis=1) + explainer.expected_value, expected)
@@ -0,0 +1,176 @@
+# stdlib
+from typing import Any, List
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_breast_cancer, load_iris
+from sklearn.preprocessing import MinMaxScaler, StandardScaler
+
+# autoprognosis absolute
+from autoprognosis.plugins.pipeline import CompiledPipeline, Pipeline
+
+
+def _dataset(categorical: bool = False, missing: bool = False) -> Any:
+    X, y = load_breast_cancer(return_X_y=True, as_frame=True)
+    X = X.iloc[:, :10].copy()
+    if missing:
+        X.iloc[::7, 1] = np.nan
+    else:
+        # dropped by the first stage
+        X["constant"] = 1.0
+    if categorical:
+        X["group"] = np.where(X.iloc[:, 0] > X.iloc[:, 0].median(), "high", "low")
+
+    return X, y
+
+
+@pytest.mark.parametrize(
+    "plugins",
+    [
+        ["prediction.classifier.logistic_regression"],
+        [
+            "preprocessor.feature_scaling.scaler",
+            "prediction.classifier.logistic_regression",
+        ],
+        [
+            "preprocessor.feature_scaling.minmax_scaler",
+            "preprocessor.dimensionality_reduction.pca",
+            "prediction.classifier.logistic_regression",
+        ],
+        [
+            "preprocessor.dimensionality_reduction.variance_threshold",
+            "preprocessor.feature_scaling.maxabs_scaler",
+            "preprocessor.feature_scaling.nop",
+            "prediction.classifier.logistic_regression",
+        ],
+        # the stages which cannot be fused run on DataFrames
+        [
+            "imputer.default.median",
+            "preprocessor.feature_scaling.scaler",
+            "prediction.classifier.logistic_regression",
+        ],
+        [
+            "preprocessor.feature_scaling.scaler",
+            "preprocessor.feature_scaling.normal_transform",
+            "preprocessor.feature_scaling.minmax_scaler",
+            "prediction.classifier.random_forest",
+        ],
+    ],
+)
+@pytest.mark.parametrize("categorical", [False, True])
+def test_compiled_pipeline_parity(plugins: List[str], categorical: bool) -> None:
+    missing = plugins[0].startswith("imputer")
+    if missing and categorical:
+        pytest.skip("the imputers expect numerical data")
+
+    X, y = _dataset(categorical, missing=missing)
+
+    pipeline = Pipeline(plugins)()
+    pipeline.fit(X, y)
+
+    compiled = pipeline.compile()
+    assert isinstance(compiled, CompiledPipeline)
+
+    reference = pipeline.predict_proba(X).to_numpy()
+
+    assert np.allclose(compiled.predict_proba(X), reference)
+    # shuffled columns
+    assert np.allclose(compiled.predict_proba(X[X.columns[::-1]]), reference)
+    # single row
+    assert np.allclose(compiled.predict_proba(X.iloc[3].to_numpy()), reference[[3]])
+    assert np.array_equal(compiled.predict(X), pipeline.predict(X).to_numpy())
+
+    if not categorical:
+        assert np.allclose(compiled.predict_proba(X.to_numpy()), reference)
+
+
+@pytest.mark.parametrize(
+    "plugins,args",
+    [
+        (
+            ["preprocessor.feature_scaling.scaler"],
+            {"scaler": {"model": StandardScaler(with_mean=False)}},
+        ),
+        (
+            ["preprocessor.feature_scaling.scaler"],
+            {"scaler": {"model": StandardScaler(with_std=False)}},
+        ),
+        (
+            ["preprocessor.feature_scaling.scaler"],
+            {"scaler": {"model": StandardScaler(with_mean=False, with_std=False)}},
+        ),
+        (
+            ["preprocessor.feature_scaling.minmax_scaler"],
+            {"minmax_scaler": {"model": MinMaxScaler(feature_range=(-1, 2))}},
+        ),
+    ],
+)
+def test_compiled_pipeline_transformer_settings(plugins: List[str], args: dict) -> None:
+    X, y = _dataset()
+
+    pipeline = Pipeline(plugins + ["prediction.classifier.logistic_regression"])(args)
+    pipeline.fit(X, y)
+
+    assert np.allclose(
+        pipeline.compile().predict_proba(X), pipeline.predict_proba(X).to_numpy()
+    )
+
+
+def test_compiled_pipeline_multiclass() -> None:
+    X, y = load_iris(return_X_y=True, as_frame=True)
+
+    for multi_class in [0, 1, 2]:
+        pipeline = Pipeline(
+            [
+                "preprocessor.feature_scaling.scaler",
+                "prediction.classifier.logistic_regression",
+            ]
+        )({"logistic_regression": {"multi_class": multi_class}})
+        pipeline.fit(X, y)
+
+        assert np.allclose(
+            pipeline.compile().predict_proba(X), pipeline.predict_proba(X).to_numpy()
+        )
+
+
+def test_compiled_pipeline_errors() -> None:
+    X, y = _dataset(categorical=True)
+
+    pipeline = Pipeline(["prediction.classifier.logistic_regression"])()
+    with pytest.raises(ValueError):
+        pipeline.compile()
+
+    pipeline.fit(X, y)
+    compiled = pipeline.compile()
+
+    unseen = X.copy()
+    unseen.loc[0, "group"] = "unknown"
+    with pytest.raises(ValueError):
+        compiled.predict_proba(unseen)
+
+    with pytest.raises(ValueError):
+        compiled.predict_proba(X.to_numpy()[:, :5])
+
+
+@pytest.mark.parametrize("compile", [False, True])
+def test_benchmark_compiled_single_row(benchmark: Any, compile: bool) -> None:
+    X, y = _dataset()
+
+    pipeline = Pipeline(
+        [
+            "preprocessor.feature_scaling.scaler",
+            "prediction.classifier.logistic_regression",
+        ]
+    )()
+    pipeline.fit(X, y)
+
+    if compile:
+        model = pipeline.compile()
+        row: Any = X.iloc[0].to_numpy()
+    else:
+        model = pipeline
+        row = pd.DataFrame(X.iloc[[0]])
+
+    benchmark(model.predict_proba, row)
@@ -1,4 +1,5 @@
 # stdlib
+from pathlib import Path
 from typing import Any, List, Tuple
 
 # third party
@@ -219,3 +220,31 @@ def test_pipeline_pickle() -> None:
 
     assert pipeline.name() == new_pipeline.name()
     assert pipeline.get_args() == new_pipeline.get_args()
+
+
+def test_pipeline_predict_batches(tmp_path: Path) -> None:
+    X_train, X_test, y_train, y_test = dataset()
+
+    pipeline = Pipeline(
+        [
+            Preprocessors().get_type("scaler").fqdn(),
+            Classifiers().get_type("logistic_regression").fqdn(),
+        ]
+    )()
+    pipeline.fit(pd.DataFrame(X_train), pd.Series(y_train))
+
+    X_test = pd.DataFrame(X_test)
+    reference = pipeline.predict_proba(X_test)
+
+    streamed = pd.concat(pipeline.predict_proba_batches(X_test, batch_size=16))
+    assert np.allclose(streamed.to_numpy(), reference.to_numpy())
+
+    # chunks read from a file
+    X_test.to_csv(tmp_path / "test.csv", index=False)
+    streamed = pd.concat(
+        pipeline.predict_proba_batches(tmp_path / "test.csv", batch_size=16)
+    )
+    assert np.allclose(streamed.to_numpy(), reference.to_numpy())
+
+    labels = pd.concat(pipeline.predict_iter(X_test, batch_size=16))
+    assert (labels.to_numpy() == pipeline.predict(X_test).to_numpy()).all()
@@ -1,9 +1,55 @@
+# stdlib
+from typing import Any
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
 # autoprognosis absolute
 from autoprognosis.plugins.prediction.risk_estimation.benchmarks.cvd.aha.model import (
+    AHAModel,
     inference,
+    mmolL_to_mgdl,
 )
 
 
+def _cohort(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    return pd.DataFrame(
+        {
+            "sex": rng.choice(["M", "F", "f"], n),
+            "race": rng.choice(["W", "B", "w"], n),
+            "age": rng.uniform(40, 79, n),
+            "tchol": rng.uniform(3, 9, n),
+            "hdl": rng.uniform(0.5, 3, n),
+            "sbp": rng.uniform(90, 200, n),
+            "smoker": rng.integers(0, 2, n),
+            "diabetes": rng.integers(0, 3, n),
+            "ht_treat": rng.integers(0, 2, n),
+        }
+    )
+
+
+def _legacy_predict(df: pd.DataFrame) -> np.ndarray:
+    # the row-by-row evaluation of the scalar equations
+    def _row(row: pd.Series) -> float:
+        return inference(
+            gender=row["sex"],
+            age=row["age"],
+            tchol=mmolL_to_mgdl(row["tchol"]),
+            hdlc=mmolL_to_mgdl(row["hdl"]),
+            sbp=row["sbp"],
+            smoking=row["smoker"],
+            diab=row["diabetes"],
+            ht_treat=row["ht_treat"],
+            race=row["race"],
+        )
+
+    return df.apply(_row, axis=1).to_numpy()
+
+
 def test_sanity() -> None:
     score = inference(
         gender="M",
@@ -17,3 +63,27 @@ def test_sanity() -> None:
         race="W",
     )
     assert score < 1
+
+
+def test_batch_parity() -> None:
+    df = _cohort(5000)
+
+    preds = AHAModel().predict(df)
+
+    assert list(preds.columns) == [10 * 365]
+    assert np.array_equal(preds.to_numpy()[:, 0], _legacy_predict(df))
+
+
+def test_batch_invalid() -> None:
+    df = _cohort(10)
+    df.loc[3, "race"] = "X"
+
+    with pytest.raises(ValueError):
+        AHAModel().predict(df)
+
+
+def test_benchmark_batch(benchmark: Any) -> None:
+    df = _cohort(200000)
+
+    preds = benchmark.pedantic(AHAModel().predict, args=(df,), rounds=3)
+    assert preds.shape == (len(df), 1)
@@ -1,9 +1,60 @@
+# stdlib
+from typing import Any
+
+# third party
+import numpy as np
+import pandas as pd
+
 # autoprognosis absolute
 from autoprognosis.plugins.prediction.risk_estimation.benchmarks.cvd.framingham.model import (
+    FraminghamModel,
     inference,
+    mmolL_to_mgdl,
 )
 
 
+def _cohort(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    df = pd.DataFrame(
+        {
+            "sex": rng.choice(["M", "F", "m", "f"], n),
+            # the integer ages hit the bounds of the bands, the others the gaps between the bands
+            "age": np.where(
+                rng.random(n) < 0.5,
+                rng.integers(25, 85, n),
+                rng.uniform(25, 85, n),
+            ),
+            "tchol": rng.uniform(2, 20, n),
+            "hdl": rng.uniform(1, 4, n),
+            "sbp": rng.integers(90, 200, n),
+            "smoker": rng.integers(0, 2, n),
+            "ht_treat": rng.integers(0, 2, n),
+        }
+    )
+    # the gaps of the cholesterol and HDL bands
+    df.loc[:10, "tchol"] = 285 / 18.0182
+    df.loc[10:20, "hdl"] = 59.5 / 18.0182
+
+    return df
+
+
+def _legacy_predict(df: pd.DataFrame) -> np.ndarray:
+    # the row-by-row evaluation of the scalar points
+    def _row(row: pd.Series) -> float:
+        return inference(
+            sex=row["sex"],
+            age=row["age"],
+            total_cholesterol=mmolL_to_mgdl(row["tchol"]),
+            hdl_cholesterol=mmolL_to_mgdl(row["hdl"]),
+            systolic_blood_pressure=row["sbp"],
+            smoker=row["smoker"],
+            blood_pressure_med_treatment=row["ht_treat"],
+        )
+
+    return df.apply(_row, axis=1).to_numpy()
+
+
 def test_sanity() -> None:
     score = inference(
         sex="F",
@@ -16,3 +67,19 @@ def test_sanity() -> None:
     )
 
     assert score < 1
+
+
+def test_batch_parity() -> None:
+    df = _cohort(5000)
+
+    preds = FraminghamModel().predict(df)
+
+    assert list(preds.columns) == [10 * 365]
+    assert np.array_equal(preds.to_numpy()[:, 0], _legacy_predict(df))
+
+
+def test_benchmark_batch(benchmark: Any) -> None:
+    df = _cohort(200000)
+
+    preds = benchmark.pedantic(FraminghamModel().predict, args=(df,), rounds=3)
+    assert preds.shape == (len(df), 1)
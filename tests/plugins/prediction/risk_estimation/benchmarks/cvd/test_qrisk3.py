@@ -1,9 +1,85 @@
+# stdlib
+from typing import Any
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
 # autoprognosis absolute
 from autoprognosis.plugins.prediction.risk_estimation.benchmarks.cvd.qrisk3.model import (
+    QRisk3Model,
     inference,
 )
 
 
+def _cohort(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    df = pd.DataFrame(
+        {
+            "sex": rng.choice(["M", "F"], n),
+            "age": rng.uniform(25, 84, n),
+            "bmi": rng.uniform(18, 45, n),
+            "ethrisk": rng.integers(1, 10, n),
+            "chol_ratio": rng.uniform(1, 11, n),
+            "sbp": rng.uniform(80, 200, n),
+            "sbps5": rng.uniform(0, 30, n),
+            "smoker": rng.integers(0, 5, n),
+            "town_depr_index": rng.uniform(-7, 11, n),
+        }
+    )
+    for col in [
+        "b_atrial_fibr",
+        "b_antipsychotic_use",
+        "b_steroid_treat",
+        "b_erectile_disf",
+        "b_had_migraine",
+        "b_rheumatoid_arthritis",
+        "b_renal",
+        "b_mental_illness",
+        "b_sle",
+        "ht_treat",
+        "b_diab_type1",
+        "b_diab_type2",
+        "family_cvd",
+    ]:
+        df[col] = rng.integers(0, 2, n)
+
+    return df
+
+
+def _legacy_predict(df: pd.DataFrame) -> np.ndarray:
+    # the row-by-row evaluation of the scalar equations
+    def _row(row: pd.Series) -> float:
+        return inference(
+            gender=row["sex"],
+            age=row["age"],
+            b_AF=row["b_atrial_fibr"],
+            b_atypicalantipsy=row["b_antipsychotic_use"],
+            b_corticosteroids=row["b_steroid_treat"],
+            b_impotence2=row["b_erectile_disf"],
+            b_migraine=row["b_had_migraine"],
+            b_ra=row["b_rheumatoid_arthritis"],
+            b_renal=row["b_renal"],
+            b_semi=row["b_mental_illness"],
+            b_sle=row["b_sle"],
+            b_treatedhyp=row["ht_treat"],
+            b_type1=row["b_diab_type1"],
+            b_type2=row["b_diab_type2"],
+            bmi=row["bmi"],
+            ethrisk=row["ethrisk"],
+            fh_cvd=row["family_cvd"],
+            rati=row["chol_ratio"],
+            sbp=row["sbp"],
+            sbps5=row["sbps5"],
+            smoke_cat=row["smoker"],
+            town=row["town_depr_index"],
+        )
+
+    return df.apply(_row, axis=1).to_numpy()
+
+
 def test_sanity() -> None:
     score = inference(
         gender="F",
@@ -31,3 +107,29 @@ def test_sanity() -> None:
     )
 
     assert score < 1
+
+
+def test_batch_parity() -> None:
+    df = _cohort(2000)
+    df.index = df.index + 100
+
+    preds = QRisk3Model().predict(df)
+
+    assert list(preds.columns) == [10 * 365]
+    assert (preds.index == df.index).all()
+    assert np.array_equal(preds.to_numpy()[:, 0], _legacy_predict(df))
+
+
+@pytest.mark.parametrize("n_samples", [200000])
+def test_benchmark_batch(benchmark: Any, n_samples: int) -> None:
+    df = _cohort(n_samples)
+
+    preds = benchmark.pedantic(QRisk3Model().predict, args=(df,), rounds=3)
+    assert preds.shape == (n_samples, 1)
+
+
+@pytest.mark.parametrize("n_samples", [5000])
+def test_benchmark_legacy(benchmark: Any, n_samples: int) -> None:
+    df = _cohort(n_samples)
+
+    benchmark.pedantic(_legacy_predict, args=(df,), rounds=1)
@@ -1,9 +1,47 @@
+# stdlib
+from typing import Any
+
+# third party
+import numpy as np
+import pandas as pd
+
 # autoprognosis absolute
 from autoprognosis.plugins.prediction.risk_estimation.benchmarks.diabetes.ada.model import (
+    ADAModel,
     inference,
 )
 
 
+def _cohort(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    return pd.DataFrame(
+        {
+            "sex": rng.choice(["M", "F"], n),
+            "age": rng.integers(30, 80, n),
+            "fh_diab": rng.integers(0, 2, n),
+            "ht_treat": rng.integers(0, 2, n),
+            "b_daily_exercise": rng.integers(0, 2, n),
+            "bmi": rng.integers(18, 45, n),
+        }
+    )
+
+
+def _legacy_predict(df: pd.DataFrame) -> np.ndarray:
+    # the row-by-row evaluation of the scalar points
+    def _row(row: pd.Series) -> float:
+        return inference(
+            gender=row["sex"],
+            age=row["age"],
+            fh_diab=row["fh_diab"],
+            b_treatedhyp=row["ht_treat"],
+            b_daily_exercise=row["b_daily_exercise"],
+            bmi=row["bmi"],
+        )
+
+    return df.apply(_row, axis=1).to_numpy()
+
+
 def test_sanity() -> None:
     score = inference(
         gender="F",
@@ -15,3 +53,19 @@ def test_sanity() -> None:
     )
 
     assert score < 1
+
+
+def test_batch_parity() -> None:
+    df = _cohort(5000)
+
+    preds = ADAModel().predict(df)
+
+    assert list(preds.columns) == [10 * 365]
+    assert np.array_equal(preds.to_numpy()[:, 0], _legacy_predict(df))
+
+
+def test_benchmark_batch(benchmark: Any) -> None:
+    df = _cohort(200000)
+
+    preds = benchmark.pedantic(ADAModel().predict, args=(df,), rounds=3)
+    assert preds.shape == (len(df), 1)
@@ -1,9 +1,49 @@
+# stdlib
+from typing import Any
+
+# third party
+import numpy as np
+import pandas as pd
+
 # autoprognosis absolute
 from autoprognosis.plugins.prediction.risk_estimation.benchmarks.diabetes.diabetes_uk.model import (
+    DiabetesUKModel,
     inference,
 )
 
 
+def _cohort(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    return pd.DataFrame(
+        {
+            "sex": rng.choice(["M", "F"], n),
+            "age": rng.integers(30, 80, n),
+            "ethrisk": rng.integers(0, 3, n),
+            "fh_diab": rng.integers(0, 2, n),
+            "waist": rng.integers(70, 120, n),
+            "bmi": rng.integers(18, 40, n),
+            "ht_treat": rng.integers(0, 2, n),
+        }
+    )
+
+
+def _legacy_predict(df: pd.DataFrame) -> np.ndarray:
+    # the row-by-row evaluation of the scalar points
+    def _row(row: pd.Series) -> float:
+        return inference(
+            gender=row["sex"],
+            age=row["age"],
+            ethrisk=row["ethrisk"],
+            fh_diab=row["fh_diab"],
+            waist=row["waist"],
+            bmi=row["bmi"],
+            b_treatedhyp=row["ht_treat"],
+        )
+
+    return df.apply(_row, axis=1).to_numpy()
+
+
 def test_sanity() -> None:
     score = inference(
         gender="F",
@@ -16,3 +56,19 @@ def test_sanity() -> None:
     )
 
     assert score < 1
+
+
+def test_batch_parity() -> None:
+    df = _cohort(5000)
+
+    preds = DiabetesUKModel().predict(df)
+
+    assert list(preds.columns) == [10 * 365]
+    assert np.array_equal(preds.to_numpy()[:, 0], _legacy_predict(df))
+
+
+def test_benchmark_batch(benchmark: Any) -> None:
+    df = _cohort(200000)
+
+    preds = benchmark.pedantic(DiabetesUKModel().predict, args=(df,), rounds=3)
+    assert preds.shape == (len(df), 1)
@@ -1,12 +1,78 @@
+# stdlib
+from typing import Any
+
 # third party
+import numpy as np
+import pandas as pd
 import pytest
 
 # autoprognosis absolute
 from autoprognosis.plugins.prediction.risk_estimation.benchmarks.diabetes.qdiabetes.model import (
+    QDiabetesModel,
     inference,
 )
 
 
+def _cohort(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+
+    df = pd.DataFrame(
+        {
+            "sex": rng.choice(["M", "F"], n),
+            "age": rng.uniform(25, 84, n),
+            "bmi": rng.uniform(18, 45, n),
+            "ethrisk": rng.integers(1, 10, n),
+            "fbs": rng.uniform(2, 7, n),
+            "hba1c": rng.uniform(15, 48, n),
+            "smoker": rng.integers(0, 5, n),
+            "town_depr_index": rng.uniform(-7, 11, n),
+        }
+    )
+    for col in [
+        "b_antipsychotic_use",
+        "b_steroid_treat",
+        "b_cvd",
+        "b_gestdiab",
+        "b_learning",
+        "b_manicschiz",
+        "b_pos",
+        "b_statin",
+        "ht_treat",
+        "fh_diab",
+    ]:
+        df[col] = rng.integers(0, 2, n)
+
+    return df
+
+
+def _legacy_predict(model: str, df: pd.DataFrame) -> np.ndarray:
+    # the row-by-row evaluation of the scalar equations
+    def _row(row: pd.Series) -> float:
+        return inference(
+            model=model,
+            gender=row["sex"],
+            age=row["age"],
+            b_atypicalantipsy=row["b_antipsychotic_use"],
+            b_corticosteroids=row["b_steroid_treat"],
+            b_cvd=row["b_cvd"],
+            b_gestdiab=row["b_gestdiab"],
+            b_learning=row["b_learning"],
+            b_manicschiz=row["b_manicschiz"],
+            b_pos=row["b_pos"],
+            b_statin=row["b_statin"],
+            b_treatedhyp=row["ht_treat"],
+            bmi=row["bmi"],
+            ethrisk=row["ethrisk"],
+            fbs=row["fbs"],
+            fh_diab=row["fh_diab"],
+            hba1c=row["hba1c"],
+            smoke_cat=row["smoker"],
+            town=row["town_depr_index"],
+        )
+
+    return df.apply(_row, axis=1).to_numpy()
+
+
 @pytest.mark.parametrize("model", ["A", "B", "C"])
 def test_sanity(model) -> None:
     score = inference(
@@ -32,3 +98,26 @@ def test_sanity(model) -> None:
     )
 
     assert score <= 1
+
+
+@pytest.mark.parametrize("model", ["A", "B", "C"])
+def test_batch_parity(model: str) -> None:
+    df = _cohort(2000)
+
+    preds = QDiabetesModel(model).predict(df)
+
+    assert list(preds.columns) == [10 * 365]
+    assert np.array_equal(preds.to_numpy()[:, 0], _legacy_predict(model, df))
+
+
+def test_batch_invalid_model() -> None:
+    with pytest.raises(ValueError):
+        QDiabetesModel("D").predict(_cohort(10))
+
+
+@pytest.mark.parametrize("model", ["A", "C"])
+def test_benchmark_batch(benchmark: Any, model: str) -> None:
+    df = _cohort(200000)
+
+    preds = benchmark.pedantic(QDiabetesModel(model).predict, args=(df,), rounds=3)
+    assert preds.shape == (len(df), 1)
@@ -0,0 +1,67 @@
+# stdlib
+from pathlib import Path
+
+# third party
+import pandas as pd
+from sklearn.datasets import load_breast_cancer
+
+# autoprognosis absolute
+from autoprognosis.plugins.pipeline import Pipeline
+from autoprognosis.utils.cache import (
+    EvaluationCache,
+    dataset_fingerprint,
+    estimator_fingerprint,
+)
+from autoprognosis.utils.tester import evaluate_estimator
+
+
+def test_fingerprints() -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+
+    assert dataset_fingerprint(X, Y) == dataset_fingerprint(X.copy(), Y.copy())
+    assert dataset_fingerprint(X, Y) != dataset_fingerprint(X, 1 - Y)
+    assert dataset_fingerprint(X, Y) != dataset_fingerprint(
+        X, Y, group_ids=pd.Series(range(len(Y)))
+    )
+
+    template = Pipeline(["prediction.classifier.logistic_regression"])
+    assert estimator_fingerprint(template({"logistic_regression": {"C": 1}})) != (
+        estimator_fingerprint(template({"logistic_regression": {"C": 2}}))
+    )
+    assert estimator_fingerprint(template()) == estimator_fingerprint(template())
+    assert estimator_fingerprint([template()]) is None
+
+
+def test_evaluate_estimator_cache(tmp_path: Path) -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+
+    cache = EvaluationCache(tmp_path)
+    model = Pipeline(["prediction.classifier.logistic_regression"])()
+
+    reference = evaluate_estimator(model, X, Y, n_folds=3)
+    first = evaluate_estimator(model, X, Y, n_folds=3, cache=cache)
+    assert len(list(tmp_path.glob("*.fold"))) == 3
+
+    second = evaluate_estimator(model, X, Y, n_folds=3, cache=cache)
+
+    assert reference["clf"]["aucroc"] == first["clf"]["aucroc"]
+    assert first["clf"]["aucroc"] == second["clf"]["aucroc"]
+
+    # the cached fold models are reused for other metrics
+    aucprc = evaluate_estimator(model, X, Y, n_folds=3, metric="aucprc", cache=cache)
+    assert aucprc["clf"]["aucprc"][0] > 0
+
+
+def test_cache_eviction(tmp_path: Path) -> None:
+    cache = EvaluationCache(tmp_path, max_size=1024)
+
+    for idx in range(10):
+        key = cache.key("dataset", "estimator", 3, 0, idx)
+        cache.put(key, scores={"aucroc": idx}, model=list(range(100)))
+
+    assert cache.size() <= 1024
+    last = cache.key("dataset", "estimator", 3, 0, 9)
+    assert cache.get_score(last, "aucroc") == 9
+
+    cache.clear()
+    assert cache.size() == 0
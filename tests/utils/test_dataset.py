@@ -0,0 +1,72 @@
+# stdlib
+import pickle
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
+# autoprognosis absolute
+from autoprognosis.utils.dataset import SharedDataset, reset_index, share, take_rows
+
+
+def _dataset(n_rows: int) -> pd.DataFrame:
+    rng = np.random.RandomState(0)
+    return pd.DataFrame(
+        {
+            "a": rng.rand(n_rows),
+            "b": rng.randint(0, 10, n_rows),
+            "c": rng.rand(n_rows),
+            "d": rng.choice(["x", "y"], n_rows),
+        }
+    )
+
+
+@pytest.mark.parametrize("shared", [True, False])
+def test_shared_dataset_rows(shared: bool) -> None:
+    X = _dataset(100000)
+    data = SharedDataset(X, shared=shared)
+
+    assert (data.folder is not None) == shared
+    assert data.shape == X.shape
+    assert data.frame().equals(X)
+
+    index = np.array([5, 1, 99999, 42])
+    rows = data.rows(index)
+    assert rows.equals(X.iloc[index])
+
+    # the rows are private copies
+    rows["a"] = 0
+    assert data.frame().equals(X)
+
+
+def test_shared_dataset_pickle() -> None:
+    X = _dataset(100000)
+    data = SharedDataset(X)
+
+    buff = pickle.dumps(data)
+    # only the paths of the numeric blocks are pickled
+    assert len(buff) < X[["a", "b", "c"]].memory_usage().sum() / 10
+
+    remote = pickle.loads(buff)
+    assert isinstance(remote._blocks[0][1], np.memmap)
+    assert remote.frame().equals(X)
+    assert remote.rows(np.arange(10)).equals(X.iloc[:10])
+
+
+def test_shared_dataset_view() -> None:
+    X = pd.DataFrame(np.random.rand(1000, 5))
+    data = SharedDataset(X, shared=False)
+
+    # single dtype, no copies
+    assert np.shares_memory(data.frame().to_numpy(), data._blocks[0][1])
+
+
+def test_helpers() -> None:
+    X = _dataset(10)
+
+    assert reset_index(X) is X
+    assert reset_index(X.iloc[::-1]).index.equals(pd.RangeIndex(10))
+
+    assert take_rows(X, np.array([1, 2])).equals(X.iloc[[1, 2]])
+    assert share(X, n_jobs=1, n_tasks=3) is X
@@ -0,0 +1,125 @@
+# stdlib
+import copy
+from typing import Any, List
+
+# third party
+from lifelines.datasets import load_rossi
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import load_breast_cancer
+from sklearn.model_selection import StratifiedKFold
+
+# autoprognosis absolute
+from autoprognosis.plugins.ensemble.classifiers import WeightedEnsemble
+from autoprognosis.plugins.ensemble.risk_estimation import RiskEnsemble
+from autoprognosis.plugins.pipeline import Pipeline
+from autoprognosis.utils.oof import ClassifierOOFPredictions, RiskOOFPredictions
+from autoprognosis.utils.tester import evaluate_estimator, evaluate_survival_estimator
+
+
+def _pretrain(models: List, X: pd.DataFrame, *targets: Any, n_folds: int = 3) -> List:
+    skf = StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=0)
+
+    folds = []
+    for train_index, _ in skf.split(X, targets[-1]):
+        fold = []
+        for model in models:
+            model = copy.deepcopy(model)
+            model.fit(
+                X.iloc[train_index], *[target.iloc[train_index] for target in targets]
+            )
+            fold.append(model)
+        folds.append(fold)
+
+    return folds
+
+
+@pytest.mark.parametrize("metric", ["aucroc", "aucprc"])
+def test_classifier_oof_parity(metric: str) -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+    models = [
+        Pipeline(["prediction.classifier.logistic_regression"])(),
+        Pipeline(["prediction.classifier.lda"])(),
+    ]
+    folds = _pretrain(models, X, Y)
+
+    oof = ClassifierOOFPredictions(folds, X, Y, n_folds=3, metric=metric)
+
+    for weights in [[1, 0], [0.3, 0.7]]:
+        expected = evaluate_estimator(
+            [WeightedEnsemble(fold, weights) for fold in folds],
+            X,
+            Y,
+            n_folds=3,
+            metric=metric,
+            pretrained=True,
+        )
+        assert np.allclose(
+            oof.evaluate(weights)["clf"][metric], expected["clf"][metric]
+        )
+
+
+def test_risk_oof_parity() -> None:
+    rossi = load_rossi()
+
+    X = rossi.drop(["week", "arrest"], axis=1)
+    T = rossi["week"]
+    Y = rossi["arrest"]
+    time_horizon = int(T[Y.iloc[:] == 1].quantile(0.5))
+
+    models = [
+        # RiskEnsemble merges the models with the same args
+        Pipeline(["prediction.risk_estimation.cox_ph"])({"cox_ph": {"penalizer": 0.1}}),
+        Pipeline(["prediction.risk_estimation.weibull_aft"])(),
+    ]
+    folds = _pretrain(models, X, T, Y)
+
+    oof = RiskOOFPredictions(folds, X, T, Y, [time_horizon], n_folds=3)
+
+    for weights in [[1, 0], [0.4, 0.6]]:
+        expected = evaluate_survival_estimator(
+            [RiskEnsemble(fold, [weights], [time_horizon]) for fold in folds],
+            X,
+            T,
+            Y,
+            [time_horizon],
+            n_folds=3,
+            pretrained=True,
+        )
+        output = oof.evaluate(weights)
+
+        for metric in ["c_index", "brier_score", "aucroc", "sensitivity"]:
+            assert np.allclose(output["clf"][metric], expected["clf"][metric])
+
+
+def test_risk_oof_horizon_subset() -> None:
+    rossi = load_rossi()
+
+    X = rossi.drop(["week", "arrest"], axis=1)
+    T = rossi["week"]
+    Y = rossi["arrest"]
+    time_horizons = [
+        int(T[Y.iloc[:] == 1].quantile(0.25)),
+        int(T[Y.iloc[:] == 1].quantile(0.5)),
+    ]
+
+    models = [
+        Pipeline(["prediction.risk_estimation.cox_ph"])({"cox_ph": {"penalizer": 0.1}}),
+        Pipeline(["prediction.risk_estimation.weibull_aft"])(),
+    ]
+    folds = _pretrain(models, X, T, Y)
+
+    shared = RiskOOFPredictions(folds, X, T, Y, time_horizons, n_folds=3)
+
+    for horizon in time_horizons:
+        single = RiskOOFPredictions(folds, X, T, Y, [horizon], n_folds=3)
+
+        expected = single.evaluate([0.4, 0.6])
+        output = shared.evaluate([0.4, 0.6], [horizon])
+
+        for metric in ["c_index", "brier_score", "aucroc", "sensitivity"]:
+            assert np.allclose(output["clf"][metric], expected["clf"][metric])
+
+    with pytest.raises(ValueError):
+        shared.evaluate([0.4, 0.6], [time_horizons[0] + 1000])
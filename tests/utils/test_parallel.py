@@ -0,0 +1,111 @@
+# stdlib
+import threading
+
+# third party
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+# autoprognosis absolute
+from autoprognosis.plugins.prediction.classifiers.helper_calibration import (
+    calibrated_model,
+)
+from autoprognosis.utils.parallel import ResourceManager, limit_model_threads, resources
+
+
+def _budget(manager: ResourceManager) -> int:
+    return manager.available()
+
+
+def test_budget_split() -> None:
+    manager = ResourceManager(8)
+
+    assert manager.available() == 8
+    assert manager.clamp(-1) == 8
+    assert manager.clamp(None) == 8
+    assert manager.clamp(3) == 3
+    assert manager.clamp(16) == 8
+
+    assert manager.split(2, 10) == (2, 4)
+    assert manager.split(-1, 3) == (3, 2)
+    assert manager.split(16, 100) == (8, 1)
+
+
+def test_nested_scopes() -> None:
+    manager = ResourceManager(8)
+
+    with manager.scope(4, name="search"):
+        assert manager.available() == 4
+        with manager.scope(-1, name="folds"):
+            assert manager.available() == 4
+        with manager.scope(2, name="folds"):
+            assert manager.available() == 2
+            assert manager.split(-1, 10) == (2, 1)
+        assert manager.available() == 4
+
+    assert manager.available() == 8
+
+    usage = manager.usage()
+    assert usage["search"]["calls"] == 1
+    assert usage["folds"]["calls"] == 2
+    assert set(manager.utilization().keys()) == {"search", "folds"}
+
+    manager.reset_usage()
+    assert manager.usage() == {}
+
+
+def test_parallel_map() -> None:
+    manager = ResourceManager(2)
+
+    out = manager.parallel_map(
+        pow, [(idx, 2) for idx in range(10)], n_jobs=2, name="tasks"
+    )
+    assert out == [idx**2 for idx in range(10)]
+    assert manager.usage()["tasks"]["calls"] == 10
+
+    budgets = manager.parallel_map(_budget, [(manager,)] * 4, n_jobs=1, name="seq")
+    assert budgets == [2] * 4
+
+
+def test_limit_model_threads() -> None:
+    model = RandomForestClassifier(n_jobs=-1)
+
+    with resources.scope(1):
+        limit_model_threads(model)
+        assert model.n_jobs == 1
+
+    limit_model_threads(model)
+    assert model.n_jobs == resources.total()
+
+
+def test_thread_scopes_keep_native_limits() -> None:
+    # third party
+    from threadpoolctl import threadpool_info, threadpool_limits
+
+    def native_threads() -> list:
+        return [pool["num_threads"] for pool in threadpool_info()]
+
+    manager = ResourceManager(8)
+
+    with threadpool_limits(limits=2):
+        expected = native_threads()
+
+        def worker() -> None:
+            with manager.scope(1, name="thread"):
+                assert manager.available() == 1
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert native_threads() == expected
+        assert manager.usage()["thread"]["calls"] == 4
+
+
+def test_calibrated_model_threads() -> None:
+    model = calibrated_model(LogisticRegression(), calibration=1)
+
+    with resources.scope(1):
+        limit_model_threads(model)
+        assert model.n_jobs == 1
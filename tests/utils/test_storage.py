@@ -0,0 +1,101 @@
+# stdlib
+from pathlib import Path
+
+# third party
+import optuna
+import pytest
+
+# autoprognosis absolute
+from autoprognosis.explorers.core.optimizers.bayesian import BayesianOptimizer
+from autoprognosis.utils.storage import (
+    InMemoryBackend,
+    JournalBackend,
+    RedisBackend,
+    SQLiteBackend,
+    default_storage_path,
+    get_backend,
+)
+
+
+def _objective(trial: optuna.Trial) -> float:
+    return trial.suggest_float("x", 0, 1)
+
+
+def test_get_backend(tmp_path: Path) -> None:
+    assert isinstance(get_backend("sqlite", tmp_path), SQLiteBackend)
+    assert isinstance(get_backend("journal", tmp_path), JournalBackend)
+    assert isinstance(get_backend("memory"), InMemoryBackend)
+    assert get_backend("sqlite", tmp_path) is get_backend("sqlite", tmp_path)
+
+    # the default storage is selected by the environment
+    assert isinstance(get_backend(), SQLiteBackend)
+
+    with pytest.raises(ValueError):
+        get_backend("invalid")
+
+
+def test_lazy_connection() -> None:
+    backend = RedisBackend(host="invalid-host")
+    assert backend._storage is None
+    assert backend._client is None
+
+
+@pytest.mark.parametrize("storage_type", ["sqlite", "journal"])
+def test_local_storage_resume(tmp_path: Path, storage_type: str) -> None:
+    storage = get_backend(storage_type, tmp_path).optuna()
+
+    study = optuna.create_study(study_name="resume", storage=storage)
+    study.optimize(_objective, n_trials=3)
+
+    # a new process would reconnect to the same files
+    reloaded = get_backend(storage_type, tmp_path).__class__(tmp_path).optuna()
+    resumed = optuna.load_study(study_name="resume", storage=reloaded)
+    assert len(resumed.trials) == 3
+
+
+def test_sqlite_connection_pool(tmp_path: Path) -> None:
+    # third party
+    from sqlalchemy import event
+
+    storage = SQLiteBackend(tmp_path, max_connections=2).optuna()
+
+    connections = []
+    event.listen(
+        storage.engine, "connect", lambda conn, record: connections.append(conn)
+    )
+
+    study = optuna.create_study(study_name="pool", storage=storage)
+    study.optimize(_objective, n_trials=10, n_jobs=4)
+
+    assert len(study.trials) == 10
+    assert len(connections) <= 2
+
+
+def test_optimizer_storage_fallback() -> None:
+    optimizer = BayesianOptimizer(
+        study_name="fallback",
+        evaluation_cbk=lambda: 0,
+        storage_type="redis",
+    )
+
+    # without a reachable Redis server, the study is created in the local storage
+    study, _ = optimizer.create_study("fallback_study")
+
+    assert optimizer._study_backend is not None
+    assert optimizer._study_backend.persistent()
+    study.optimize(_objective, n_trials=2)
+
+
+def test_default_storage_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("AUTOPROGNOSIS_STORAGE_PATH")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+
+    expected = tmp_path / "cache" / "autoprognosis" / "studies"
+    assert default_storage_path() == expected.resolve()
+
+    # independent of the working directory
+    monkeypatch.chdir(tmp_path)
+    assert default_storage_path() == expected.resolve()
+
+    monkeypatch.setenv("AUTOPROGNOSIS_STORAGE_PATH", str(tmp_path / "studies"))
+    assert default_storage_path() == (tmp_path / "studies").resolve()
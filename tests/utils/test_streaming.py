@@ -0,0 +1,102 @@
+# stdlib
+from pathlib import Path
+
+# third party
+import numpy as np
+import pandas as pd
+import pytest
+
+# autoprognosis absolute
+from autoprognosis.utils.streaming import (
+    iter_batches,
+    predict_batches,
+    stream,
+    write_parquet,
+)
+
+
+def _dataset(n_rows: int) -> pd.DataFrame:
+    rng = np.random.RandomState(0)
+    return pd.DataFrame(
+        {
+            "a": rng.rand(n_rows),
+            "b": rng.randint(0, 10, n_rows),
+        }
+    )
+
+
+def _predict(X: pd.DataFrame) -> np.ndarray:
+    return np.asarray(X["a"] * X["b"]).reshape(-1, 1)
+
+
+@pytest.mark.parametrize("source", ["frame", "csv", "chunks"])
+def test_iter_batches(tmp_path: Path, source: str) -> None:
+    X = _dataset(1050)
+
+    if source == "frame":
+        batches = list(iter_batches(X, batch_size=100))
+        assert [len(batch) for batch in batches] == [100] * 10 + [50]
+    elif source == "csv":
+        X.to_csv(tmp_path / "data.csv", index=False)
+        batches = list(iter_batches(tmp_path / "data.csv", batch_size=100))
+        assert [len(batch) for batch in batches] == [100] * 10 + [50]
+    else:
+        batches = list(iter_batches(np.array_split(X, 3)))
+
+    assert np.allclose(pd.concat(batches).to_numpy(), X.to_numpy())
+    assert (pd.concat(batches).index == X.index).all()
+
+    with pytest.raises(ValueError):
+        iter_batches(X, batch_size=0)
+
+
+def test_stream_lazy() -> None:
+    X = _dataset(1000)
+    seen = []
+
+    def predict(chunk: pd.DataFrame) -> np.ndarray:
+        seen.append(len(chunk))
+        return _predict(chunk)
+
+    results = stream(predict, X, batch_size=300)
+    # nothing is read before the first chunk is requested
+    assert seen == []
+
+    first = next(results)
+    assert seen == [300]
+    assert (first.index == X.index[:300]).all()
+
+    output = pd.concat([first, *results])
+    assert seen == [300, 300, 300, 100]
+    assert np.allclose(output.to_numpy(), _predict(X))
+
+
+def test_predict_batches_index() -> None:
+    X = _dataset(100)
+    X.index = X.index + 1000
+
+    output = pd.concat(predict_batches(_predict, iter_batches(X, batch_size=30)))
+
+    assert (output.index == X.index).all()
+
+
+def test_stream_parquet(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow.parquet", exc_type=ImportError)
+
+    X = _dataset(1000)
+    X.to_parquet(tmp_path / "data.parquet")
+
+    n_rows = stream(
+        _predict,
+        tmp_path / "data.parquet",
+        batch_size=256,
+        output_path=tmp_path / "predictions.parquet",
+    )
+    assert n_rows == len(X)
+
+    output = pd.read_parquet(tmp_path / "predictions.parquet")
+    assert list(output.columns) == ["0"]
+    assert np.allclose(output.to_numpy(), _predict(X))
+
+    # empty input: nothing to write
+    assert write_parquet([], tmp_path / "empty.parquet") == 0
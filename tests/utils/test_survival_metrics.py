@@ -0,0 +1,173 @@
+# stdlib
+from typing import Any
+
+# third party
+import numpy as np
+import pytest
+
+# autoprognosis absolute
+from autoprognosis.utils.metrics import survival_structured
+from autoprognosis.utils.third_party.metrics import (
+    SurvivalMetricsEvaluator,
+    brier_score,
+    concordance_index_censored,
+    concordance_index_ipcw,
+)
+from autoprognosis.utils.third_party.nonparametric import CensoringDistributionEstimator
+
+
+def _cohort(n: int, seed: int = 0, ties: bool = False) -> Any:
+    rng = np.random.default_rng(seed)
+
+    T = rng.exponential(10, n)
+    if ties:
+        T = np.ceil(T)
+    Y = rng.random(n) < 0.5
+    # the censoring distribution must be positive on the test times
+    T[0] = T.max() + 1
+    Y[0] = True
+
+    risk = rng.random(n)
+    if ties:
+        risk = np.round(risk, 1)
+
+    return T, Y, risk
+
+
+def _legacy_concordance_index(
+    event: np.ndarray,
+    time: np.ndarray,
+    estimate: np.ndarray,
+    weights: np.ndarray,
+    tied_tol: float = 1e-8,
+) -> float:
+    # the pairwise estimator: each event against its comparable samples
+    numerator = 0.0
+    denominator = 0.0
+    for i in np.where(event)[0]:
+        mask = (time > time[i]) | ((time == time[i]) & ~event)
+        est = estimate[mask]
+
+        ties = np.absolute(est - estimate[i]) <= tied_tol
+        n_con = (est < estimate[i])[~ties].sum()
+
+        numerator += weights[i] * n_con + 0.5 * weights[i] * ties.sum()
+        denominator += weights[i] * mask.sum()
+
+    return numerator / denominator
+
+
+@pytest.mark.parametrize("ties", [False, True])
+def test_concordance_index_censored(ties: bool) -> None:
+    T, Y, risk = _cohort(300, ties=ties)
+
+    assert np.isclose(
+        concordance_index_censored(Y, T, risk),
+        _legacy_concordance_index(Y, T, risk, np.ones(len(T))),
+    )
+
+
+@pytest.mark.parametrize("ties", [False, True])
+@pytest.mark.parametrize("tau", [None, 5])
+def test_concordance_index_ipcw(ties: bool, tau: Any) -> None:
+    T, Y, risk = _cohort(300, ties=ties)
+    survival = survival_structured(T, Y)
+
+    ipcw = CensoringDistributionEstimator().fit(survival).predict_ipcw(survival)
+    if tau is not None:
+        ipcw[T >= tau] = 0
+
+    assert np.isclose(
+        concordance_index_ipcw(survival, survival, risk, tau=tau),
+        _legacy_concordance_index(Y, T, risk, np.square(ipcw)),
+    )
+
+
+def test_concordance_index_no_pairs() -> None:
+    with pytest.raises(RuntimeError):
+        concordance_index_censored(
+            np.asarray([False, False, True]), np.asarray([1.0, 2.0, 3.0]), np.ones(3)
+        )
+
+
+def test_batched_evaluator() -> None:
+    T, Y, _ = _cohort(500)
+    survival = survival_structured(T, Y)
+    times = [2, 5, 10]
+
+    rng = np.random.default_rng(1)
+    candidates = rng.random((4, len(T), len(times)))
+
+    evaluator = SurvivalMetricsEvaluator(survival, survival)
+
+    brier = evaluator.brier_score(candidates, times)
+    assert brier.shape == (4, len(times))
+    for idx, candidate in enumerate(candidates):
+        assert np.allclose(
+            brier[idx], brier_score(survival, survival, candidate, times)
+        )
+
+    cindex = evaluator.concordance_index(1 - candidates[:, :, 1], tau=5)
+    assert cindex.shape == (4,)
+    for idx, candidate in enumerate(candidates):
+        assert np.isclose(
+            cindex[idx],
+            concordance_index_ipcw(survival, survival, 1 - candidate[:, 1], tau=5),
+        )
+
+
+# the legacy estimator keeps a boolean mask per event: O(n^2) memory, so it is timed on a subsample of the cohort
+@pytest.mark.parametrize("n_samples", [5000])
+def test_benchmark_concordance_index_legacy(benchmark: Any, n_samples: int) -> None:
+    T, Y, risk = _cohort(n_samples)
+
+    benchmark.pedantic(
+        _legacy_concordance_index,
+        args=(Y, T, risk, np.ones(n_samples)),
+        rounds=1,
+        iterations=1,
+    )
+
+
+@pytest.mark.parametrize("n_samples", [5000, 100000])
+def test_benchmark_concordance_index(benchmark: Any, n_samples: int) -> None:
+    T, Y, risk = _cohort(n_samples)
+    survival = survival_structured(T, Y)
+
+    score = benchmark.pedantic(
+        concordance_index_ipcw,
+        args=(survival, survival, risk),
+        kwargs={"tau": 10},
+        rounds=3,
+        iterations=1,
+    )
+    assert 0.4 < score < 0.6
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_benchmark_brier_score(benchmark: Any, batched: bool) -> None:
+    T, Y, _ = _cohort(100000)
+    survival = survival_structured(T, Y)
+    times = [2, 5, 10, 15, 20]
+
+    rng = np.random.default_rng(1)
+    candidates = rng.random((10, len(T), len(times)))
+
+    def evaluate() -> np.ndarray:
+        if batched:
+            return SurvivalMetricsEvaluator(survival, survival).brier_score(
+                candidates, times
+            )
+        # one call per candidate and horizon, like the per-fold evaluation
+        return np.asarray(
+            [
+                [
+                    brier_score(survival, survival, candidate[:, k], times[k])[0]
+                    for k in range(len(times))
+                ]
+                for candidate in candidates
+            ]
+        )
+
+    scores = benchmark.pedantic(evaluate, rounds=3, iterations=1)
+    assert scores.shape == (10, len(times))
@@ -0,0 +1,138 @@
+# stdlib
+from typing import Any, List
+
+# third party
+from lifelines.datasets import load_rossi
+import numpy as np
+import pandas as pd
+from sklearn.datasets import load_breast_cancer, load_diabetes
+
+# autoprognosis absolute
+from autoprognosis.plugins.pipeline import Pipeline
+from autoprognosis.utils.tester import (
+    evaluate_estimator,
+    evaluate_regression,
+    evaluate_survival_estimator,
+)
+
+
+def test_evaluate_estimator_parallel_folds() -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+    model = Pipeline(["prediction.classifier.logistic_regression"])()
+
+    sequential = evaluate_estimator(model, X, Y, n_folds=3, n_jobs=1)
+    parallel = evaluate_estimator(model, X, Y, n_folds=3, n_jobs=3)
+
+    assert np.allclose(sequential["clf"]["aucroc"], parallel["clf"]["aucroc"])
+
+
+def test_evaluate_regression_parallel_folds() -> None:
+    X, Y = load_diabetes(return_X_y=True, as_frame=True)
+    model = Pipeline(["prediction.regression.linear_regression"])()
+
+    sequential = evaluate_regression(model, X, Y, n_folds=3, n_jobs=1)
+    parallel = evaluate_regression(model, X, Y, n_folds=3, n_jobs=-1)
+
+    assert np.allclose(sequential["clf"]["r2"], parallel["clf"]["r2"])
+    assert np.allclose(sequential["clf"]["rmse"], parallel["clf"]["rmse"])
+
+
+def test_evaluate_survival_estimator_parallel_folds() -> None:
+    rossi = load_rossi()
+
+    X = rossi.drop(["week", "arrest"], axis=1)
+    T = rossi["week"]
+    Y = rossi["arrest"]
+    time_horizons = [int(T[Y.iloc[:] == 1].quantile(0.5))]
+
+    model = Pipeline(["prediction.risk_estimation.cox_ph"])()
+
+    sequential = evaluate_survival_estimator(
+        model, X, T, Y, time_horizons, n_folds=3, n_jobs=1
+    )
+    parallel = evaluate_survival_estimator(
+        model, X, T, Y, time_horizons, n_folds=3, n_jobs=3
+    )
+
+    for metric in ["c_index", "brier_score", "aucroc"]:
+        assert np.allclose(sequential["clf"][metric], parallel["clf"][metric])
+
+
+class _CountingRiskModel:
+    calls: List[str] = []
+
+    def __init__(self) -> None:
+        self.model = Pipeline(["prediction.risk_estimation.cox_ph"])()
+
+    def fit(self, X: pd.DataFrame, T: pd.Series, Y: pd.Series) -> "_CountingRiskModel":
+        self.calls.append("fit")
+        self.model.fit(X, T, Y)
+        return self
+
+    def predict(self, X: pd.DataFrame, time_horizons: List) -> Any:
+        self.calls.append("predict")
+        return self.model.predict(X, time_horizons)
+
+
+def test_evaluate_survival_estimator_single_pass() -> None:
+    rossi = load_rossi()
+
+    X = rossi.drop(["week", "arrest"], axis=1)
+    T = rossi["week"]
+    Y = rossi["arrest"]
+    time_horizons = [int(T[Y.iloc[:] == 1].quantile(q)) for q in [0.25, 0.5, 0.75]]
+
+    _CountingRiskModel.calls.clear()
+    output = evaluate_survival_estimator(
+        _CountingRiskModel(), X, T, Y, time_horizons, n_folds=3
+    )
+
+    # one fit and one prediction per fold, for all the horizons
+    assert _CountingRiskModel.calls.count("fit") == 3
+    assert _CountingRiskModel.calls.count("predict") == 3
+
+    assert 0.5 < output["clf"]["c_index"][0] < 1
+    assert 0 < output["clf"]["brier_score"][0] < 0.5
+    assert 0.5 < output["clf"]["aucroc"][0] < 1
+
+
+def test_evaluate_estimator_subsample() -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+    model = Pipeline(["prediction.classifier.logistic_regression"])()
+
+    full = evaluate_estimator(model, X, Y, n_folds=3)
+    subsampled = evaluate_estimator(model, X, Y, n_folds=3, subsample=0.3)
+    repeated = evaluate_estimator(model, X, Y, n_folds=3, subsample=0.3)
+
+    assert subsampled["clf"]["aucroc"][0] > 0.5
+    assert subsampled["clf"]["aucroc"] != full["clf"]["aucroc"]
+    assert subsampled["clf"]["aucroc"] == repeated["clf"]["aucroc"]
+
+
+def test_evaluate_estimator_fold_cbk() -> None:
+    X, Y = load_breast_cancer(return_X_y=True, as_frame=True)
+    model = Pipeline(["prediction.classifier.logistic_regression"])()
+
+    reported = []
+
+    def fold_cbk(step: int, score: float) -> bool:
+        reported.append((step, score))
+        return False
+
+    full = evaluate_estimator(model, X, Y, n_folds=3, fold_cbk=fold_cbk)
+
+    assert [step for step, _ in reported] == [1, 2, 3]
+    assert np.isclose(reported[-1][1], full["clf"]["aucroc"][0])
+
+    # stop after the first fold
+    reported = []
+    pruned = evaluate_estimator(
+        model,
+        X,
+        Y,
+        n_folds=3,
+        fold_cbk=lambda step, score: fold_cbk(step, score) or True,
+    )
+
+    assert len(reported) == 1
+    assert np.isclose(pruned["clf"]["aucroc"][0], reported[0][1])